@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import itertools
 import json
 import logging
+import math
 import sqlite3
 import time
 from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
 from datetime import UTC, datetime
 from pathlib import Path
@@ -15,12 +18,13 @@ from uuid import uuid4
 
 from apscheduler.schedulers.base import SchedulerNotRunningError  # type: ignore[import-untyped]
 from fastapi import Body, Depends, FastAPI, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from neo4j import Driver, GraphDatabase
+from neo4j import AsyncDriver, AsyncGraphDatabase, Driver, GraphDatabase
 from neo4j.exceptions import Neo4jError, ServiceUnavailable
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http.exceptions import UnexpectedResponse
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
@@ -30,11 +34,20 @@ from slowapi.util import get_remote_address
 from gateway import get_version
 from gateway.api.auth import require_maintainer, require_reader
 from gateway.config.settings import AppSettings, get_settings
-from gateway.graph import GraphNotFoundError, GraphQueryError, GraphService, get_graph_service
+from gateway.graph import AsyncGraphService, GraphNotFoundError, GraphQueryError, GraphService, NodeLookup, get_graph_service
 from gateway.graph.migrations import MigrationRunner
+from gateway.graph.projection import GraphProjectionStore
 from gateway.ingest.audit import AuditLogger
 from gateway.ingest.embedding import Embedder
+from gateway.ingest.lexical import LexicalVocabulary, lexical_vocabulary_path
 from gateway.ingest.lifecycle import summarize_lifecycle
+from gateway.ingest.state_files import (
+    ReloadingFileCache,
+    index_generation_path,
+    read_index_generation,
+    read_index_generation_state,
+)
+from gateway.ingest.symbols import SymbolIndex, symbol_index_path
 from gateway.observability import (
     GRAPH_MIGRATION_LAST_STATUS,
     GRAPH_MIGRATION_LAST_TIMESTAMP,
@@ -43,8 +56,24 @@ from gateway.observability import (
     configure_tracing,
 )
 from gateway.scheduler import IngestionScheduler
-from gateway.search import SearchOptions, SearchService, SearchWeights
+from gateway.search import (
+    SEARCH_MODES,
+    SEARCH_VERBOSITY_LEVELS,
+    AsyncSearchService,
+    SearchBatchResponse,
+    SearchOptions,
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+    SearchService,
+    SearchWeights,
+    project_result,
+)
+from gateway.search.breaker import GraphCircuitBreaker
+from gateway.search.cache import SearchResponseCache, search_fingerprint
+from gateway.search.encoder import QueryEncoder
 from gateway.search.feedback import SearchFeedbackStore
+from gateway.search.service import MAX_EXPAND_CONTEXT, MAX_GROUP_SIBLINGS, MAX_SIMILAR_SEEDS
 from gateway.search.trainer import ModelArtifact, load_artifact
 from gateway.ui import get_static_path
 from gateway.ui import router as ui_router
@@ -89,10 +118,21 @@ def _log_startup_configuration(settings: AppSettings) -> None:
     )
 
 
+def _refresh_graph_cache(app: FastAPI) -> None:
+    """Rebuild the graph projection, then invalidate and pre-warm subsystem snapshots, once an in-process ingest finishes."""
+
+    projection = getattr(app.state, "graph_projection_store", None)
+    if isinstance(projection, GraphProjectionStore):
+        projection.refresh(background=False)
+    service = getattr(app.state, "graph_service_instance", None)
+    if isinstance(service, GraphService):
+        service.refresh_generation()
+
+
 def _build_lifespan(settings: AppSettings) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-        scheduler = IngestionScheduler(settings)
+        scheduler = IngestionScheduler(settings, on_success=lambda _result: _refresh_graph_cache(app))
         scheduler.start()
         app.state.scheduler = scheduler
         try:
@@ -106,6 +146,20 @@ def _build_lifespan(settings: AppSettings) -> Callable[[FastAPI], AbstractAsyncC
             if driver:
                 with suppress(Neo4jError, OSError):
                     driver.close()
+            async_driver = getattr(app.state, "async_graph_driver", None)
+            if async_driver is not None:
+                with suppress(Neo4jError, OSError):
+                    await async_driver.close()
+            async_qdrant = getattr(app.state, "async_qdrant_client", None)
+            if async_qdrant is not None:
+                with suppress(OSError, RuntimeError):
+                    await async_qdrant.close()
+            encoder = getattr(app.state, "search_embedder", None)
+            if isinstance(encoder, QueryEncoder):
+                encoder.close()
+            encode_executor = getattr(app.state, "search_encode_executor", None)
+            if encode_executor is not None:
+                encode_executor.shutdown(wait=False)
 
     return cast(Callable[[FastAPI], AbstractAsyncContextManager[None]], lifespan)
 
@@ -153,7 +207,7 @@ def _init_graph_driver(settings: AppSettings) -> Driver | None:
         return None
 
     if settings.graph_auto_migrate:
-        _run_graph_auto_migration(driver, settings.neo4j_database)
+        _run_graph_auto_migration(driver, settings.neo4j_database, settings.graph_chunk_mode)
         return driver
 
     logger.info("Graph auto-migration disabled; run `gateway-graph migrate` during deployment")
@@ -169,11 +223,33 @@ def _init_qdrant_client(settings: AppSettings) -> QdrantClient | None:
         return None
 
 
+def _init_async_qdrant_client(settings: AppSettings) -> AsyncQdrantClient | None:
+    try:
+        # The synchronous client already performs the server version check at startup.
+        return AsyncQdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key, check_compatibility=False)
+    except (ValueError, ConnectionError, RuntimeError) as exc:  # pragma: no cover - offline scenarios
+        logger.warning("Async Qdrant client initialization failed: %s", exc)
+        return None
+
+
+def _create_async_graph_driver(settings: AppSettings) -> AsyncDriver | None:
+    try:
+        return AsyncGraphDatabase.driver(
+            settings.neo4j_uri,
+            auth=(settings.neo4j_user, settings.neo4j_password),
+            **settings.neo4j_driver_options(),
+        )
+    except (Neo4jError, ServiceUnavailable, OSError) as exc:  # pragma: no cover - connection may fail in dev/test
+        logger.warning("Async Neo4j driver initialization failed: %s", exc)
+        return None
+
+
 def _create_graph_driver(settings: AppSettings) -> Driver | None:
     try:
         return GraphDatabase.driver(
             settings.neo4j_uri,
             auth=(settings.neo4j_user, settings.neo4j_password),
+            **settings.neo4j_driver_options(),
         )
     except (Neo4jError, ServiceUnavailable, OSError) as exc:  # pragma: no cover - connection may fail in dev/test
         logger.warning("Neo4j driver initialization failed: %s", exc)
@@ -181,8 +257,21 @@ def _create_graph_driver(settings: AppSettings) -> Driver | None:
         return None
 
 
-def _run_graph_auto_migration(driver: Driver, database: str) -> None:
-    runner = MigrationRunner(driver=driver, database=database)
+def _init_graph_breaker(settings: AppSettings) -> GraphCircuitBreaker | None:
+    if not settings.search_graph_breaker_enabled:
+        return None
+    return GraphCircuitBreaker(
+        window_seconds=settings.search_graph_breaker_window_seconds,
+        min_calls=settings.search_graph_breaker_min_calls,
+        error_rate=settings.search_graph_breaker_error_rate,
+        slow_call_seconds=settings.search_graph_breaker_slow_ms / 1000.0,
+        cooldown_seconds=settings.search_graph_breaker_cooldown_seconds,
+        half_open_probes=settings.search_graph_breaker_half_open_probes,
+    )
+
+
+def _run_graph_auto_migration(driver: Driver, database: str, chunk_mode: str = "nodes") -> None:
+    runner = MigrationRunner(driver=driver, database=database, chunk_mode=chunk_mode)
     pending = _fetch_pending_migrations(runner)
     _log_migration_plan(pending)
 
@@ -276,11 +365,48 @@ def create_app() -> FastAPI:
 
     graph_driver = _init_graph_driver(settings)
     app.state.graph_driver = graph_driver
+    app.state.search_graph_breaker = _init_graph_breaker(settings)
 
     app.state.qdrant_client = _init_qdrant_client(settings)
 
+    app.state.async_qdrant_client = None
+    app.state.async_graph_driver = None
+    app.state.search_encode_executor = None
+    if settings.search_async_enabled:
+        app.state.async_qdrant_client = _init_async_qdrant_client(settings)
+        app.state.async_graph_driver = _create_async_graph_driver(settings) if graph_driver is not None else None
+        app.state.search_encode_executor = ThreadPoolExecutor(
+            max_workers=settings.search_encode_workers,
+            thread_name_prefix="search-encode",
+        )
+
     app.state.search_embedder = None
     app.state.search_model_artifact = model_artifact
+    app.state.lexical_vocabulary_store = (
+        ReloadingFileCache(
+            lexical_vocabulary_path(settings.state_path, settings.qdrant_collection),
+            LexicalVocabulary.load,
+        )
+        if settings.search_sparse_enabled
+        else None
+    )
+    app.state.search_response_cache = SearchResponseCache(
+        max_entries=settings.search_cache_max_entries,
+        ttl_seconds=settings.search_cache_ttl_seconds,
+    )
+    app.state.index_generation_store = ReloadingFileCache(
+        index_generation_path(settings.state_path),
+        read_index_generation,
+    )
+    app.state.graph_generation_store = ReloadingFileCache(
+        index_generation_path(settings.state_path),
+        read_index_generation_state,
+    )
+    app.state.symbol_index_store = (
+        ReloadingFileCache(symbol_index_path(settings.state_path, settings.qdrant_collection), SymbolIndex.load)
+        if settings.search_symbol_fastpath
+        else None
+    )
 
     limiter = _configure_rate_limits(app, settings)
     app.state.scheduler = None
@@ -299,6 +425,16 @@ def create_app() -> FastAPI:
 
     metrics_limit = f"{settings.rate_limit_requests} per {settings.rate_limit_window_seconds} seconds"
 
+    def graph_projection_store(request: Request) -> GraphProjectionStore | None:
+        driver = getattr(request.app.state, "graph_driver", None)
+        if driver is None or not settings.graph_projection_enabled:
+            return None
+        store = getattr(request.app.state, "graph_projection_store", None)
+        if store is None or store.driver is not driver:
+            store = GraphProjectionStore(driver, settings.neo4j_database, request.app.state.graph_generation_store.get)
+            request.app.state.graph_projection_store = store
+        return store
+
     def graph_service_dependency(request: Request) -> GraphService:
         driver = getattr(request.app.state, "graph_driver", None)
         if driver is None:
@@ -312,6 +448,11 @@ def create_app() -> FastAPI:
                 settings.neo4j_database,
                 cache_ttl=cache_ttl,
                 cache_max_entries=cache_max,
+                subsystem_fanout=settings.graph_subsystem_fanout,
+                generation_source=request.app.state.graph_generation_store.get,
+                prewarm_top_n=settings.graph_subsystem_prewarm_top_n,
+                chunk_nodes=settings.graph_chunk_mode == "nodes",
+                projection=graph_projection_store(request),
             )
             request.app.state.graph_service_instance = service
         return service
@@ -323,7 +464,12 @@ def create_app() -> FastAPI:
         embedder = getattr(request.app.state, "search_embedder", None)
         if embedder is None:
             try:
-                embedder = Embedder(settings.embedding_model)
+                embedder = QueryEncoder(
+                    Embedder(settings.embedding_model),
+                    cache_max_bytes=settings.search_embed_cache_mb * 1024 * 1024,
+                    batch_window_ms=settings.search_embed_batch_window_ms,
+                    max_batch_size=settings.search_embed_max_batch,
+                )
             except (RuntimeError, ValueError, OSError) as exc:  # pragma: no cover - loading errors logged
                 logger.warning("Failed to initialize embedder: %s", exc)
                 return None
@@ -340,11 +486,25 @@ def create_app() -> FastAPI:
             vector=vector_weight,
             lexical=lexical_weight,
         )
+        enrichment = settings.resolved_search_enrichment()
+        vocabulary_store = getattr(request.app.state, "lexical_vocabulary_store", None)
+        symbol_store = getattr(request.app.state, "symbol_index_store", None)
         search_options = SearchOptions(
             hnsw_ef_search=settings.search_hnsw_ef_search,
             scoring_mode=settings.search_scoring_mode,
             weight_profile=weight_profile,
             slow_graph_warn_seconds=max(settings.search_warn_slow_graph_ms, 0) / 1000.0,
+            enrichment_mode=cast(Any, enrichment["mode"]),
+            overfetch_factor=float(cast(float, enrichment["overfetch_factor"])),
+            enrich_top_n=int(cast(int, enrichment["enrich_top_n"])),
+            # The chunker falls back to non-overlapping windows when overlap >= window.
+            chunk_overlap=settings.ingest_overlap if settings.ingest_overlap < settings.ingest_window else 0,
+            routing_mode=settings.search_routing_mode,
+            routing_top_k=settings.search_routing_top_k,
+            routing_min_score=settings.search_routing_min_score,
+            routing_min_margin=settings.search_routing_min_margin,
+            exact_search_max_points=settings.search_exact_max_points,
+            max_hnsw_ef=settings.search_hnsw_ef_max,
         )
         return SearchService(
             qdrant_client=qclient,
@@ -353,6 +513,37 @@ def create_app() -> FastAPI:
             options=search_options,
             weights=search_weights,
             model_artifact=getattr(request.app.state, "search_model_artifact", None),
+            lexical_vocabulary=vocabulary_store.get() if vocabulary_store is not None else None,
+            symbol_index=symbol_store.get() if symbol_store is not None else None,
+            graph_breaker=getattr(request.app.state, "search_graph_breaker", None),
+        )
+
+    def async_graph_service(request: Request) -> AsyncGraphService | None:
+        driver = getattr(request.app.state, "async_graph_driver", None)
+        if driver is None:
+            return None
+        service = getattr(request.app.state, "async_graph_service_instance", None)
+        if service is None or service.driver is not driver:
+            service = AsyncGraphService(
+                driver,
+                settings.neo4j_database,
+                chunk_nodes=settings.graph_chunk_mode == "nodes",
+                projection=graph_projection_store(request),
+            )
+            request.app.state.async_graph_service_instance = service
+        return service
+
+    def async_search_service(request: Request, service: object) -> AsyncSearchService | None:
+        """Wrap a live search service for the event loop when the async clients are configured."""
+
+        async_client = getattr(request.app.state, "async_qdrant_client", None)
+        if async_client is None or not isinstance(service, SearchService):
+            return None
+        return AsyncSearchService(
+            service,
+            async_client,
+            encode_executor=getattr(request.app.state, "search_encode_executor", None),
+            graph_concurrency=settings.search_graph_concurrency,
         )
 
     app.state.graph_service_dependency = graph_service_dependency
@@ -427,168 +618,32 @@ def create_app() -> FastAPI:
             entries.append(summary)
         return JSONResponse({"history": entries})
 
-    @app.post("/search", dependencies=[Depends(require_reader)], tags=["search"])
-    @limiter.limit(metrics_limit)
-    def search_endpoint(
-        request: Request,
-        payload: dict[str, Any] = Body(...),  # noqa: B008
-        search_service: SearchService | None = Depends(search_service_dependency),  # noqa: B008
-    ) -> JSONResponse:
-        if search_service is None:
-            raise HTTPException(status_code=503, detail="Search service unavailable")
-
-        query = payload.get("query")
-        if not isinstance(query, str) or not query.strip():
-            raise HTTPException(status_code=422, detail="Field 'query' is required")
-
-        limit_value = payload.get("limit", 10)
-        try:
-            limit = int(limit_value)
-        except (TypeError, ValueError):
-            raise HTTPException(status_code=422, detail="Field 'limit' must be an integer") from None
-        include_graph = bool(payload.get("include_graph", True))
-
-        filters_payload = payload.get("filters")
-        filters_resolved: dict[str, Any] = {}
-        if filters_payload is not None:
-            if not isinstance(filters_payload, dict):
-                raise HTTPException(status_code=422, detail="Field 'filters' must be an object")
-
-            subsystems = filters_payload.get("subsystems")
-            if subsystems is not None:
-                if not isinstance(subsystems, list) or not all(isinstance(item, str) for item in subsystems):
-                    raise HTTPException(status_code=422, detail="filters.subsystems must be an array of strings")
-                cleaned = [value.strip() for value in subsystems if isinstance(value, str) and value.strip()]
-                if cleaned:
-                    filters_resolved["subsystems"] = cleaned
-
-            artifact_types = filters_payload.get("artifact_types")
-            if artifact_types is not None:
-                if not isinstance(artifact_types, list) or not all(isinstance(item, str) for item in artifact_types):
-                    raise HTTPException(status_code=422, detail="filters.artifact_types must be an array of strings")
-                allowed_types = {"code", "doc", "test", "proto", "config"}
-                cleaned_types: list[str] = []
-                for value in artifact_types:
-                    key = value.strip().lower()
-                    if not key:
-                        continue
-                    if key not in allowed_types:
-                        raise HTTPException(status_code=422, detail=f"Unsupported artifact type '{value}'")
-                    cleaned_types.append(key)
-                if cleaned_types:
-                    filters_resolved["artifact_types"] = cleaned_types
-
-            namespaces = filters_payload.get("namespaces")
-            if namespaces is not None:
-                if not isinstance(namespaces, list) or not all(isinstance(item, str) for item in namespaces):
-                    raise HTTPException(status_code=422, detail="filters.namespaces must be an array of strings")
-                cleaned_namespaces = [value.strip() for value in namespaces if isinstance(value, str) and value.strip()]
-                if cleaned_namespaces:
-                    filters_resolved["namespaces"] = cleaned_namespaces
-
-            tags = filters_payload.get("tags")
-            if tags is not None:
-                if not isinstance(tags, list) or not all(isinstance(item, str) for item in tags):
-                    raise HTTPException(status_code=422, detail="filters.tags must be an array of strings")
-                cleaned_tags = [value.strip() for value in tags if isinstance(value, str) and value.strip()]
-                if cleaned_tags:
-                    filters_resolved["tags"] = cleaned_tags
-
-            updated_after = filters_payload.get("updated_after")
-            if updated_after is not None:
-                if not isinstance(updated_after, str) or not updated_after.strip():
-                    raise HTTPException(status_code=422, detail="filters.updated_after must be an ISO-8601 string")
-                parsed_updated_after = _parse_iso8601_to_utc(updated_after)
-                if parsed_updated_after is None:
-                    raise HTTPException(status_code=422, detail="filters.updated_after must be an ISO-8601 string")
-                filters_resolved["updated_after"] = parsed_updated_after
-
-            max_age_days = filters_payload.get("max_age_days")
-            if max_age_days is not None:
-                try:
-                    max_age_value = int(max_age_days)
-                except (TypeError, ValueError):
-                    raise HTTPException(status_code=422, detail="filters.max_age_days must be a positive integer") from None
-                if max_age_value <= 0:
-                    raise HTTPException(status_code=422, detail="filters.max_age_days must be a positive integer")
-                filters_resolved["max_age_days"] = max_age_value
-
-        graph_service = None
-        if include_graph:
-            driver = getattr(request.app.state, "graph_driver", None)
-            if driver is not None:
-                graph_service = graph_service_dependency(request)
-
-        request_id = getattr(request.state, "request_id", None) or str(uuid4())
-
-        try:
-            response = search_service.search(
-                query=query,
-                limit=limit,
-                include_graph=include_graph,
-                graph_service=graph_service,
-                sort_by_vector=settings.search_sort_by_vector,
-                request_id=request_id,
-                filters=filters_resolved,
-            )
-        except HTTPException:
-            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc()
-            raise
-        except (UnexpectedResponse, RuntimeError, ValueError, TimeoutError) as exc:  # pragma: no cover
-            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc()
-            logger.error("Search failed: %s", exc)
-            raise HTTPException(status_code=500, detail="Search failed") from exc
-        SEARCH_REQUESTS_TOTAL.labels(status="success").inc()
+    async def complete_search_metadata(
+        response: SearchResponse,
+        *,
+        payload: Mapping[str, Any],
+        request_id: str,
+        include_graph: bool,
+        graph_available: bool,
+        filters: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Annotate response metadata for the client and record the search in the feedback log."""
 
         metadata: dict[str, Any] = dict(response.metadata)
-        payload_json = {
-            "query": response.query,
-            "results": [
-                {
-                    "chunk": result.chunk,
-                    "graph_context": result.graph_context,
-                    "scoring": result.scoring,
-                }
-                for result in response.results
-            ],
-            "metadata": metadata,
-        }
         metadata["request_id"] = request_id
-        if include_graph and graph_service is None:
+        if include_graph and not graph_available:
             warnings = metadata.setdefault("warnings", [])
             warnings.append("Graph context unavailable")
             metadata["graph_context_included"] = False
 
-        if filters_resolved and "filters_applied" not in metadata:
-            serialisable_filters: dict[str, Any] = {}
-            for key, value in filters_resolved.items():
-                if isinstance(value, datetime):
-                    serialisable_filters[key] = value.astimezone(UTC).isoformat()
-                elif isinstance(value, list):
-                    serialisable_filters[key] = value
-                else:
-                    serialisable_filters[key] = value
-            metadata["filters_applied"] = serialisable_filters
+        if filters and "filters_applied" not in metadata:
+            metadata["filters_applied"] = _serialise_filters(filters)
 
         feedback_payload = payload.get("feedback")
         feedback_mapping = feedback_payload if isinstance(feedback_payload, dict) else None
         context_payload = payload.get("context")
         feedback_store = getattr(app.state, "search_feedback_store", None)
 
-        def _has_vote(mapping: Mapping[str, Any] | None) -> bool:
-            if not mapping:
-                return False
-            vote_value = mapping.get("vote")
-            if isinstance(vote_value, (int, float)):
-                return True
-            if isinstance(vote_value, str):
-                try:
-                    float(vote_value)
-                except ValueError:
-                    return False
-                return True
-            return False
-
         if feedback_store is not None and response.results and not _has_vote(feedback_mapping):
             metadata["feedback_prompt"] = (
                 "Optional: call `km-feedback-submit` with the provided `request_id` "
@@ -597,7 +652,8 @@ def create_app() -> FastAPI:
 
         if feedback_store is not None:
             try:
-                feedback_store.record(
+                await run_in_threadpool(
+                    feedback_store.record,
                     response=response,
                     feedback=feedback_mapping,
                     context=context_payload,
@@ -605,7 +661,340 @@ def create_app() -> FastAPI:
                 )
             except (OSError, RuntimeError, TypeError, ValueError):
                 logger.warning("Failed to record search feedback", exc_info=True)
-        return JSONResponse(payload_json)
+        return metadata
+
+    async def stream_search_events(
+        events: AsyncIterator[dict[str, Any]],
+        *,
+        payload: Mapping[str, Any],
+        search_request: SearchRequest,
+        request_id: str,
+        include_graph: bool,
+        graph_available: bool,
+        filters: dict[str, Any],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Relay search events, completing the final metadata exactly like the JSON response."""
+
+        query = ""
+        results: list[SearchResult] = []
+        try:
+            async for event in events:
+                kind = event["event"]
+                if kind == "header":
+                    query = event["query"]
+                    event["request_id"] = request_id
+                elif kind == "score":
+                    results.append(SearchResult(**event["result"]))
+                elif kind == "final":
+                    response = SearchResponse(query=query, results=results, metadata=event["metadata"])
+                    event["metadata"] = await complete_search_metadata(
+                        response,
+                        payload=payload,
+                        request_id=request_id,
+                        include_graph=include_graph,
+                        graph_available=graph_available,
+                        filters=filters,
+                    )
+                    SEARCH_REQUESTS_TOTAL.labels(status="success").inc()
+                projected = _project_search_event(event, search_request)
+                if projected is not None:
+                    yield projected
+        except (UnexpectedResponse, RuntimeError, ValueError, TimeoutError) as exc:  # pragma: no cover
+            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc()
+            logger.error("Streaming search failed: %s", exc)
+            yield {"event": "error", "detail": "Search failed", "request_id": request_id}
+
+    @app.post("/search", dependencies=[Depends(require_reader)], tags=["search"])
+    @limiter.limit(metrics_limit)
+    async def search_endpoint(
+        request: Request,
+        payload: dict[str, Any] = Body(...),  # noqa: B008
+        search_service: SearchService | None = Depends(search_service_dependency),  # noqa: B008
+    ) -> Response:
+        """Search the index; `Accept: application/x-ndjson` or `text/event-stream` streams events instead.
+
+        Streaming requires the async search path; otherwise the single-shot JSON
+        response is returned and clients fall back on its content type.
+        """
+        if search_service is None:
+            raise HTTPException(status_code=503, detail="Search service unavailable")
+
+        search_request = _parse_search_request(payload)
+        query = search_request.query
+        limit = search_request.limit
+        include_graph = search_request.include_graph
+        verbosity = search_request.verbosity
+        enrichment_mode = search_request.enrichment_mode
+        overfetch_factor = search_request.overfetch_factor
+        enrich_top_n = search_request.enrich_top_n
+        filters_resolved = search_request.filters or {}
+
+        request_id = getattr(request.state, "request_id", None) or str(uuid4())
+        search_kwargs: dict[str, Any] = {
+            "query": query,
+            "limit": limit,
+            "include_graph": include_graph,
+            "sort_by_vector": settings.search_sort_by_vector,
+            "request_id": request_id,
+            "filters": filters_resolved,
+            "enrichment_mode": enrichment_mode,
+            "overfetch_factor": overfetch_factor,
+            "enrich_top_n": enrich_top_n,
+            "verbosity": verbosity,
+            "group_by": search_request.group_by,
+            "group_siblings": search_request.group_siblings,
+            "expand_context": search_request.expand_context,
+            "mode": search_request.mode,
+        }
+
+        # Live services run on the event loop via the async clients; anything else
+        # (including the synchronous fallback) runs on the thread pool.
+        async_service = async_search_service(request, search_service)
+        if async_service is not None:
+            async_graph = async_graph_service(request) if include_graph else None
+            graph_available = async_graph is not None
+
+            async def _run_search() -> SearchResponse:
+                return await async_service.search(graph_service=async_graph, **search_kwargs)
+
+            stream_format = _search_stream_format(request)
+            if stream_format is not None:
+                # Streams always run fresh: the point is to surface hits before enrichment finishes.
+                events = stream_search_events(
+                    async_service.search_events(graph_service=async_graph, **search_kwargs),
+                    payload=payload,
+                    search_request=search_request,
+                    request_id=request_id,
+                    include_graph=include_graph,
+                    graph_available=graph_available,
+                    filters=filters_resolved,
+                )
+                return StreamingResponse(
+                    _encode_search_events(events, stream_format),
+                    media_type=_SEARCH_STREAM_MEDIA_TYPES[stream_format],
+                    headers={"Cache-Control": "no-cache"},
+                )
+
+        else:
+            graph_service = None
+            if include_graph:
+                driver = getattr(request.app.state, "graph_driver", None)
+                if driver is not None:
+                    graph_service = graph_service_dependency(request)
+            graph_available = graph_service is not None
+
+            async def _run_search() -> SearchResponse:
+                return await run_in_threadpool(search_service.search, graph_service=graph_service, **search_kwargs)
+
+        try:
+            response_cache = getattr(request.app.state, "search_response_cache", None)
+            if isinstance(response_cache, SearchResponseCache):
+                generation_store = getattr(request.app.state, "index_generation_store", None)
+                fingerprint = search_fingerprint(
+                    query=query,
+                    limit=limit,
+                    include_graph=include_graph,
+                    graph_available=graph_available,
+                    sort_by_vector=settings.search_sort_by_vector,
+                    filters=filters_resolved,
+                    options={
+                        "enrichment_mode": enrichment_mode,
+                        "overfetch_factor": overfetch_factor,
+                        "enrich_top_n": enrich_top_n,
+                        # Verbosity is applied on the way out; only `ids` changes what is fetched.
+                        "with_text": verbosity != "ids",
+                        "group_by": search_request.group_by,
+                        "group_siblings": search_request.group_siblings,
+                        "expand_context": search_request.expand_context if verbosity != "ids" else 0,
+                        "mode": search_request.mode or "balanced",
+                        "service": search_service.cache_scope(),
+                    },
+                )
+                response = await response_cache.get_or_compute_async(
+                    fingerprint,
+                    generation=generation_store.get() if generation_store is not None else None,
+                    request_id=request_id,
+                    compute=_run_search,
+                )
+            else:
+                response = await _run_search()
+        except HTTPException:
+            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc()
+            raise
+        except (UnexpectedResponse, RuntimeError, ValueError, TimeoutError) as exc:  # pragma: no cover
+            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc()
+            logger.error("Search failed: %s", exc)
+            raise HTTPException(status_code=500, detail="Search failed") from exc
+        SEARCH_REQUESTS_TOTAL.labels(status="success").inc()
+
+        metadata = await complete_search_metadata(
+            response,
+            payload=payload,
+            request_id=request_id,
+            include_graph=include_graph,
+            graph_available=graph_available,
+            filters=filters_resolved,
+        )
+        return JSONResponse(_search_response_json(response, metadata, search_request))
+
+    def search_batch_requests(request: Request, payload: dict[str, Any] = Body(...)) -> list[SearchRequest]:  # noqa: B008
+        """Parse a `/search/batch` body and record its weighted rate-limit cost."""
+
+        entries = payload.get("queries")
+        if not isinstance(entries, list) or not entries:
+            raise HTTPException(status_code=422, detail="Field 'queries' must be a non-empty array")
+        if len(entries) > settings.search_batch_max_queries:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Field 'queries' accepts at most {settings.search_batch_max_queries} entries",
+            )
+        try:
+            default_limit = int(payload.get("limit", 10))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Field 'limit' must be an integer") from None
+        default_include_graph = bool(payload.get("include_graph", True))
+        default_verbosity = payload.get("verbosity", "full")
+        if default_verbosity not in SEARCH_VERBOSITY_LEVELS:
+            raise HTTPException(status_code=422, detail="Field 'verbosity' must be 'ids', 'compact', or 'full'")
+        requests: list[SearchRequest] = []
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"query": entry}
+            if not isinstance(entry, dict):
+                raise HTTPException(status_code=422, detail="Each entry in 'queries' must be a string or an object")
+            if entry.get("mode") is not None:
+                raise HTTPException(status_code=422, detail="Field 'mode' is not supported by batch search")
+            requests.append(
+                _parse_search_request(
+                    entry,
+                    default_limit=default_limit,
+                    default_include_graph=default_include_graph,
+                    default_verbosity=default_verbosity,
+                )
+            )
+        # Larger result pages cost more, so a batch is charged per query by its page size.
+        request.state.search_batch_cost = sum(max(1, math.ceil(item.limit / 10)) for item in requests)
+        return requests
+
+    @app.post("/search/batch", dependencies=[Depends(require_reader)], tags=["search"])
+    @limiter.limit(metrics_limit, cost=_search_batch_cost)
+    async def search_batch_endpoint(
+        request: Request,
+        search_requests: list[SearchRequest] = Depends(search_batch_requests),  # noqa: B008
+        search_service: SearchService | None = Depends(search_service_dependency),  # noqa: B008
+    ) -> JSONResponse:
+        if search_service is None:
+            raise HTTPException(status_code=503, detail="Search service unavailable")
+
+        request_id = getattr(request.state, "request_id", None) or str(uuid4())
+        wants_graph = any(item.include_graph for item in search_requests)
+        async_service = async_search_service(request, search_service)
+        try:
+            if async_service is not None:
+                async_graph = async_graph_service(request) if wants_graph else None
+                graph_available = async_graph is not None
+                batch = await async_service.search_batch(
+                    search_requests,
+                    graph_service=async_graph,
+                    sort_by_vector=settings.search_sort_by_vector,
+                    request_id=request_id,
+                )
+            else:
+                graph_service = None
+                if wants_graph and getattr(request.app.state, "graph_driver", None) is not None:
+                    graph_service = graph_service_dependency(request)
+                graph_available = graph_service is not None
+                batch = await run_in_threadpool(
+                    search_service.search_batch,
+                    search_requests,
+                    graph_service=graph_service,
+                    sort_by_vector=settings.search_sort_by_vector,
+                    request_id=request_id,
+                )
+        except HTTPException:
+            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc(len(search_requests))
+            raise
+        except (UnexpectedResponse, RuntimeError, ValueError, TimeoutError) as exc:  # pragma: no cover
+            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc(len(search_requests))
+            logger.error("Batch search failed: %s", exc)
+            raise HTTPException(status_code=500, detail="Search failed") from exc
+        SEARCH_REQUESTS_TOTAL.labels(status="success").inc(len(search_requests))
+
+        responses_json: list[dict[str, Any]] = []
+        for index, (search_request, response) in enumerate(zip(search_requests, batch.responses, strict=True)):
+            metadata = dict(response.metadata)
+            metadata["request_id"] = f"{request_id}:{index}"
+            if search_request.include_graph and not graph_available:
+                metadata.setdefault("warnings", []).append("Graph context unavailable")
+                metadata["graph_context_included"] = False
+            if search_request.filters and "filters_applied" not in metadata:
+                metadata["filters_applied"] = _serialise_filters(search_request.filters)
+            responses_json.append(_search_response_json(response, metadata, search_request))
+
+        feedback_store = getattr(app.state, "search_feedback_store", None)
+        if feedback_store is not None:
+            await run_in_threadpool(_record_batch_feedback, feedback_store, batch, request_id)
+        return JSONResponse({"responses": responses_json, "metadata": batch.metadata})
+
+    @app.post("/search/similar", dependencies=[Depends(require_reader)], tags=["search"])
+    @limiter.limit(metrics_limit)
+    async def search_similar_endpoint(
+        request: Request,
+        payload: dict[str, Any] = Body(...),  # noqa: B008
+        search_service: SearchService | None = Depends(search_service_dependency),  # noqa: B008
+    ) -> JSONResponse:
+        """Find chunks similar to stored `chunk_ids` using their indexed vectors (no embedding)."""
+        if search_service is None:
+            raise HTTPException(status_code=503, detail="Search service unavailable")
+
+        chunk_ids, search_request = _parse_similar_request(payload)
+        include_graph = search_request.include_graph
+        filters_resolved = search_request.filters or {}
+        request_id = getattr(request.state, "request_id", None) or str(uuid4())
+        similar_kwargs: dict[str, Any] = {
+            "chunk_ids": chunk_ids,
+            "limit": search_request.limit,
+            "include_graph": include_graph,
+            "sort_by_vector": settings.search_sort_by_vector,
+            "request_id": request_id,
+            "filters": filters_resolved,
+            "enrichment_mode": search_request.enrichment_mode,
+            "overfetch_factor": search_request.overfetch_factor,
+            "enrich_top_n": search_request.enrich_top_n,
+            "verbosity": search_request.verbosity,
+            "expand_context": search_request.expand_context,
+        }
+
+        async_service = async_search_service(request, search_service)
+        try:
+            if async_service is not None:
+                async_graph = async_graph_service(request) if include_graph else None
+                graph_available = async_graph is not None
+                response = await async_service.search_similar(graph_service=async_graph, **similar_kwargs)
+            else:
+                graph_service = None
+                if include_graph and getattr(request.app.state, "graph_driver", None) is not None:
+                    graph_service = graph_service_dependency(request)
+                graph_available = graph_service is not None
+                response = await run_in_threadpool(search_service.search_similar, graph_service=graph_service, **similar_kwargs)
+        except (UnexpectedResponse, RuntimeError, ValueError, TimeoutError) as exc:  # pragma: no cover
+            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc()
+            logger.error("Similar search failed: %s", exc)
+            raise HTTPException(status_code=500, detail="Search failed") from exc
+        if not response.metadata.get("seed_chunk_ids"):
+            SEARCH_REQUESTS_TOTAL.labels(status="failure").inc()
+            raise HTTPException(status_code=404, detail="No stored chunk matches the requested chunk_ids")
+        SEARCH_REQUESTS_TOTAL.labels(status="success").inc()
+
+        metadata = await complete_search_metadata(
+            response,
+            payload=payload,
+            request_id=request_id,
+            include_graph=include_graph,
+            graph_available=graph_available,
+            filters=filters_resolved,
+        )
+        return JSONResponse(_search_response_json(response, metadata, search_request))
 
     @app.get("/search/weights", dependencies=[Depends(require_maintainer)], tags=["search"])
     @limiter.limit("60/minute")
@@ -627,6 +1016,7 @@ def create_app() -> FastAPI:
         request: Request,
         depth: int = 1,
         include_artifacts: bool = True,
+        include_chunks: bool = False,
         cursor: str | None = None,
         limit: int = 25,
         service: GraphService = Depends(graph_service_dependency),  # noqa: B008
@@ -640,6 +1030,7 @@ def create_app() -> FastAPI:
                 limit=limit,
                 cursor=cursor,
                 include_artifacts=include_artifacts,
+                include_chunks=include_chunks,
             )
         except GraphNotFoundError as exc:
             raise HTTPException(status_code=404, detail=str(exc)) from exc
@@ -653,12 +1044,13 @@ def create_app() -> FastAPI:
         name: str,
         request: Request,
         depth: int = 2,
+        include_chunks: bool = False,
         service: GraphService = Depends(graph_service_dependency),  # noqa: B008
     ) -> JSONResponse:
         del request
         depth = max(1, depth)
         try:
-            payload = service.get_subsystem_graph(name, depth=depth)
+            payload = service.get_subsystem_graph(name, depth=depth, include_chunks=include_chunks)
         except GraphNotFoundError as exc:
             raise HTTPException(status_code=404, detail=str(exc)) from exc
         except GraphQueryError as exc:
@@ -695,6 +1087,17 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
         return JSONResponse(payload)
 
+    @app.post("/graph/nodes:batch", dependencies=[Depends(require_reader)], tags=["graph"])
+    @limiter.limit(metrics_limit)
+    def graph_nodes_batch(
+        request: Request,
+        payload: dict[str, Any] = Body(...),  # noqa: B008
+        service: GraphService = Depends(graph_service_dependency),  # noqa: B008
+    ) -> JSONResponse:
+        del request
+        lookups = _parse_node_lookups(payload, max_nodes=settings.graph_batch_max_nodes)
+        return JSONResponse({"nodes": service.get_nodes(lookups)})
+
     @app.get("/graph/search", dependencies=[Depends(require_reader)], tags=["graph"])
     @limiter.limit(metrics_limit)
     def graph_search(
@@ -731,14 +1134,32 @@ def create_app() -> FastAPI:
         request: Request,
         payload: dict[str, Any] = Body(...),  # noqa: B008
         service: GraphService = Depends(graph_service_dependency),  # noqa: B008
-    ) -> JSONResponse:
-        del request
+    ) -> Response:
+        """Run a read-only Cypher query; `Accept: application/x-ndjson` streams bounded rows instead."""
         query = payload.get("query")
         if not isinstance(query, str) or not query.strip():
             raise HTTPException(status_code=422, detail="Field 'query' is required")
         parameters = payload.get("parameters")
         if parameters is not None and not isinstance(parameters, dict):
             raise HTTPException(status_code=422, detail="Field 'parameters' must be an object")
+        if _SEARCH_STREAM_MEDIA_TYPES["ndjson"] in request.headers.get("accept", ""):
+            try:
+                lines = service.stream_cypher(
+                    query,
+                    parameters,
+                    max_rows=settings.graph_cypher_max_rows,
+                    max_bytes=settings.graph_cypher_max_bytes,
+                    timeout_seconds=settings.graph_cypher_timeout_seconds,
+                )
+                # Pull the header here so invalid queries still fail with a status code.
+                header = next(lines)
+            except GraphQueryError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+            return StreamingResponse(
+                itertools.chain([header], lines),
+                media_type=_SEARCH_STREAM_MEDIA_TYPES["ndjson"],
+                headers={"Cache-Control": "no-cache"},
+            )
         try:
             result = service.run_cypher(query, parameters)
         except GraphQueryError as exc:
@@ -748,6 +1169,292 @@ def create_app() -> FastAPI:
     return app
 
 
+def _parse_search_request(
+    payload: Mapping[str, Any],
+    *,
+    default_limit: int = 10,
+    default_include_graph: bool = True,
+    default_verbosity: str = "full",
+    require_query: bool = True,
+) -> SearchRequest:
+    """Validate a `/search` payload (or one `/search/batch` entry), raising 422 on bad input."""
+
+    query = payload.get("query") if require_query else ""
+    if not isinstance(query, str) or (require_query and not query.strip()):
+        raise HTTPException(status_code=422, detail="Field 'query' is required")
+
+    limit_value = payload.get("limit", default_limit)
+    try:
+        limit = int(limit_value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="Field 'limit' must be an integer") from None
+    include_graph = bool(payload.get("include_graph", default_include_graph))
+
+    enrichment_mode = payload.get("enrichment_mode")
+    if enrichment_mode is not None and enrichment_mode not in {"lazy", "eager"}:
+        raise HTTPException(status_code=422, detail="Field 'enrichment_mode' must be 'lazy' or 'eager'")
+    overfetch_factor: float | None = None
+    if payload.get("overfetch_factor") is not None:
+        try:
+            overfetch_factor = float(payload["overfetch_factor"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Field 'overfetch_factor' must be a number") from None
+        if overfetch_factor < 1:
+            raise HTTPException(status_code=422, detail="Field 'overfetch_factor' must be >= 1")
+    enrich_top_n: int | None = None
+    if payload.get("enrich_top_n") is not None:
+        try:
+            enrich_top_n = int(payload["enrich_top_n"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Field 'enrich_top_n' must be an integer") from None
+        if enrich_top_n < 0:
+            raise HTTPException(status_code=422, detail="Field 'enrich_top_n' must be >= 0")
+
+    verbosity = payload.get("verbosity", default_verbosity)
+    if verbosity not in SEARCH_VERBOSITY_LEVELS:
+        raise HTTPException(status_code=422, detail="Field 'verbosity' must be 'ids', 'compact', or 'full'")
+    snippet_chars: int | None = None
+    if payload.get("snippet_chars") is not None:
+        try:
+            snippet_chars = int(payload["snippet_chars"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Field 'snippet_chars' must be an integer") from None
+        if snippet_chars < 0:
+            raise HTTPException(status_code=422, detail="Field 'snippet_chars' must be >= 0")
+
+    mode = payload.get("mode")
+    if mode is not None and mode not in SEARCH_MODES:
+        raise HTTPException(status_code=422, detail="Field 'mode' must be 'fast', 'balanced', or 'exhaustive'")
+
+    group_by = payload.get("group_by")
+    if group_by is not None and group_by != "artifact":
+        raise HTTPException(status_code=422, detail="Field 'group_by' must be 'artifact'")
+    group_siblings = 0
+    if payload.get("group_siblings") is not None:
+        try:
+            group_siblings = int(payload["group_siblings"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Field 'group_siblings' must be an integer") from None
+        if not 0 <= group_siblings <= MAX_GROUP_SIBLINGS:
+            raise HTTPException(status_code=422, detail=f"Field 'group_siblings' must be between 0 and {MAX_GROUP_SIBLINGS}")
+    expand_context = 0
+    if payload.get("expand_context") is not None:
+        try:
+            expand_context = int(payload["expand_context"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Field 'expand_context' must be an integer") from None
+        if not 0 <= expand_context <= MAX_EXPAND_CONTEXT:
+            raise HTTPException(status_code=422, detail=f"Field 'expand_context' must be between 0 and {MAX_EXPAND_CONTEXT}")
+
+    filters_payload = payload.get("filters")
+    filters_resolved: dict[str, Any] = {}
+    if filters_payload is not None:
+        if not isinstance(filters_payload, dict):
+            raise HTTPException(status_code=422, detail="Field 'filters' must be an object")
+
+        subsystems = filters_payload.get("subsystems")
+        if subsystems is not None:
+            if not isinstance(subsystems, list) or not all(isinstance(item, str) for item in subsystems):
+                raise HTTPException(status_code=422, detail="filters.subsystems must be an array of strings")
+            cleaned = [value.strip() for value in subsystems if isinstance(value, str) and value.strip()]
+            if cleaned:
+                filters_resolved["subsystems"] = cleaned
+
+        artifact_types = filters_payload.get("artifact_types")
+        if artifact_types is not None:
+            if not isinstance(artifact_types, list) or not all(isinstance(item, str) for item in artifact_types):
+                raise HTTPException(status_code=422, detail="filters.artifact_types must be an array of strings")
+            allowed_types = {"code", "doc", "test", "proto", "config"}
+            cleaned_types: list[str] = []
+            for value in artifact_types:
+                key = value.strip().lower()
+                if not key:
+                    continue
+                if key not in allowed_types:
+                    raise HTTPException(status_code=422, detail=f"Unsupported artifact type '{value}'")
+                cleaned_types.append(key)
+            if cleaned_types:
+                filters_resolved["artifact_types"] = cleaned_types
+
+        namespaces = filters_payload.get("namespaces")
+        if namespaces is not None:
+            if not isinstance(namespaces, list) or not all(isinstance(item, str) for item in namespaces):
+                raise HTTPException(status_code=422, detail="filters.namespaces must be an array of strings")
+            cleaned_namespaces = [value.strip() for value in namespaces if isinstance(value, str) and value.strip()]
+            if cleaned_namespaces:
+                filters_resolved["namespaces"] = cleaned_namespaces
+
+        tags = filters_payload.get("tags")
+        if tags is not None:
+            if not isinstance(tags, list) or not all(isinstance(item, str) for item in tags):
+                raise HTTPException(status_code=422, detail="filters.tags must be an array of strings")
+            cleaned_tags = [value.strip() for value in tags if isinstance(value, str) and value.strip()]
+            if cleaned_tags:
+                filters_resolved["tags"] = cleaned_tags
+
+        updated_after = filters_payload.get("updated_after")
+        if updated_after is not None:
+            if not isinstance(updated_after, str) or not updated_after.strip():
+                raise HTTPException(status_code=422, detail="filters.updated_after must be an ISO-8601 string")
+            parsed_updated_after = _parse_iso8601_to_utc(updated_after)
+            if parsed_updated_after is None:
+                raise HTTPException(status_code=422, detail="filters.updated_after must be an ISO-8601 string")
+            filters_resolved["updated_after"] = parsed_updated_after
+
+        max_age_days = filters_payload.get("max_age_days")
+        if max_age_days is not None:
+            try:
+                max_age_value = int(max_age_days)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=422, detail="filters.max_age_days must be a positive integer") from None
+            if max_age_value <= 0:
+                raise HTTPException(status_code=422, detail="filters.max_age_days must be a positive integer")
+            filters_resolved["max_age_days"] = max_age_value
+
+    return SearchRequest(
+        query=query,
+        limit=limit,
+        include_graph=include_graph,
+        filters=filters_resolved,
+        enrichment_mode=enrichment_mode,
+        overfetch_factor=overfetch_factor,
+        enrich_top_n=enrich_top_n,
+        verbosity=verbosity,
+        snippet_chars=snippet_chars,
+        group_by=group_by,
+        group_siblings=group_siblings,
+        expand_context=expand_context,
+        mode=mode,
+    )
+
+
+def _parse_similar_request(payload: Mapping[str, Any]) -> tuple[list[str], SearchRequest]:
+    """Validate a `/search/similar` payload: seed `chunk_ids` plus the `/search` options."""
+
+    chunk_ids = payload.get("chunk_ids")
+    if not isinstance(chunk_ids, list) or not chunk_ids or not all(isinstance(item, str) and item.strip() for item in chunk_ids):
+        raise HTTPException(status_code=422, detail="Field 'chunk_ids' must be a non-empty array of strings")
+    if len(chunk_ids) > MAX_SIMILAR_SEEDS:
+        raise HTTPException(status_code=422, detail=f"Field 'chunk_ids' accepts at most {MAX_SIMILAR_SEEDS} entries")
+    for field_name in ("group_by", "mode"):
+        if payload.get(field_name) is not None:
+            raise HTTPException(status_code=422, detail=f"Field '{field_name}' is not supported by similar search")
+    seeds = list(dict.fromkeys(item.strip() for item in chunk_ids))
+    return seeds, _parse_search_request(payload, require_query=False)
+
+
+def _serialise_filters(filters: Mapping[str, Any]) -> dict[str, Any]:
+    return {key: value.astimezone(UTC).isoformat() if isinstance(value, datetime) else value for key, value in filters.items()}
+
+
+_SEARCH_STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _search_stream_format(request: Request) -> str | None:
+    accept = request.headers.get("accept", "")
+    for stream_format, media_type in _SEARCH_STREAM_MEDIA_TYPES.items():
+        if media_type in accept:
+            return stream_format
+    return None
+
+
+async def _encode_search_events(events: AsyncIterator[dict[str, Any]], stream_format: str) -> AsyncIterator[str]:
+    async for event in events:
+        data = json.dumps(event, default=str)
+        if stream_format == "sse":
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+        else:
+            yield data + "\n"
+
+
+def _has_vote(mapping: Mapping[str, Any] | None) -> bool:
+    if not mapping:
+        return False
+    vote_value = mapping.get("vote")
+    if isinstance(vote_value, (int, float)):
+        return True
+    if isinstance(vote_value, str):
+        try:
+            float(vote_value)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+def _search_response_json(response: SearchResponse, metadata: dict[str, Any], search_request: SearchRequest) -> dict[str, Any]:
+    return {
+        "query": response.query,
+        "results": [
+            project_result(result, search_request.verbosity, snippet_chars=search_request.snippet_chars) for result in response.results
+        ],
+        "metadata": metadata,
+    }
+
+
+def _project_search_event(event: dict[str, Any], search_request: SearchRequest) -> dict[str, Any] | None:
+    """Apply the request's verbosity to a streamed event; ``None`` drops the event."""
+
+    verbosity = search_request.verbosity
+    snippet_chars = search_request.snippet_chars
+    if verbosity == "full" and not snippet_chars:
+        return event
+    kind = event["event"]
+    if kind == "hits":
+        results = [SearchResult(**result) for result in event["results"]]
+        return {**event, "results": [project_result(result, verbosity, snippet_chars=snippet_chars) for result in results]}
+    if kind == "score":
+        return {**event, "result": project_result(SearchResult(**event["result"]), verbosity, snippet_chars=snippet_chars)}
+    if kind == "graph":
+        if verbosity == "ids":
+            return None
+        graph_context = event.get("graph_context")
+        if verbosity == "compact" and graph_context is not None:
+            return {**event, "graph_context": {key: value for key, value in graph_context.items() if key != "relationships"}}
+    return event
+
+
+def _record_batch_feedback(feedback_store: SearchFeedbackStore, batch: SearchBatchResponse, request_id: str) -> None:
+    for index, response in enumerate(batch.responses):
+        try:
+            feedback_store.record(response=response, feedback=None, context=None, request_id=f"{request_id}:{index}")
+        except (OSError, RuntimeError, TypeError, ValueError):
+            logger.warning("Failed to record search feedback", exc_info=True)
+
+
+def _parse_node_lookups(payload: Mapping[str, Any], *, max_nodes: int) -> list[NodeLookup]:
+    """Parse a `/graph/nodes:batch` body; entries are node ids or objects with per-node overrides."""
+
+    entries = payload.get("nodes")
+    if not isinstance(entries, list) or not entries:
+        raise HTTPException(status_code=422, detail="Field 'nodes' must be a non-empty array")
+    if len(entries) > max_nodes:
+        raise HTTPException(status_code=422, detail=f"Field 'nodes' accepts at most {max_nodes} entries")
+    default_relationships = payload.get("relationships", "outgoing")
+    default_limit = payload.get("limit", 50)
+    lookups: list[NodeLookup] = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"id": entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), str) or not entry["id"].strip():
+            raise HTTPException(status_code=422, detail="Each entry in 'nodes' must be a node id or an object with an 'id'")
+        relationships = entry.get("relationships", default_relationships)
+        if not isinstance(relationships, str) or relationships.lower() not in {"outgoing", "incoming", "all", "none"}:
+            raise HTTPException(status_code=422, detail="Field 'relationships' must be one of outgoing, incoming, all, none")
+        try:
+            limit = int(entry.get("limit", default_limit))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=422, detail="Field 'limit' must be an integer") from exc
+        lookups.append(NodeLookup(entry["id"], relationships=relationships.lower(), limit=max(1, min(limit, 200))))
+    return lookups
+
+
+def _search_batch_cost(request: Request) -> int:
+    """Rate-limit cost of a `/search/batch` call, computed by its payload dependency."""
+
+    return int(getattr(request.state, "search_batch_cost", 1))
+
+
 def _parse_iso8601_to_utc(value: str) -> datetime | None:
     text = value.strip()
     if not text:
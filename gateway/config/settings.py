@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import Literal, TypedDict
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -40,6 +40,33 @@ SEARCH_WEIGHT_PROFILES: dict[str, dict[str, float]] = {
     },
 }
 
+SEARCH_ENRICHMENT_PROFILES: dict[str, dict[str, float]] = {
+    "default": {
+        "overfetch_factor": 2.0,
+        "enrich_top_n": 10,
+    },
+    "analysis": {
+        "overfetch_factor": 3.0,
+        "enrich_top_n": 25,
+    },
+    "operations": {
+        "overfetch_factor": 2.0,
+        "enrich_top_n": 8,
+    },
+    "docs-heavy": {
+        "overfetch_factor": 3.0,
+        "enrich_top_n": 15,
+    },
+}
+
+
+class Neo4jDriverOptions(TypedDict):
+    """Connection-pool keyword arguments accepted by ``GraphDatabase.driver``."""
+
+    max_connection_pool_size: int
+    connection_acquisition_timeout: float
+    max_connection_lifetime: float
+
 
 class AppSettings(BaseSettings):
     """Runtime configuration for the knowledge gateway."""
@@ -67,6 +94,9 @@ class AppSettings(BaseSettings):
     neo4j_user: str = Field("neo4j", alias="KM_NEO4J_USER")
     neo4j_password: str = Field("neo4jadmin", alias="KM_NEO4J_PASSWORD")
     neo4j_database: str = Field("neo4j", alias="KM_NEO4J_DATABASE")
+    neo4j_max_connection_pool_size: int = Field(100, alias="KM_NEO4J_MAX_POOL_SIZE")
+    neo4j_connection_acquisition_timeout: float = Field(60.0, alias="KM_NEO4J_ACQUISITION_TIMEOUT")
+    neo4j_max_connection_lifetime: float = Field(3600.0, alias="KM_NEO4J_MAX_CONNECTION_LIFETIME")
 
     embedding_model: str = Field("sentence-transformers/all-MiniLM-L6-v2", alias="KM_EMBEDDING_MODEL")
     ingest_window: int = Field(1000, alias="KM_INGEST_WINDOW")
@@ -84,6 +114,7 @@ class AppSettings(BaseSettings):
     lifecycle_report_enabled: bool = Field(True, alias="KM_LIFECYCLE_REPORT_ENABLED")
     lifecycle_stale_days: int = Field(30, alias="KM_LIFECYCLE_STALE_DAYS")
     lifecycle_history_limit: int = Field(10, alias="KM_LIFECYCLE_HISTORY_LIMIT")
+    lifecycle_isolated_limit: int = Field(1000, alias="KM_LIFECYCLE_ISOLATED_LIMIT")
 
     tracing_enabled: bool = Field(False, alias="KM_TRACING_ENABLED")
     tracing_endpoint: str | None = Field(None, alias="KM_TRACING_ENDPOINT")
@@ -93,8 +124,16 @@ class AppSettings(BaseSettings):
     tracing_console_export: bool = Field(False, alias="KM_TRACING_CONSOLE_EXPORT")
 
     graph_auto_migrate: bool = Field(False, alias="KM_GRAPH_AUTO_MIGRATE")
-    graph_subsystem_cache_ttl_seconds: int = Field(30, alias="KM_GRAPH_SUBSYSTEM_CACHE_TTL")
+    graph_subsystem_cache_ttl_seconds: int = Field(600, alias="KM_GRAPH_SUBSYSTEM_CACHE_TTL")
     graph_subsystem_cache_max_entries: int = Field(128, alias="KM_GRAPH_SUBSYSTEM_CACHE_MAX")
+    graph_subsystem_fanout: int = Field(200, alias="KM_GRAPH_SUBSYSTEM_FANOUT")
+    graph_subsystem_prewarm_top_n: int = Field(8, alias="KM_GRAPH_SUBSYSTEM_PREWARM_TOP_N")
+    graph_chunk_mode: Literal["nodes", "summary"] = Field("nodes", alias="KM_GRAPH_CHUNK_MODE")
+    graph_projection_enabled: bool = Field(True, alias="KM_GRAPH_PROJECTION_ENABLED")
+    graph_batch_max_nodes: int = Field(100, alias="KM_GRAPH_BATCH_MAX_NODES")
+    graph_cypher_max_rows: int = Field(10_000, alias="KM_GRAPH_CYPHER_MAX_ROWS")
+    graph_cypher_max_bytes: int = Field(8 * 1024 * 1024, alias="KM_GRAPH_CYPHER_MAX_BYTES")
+    graph_cypher_timeout_seconds: float = Field(30.0, alias="KM_GRAPH_CYPHER_TIMEOUT")
 
     search_weight_profile: Literal[
         "default",
@@ -114,6 +153,33 @@ class AppSettings(BaseSettings):
     search_vector_weight: float = Field(1.0, alias="KM_SEARCH_VECTOR_WEIGHT")
     search_lexical_weight: float = Field(0.25, alias="KM_SEARCH_LEXICAL_WEIGHT")
     search_hnsw_ef_search: int | None = Field(128, alias="KM_SEARCH_HNSW_EF_SEARCH")
+    search_hnsw_ef_max: int = Field(1024, alias="KM_SEARCH_HNSW_EF_MAX")
+    search_exact_max_points: int = Field(2000, alias="KM_SEARCH_EXACT_MAX_POINTS")
+    search_embed_cache_mb: int = Field(32, alias="KM_SEARCH_EMBED_CACHE_MB")
+    search_embed_batch_window_ms: float = Field(3.0, alias="KM_SEARCH_EMBED_BATCH_WINDOW_MS")
+    search_embed_max_batch: int = Field(32, alias="KM_SEARCH_EMBED_MAX_BATCH")
+    search_cache_max_entries: int = Field(256, alias="KM_SEARCH_CACHE_MAX_ENTRIES")
+    search_cache_ttl_seconds: float = Field(300.0, alias="KM_SEARCH_CACHE_TTL_SECONDS")
+    search_sparse_enabled: bool = Field(True, alias="KM_SEARCH_SPARSE_ENABLED")
+    search_symbol_fastpath: bool = Field(True, alias="KM_SEARCH_SYMBOL_FASTPATH")
+    search_async_enabled: bool = Field(True, alias="KM_SEARCH_ASYNC_ENABLED")
+    search_graph_concurrency: int = Field(8, alias="KM_SEARCH_GRAPH_CONCURRENCY")
+    search_graph_breaker_enabled: bool = Field(True, alias="KM_SEARCH_GRAPH_BREAKER_ENABLED")
+    search_graph_breaker_window_seconds: float = Field(30.0, alias="KM_SEARCH_GRAPH_BREAKER_WINDOW_SECONDS")
+    search_graph_breaker_min_calls: int = Field(10, alias="KM_SEARCH_GRAPH_BREAKER_MIN_CALLS")
+    search_graph_breaker_error_rate: float = Field(0.5, alias="KM_SEARCH_GRAPH_BREAKER_ERROR_RATE")
+    search_graph_breaker_slow_ms: float = Field(1000.0, alias="KM_SEARCH_GRAPH_BREAKER_SLOW_MS")
+    search_graph_breaker_cooldown_seconds: float = Field(15.0, alias="KM_SEARCH_GRAPH_BREAKER_COOLDOWN_SECONDS")
+    search_graph_breaker_half_open_probes: int = Field(3, alias="KM_SEARCH_GRAPH_BREAKER_HALF_OPEN_PROBES")
+    search_encode_workers: int = Field(8, alias="KM_SEARCH_ENCODE_WORKERS")
+    search_batch_max_queries: int = Field(32, alias="KM_SEARCH_BATCH_MAX_QUERIES")
+    search_enrichment_mode: Literal["lazy", "eager"] = Field("lazy", alias="KM_SEARCH_ENRICHMENT_MODE")
+    search_overfetch_factor: float = Field(2.0, alias="KM_SEARCH_OVERFETCH_FACTOR")
+    search_enrich_top_n: int = Field(10, alias="KM_SEARCH_ENRICH_TOP_N")
+    search_routing_mode: Literal["off", "subsystem"] = Field("off", alias="KM_SEARCH_ROUTING")
+    search_routing_top_k: int = Field(2, alias="KM_SEARCH_ROUTING_TOP_K")
+    search_routing_min_score: float = Field(0.3, alias="KM_SEARCH_ROUTING_MIN_SCORE")
+    search_routing_min_margin: float = Field(0.05, alias="KM_SEARCH_ROUTING_MIN_MARGIN")
 
     dry_run: bool = Field(False, alias="KM_INGEST_DRY_RUN")
 
@@ -161,14 +227,122 @@ class AppSettings(BaseSettings):
             return None
         return int(value)
 
-    @field_validator("graph_subsystem_cache_ttl_seconds")
+    @field_validator(
+        "search_embed_cache_mb",
+        "search_embed_batch_window_ms",
+        "search_cache_max_entries",
+        "search_cache_ttl_seconds",
+        "search_exact_max_points",
+    )
+    @classmethod
+    def _sanitize_embed_tuning(cls, value: float) -> float:
+        if value < 0:
+            return 0
+        return value
+
+    @field_validator(
+        "search_embed_max_batch",
+        "search_graph_concurrency",
+        "search_encode_workers",
+        "search_batch_max_queries",
+        "graph_batch_max_nodes",
+        "search_routing_top_k",
+        "search_hnsw_ef_max",
+    )
+    @classmethod
+    def _sanitize_search_worker_counts(cls, value: int) -> int:
+        if value < 1:
+            return 1
+        return value
+
+    @field_validator("search_overfetch_factor")
+    @classmethod
+    def _clamp_overfetch_factor(cls, value: float) -> float:
+        """Keep the candidate over-fetch factor within [1, 10]."""
+
+        if value < 1:
+            return 1.0
+        if value > 10:
+            return 10.0
+        return value
+
+    @field_validator(
+        "search_graph_breaker_window_seconds",
+        "search_graph_breaker_cooldown_seconds",
+    )
+    @classmethod
+    def _floor_breaker_seconds(cls, value: float) -> float:
+        """Keep the breaker's rolling window and cool-down at one second or more."""
+
+        return max(float(value), 1.0)
+
+    @field_validator("search_graph_breaker_slow_ms")
+    @classmethod
+    def _floor_breaker_slow_ms(cls, value: float) -> float:
+        """Keep the slow-call threshold positive so healthy calls never count as slow."""
+
+        return max(float(value), 1.0)
+
+    @field_validator("search_graph_breaker_min_calls", "search_graph_breaker_half_open_probes")
+    @classmethod
+    def _floor_breaker_counts(cls, value: int) -> int:
+        """Require at least one call before the breaker trips or closes again."""
+
+        return max(value, 1)
+
+    @field_validator("neo4j_max_connection_pool_size")
+    @classmethod
+    def _floor_neo4j_pool_size(cls, value: int) -> int:
+        """Keep at least one pooled Neo4j connection."""
+
+        return max(value, 1)
+
+    @field_validator("neo4j_connection_acquisition_timeout", "neo4j_max_connection_lifetime")
+    @classmethod
+    def _floor_neo4j_pool_timeouts(cls, value: float) -> float:
+        """Keep pool timeouts at one second or more so acquisitions and connections cannot expire instantly."""
+
+        return max(float(value), 1.0)
+
+    @field_validator("search_graph_breaker_error_rate")
+    @classmethod
+    def _clamp_breaker_error_rate(cls, value: float) -> float:
+        """Keep the breaker's failure-share threshold within [0, 1]."""
+
+        return min(max(value, 0.0), 1.0)
+
+    @field_validator("search_enrich_top_n")
+    @classmethod
+    def _sanitize_enrich_top_n(cls, value: int) -> int:
+        if value < 0:
+            return 0
+        return value
+
+    @field_validator(
+        "graph_subsystem_cache_ttl_seconds",
+        "graph_subsystem_prewarm_top_n",
+    )
     @classmethod
     def _sanitize_graph_cache_ttl(cls, value: int) -> int:
         if value < 0:
             return 0
         return value
 
-    @field_validator("graph_subsystem_cache_max_entries")
+    @field_validator("graph_cypher_timeout_seconds")
+    @classmethod
+    def _sanitize_cypher_timeout(cls, value: float) -> float:
+        """Keep the Cypher transaction timeout non-negative (``0`` disables it)."""
+
+        if value < 0:
+            return 0.0
+        return float(value)
+
+    @field_validator(
+        "graph_subsystem_cache_max_entries",
+        "graph_subsystem_fanout",
+        "graph_cypher_max_rows",
+        "graph_cypher_max_bytes",
+    )
     @classmethod
     def _sanitize_graph_cache_max(cls, value: int) -> int:
         if value < 1:
@@ -202,6 +376,39 @@ class AppSettings(BaseSettings):
             return f"{profile}+overrides", resolved
         return profile, resolved
 
+    def neo4j_driver_options(self) -> Neo4jDriverOptions:
+        """Return the connection-pool keyword arguments shared by every Neo4j driver."""
+
+        return {
+            "max_connection_pool_size": self.neo4j_max_connection_pool_size,
+            "connection_acquisition_timeout": self.neo4j_connection_acquisition_timeout,
+            "max_connection_lifetime": self.neo4j_max_connection_lifetime,
+        }
+
+    def resolved_search_enrichment(self) -> dict[str, object]:
+        """Return the graph enrichment plan for the active weight profile.
+
+        Profiles provide the over-fetch factor and enrichment depth; explicitly set
+        environment variables override the profile defaults.
+        """
+
+        profile = self.search_weight_profile
+        base = SEARCH_ENRICHMENT_PROFILES.get(profile, SEARCH_ENRICHMENT_PROFILES["default"])
+        fields_set: set[str] = getattr(self, "model_fields_set", set())
+
+        overfetch_factor = float(base["overfetch_factor"])
+        enrich_top_n = int(base["enrich_top_n"])
+        if "search_overfetch_factor" in fields_set:
+            overfetch_factor = self.search_overfetch_factor
+        if "search_enrich_top_n" in fields_set:
+            enrich_top_n = self.search_enrich_top_n
+
+        return {
+            "mode": self.search_enrichment_mode,
+            "overfetch_factor": overfetch_factor,
+            "enrich_top_n": enrich_top_n,
+        }
+
     def scheduler_trigger_config(self) -> dict[str, object]:
         """Return trigger configuration for the ingestion scheduler."""
 
@@ -230,6 +437,15 @@ class AppSettings(BaseSettings):
             return 365
         return value
 
+    @field_validator("lifecycle_isolated_limit")
+    @classmethod
+    def _validate_lifecycle_isolated_limit(cls, value: int) -> int:
+        """Keep the per-label isolated-node cap non-negative (``0`` lists none)."""
+
+        if value < 0:
+            return 0
+        return value
+
     @field_validator("ingest_parallel_workers", "ingest_max_pending_batches", mode="before")
     @classmethod
     def _ensure_positive_parallelism(cls, value: int) -> int:
@@ -1,10 +1,13 @@
 """Graph query utilities and service layer."""
 
-from .service import GraphNotFoundError, GraphQueryError, GraphService, get_graph_service
+from .async_service import AsyncGraphService
+from .service import GraphNotFoundError, GraphQueryError, GraphService, NodeLookup, get_graph_service
 
 __all__ = [
+    "AsyncGraphService",
     "GraphService",
     "GraphNotFoundError",
     "GraphQueryError",
+    "NodeLookup",
     "get_graph_service",
 ]
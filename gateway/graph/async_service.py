@@ -0,0 +1,113 @@
+"""Asyncio graph lookups used by the async search path."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from neo4j import AsyncDriver, AsyncManagedTransaction
+from neo4j.graph import Node
+
+from .errors import GraphNotFoundError, GraphServiceError
+from .nodes import (
+    node_by_id_query,
+    node_relationships_query,
+    parse_node_id,
+    path_depth_from_record,
+    projected_node,
+    serialize_node,
+    serialize_relationship,
+    shortest_path_query,
+)
+
+if TYPE_CHECKING:
+    from .projection import GraphProjectionStore
+
+
+class AsyncGraphService:
+    """Subset of :class:`GraphService` needed for search enrichment, on the async driver.
+
+    Results are serialised exactly like the synchronous service so search scoring
+    sees identical graph context regardless of which path served the request.
+    Lookups the graph projection can answer never touch the event loop's driver.
+    """
+
+    def __init__(
+        self,
+        driver: AsyncDriver,
+        database: str,
+        *,
+        chunk_nodes: bool = True,
+        projection: GraphProjectionStore | None = None,
+    ) -> None:
+        self.driver = driver
+        self.database = database
+        self.chunk_nodes = chunk_nodes
+        self.projection = projection
+
+    async def get_node(self, node_id: str, *, relationships: str, limit: int) -> dict[str, Any]:
+        label, key, value = parse_node_id(node_id)
+        resolved = self.projection.resolve(label, value) if self.projection is not None else None
+        if resolved is not None:
+            return projected_node(*resolved, relationships, limit)
+        async with self.driver.session(database=self.database) as session:
+            node = await session.execute_read(_fetch_node_by_id, label, key, value)
+            if node is None:
+                raise GraphNotFoundError(f"Node '{node_id}' not found")
+
+            rels: list[dict[str, Any]] = []
+            if relationships != "none":
+                rel_records = await session.execute_read(
+                    _fetch_node_relationships,
+                    label,
+                    key,
+                    value,
+                    relationships,
+                    limit,
+                )
+                rels = [serialize_relationship(record) for record in rel_records]
+
+        return {
+            "node": serialize_node(node),
+            "relationships": rels,
+        }
+
+    async def shortest_path_depth(self, node_id: str, *, max_depth: int = 4) -> int | None:
+        """Async counterpart of :meth:`GraphService.shortest_path_depth`."""
+
+        label, key, value = parse_node_id(node_id)
+        if label == "Chunk" and not self.chunk_nodes:
+            return None
+        resolved = self.projection.resolve(label, value) if self.projection is not None else None
+        if resolved is not None:
+            projection, index = resolved
+            return projection.path_depth(index, max_depth)
+        query = shortest_path_query(label, key, max_depth)
+        try:
+            async with self.driver.session(database=self.database) as session:
+                result = await session.run(query, value=value)
+                record = await result.single()
+        except Exception as exc:  # pragma: no cover - defensive guard
+            raise GraphServiceError(str(exc)) from exc
+        return path_depth_from_record(record)
+
+
+async def _fetch_node_by_id(tx: AsyncManagedTransaction, /, label: str, key: str, value: object) -> Node | None:
+    result = await tx.run(node_by_id_query(label, key), value=value)
+    record = await result.single()
+    return record["n"] if record else None
+
+
+async def _fetch_node_relationships(
+    tx: AsyncManagedTransaction,
+    /,
+    label: str,
+    key: str,
+    value: object,
+    direction: str,
+    limit: int,
+) -> list[dict[str, Any]]:
+    result = await tx.run(node_relationships_query(label, key, direction), parameters={"value": value, "limit": limit})
+    return [{"relationship": record["relationship"], "node": record["node"]} async for record in result]
+
+
+__all__ = ["AsyncGraphService"]
@@ -33,7 +33,11 @@ def run_migrations(*, dry_run: bool = False) -> None:
     )
 
     try:
-        runner = MigrationRunner(driver=driver, database=settings.neo4j_database)
+        runner = MigrationRunner(
+            driver=driver,
+            database=settings.neo4j_database,
+            chunk_mode=settings.graph_chunk_mode,
+        )
         if dry_run:
             pending = runner.pending_ids()
             if not pending:
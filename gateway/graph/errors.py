@@ -0,0 +1,18 @@
+"""Exceptions raised by the graph services."""
+
+from __future__ import annotations
+
+
+class GraphServiceError(RuntimeError):
+    """Base class for graph-related errors."""
+
+
+class GraphNotFoundError(GraphServiceError):
+    """Raised when a requested node cannot be found."""
+
+
+class GraphQueryError(GraphServiceError):
+    """Raised when a supplied query is invalid or unsafe."""
+
+
+__all__ = ["GraphNotFoundError", "GraphQueryError", "GraphServiceError"]
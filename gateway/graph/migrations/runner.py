@@ -8,11 +8,15 @@ from neo4j import Driver
 
 logger = logging.getLogger(__name__)
 
+ENTITY_SEARCH_INDEX = "graph_entity_search"
+
 
 @dataclass
 class Migration:
     id: str
     statements: Iterable[str]
+    # Only applied when the runner's graph chunk mode matches (``None`` applies always).
+    chunk_mode: str | None = None
 
 
 MIGRATIONS: list[Migration] = [
@@ -34,6 +38,35 @@ MIGRATIONS: list[Migration] = [
             "CREATE CONSTRAINT IF NOT EXISTS FOR (cfg:ConfigFile) REQUIRE cfg.path IS UNIQUE",
         ],
     ),
+    Migration(
+        id="003_fulltext_search",
+        statements=[
+            f"CREATE FULLTEXT INDEX {ENTITY_SEARCH_INDEX} IF NOT EXISTS FOR (n:Subsystem|DesignDoc|SourceFile) ON EACH [n.name, n.path]",
+        ],
+    ),
+    Migration(
+        id="004_artifact_path_index",
+        statements=[
+            "CREATE INDEX artifact_path IF NOT EXISTS FOR (a:Artifact) ON (a.path)",
+        ],
+    ),
+    Migration(
+        id="005_collapse_chunks",
+        statements=[
+            "MATCH (f)-[:HAS_CHUNK]->(:Chunk) "
+            "WITH DISTINCT f "
+            "CALL { "
+            "  WITH f "
+            "  MATCH (f)-[:HAS_CHUNK]->(c:Chunk) "
+            "  WITH f, c ORDER BY c.sequence "
+            "  WITH f, collect(c) AS chunks "
+            "  SET f.chunk_count = size(chunks), f.chunk_digests = [chunk IN chunks | chunk.content_digest] "
+            "  FOREACH (chunk IN chunks | DETACH DELETE chunk) "
+            "} IN TRANSACTIONS OF 500 ROWS",
+            "MATCH (c:Chunk) CALL { WITH c DETACH DELETE c } IN TRANSACTIONS OF 5000 ROWS",
+        ],
+        chunk_mode="summary",
+    ),
 ]
 
 
@@ -41,10 +74,11 @@ MIGRATIONS: list[Migration] = [
 class MigrationRunner:
     driver: Driver
     database: str = "knowledge"
+    chunk_mode: str = "nodes"
 
     def pending_ids(self) -> list[str]:
         pending: list[str] = []
-        for migration in MIGRATIONS:
+        for migration in self._migrations():
             if not self._is_applied(migration.id):
                 pending.append(migration.id)
         return pending
@@ -53,11 +87,14 @@ class MigrationRunner:
         with self.driver.session(database=self.database) as session:
             session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (m:MigrationHistory) REQUIRE m.id IS UNIQUE")
 
-        for migration in MIGRATIONS:
+        for migration in self._migrations():
             if self._is_applied(migration.id):
                 continue
             self._apply(migration)
 
+    def _migrations(self) -> list[Migration]:
+        return [migration for migration in MIGRATIONS if migration.chunk_mode in (None, self.chunk_mode)]
+
     def _is_applied(self, migration_id: str) -> bool:
         with self.driver.session(database=self.database) as session:
             record = session.run(
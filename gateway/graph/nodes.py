@@ -0,0 +1,208 @@
+"""Canonical node ids, lookup queries and serialisation shared by the graph services and projection."""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+from typing import TYPE_CHECKING, Any
+
+from neo4j import Record
+from neo4j.graph import Node, Relationship
+
+from .errors import GraphQueryError, GraphServiceError
+
+if TYPE_CHECKING:
+    from .projection import GraphProjection
+
+# Labels addressable by ``<Label>:<value>`` node ids, and the property holding the value.
+NODE_ID_KEYS: dict[str, str] = {
+    "Subsystem": "name",
+    "DesignDoc": "path",
+    "SourceFile": "path",
+    "TestCase": "path",
+    "Chunk": "chunk_id",
+}
+_PATH_DEPTH_RELATIONSHIPS = "BELONGS_TO|DESCRIBES|VALIDATES"
+
+
+# --- Node ids --------------------------------------------------------------
+
+
+def canonical_id(labels: Collection[str], props: Mapping[str, Any], element_id: str) -> str:
+    """Return the canonical ``<Label>:<value>`` id, falling back to the element id."""
+
+    if "Subsystem" in labels and "name" in props:
+        return f"Subsystem:{props['name']}"
+    if "DesignDoc" in labels and "path" in props:
+        return f"DesignDoc:{props['path']}"
+    if "SourceFile" in labels and "path" in props:
+        return f"SourceFile:{props['path']}"
+    if "TestCase" in labels and "path" in props:
+        return f"TestCase:{props['path']}"
+    if "Chunk" in labels and "chunk_id" in props:
+        return f"Chunk:{props['chunk_id']}"
+    return element_id
+
+
+def canonical_node_id(node: Node) -> str:
+    """Return the canonical ``<Label>:<value>`` id of a Neo4j node."""
+
+    return canonical_id(node.labels, node, node.element_id)
+
+
+def parse_node_id(node_id: str) -> tuple[str, str, str]:
+    """Split a ``<Label>:<value>`` id into ``(label, key, value)``."""
+
+    if ":" not in node_id:
+        raise GraphQueryError("Invalid node identifier")
+    label, value = node_id.split(":", 1)
+    label = label.strip()
+    value = value.strip()
+    key = NODE_ID_KEYS.get(label)
+    if key is None:
+        raise GraphQueryError(f"Unsupported node label '{label}'")
+    return label, key, value
+
+
+# --- Lookup queries --------------------------------------------------------
+
+
+def node_by_id_query(label: str, key: str) -> str:
+    """Cypher returning the node whose ``key`` property equals ``$value``."""
+
+    return f"MATCH (n:{label} {{{key}: $value}}) RETURN n LIMIT 1"
+
+
+def node_relationships_query(label: str, key: str, direction: str) -> str:
+    """Cypher listing a node's relationships in ``direction`` (``outgoing``, ``incoming`` or ``all``)."""
+
+    if direction == "incoming":
+        pattern = "<-[rel]-"
+    elif direction == "all":
+        pattern = "-[rel]-"
+    else:  # outgoing
+        pattern = "-[rel]->"
+    return f"MATCH (n:{label} {{{key}: $value}}){pattern}(other) RETURN rel AS relationship, other AS node LIMIT $limit"
+
+
+def shortest_path_query(label: str, key: str, max_depth: int) -> str:
+    """Cypher returning the hop count from a node to its nearest subsystem."""
+
+    depth_limit = max(1, int(max_depth))
+    # HAS_CHUNK only ever leads from a chunk to its artifact, so only chunk starts need to expand it.
+    relationships = f"{_PATH_DEPTH_RELATIONSHIPS}|HAS_CHUNK" if label == "Chunk" else _PATH_DEPTH_RELATIONSHIPS
+    return (
+        f"MATCH (start:{label} {{{key}: $value}}) "
+        f"MATCH p = shortestPath((start)-[:{relationships}*1..{depth_limit}]-(sub:Subsystem)) "
+        "RETURN length(p) AS depth"
+    )
+
+
+def path_depth_from_record(record: Record | None) -> int | None:
+    """Extract the ``depth`` column of a :func:`shortest_path_query` record."""
+
+    if record is None:
+        return None
+    depth = record.get("depth")
+    if depth is None:
+        return None
+    try:
+        return int(depth)
+    except (TypeError, ValueError):  # pragma: no cover - defensive guard
+        return None
+
+
+# --- Serialisation ---------------------------------------------------------
+
+
+def serialize_node(node: Node) -> dict[str, Any]:
+    """Serialise a Neo4j node as ``{id, labels, properties}``."""
+
+    return {
+        "id": canonical_node_id(node),
+        "labels": list(node.labels),
+        "properties": dict(node),
+    }
+
+
+def serialize_relationship(record: dict[str, Any]) -> dict[str, Any]:
+    """Serialise a ``{relationship, node}`` record relative to its far node."""
+
+    relationship = record["relationship"]
+    node = ensure_node(record["node"])
+    if isinstance(relationship, Relationship):
+        end_element = node_element_id(relationship.end_node)
+        start_element = node_element_id(relationship.start_node)
+        node_element = node.element_id
+        if end_element == node_element:
+            direction = "OUT"
+        elif start_element == node_element:
+            direction = "IN"
+        else:  # pragma: no cover - fallback for undirected or unexpected shapes
+            direction = "BOTH"
+        rel_type = relationship.type
+    else:  # pragma: no cover - defensive against legacy tuple encodings
+        direction = "OUT"
+        rel_type = getattr(relationship, "type", "UNKNOWN")
+    return {
+        "type": rel_type,
+        "direction": direction,
+        "target": serialize_node(node),
+    }
+
+
+def serialize_value(value: object) -> object:
+    """Serialise a Cypher result value, recursing into lists."""
+
+    if isinstance(value, Node):
+        return serialize_node(value)
+    if isinstance(value, Relationship):
+        return {
+            "type": value.type,
+            "start": canonical_node_id(ensure_node(value.start_node)),
+            "end": canonical_node_id(ensure_node(value.end_node)),
+            "properties": dict(value),
+        }
+    if isinstance(value, list):
+        return [serialize_value(item) for item in value]
+    return value
+
+
+def projected_node(projection: GraphProjection, index: int, relationships: str, limit: int) -> dict[str, Any]:
+    """Build a ``get_node`` response from the in-memory projection."""
+
+    rels = projection.relationships(index, relationships, limit) if relationships != "none" else []
+    return {"node": projection.serialize(index), "relationships": rels}
+
+
+def ensure_node(value: object) -> Node:
+    """Return ``value`` as a Neo4j node or raise :class:`GraphServiceError`."""
+
+    if not isinstance(value, Node):
+        raise GraphServiceError("Expected Neo4j node from query result")
+    return value
+
+
+def node_element_id(node: Node | None) -> str:
+    """Return the element id of a relationship endpoint."""
+
+    if node is None:
+        raise GraphServiceError("Neo4j relationship missing node reference")
+    return node.element_id
+
+
+__all__ = [
+    "NODE_ID_KEYS",
+    "canonical_id",
+    "canonical_node_id",
+    "ensure_node",
+    "node_by_id_query",
+    "node_element_id",
+    "node_relationships_query",
+    "parse_node_id",
+    "path_depth_from_record",
+    "projected_node",
+    "serialize_node",
+    "serialize_relationship",
+    "serialize_value",
+    "shortest_path_query",
+]
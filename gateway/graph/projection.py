@@ -0,0 +1,380 @@
+"""Read-only, in-process projection of the knowledge graph.
+
+The projection keeps the whole graph as compressed sparse row (CSR) adjacency
+arrays: nodes are interned to dense integer indices, relationship types to
+small integer codes, and every relationship is stored once on each endpoint.
+It answers the hot read paths (node relationships, path depth to a subsystem
+and subsystem breadth-first expansion) without a Neo4j round trip, and is
+stamped with the index generation it was built at so readers can tell when an
+ingestion run has made it stale.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from threading import Lock, Thread
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any
+
+from neo4j import Driver, ManagedTransaction
+
+from gateway.observability.metrics import GRAPH_PROJECTION_BYTES, GRAPH_PROJECTION_LOOKUPS
+
+from .nodes import NODE_ID_KEYS, canonical_id
+
+if TYPE_CHECKING:
+    from gateway.ingest.state_files import IndexGeneration
+
+logger = logging.getLogger(__name__)
+
+# Same relationship set as ``shortest_path_query``; HAS_CHUNK is only followed from chunk starts.
+_PATH_DEPTH_TYPES = frozenset({"BELONGS_TO", "DESCRIBES", "VALIDATES"})
+_ARTIFACT_LIMIT = 200
+_SORT_KEY_PROPERTIES = ("name", "title", "path")
+
+# (source index, target index, relationship type, "OUT" | "IN" relative to the source)
+ProjectionHop = tuple[int, int, str, str]
+
+
+class GraphProjection:
+    """Immutable CSR snapshot of the graph.
+
+    Relationships of node ``i`` occupy ``offsets[i]:offsets[i + 1]`` in the
+    parallel ``targets`` / ``type_codes`` / ``outgoing`` arrays.
+    """
+
+    __slots__ = (
+        "generation",
+        "node_ids",
+        "element_ids",
+        "label_sets",
+        "node_label_codes",
+        "properties",
+        "relationship_types",
+        "offsets",
+        "targets",
+        "type_codes",
+        "outgoing",
+        "nbytes",
+        "_index",
+        "_subsystem_sets",
+        "_chunk_sets",
+    )
+
+    def __init__(
+        self,
+        nodes: Iterable[tuple[str, Sequence[str], Mapping[str, Any]]],
+        relationships: Iterable[tuple[str, str, str]],
+        *,
+        generation: int | None,
+    ) -> None:
+        """Build the projection from ``(element_id, labels, properties)`` and ``(start, type, end)`` rows."""
+
+        self.generation = generation
+        self.node_ids: list[str] = []
+        self.element_ids: list[str] = []
+        self.label_sets: list[tuple[str, ...]] = []
+        self.node_label_codes = array("H")
+        self.properties: list[dict[str, Any]] = []
+        self._index: dict[str, int] = {}
+        label_codes: dict[tuple[str, ...], int] = {}
+        by_element: dict[str, int] = {}
+
+        for element_id, labels, properties in nodes:
+            index = len(self.node_ids)
+            label_set = tuple(labels)
+            code = label_codes.setdefault(label_set, len(label_codes))
+            if code == len(self.label_sets):
+                self.label_sets.append(label_set)
+            props = dict(properties)
+            self.node_ids.append(sys.intern(canonical_id(label_set, props, element_id)))
+            self.element_ids.append(element_id)
+            self.node_label_codes.append(code)
+            self.properties.append(props)
+            by_element[element_id] = index
+            for label in label_set:
+                key = NODE_ID_KEYS.get(label)
+                if key is not None and props.get(key) is not None:
+                    self._index.setdefault(f"{label}:{props[key]}", index)
+
+        type_codes: dict[str, int] = {}
+        edges: list[tuple[int, int, int]] = []
+        degree = array("I", bytes(4 * len(self.node_ids)))
+        for start, rel_type, end in relationships:
+            source = by_element.get(start)
+            target = by_element.get(end)
+            if source is None or target is None:
+                continue  # endpoint written after the node scan; the next build picks it up
+            edges.append((source, target, type_codes.setdefault(rel_type, len(type_codes))))
+            degree[source] += 1
+            if target != source:
+                degree[target] += 1
+        self.relationship_types: list[str] = list(type_codes)
+
+        self.offsets = array("I", [0])
+        for count in degree:
+            self.offsets.append(self.offsets[-1] + count)
+        total = self.offsets[-1]
+        self.targets = array("I", bytes(4 * total))
+        self.type_codes = array("H", bytes(2 * total))
+        self.outgoing = array("B", bytes(total))
+        cursor = array("I", self.offsets[:-1])
+        for source, target, code in edges:
+            slot = cursor[source]
+            self.targets[slot], self.type_codes[slot], self.outgoing[slot] = target, code, 1
+            cursor[source] += 1
+            if target != source:
+                slot = cursor[target]
+                self.targets[slot], self.type_codes[slot], self.outgoing[slot] = source, code, 0
+                cursor[target] += 1
+
+        self._subsystem_sets = frozenset(code for code, labels in enumerate(self.label_sets) if "Subsystem" in labels)
+        self._chunk_sets = frozenset(code for code, labels in enumerate(self.label_sets) if "Chunk" in labels)
+        self.nbytes = self._approximate_size()
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def relationship_count(self) -> int:
+        return sum(self.outgoing)
+
+    def lookup(self, node_id: str) -> int | None:
+        """Return the index of a ``<Label>:<value>`` node id, or ``None`` when it is not projected."""
+
+        return self._index.get(node_id)
+
+    def serialize(self, index: int) -> dict[str, Any]:
+        """Serialise a node exactly like ``GraphService`` serialises Neo4j nodes."""
+
+        return {
+            "id": self.node_ids[index],
+            "labels": list(self.label_sets[self.node_label_codes[index]]),
+            "properties": dict(self.properties[index]),
+        }
+
+    def relationships(self, index: int, direction: str, limit: int) -> list[dict[str, Any]]:
+        """Return up to ``limit`` relationships of a node in the ``get_node`` payload shape."""
+
+        results: list[dict[str, Any]] = []
+        for target, rel_type, outgoing in self._neighbours(index):
+            if len(results) >= limit:
+                break
+            if (direction == "outgoing" and not outgoing) or (direction == "incoming" and outgoing):
+                continue
+            results.append({"type": rel_type, "direction": "OUT" if outgoing else "IN", "target": self.serialize(target)})
+        return results
+
+    def path_depth(self, index: int, max_depth: int) -> int | None:
+        """Breadth-first hop count to the nearest other subsystem, mirroring ``shortest_path_query``."""
+
+        allowed = _PATH_DEPTH_TYPES | {"HAS_CHUNK"} if self._is_chunk(index) else _PATH_DEPTH_TYPES
+        codes = {code for code, rel_type in enumerate(self.relationship_types) if rel_type in allowed}
+        seen = {index}
+        frontier = [index]
+        for depth in range(1, max(1, int(max_depth)) + 1):
+            next_frontier: list[int] = []
+            for node in frontier:
+                for slot in range(self.offsets[node], self.offsets[node + 1]):
+                    if self.type_codes[slot] not in codes:
+                        continue
+                    target = self.targets[slot]
+                    if target in seen:
+                        continue
+                    if self.node_label_codes[target] in self._subsystem_sets:
+                        return depth
+                    seen.add(target)
+                    next_frontier.append(target)
+            if not next_frontier:
+                return None
+            frontier = next_frontier
+        return None
+
+    def expand(self, index: int, *, depth: int, fanout: int, include_chunks: bool) -> list[ProjectionHop]:
+        """Breadth-first expansion mirroring ``_fetch_subsystem_frontier``.
+
+        Per hop, each frontier node contributes at most ``fanout`` relationships
+        to nodes not visited before the hop, ordered like the Cypher query; each
+        node is attached to the first frontier node that reached it.
+        """
+
+        visited = {index}
+        frontier = [index]
+        hops: list[ProjectionHop] = []
+        for _ in range(max(1, int(depth))):
+            reached_this_hop: set[int] = set()
+            next_frontier: list[int] = []
+            for source in frontier:
+                candidates = [
+                    (target, rel_type, outgoing)
+                    for target, rel_type, outgoing in self._neighbours(source)
+                    if (target not in visited or target in reached_this_hop) and (include_chunks or not self._is_chunk(target))
+                ]
+                candidates.sort(key=lambda candidate: self._sort_key(candidate[0]))
+                for target, rel_type, outgoing in candidates[: max(1, int(fanout))]:
+                    if target in visited:
+                        continue
+                    visited.add(target)
+                    reached_this_hop.add(target)
+                    next_frontier.append(target)
+                    hops.append((source, target, rel_type, "OUT" if outgoing else "IN"))
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return hops
+
+    def subsystem_artifacts(self, index: int) -> list[int]:
+        """Artifacts linked to a subsystem, mirroring ``_fetch_artifacts_for_subsystem``."""
+
+        artifacts = [target for target, rel_type, outgoing in self._neighbours(index) if not outgoing and rel_type in _PATH_DEPTH_TYPES]
+        artifacts.sort(key=lambda target: (self.properties[target].get("path") is None, str(self.properties[target].get("path"))))
+        return artifacts[:_ARTIFACT_LIMIT]
+
+    def _neighbours(self, index: int) -> Iterator[tuple[int, str, int]]:
+        for slot in range(self.offsets[index], self.offsets[index + 1]):
+            yield self.targets[slot], self.relationship_types[self.type_codes[slot]], self.outgoing[slot]
+
+    def _is_chunk(self, index: int) -> bool:
+        return self.node_label_codes[index] in self._chunk_sets
+
+    def _sort_key(self, index: int) -> str:
+        properties = self.properties[index]
+        for key in _SORT_KEY_PROPERTIES:
+            value = properties.get(key)
+            if value is not None:
+                return str(value)
+        return self.element_ids[index]
+
+    def _approximate_size(self) -> int:
+        size = sum(
+            column.itemsize * len(column) for column in (self.node_label_codes, self.offsets, self.targets, self.type_codes, self.outgoing)
+        )
+        size += sys.getsizeof(self._index) + sys.getsizeof(self.properties) + sys.getsizeof(self.node_ids)
+        size += sum(sys.getsizeof(value) for value in self.node_ids)
+        size += sum(sys.getsizeof(value) for value in self.element_ids)
+        for properties in self.properties:
+            size += sys.getsizeof(properties) + sum(sys.getsizeof(value) for value in properties.values())
+        return size
+
+
+class GraphProjectionStore:
+    """Holds the current projection and rebuilds it whenever the index generation moves on.
+
+    Readers call :meth:`current`, which only hands out a projection built at the
+    generation recorded on disk; otherwise it schedules a background rebuild and
+    returns ``None`` so the caller falls back to Neo4j. Failed builds are retried
+    after ``retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        driver: Driver,
+        database: str,
+        generation_source: Callable[[], IndexGeneration | None],
+        *,
+        retry_seconds: float = 60.0,
+    ) -> None:
+        self.driver = driver
+        self.database = database
+        self.generation_source = generation_source
+        self.retry_seconds = retry_seconds
+        self._projection: GraphProjection | None = None
+        self._lock = Lock()
+        self._building = False
+        self._retry_at = 0.0
+
+    def resolve(self, label: str, value: str) -> tuple[GraphProjection, int] | None:
+        """Return the current projection and the node's index, or ``None`` when the caller must ask Neo4j."""
+
+        projection = self.current()
+        index = projection.lookup(f"{label}:{value}") if projection is not None else None
+        if projection is None or index is None:
+            GRAPH_PROJECTION_LOOKUPS.labels(result="fallback").inc()
+            return None
+        GRAPH_PROJECTION_LOOKUPS.labels(result="served").inc()
+        return projection, index
+
+    def current(self) -> GraphProjection | None:
+        generation = self._generation()
+        projection = self._projection
+        if projection is not None and projection.generation == generation:
+            return projection
+        self._schedule(generation, background=True)
+        return None
+
+    def refresh(self, *, background: bool = True) -> None:
+        """Rebuild the projection if it does not match the current index generation."""
+
+        generation = self._generation()
+        projection = self._projection
+        if projection is None or projection.generation != generation:
+            self._schedule(generation, background=background)
+
+    def _generation(self) -> int | None:
+        state = self.generation_source()
+        return state.generation if state is not None else None
+
+    def _schedule(self, generation: int | None, *, background: bool) -> None:
+        with self._lock:
+            if self._building or monotonic() < self._retry_at:
+                return
+            self._building = True
+        if background:
+            Thread(target=self._build, args=(generation,), name="graph-projection-build", daemon=True).start()
+        else:
+            self._build(generation)
+
+    def _build(self, generation: int | None) -> None:
+        try:
+            start = perf_counter()
+            projection = load_graph_projection(self.driver, self.database, generation=generation)
+        except Exception as exc:  # pragma: no cover - Neo4j unavailable; requests keep falling back
+            logger.warning("Failed to build graph projection: %s", exc)
+            with self._lock:
+                self._retry_at = monotonic() + self.retry_seconds
+        else:
+            self._projection = projection
+            GRAPH_PROJECTION_BYTES.set(projection.nbytes)
+            logger.info(
+                "Built graph projection for generation %s: %d nodes, %d relationships, ~%d bytes in %.3fs",
+                generation,
+                projection.node_count,
+                projection.relationship_count,
+                projection.nbytes,
+                perf_counter() - start,
+            )
+        finally:
+            with self._lock:
+                self._building = False
+
+
+def load_graph_projection(driver: Driver, database: str, *, generation: int | None) -> GraphProjection:
+    """Read every node and relationship in one transaction and build a projection stamped with ``generation``."""
+
+    with driver.session(database=database) as session:
+        nodes, relationships = session.execute_read(_fetch_projection_rows)
+    return GraphProjection(nodes, relationships, generation=generation)
+
+
+def _fetch_projection_rows(
+    tx: ManagedTransaction,
+    /,
+) -> tuple[list[tuple[str, list[str], dict[str, Any]]], list[tuple[str, str, str]]]:
+    nodes = [
+        (record["id"], record["labels"], record["properties"])
+        for record in tx.run(
+            "MATCH (n) WHERE NOT n:MigrationHistory RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS properties"
+        )
+    ]
+    relationships = [
+        (record["start"], record["type"], record["end"])
+        for record in tx.run("MATCH (a)-[r]->(b) RETURN elementId(a) AS start, type(r) AS type, elementId(b) AS end")
+    ]
+    return nodes, relationships
+
+
+__all__ = ["GraphProjection", "GraphProjectionStore", "load_graph_projection"]
@@ -1,27 +1,51 @@
 from __future__ import annotations
 
 import base64
-from collections import OrderedDict
-from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
-from threading import Lock
-from time import monotonic
-from typing import Any
-
-from neo4j import Driver, ManagedTransaction
+import json
+import logging
+import re
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from threading import Lock, Thread
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any
+
+from neo4j import READ_ACCESS, Driver, ManagedTransaction
+from neo4j.exceptions import ClientError, DriverError, Neo4jError
 from neo4j.graph import Node, Relationship
 
+from gateway.graph.migrations.runner import ENTITY_SEARCH_INDEX
+from gateway.observability.metrics import GRAPH_SUBSYSTEM_CACHE_EVENTS, GRAPH_SUBSYSTEM_SNAPSHOT_SECONDS
+
+from .errors import GraphNotFoundError, GraphQueryError, GraphServiceError
+from .nodes import (
+    NODE_ID_KEYS,
+    canonical_node_id,
+    ensure_node,
+    node_by_id_query,
+    node_element_id,
+    node_relationships_query,
+    parse_node_id,
+    path_depth_from_record,
+    projected_node,
+    serialize_node,
+    serialize_relationship,
+    serialize_value,
+    shortest_path_query,
+)
 
-class GraphServiceError(RuntimeError):
-    """Base class for graph-related errors."""
-
-
-class GraphNotFoundError(GraphServiceError):
-    """Raised when a requested node cannot be found."""
+if TYPE_CHECKING:
+    from gateway.graph.projection import GraphProjection, GraphProjectionStore
+    from gateway.ingest.state_files import IndexGeneration
 
+logger = logging.getLogger(__name__)
 
-class GraphQueryError(GraphServiceError):
-    """Raised when a supplied query is invalid or unsafe."""
+DEFAULT_SUBSYSTEM_FANOUT = 200
+_SEARCH_LABELS = ("Subsystem", "DesignDoc", "SourceFile")
+# Mirrors the standard analyzer: paths split on separators, dotted names stay whole.
+_SEARCH_TOKEN_PATTERN = re.compile(r"[\w.]+")
+_FUZZY_MIN_TOKEN_LENGTH = 4
 
 
 @dataclass(slots=True)
@@ -33,6 +57,15 @@ class SubsystemGraphSnapshot:
     artifacts: list[dict[str, Any]]
 
 
+@dataclass(frozen=True, slots=True)
+class NodeLookup:
+    """One entry of a batched node lookup; ``relationships`` and ``limit`` mirror :meth:`GraphService.get_node`."""
+
+    node_id: str
+    relationships: str = "outgoing"
+    limit: int = 50
+
+
 ORPHAN_DEFAULT_LABELS: tuple[str, ...] = (
     "DesignDoc",
     "SourceFile",
@@ -41,45 +74,122 @@ ORPHAN_DEFAULT_LABELS: tuple[str, ...] = (
     "IntegrationMessage",
 )
 
+# Uniquely constrained (and therefore range-indexed) key per orphan label; used for keyset pagination.
+_ORPHAN_KEY_PROPERTIES: dict[str, str] = {
+    "DesignDoc": "path",
+    "SourceFile": "path",
+    "Chunk": "chunk_id",
+    "TestCase": "path",
+    "IntegrationMessage": "name",
+}
+_ORPHAN_FILTER = "NOT (n)-[:BELONGS_TO|DESCRIBES|VALIDATES]->(:Subsystem)"
+
+
+SubsystemCacheKey = tuple[str, int, bool]
+
+
+@dataclass(slots=True)
+class _SubsystemCacheEntry:
+    expires_at: float
+    generation: int | None
+    subsystems: frozenset[str]
+    snapshot: SubsystemGraphSnapshot
+
 
 class SubsystemGraphCache:
-    """Simple TTL cache for subsystem graph snapshots."""
+    """Subsystem snapshot cache keyed to the ingestion index generation.
+
+    Entries are stamped with the generation they were built from. When a new
+    generation is applied, only entries whose snapshot contains a subsystem
+    touched by that ingestion run are dropped; the TTL merely bounds how long
+    changes made outside ingestion can go unnoticed.
+    """
 
     def __init__(self, ttl_seconds: float, max_entries: int) -> None:
         self._ttl = max(0.0, ttl_seconds)
         self._max_entries = max(1, max_entries)
-        self._entries: OrderedDict[tuple[str, int], tuple[float, SubsystemGraphSnapshot]] = OrderedDict()
+        self._entries: OrderedDict[SubsystemCacheKey, _SubsystemCacheEntry] = OrderedDict()
+        self._requests: Counter[SubsystemCacheKey] = Counter()
+        self._generation: int | None = None
         self._lock = Lock()
 
-    def get(self, key: tuple[str, int]) -> SubsystemGraphSnapshot | None:
+    @property
+    def generation(self) -> int | None:
+        return self._generation
+
+    def get(self, key: SubsystemCacheKey) -> SubsystemGraphSnapshot | None:
         if self._ttl <= 0:
             return None
         now = monotonic()
         with self._lock:
+            self._count_request(key)
             entry = self._entries.get(key)
-            if entry is None:
-                return None
-            expires_at, snapshot = entry
-            if expires_at <= now:
+            if entry is not None and entry.expires_at <= now:
                 del self._entries[key]
-                return None
-            self._entries.move_to_end(key)
-            return snapshot
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        GRAPH_SUBSYSTEM_CACHE_EVENTS.labels(event="miss" if entry is None else "hit").inc()
+        return entry.snapshot if entry is not None else None
+
+    def set(self, key: SubsystemCacheKey, snapshot: SubsystemGraphSnapshot, *, generation: int | None = None) -> bool:
+        """Store a snapshot built from ``generation``; stale builds are discarded."""
 
-    def set(self, key: tuple[str, int], snapshot: SubsystemGraphSnapshot) -> None:
         if self._ttl <= 0:
-            return
+            return False
         expires_at = monotonic() + self._ttl
         with self._lock:
-            self._entries[key] = (expires_at, snapshot)
+            if generation != self._generation:
+                return False
+            self._entries[key] = _SubsystemCacheEntry(
+                expires_at=expires_at,
+                generation=generation,
+                subsystems=_snapshot_subsystems(snapshot),
+                snapshot=snapshot,
+            )
             self._entries.move_to_end(key)
             while len(self._entries) > self._max_entries:
                 self._entries.popitem(last=False)
+        return True
+
+    def advance(self, state: IndexGeneration | None) -> list[SubsystemCacheKey]:
+        """Apply an index generation and return the dropped keys, most requested first.
+
+        Everything is dropped when the touched subsystems are unknown or when
+        one or more generations were missed in between.
+        """
+
+        if state is None:
+            return []
+        with self._lock:
+            previous = self._generation
+            if state.generation == previous:
+                return []
+            self._generation = state.generation
+            touched = state.subsystems
+            if touched is None or previous is None or state.generation != previous + 1:
+                dropped = list(self._entries)
+            else:
+                dropped = [key for key, entry in self._entries.items() if entry.subsystems & touched]
+            for key in dropped:
+                del self._entries[key]
+            for entry in self._entries.values():
+                entry.generation = state.generation
+            dropped.sort(key=lambda key: self._requests[key], reverse=True)
+        if dropped:
+            GRAPH_SUBSYSTEM_CACHE_EVENTS.labels(event="invalidate").inc(len(dropped))
+        return dropped
 
     def clear(self) -> None:
         with self._lock:
             self._entries.clear()
 
+    def _count_request(self, key: SubsystemCacheKey) -> None:
+        self._requests[key] += 1
+        # Unknown subsystem names also count; keep only the busiest keys around.
+        if len(self._requests) > self._max_entries * 4:
+            self._requests = Counter(dict(self._requests.most_common(self._max_entries)))
+
 
 @dataclass(slots=True)
 class GraphService:
@@ -88,6 +198,14 @@ class GraphService:
     driver: Driver
     database: str
     subsystem_cache: SubsystemGraphCache | None = None
+    subsystem_fanout: int = DEFAULT_SUBSYSTEM_FANOUT
+    generation_source: Callable[[], IndexGeneration | None] | None = None
+    prewarm_top_n: int = 0
+    # False when ingestion keeps chunk identity in Qdrant only (KM_GRAPH_CHUNK_MODE=summary).
+    chunk_nodes: bool = True
+    # In-process CSR projection consulted before Neo4j; None disables it.
+    projection: GraphProjectionStore | None = None
+    _prewarm_lock: Lock = field(default_factory=Lock, init=False, repr=False)
 
     def get_subsystem(
         self,
@@ -97,10 +215,11 @@ class GraphService:
         limit: int,
         cursor: str | None,
         include_artifacts: bool,
+        include_chunks: bool = False,
     ) -> dict[str, Any]:
         offset = max(0, _decode_cursor(cursor))
         limit = max(1, limit)
-        snapshot = self._load_subsystem_snapshot(name, depth)
+        snapshot = self._load_subsystem_snapshot(name, depth, include_chunks=include_chunks)
 
         related = snapshot.related
         total = len(related)
@@ -121,8 +240,8 @@ class GraphService:
             "artifacts": artifacts,
         }
 
-    def get_subsystem_graph(self, name: str, *, depth: int) -> dict[str, Any]:
-        snapshot = self._load_subsystem_snapshot(name, depth)
+    def get_subsystem_graph(self, name: str, *, depth: int, include_chunks: bool = False) -> dict[str, Any]:
+        snapshot = self._load_subsystem_snapshot(name, depth, include_chunks=include_chunks)
         return {
             "subsystem": snapshot.subsystem,
             "nodes": snapshot.nodes,
@@ -137,86 +256,154 @@ class GraphService:
         cursor: str | None,
         limit: int,
     ) -> dict[str, Any]:
-        if label and label not in ORPHAN_DEFAULT_LABELS:
+        """Page through nodes not attached to any subsystem.
+
+        Nodes are ordered by label, then by the label's indexed key property,
+        and the opaque cursor records the last (label, key) returned so each
+        page seeks straight past the previous one.
+        """
+
+        if label and label not in self.orphan_labels:
             raise GraphQueryError(f"Unsupported orphan label '{label}'")
-        offset = max(0, _decode_cursor(cursor))
+        labels = (label,) if label else self.orphan_labels
         limit = max(1, limit)
+        start_label, after = _decode_keyset_cursor(cursor, labels)
+        remaining_labels = labels[labels.index(start_label) :]
         with self.driver.session(database=self.database) as session:
-            records = session.execute_read(
-                _fetch_orphan_nodes,
-                label,
-                offset,
-                limit,
-            )
-        nodes = [_serialize_node(record) for record in records]
+            rows = session.execute_read(_fetch_orphan_nodes, remaining_labels, after, limit + 1)
+        page = rows[:limit]
+        nodes = [serialize_node(node) for _, node in page]
         next_cursor = None
-        if len(nodes) == limit:
-            next_cursor = _encode_cursor(offset + limit)
+        if len(rows) > limit:
+            last_label, last_node = page[-1]
+            next_cursor = _encode_keyset_cursor(last_label, str(last_node.get(_ORPHAN_KEY_PROPERTIES[last_label])))
         return {"nodes": nodes, "cursor": next_cursor}
 
+    def count_orphan_nodes(self, labels: Sequence[str] | None = None) -> dict[str, int]:
+        """Return orphan totals per label in one aggregated query."""
+
+        selected = tuple(labels) if labels else self.orphan_labels
+        unknown = [label for label in selected if label not in self.orphan_labels]
+        if unknown:
+            raise GraphQueryError(f"Unsupported orphan label '{unknown[0]}'")
+        with self.driver.session(database=self.database) as session:
+            return session.execute_read(_count_orphan_nodes, selected)
+
+    @property
+    def orphan_labels(self) -> tuple[str, ...]:
+        if self.chunk_nodes:
+            return ORPHAN_DEFAULT_LABELS
+        return tuple(label for label in ORPHAN_DEFAULT_LABELS if label != "Chunk")
+
     def clear_cache(self) -> None:
         if self.subsystem_cache is not None:
             self.subsystem_cache.clear()
 
-    def _load_subsystem_snapshot(self, name: str, depth: int) -> SubsystemGraphSnapshot:
+    def refresh_generation(self, *, background: bool = True) -> list[SubsystemCacheKey]:
+        """Apply the current index generation to the subsystem cache.
+
+        Snapshots invalidated by the new generation are rebuilt for the
+        ``prewarm_top_n`` most requested keys, on a background thread unless
+        ``background`` is false. Returns the keys selected for pre-warming.
+        """
+
+        cache = self.subsystem_cache
+        if cache is None or self.generation_source is None:
+            return []
+        dropped = cache.advance(self.generation_source())
+        warm_keys = dropped[: max(0, self.prewarm_top_n)]
+        if not warm_keys:
+            return []
+        generation = cache.generation
+        if background:
+            Thread(
+                target=self._prewarm,
+                args=(warm_keys, generation),
+                name="graph-subsystem-prewarm",
+                daemon=True,
+            ).start()
+        else:
+            self._prewarm(warm_keys, generation)
+        return warm_keys
+
+    def _prewarm(self, keys: Sequence[SubsystemCacheKey], generation: int | None) -> None:
+        cache = self.subsystem_cache
+        if cache is None:
+            return
+        with self._prewarm_lock:
+            for name, depth, include_chunks in keys:
+                if cache.generation != generation:
+                    return
+                try:
+                    snapshot = self._timed_snapshot(name, depth, include_chunks=include_chunks, source="warm")
+                except Exception as exc:  # pragma: no cover - warming is best effort
+                    logger.warning("Failed to pre-warm subsystem snapshot %s: %s", name, exc)
+                    continue
+                if cache.set((name, depth, include_chunks), snapshot, generation=generation):
+                    GRAPH_SUBSYSTEM_CACHE_EVENTS.labels(event="warm").inc()
+
+    def _load_subsystem_snapshot(self, name: str, depth: int, *, include_chunks: bool = False) -> SubsystemGraphSnapshot:
         depth = max(1, depth)
-        cache_key = (name, depth)
-        if self.subsystem_cache is not None:
-            cached = self.subsystem_cache.get(cache_key)
-            if cached is not None:
-                return cached
-        snapshot = self._build_subsystem_snapshot(name, depth)
-        if self.subsystem_cache is not None:
-            self.subsystem_cache.set(cache_key, snapshot)
+        cache = self.subsystem_cache
+        if cache is None:
+            return self._timed_snapshot(name, depth, include_chunks=include_chunks, source="request")
+        self.refresh_generation()
+        cache_key = (name, depth, include_chunks)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = cache.generation
+        snapshot = self._timed_snapshot(name, depth, include_chunks=include_chunks, source="request")
+        cache.set(cache_key, snapshot, generation=generation)
         return snapshot
 
-    def _build_subsystem_snapshot(self, name: str, depth: int) -> SubsystemGraphSnapshot:
+    def _timed_snapshot(self, name: str, depth: int, *, include_chunks: bool, source: str) -> SubsystemGraphSnapshot:
+        start = perf_counter()
+        snapshot = self._build_subsystem_snapshot(name, depth, include_chunks=include_chunks)
+        GRAPH_SUBSYSTEM_SNAPSHOT_SECONDS.labels(source=source).observe(perf_counter() - start)
+        return snapshot
+
+    def _build_subsystem_snapshot(self, name: str, depth: int, *, include_chunks: bool = False) -> SubsystemGraphSnapshot:
+        """Expand the subsystem breadth-first, one hop per query.
+
+        Every node is visited once, through the first relationship that reaches
+        it, so each related entry carries a shortest path. At most
+        ``subsystem_fanout`` new neighbours are taken per node and hop, and
+        ``Chunk`` nodes are skipped unless ``include_chunks`` is set. The
+        expansion is served from the graph projection when it is current.
+        """
+
+        resolved = self.projection.resolve("Subsystem", name) if self.projection is not None else None
+        if resolved is not None:
+            return _projected_subsystem_snapshot(*resolved, depth, max(1, self.subsystem_fanout), include_chunks)
+
         with self.driver.session(database=self.database) as session:
             subsystem_node = session.execute_read(_fetch_subsystem_node, name)
             if subsystem_node is None:
                 raise GraphNotFoundError(f"Subsystem '{name}' not found")
-            subsystem_node = _ensure_node(subsystem_node)
+            subsystem_node = ensure_node(subsystem_node)
 
-            path_records = session.execute_read(
-                _fetch_subsystem_paths,
-                name,
+            frontier_records = session.execute_read(
+                _fetch_subsystem_frontier,
+                subsystem_node.element_id,
                 depth,
+                max(1, self.subsystem_fanout),
+                include_chunks,
             )
             artifact_records = session.execute_read(_fetch_artifacts_for_subsystem, name)
 
-        subsystem_serialized = _serialize_node(subsystem_node)
-        nodes_by_id: OrderedDict[str, dict[str, Any]] = OrderedDict()
-        nodes_by_id[subsystem_serialized["id"]] = subsystem_serialized
-        edges_by_key: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
-        related_entries: list[dict[str, Any]] = []
-        related_order: list[str] = []
-
-        for record in path_records:
-            components = _extract_path_components(record)
-            if components is None:
-                continue
-            target_node_obj, path_nodes, relationships = components
-
-            path_edges = _record_path_edges(path_nodes, relationships, nodes_by_id, edges_by_key)
-            if not path_edges:
-                continue
-
-            target_serialized = _ensure_serialized_node(target_node_obj, nodes_by_id)
-            entry = _build_related_entry(target_serialized, relationships, path_edges)
-            _append_related_entry(entry, target_serialized["id"], related_entries, related_order)
-
-        artifacts = [_serialize_node(_ensure_node(node)) for node in artifact_records]
-
-        return SubsystemGraphSnapshot(
-            subsystem=subsystem_serialized,
-            related=related_entries,
-            nodes=list(nodes_by_id.values()),
-            edges=list(edges_by_key.values()),
-            artifacts=artifacts,
+        return _assemble_subsystem_snapshot(
+            subsystem_node.element_id,
+            serialize_node(subsystem_node),
+            _frontier_hops(frontier_records),
+            [serialize_node(ensure_node(node)) for node in artifact_records],
         )
 
     def get_node(self, node_id: str, *, relationships: str, limit: int) -> dict[str, Any]:
-        label, key, value = _parse_node_id(node_id)
+        label, key, value = parse_node_id(node_id)
+        resolved = self.projection.resolve(label, value) if self.projection is not None else None
+        if resolved is not None:
+            return projected_node(*resolved, relationships, limit)
         with self.driver.session(database=self.database) as session:
             node = session.execute_read(_fetch_node_by_id, label, key, value)
             if node is None:
@@ -233,22 +420,75 @@ class GraphService:
                     direction,
                     limit,
                 )
-                rels = [_serialize_relationship(record) for record in rel_records]
+                rels = [serialize_relationship(record) for record in rel_records]
 
         return {
-            "node": _serialize_node(node),
+            "node": serialize_node(node),
             "relationships": rels,
         }
 
+    def get_nodes(self, lookups: Sequence[NodeLookup]) -> list[dict[str, Any]]:
+        """Resolve several nodes in request order, with one query for those the projection cannot serve.
+
+        Each entry echoes the requested ``id`` and carries ``node`` and
+        ``relationships`` like :meth:`get_node`, or an inline ``error`` when the
+        id is invalid or no such node exists.
+        """
+
+        results: list[dict[str, Any] | None] = [None] * len(lookups)
+        rows: list[dict[str, Any]] = []
+        for index, lookup in enumerate(lookups):
+            try:
+                label, _, value = parse_node_id(lookup.node_id)
+            except GraphQueryError as exc:
+                results[index] = _node_lookup_error(lookup.node_id, "GRAPH_QUERY_INVALID", str(exc))
+                continue
+            resolved = self.projection.resolve(label, value) if self.projection is not None else None
+            if resolved is not None:
+                results[index] = {"id": lookup.node_id, **projected_node(*resolved, lookup.relationships, lookup.limit)}
+                continue
+            limit = 0 if lookup.relationships == "none" else max(0, lookup.limit)
+            rows.append({"index": index, "label": label, "value": value, "direction": lookup.relationships, "limit": limit})
+
+        if rows:
+            with self.driver.session(database=self.database) as session:
+                records = session.execute_read(_fetch_nodes_batch, rows)
+            for record in records:
+                index = int(record["index"])
+                if results[index] is None:
+                    results[index] = {
+                        "id": lookups[index].node_id,
+                        "node": serialize_node(ensure_node(record["node"])),
+                        "relationships": [serialize_relationship(item) for item in record["relationships"]],
+                    }
+
+        return [
+            (
+                result
+                if result is not None
+                else _node_lookup_error(lookup.node_id, "GRAPH_NODE_NOT_FOUND", f"Node '{lookup.node_id}' not found")
+            )
+            for lookup, result in zip(lookups, results, strict=True)
+        ]
+
     def search(self, term: str, *, limit: int) -> dict[str, Any]:
         if not term.strip():
             return {"results": []}
         lower_term = term.lower()
+        fulltext_query = _fulltext_query(lower_term)
         with self.driver.session(database=self.database) as session:
-            records = session.execute_read(_search_entities, lower_term, limit)
+            records = None
+            if fulltext_query is not None:
+                try:
+                    records = session.execute_read(_search_entities_fulltext, fulltext_query, limit)
+                except ClientError as exc:
+                    # The 003_fulltext_search migration has not run on this database.
+                    logger.debug("Full-text entity search unavailable, scanning instead: %s", exc)
+            if records is None:
+                records = session.execute_read(_search_entities, lower_term, limit)
         results = [
             {
-                "id": _canonical_node_id(_ensure_node(record["node"])),
+                "id": canonical_node_id(ensure_node(record["node"])),
                 "label": record["label"],
                 "score": record["score"],
                 "snippet": record.get("snippet"),
@@ -265,31 +505,21 @@ class GraphService:
         subsystem can be reached within the given depth limit.
         """
 
-        if max_depth < 1:
-            max_depth = 1
-        label, key, value = _parse_node_id(node_id)
-        relationship_pattern = "BELONGS_TO|DESCRIBES|VALIDATES|HAS_CHUNK"
-        depth_limit = int(max_depth)
-        query = (
-            f"MATCH (start:{label} {{{key}: $value}}) "
-            f"MATCH p = shortestPath((start)-[:{relationship_pattern}*1..{depth_limit}]-(sub:Subsystem)) "
-            "RETURN length(p) AS depth"
-        )
+        label, key, value = parse_node_id(node_id)
+        if label == "Chunk" and not self.chunk_nodes:
+            return None
+        resolved = self.projection.resolve(label, value) if self.projection is not None else None
+        if resolved is not None:
+            projection, index = resolved
+            return projection.path_depth(index, max_depth)
+        query = shortest_path_query(label, key, max_depth)
 
         try:
             with self.driver.session(database=self.database) as session:
                 record = session.run(query, value=value).single()
         except Exception as exc:  # pragma: no cover - defensive guard
             raise GraphServiceError(str(exc)) from exc
-        if record is None:
-            return None
-        depth = record.get("depth")
-        if depth is None:
-            return None
-        try:
-            return int(depth)
-        except (TypeError, ValueError):  # pragma: no cover - defensive guard
-            return None
+        return path_depth_from_record(record)
 
     def run_cypher(
         self,
@@ -309,30 +539,97 @@ class GraphService:
 
         data = [
             {
-                "row": [_serialize_value(value) for value in record.values()],
+                "row": [serialize_value(value) for value in record.values()],
             }
             for record in result.records
         ]
-        summary = result.summary
-        consumed_ms = None
-        if summary and summary.result_available_after is not None:
-            consumed_ms = summary.result_available_after
-
-        database_name = self.database
-        if summary is not None:
-            db_info = getattr(summary, "database", None)
-            db_name = getattr(db_info, "name", None)
-            if isinstance(db_name, str):
-                database_name = db_name
-
         return {
             "data": data,
-            "summary": {
-                "resultConsumedAfterMs": consumed_ms,
-                "database": database_name,
-            },
+            "summary": _cypher_summary(result.summary, self.database),
         }
 
+    def stream_cypher(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None,
+        *,
+        max_rows: int,
+        max_bytes: int,
+        timeout_seconds: float | None,
+    ) -> Iterator[str]:
+        """Run a read-only query and yield NDJSON lines as records arrive.
+
+        The first line is a ``header`` event with the result columns, then one
+        ``row`` event per record, then a ``final`` trailer reporting the rows and
+        bytes written and whether ``max_rows`` or ``max_bytes`` cut the result
+        short. The query runs in a read transaction with a server-side
+        ``timeout_seconds``; failures after the header become an ``error``
+        trailer. Validation and failures before the header raise
+        :class:`GraphQueryError` so callers can still reject the request.
+        """
+
+        _validate_cypher(query)
+        return self._stream_cypher(query, parameters or {}, max(1, max_rows), max(1, max_bytes), timeout_seconds or None)
+
+    def _stream_cypher(
+        self,
+        query: str,
+        parameters: dict[str, Any],
+        max_rows: int,
+        max_bytes: int,
+        timeout_seconds: float | None,
+    ) -> Iterator[str]:
+        rows = 0
+        written = 0
+        truncated_by: str | None = None
+        summary = None
+        with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+            try:
+                tx = session.begin_transaction(timeout=timeout_seconds)
+            except (Neo4jError, DriverError) as exc:
+                raise GraphQueryError(str(exc)) from exc
+            # Records are pulled from the server in fetch-size batches as the client reads. Leaving the
+            # block normally would commit, which first drains every unread record, so a truncated or
+            # failed stream rolls back explicitly; a client disconnect exits with GeneratorExit, which
+            # the driver also turns into a rollback.
+            with tx:
+                try:
+                    result = tx.run(query, parameters)
+                    columns = list(result.keys())
+                except (Neo4jError, DriverError) as exc:
+                    raise GraphQueryError(str(exc)) from exc
+                yield _ndjson_line({"event": "header", "columns": columns})
+                try:
+                    for record in result:
+                        if rows >= max_rows:
+                            truncated_by = "rows"
+                            break
+                        line = _ndjson_line({"event": "row", "row": [serialize_value(value) for value in record.values()]})
+                        if written + len(line) > max_bytes:
+                            truncated_by = "bytes"
+                            break
+                        rows += 1
+                        written += len(line)
+                        yield line
+                    if truncated_by is None:
+                        summary = result.consume()
+                except (Neo4jError, DriverError) as exc:
+                    tx.close()
+                    yield _ndjson_line({"event": "error", "detail": str(exc), "rows": rows, "bytes": written})
+                    return
+                if truncated_by is not None:
+                    tx.rollback()
+        yield _ndjson_line(
+            {
+                "event": "final",
+                "rows": rows,
+                "bytes": written,
+                "truncated": truncated_by is not None,
+                "truncated_by": truncated_by,
+                "summary": _cypher_summary(summary, self.database),
+            }
+        )
+
 
 def get_graph_service(
     driver: Driver,
@@ -340,110 +637,132 @@ def get_graph_service(
     *,
     cache_ttl: float | None = None,
     cache_max_entries: int = 128,
+    subsystem_fanout: int = DEFAULT_SUBSYSTEM_FANOUT,
+    generation_source: Callable[[], IndexGeneration | None] | None = None,
+    prewarm_top_n: int = 0,
+    chunk_nodes: bool = True,
+    projection: GraphProjectionStore | None = None,
 ) -> GraphService:
     cache = None
     if cache_ttl is not None and cache_ttl > 0:
         cache = SubsystemGraphCache(cache_ttl, cache_max_entries)
-    return GraphService(driver=driver, database=database, subsystem_cache=cache)
-
-
-def _extract_path_components(
-    record: Mapping[str, Any],
-) -> tuple[Node, Sequence[Node], Sequence[Relationship]] | None:
-    target_node = record.get("node")
-    if not isinstance(target_node, Node):
-        return None
-
-    path_nodes_raw = record.get("nodes")
-    if not isinstance(path_nodes_raw, list):
-        return None
-    path_nodes: list[Node] = [node for node in path_nodes_raw if isinstance(node, Node)]
-    if len(path_nodes) != len(path_nodes_raw) or len(path_nodes) < 2:
-        return None
-
-    relationships_raw = record.get("relationships")
-    if not isinstance(relationships_raw, list):
-        return None
-    relationships: list[Relationship] = [rel for rel in relationships_raw if isinstance(rel, Relationship)]
-    if len(relationships) != len(relationships_raw) or not relationships:
-        return None
-    if len(path_nodes) != len(relationships) + 1:
-        return None
-
-    return target_node, path_nodes, relationships
-
-
-def _record_path_edges(
-    path_nodes: Sequence[Node],
-    relationships: Sequence[Relationship],
-    nodes_by_id: OrderedDict[str, dict[str, Any]],
-    edges_by_key: OrderedDict[tuple[str, str, str], dict[str, Any]],
-) -> list[dict[str, Any]]:
-    path_edges: list[dict[str, Any]] = []
-    for idx, relationship in enumerate(relationships):
-        source_node = path_nodes[idx]
-        target_node = path_nodes[idx + 1]
-        source_serialized = _ensure_serialized_node(source_node, nodes_by_id)
-        target_serialized = _ensure_serialized_node(target_node, nodes_by_id)
-        direction = _relationship_direction(relationship, source_node)
-        edge_payload = {
-            "type": relationship.type,
-            "direction": direction,
-            "source": source_serialized["id"],
-            "target": target_serialized["id"],
-        }
-        edge_key = (
-            source_serialized["id"],
-            target_serialized["id"],
-            relationship.type,
+    return GraphService(
+        driver=driver,
+        database=database,
+        subsystem_cache=cache,
+        subsystem_fanout=subsystem_fanout,
+        generation_source=generation_source,
+        prewarm_top_n=prewarm_top_n,
+        chunk_nodes=chunk_nodes,
+        projection=projection,
+    )
+
+
+def _snapshot_subsystems(snapshot: SubsystemGraphSnapshot) -> frozenset[str]:
+    """Return every subsystem a snapshot draws on: its own, reached ones and node owners."""
+
+    names: set[str] = set()
+    for node in (snapshot.subsystem, *snapshot.nodes, *snapshot.artifacts):
+        properties = node.get("properties") or {}
+        if "Subsystem" in (node.get("labels") or ()) and properties.get("name"):
+            names.add(str(properties["name"]))
+        if properties.get("subsystem"):
+            names.add(str(properties["subsystem"]))
+    return frozenset(names)
+
+
+# (source key, target key, serialised target, relationship type, direction relative to the source)
+_SnapshotHop = tuple[object, object, dict[str, Any], str, str]
+
+
+def _assemble_subsystem_snapshot(
+    subsystem_key: object,
+    subsystem_serialized: dict[str, Any],
+    hops: Iterable[_SnapshotHop],
+    artifacts: list[dict[str, Any]],
+) -> SubsystemGraphSnapshot:
+    """Turn breadth-first hops (Neo4j element ids or projection indices as keys) into a snapshot."""
+
+    nodes_by_id: OrderedDict[str, dict[str, Any]] = OrderedDict()
+    nodes_by_id[subsystem_serialized["id"]] = subsystem_serialized
+    edges_by_key: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
+    related_entries: list[dict[str, Any]] = []
+    # Node key -> (serialised node, edges on the path from the subsystem to it).
+    reached: dict[object, tuple[dict[str, Any], list[dict[str, Any]]]] = {subsystem_key: (subsystem_serialized, [])}
+
+    for source_key, target_key, target, rel_type, direction in hops:
+        parent = reached.get(source_key)
+        if parent is None or target_key in reached:
+            continue
+        source, parent_path = parent
+        target = nodes_by_id.setdefault(target["id"], target)
+        edge = edges_by_key.setdefault(
+            (source["id"], target["id"], rel_type),
+            {"type": rel_type, "direction": direction, "source": source["id"], "target": target["id"]},
         )
-        if edge_key not in edges_by_key:
-            edges_by_key[edge_key] = edge_payload
-        path_edges.append(edge_payload)
-    return path_edges
+        path_edges = [*parent_path, edge]
+        reached[target_key] = (target, path_edges)
+        related_entries.append(_build_related_entry(nodes_by_id[edge["target"]], path_edges))
+
+    related_entries.sort(key=lambda entry: _node_sort_key(entry["target"]))
+    return SubsystemGraphSnapshot(
+        subsystem=subsystem_serialized,
+        related=related_entries,
+        nodes=list(nodes_by_id.values()),
+        edges=list(edges_by_key.values()),
+        artifacts=artifacts,
+    )
 
 
-def _ensure_serialized_node(
-    node: Node,
-    nodes_by_id: OrderedDict[str, dict[str, Any]],
-) -> dict[str, Any]:
-    node_id = _canonical_node_id(node)
-    if node_id not in nodes_by_id:
-        nodes_by_id[node_id] = _serialize_node(node)
-    return nodes_by_id[node_id]
+def _frontier_hops(records: Iterable[Mapping[str, Any]]) -> Iterator[_SnapshotHop]:
+    for record in records:
+        node = record.get("node")
+        relationship = record.get("relationship")
+        if not isinstance(node, Node) or not isinstance(relationship, Relationship):
+            continue
+        source_id = str(record.get("source_id"))
+        direction = "OUT" if node_element_id(relationship.start_node) == source_id else "IN"
+        yield source_id, node.element_id, serialize_node(node), relationship.type, direction
 
 
-def _relationship_direction(relationship: Relationship, source_node: Node) -> str:
-    start_element = _node_element_id(relationship.start_node)
-    return "OUT" if start_element == source_node.element_id else "IN"
+def _projected_subsystem_snapshot(
+    projection: GraphProjection,
+    index: int,
+    depth: int,
+    fanout: int,
+    include_chunks: bool,
+) -> SubsystemGraphSnapshot:
+    hops = projection.expand(index, depth=depth, fanout=fanout, include_chunks=include_chunks)
+    return _assemble_subsystem_snapshot(
+        index,
+        projection.serialize(index),
+        ((source, target, projection.serialize(target), rel_type, direction) for source, target, rel_type, direction in hops),
+        [projection.serialize(artifact) for artifact in projection.subsystem_artifacts(index)],
+    )
+
+
+def _node_sort_key(node: Mapping[str, Any]) -> str:
+    properties = node.get("properties") or {}
+    for key in ("name", "title", "path"):
+        value = properties.get(key)
+        if value is not None:
+            return str(value)
+    return str(node.get("id"))
 
 
 def _build_related_entry(
     target_serialized: dict[str, Any],
-    relationships: Sequence[Relationship],
     path_edges: Sequence[dict[str, Any]],
 ) -> dict[str, Any]:
     return {
         "target": target_serialized,
-        "hops": len(relationships),
+        "hops": len(path_edges),
         "path": list(path_edges),
         "relationship": path_edges[0]["type"],
         "direction": path_edges[0]["direction"],
     }
 
 
-def _append_related_entry(
-    entry: dict[str, Any],
-    target_id: str,
-    related_entries: list[dict[str, Any]],
-    related_order: list[str],
-) -> None:
-    if target_id in related_order:
-        return
-    related_entries.append(entry)
-    related_order.append(target_id)
-
-
 # --- Neo4j read helpers ----------------------------------------------------
 
 
@@ -453,32 +772,58 @@ def _fetch_subsystem_node(tx: ManagedTransaction, /, name: str) -> Node | None:
     return record["s"] if record else None
 
 
-def _fetch_subsystem_paths(
+def _fetch_subsystem_frontier(
     tx: ManagedTransaction,
     /,
-    name: str,
+    subsystem_id: str,
     depth: int,
+    fanout: int,
+    include_chunks: bool,
 ) -> list[dict[str, Any]]:
-    bounded_depth = max(1, int(depth))
+    """Breadth-first expansion from the subsystem, one query per hop.
+
+    Returns ``{"source_id", "relationship", "node"}`` rows in hop order; each
+    node appears once, attached to the first frontier node that reached it.
+    """
+
     query = (
-        "MATCH p=(s:Subsystem {name: $name})-[rel*1..$depth]-(n) "
-        "WHERE n <> s "
-        "WITH n, p "
-        "ORDER BY length(p) ASC "
-        "WITH n, collect(p) AS paths "
-        "WITH n, head(paths) AS path "
-        "RETURN n AS node, nodes(path) AS nodes, relationships(path) AS relationships "
-        "ORDER BY coalesce(n.name, n.title, n.path, elementId(n))"
+        "UNWIND $frontier AS source_id "
+        "MATCH (source) WHERE elementId(source) = source_id "
+        "CALL { "
+        "  WITH source "
+        "  MATCH (source)-[rel]-(node) "
+        "  WHERE NOT elementId(node) IN $visited AND ($include_chunks OR NOT node:Chunk) "
+        "  RETURN rel, node "
+        "  ORDER BY coalesce(node.name, node.title, node.path, elementId(node)) "
+        "  LIMIT $fanout "
+        "} "
+        "RETURN source_id, rel AS relationship, node"
     )
-    result = tx.run(query, name=name, depth=bounded_depth)
-    return [
-        {
-            "node": record["node"],
-            "nodes": record["nodes"],
-            "relationships": record["relationships"],
-        }
-        for record in result
-    ]
+    visited = [subsystem_id]
+    seen = {subsystem_id}
+    frontier = [subsystem_id]
+    rows: list[dict[str, Any]] = []
+    for _ in range(max(1, int(depth))):
+        result = tx.run(
+            query,
+            frontier=frontier,
+            visited=visited,
+            fanout=max(1, int(fanout)),
+            include_chunks=include_chunks,
+        )
+        frontier = []
+        for record in result:
+            node = record["node"]
+            node_id = node.element_id
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+            visited.append(node_id)
+            frontier.append(node_id)
+            rows.append({"source_id": record["source_id"], "relationship": record["relationship"], "node": node})
+        if not frontier:
+            break
+    return rows
 
 
 def _fetch_artifacts_for_subsystem(tx: ManagedTransaction, /, name: str) -> list[Node]:
@@ -494,32 +839,37 @@ def _fetch_artifacts_for_subsystem(tx: ManagedTransaction, /, name: str) -> list
 def _fetch_orphan_nodes(
     tx: ManagedTransaction,
     /,
-    label: str | None,
-    skip: int,
+    labels: Sequence[str],
+    after: str,
     limit: int,
-) -> list[Node]:
-    params: dict[str, Any] = {
-        "allowed": ORPHAN_DEFAULT_LABELS,
-        "skip": max(0, int(skip)),
-        "limit": max(1, int(limit)),
-    }
-    clauses = [
-        "MATCH (n)",
-        "WHERE any(l IN labels(n) WHERE l IN $allowed)",
-        "  AND NOT (n)-[:BELONGS_TO|DESCRIBES|VALIDATES]->(:Subsystem)",
-    ]
-    if label:
-        params["label"] = label
-        clauses.append("  AND $label IN labels(n)")
-    clauses.append("RETURN n ORDER BY coalesce(n.name, n.title, n.path, elementId(n)) SKIP $skip LIMIT $limit")
-    query = " ".join(clauses)
-    result = tx.run(query, parameters=params)
-    return [record["n"] for record in result]
+) -> list[tuple[str, Node]]:
+    """Read up to ``limit`` orphans, continuing into later labels once one is exhausted."""
+
+    rows: list[tuple[str, Node]] = []
+    for label in labels:
+        key = _ORPHAN_KEY_PROPERTIES[label]
+        query = f"MATCH (n:{label}) WHERE n.{key} > $after AND {_ORPHAN_FILTER} RETURN n ORDER BY n.{key} LIMIT $limit"
+        result = tx.run(query, parameters={"after": after, "limit": limit - len(rows)})
+        rows.extend((label, record["n"]) for record in result)
+        if len(rows) >= limit:
+            break
+        after = ""
+    return rows
+
+
+def _count_orphan_nodes(tx: ManagedTransaction, /, labels: Sequence[str]) -> dict[str, int]:
+    branches = " UNION ALL ".join(
+        f"MATCH (n:{label}) WHERE {_ORPHAN_FILTER} RETURN '{label}' AS label, count(n) AS total" for label in labels
+    )
+    result = tx.run(f"CALL {{ {branches} }} RETURN label, total")
+    counts = dict.fromkeys(labels, 0)
+    for record in result:
+        counts[record["label"]] = int(record["total"])
+    return counts
 
 
 def _fetch_node_by_id(tx: ManagedTransaction, /, label: str, key: str, value: object) -> Node | None:
-    query = f"MATCH (n:{label} {{{key}: $value}}) RETURN n LIMIT 1"
-    record = tx.run(query, value=value).single()
+    record = tx.run(node_by_id_query(label, key), value=value).single()
     return record["n"] if record else None
 
 
@@ -532,16 +882,75 @@ def _fetch_node_relationships(
     direction: str,
     limit: int,
 ) -> list[dict[str, Any]]:
-    if direction == "incoming":
-        query = f"MATCH (n:{label} {{{key}: $value}})<-[rel]-(other) RETURN rel AS relationship, other AS node LIMIT $limit"
-    elif direction == "all":
-        query = f"MATCH (n:{label} {{{key}: $value}})-[rel]-(other) RETURN rel AS relationship, other AS node LIMIT $limit"
-    else:  # outgoing
-        query = f"MATCH (n:{label} {{{key}: $value}})-[rel]->(other) RETURN rel AS relationship, other AS node LIMIT $limit"
+    query = node_relationships_query(label, key, direction)
     result = tx.run(query, parameters={"value": value, "limit": limit})
     return [{"relationship": record["relationship"], "node": record["node"]} for record in result]
 
 
+def _nodes_batch_query(labels: Sequence[str]) -> str:
+    """One UNWIND over lookup rows; each label gets its own index-backed branch."""
+
+    branches = " UNION ".join(
+        f"WITH row MATCH (n:{label} {{{NODE_ID_KEYS[label]}: row.value}}) WHERE row.label = '{label}' RETURN n" for label in labels
+    )
+    return (
+        "UNWIND $rows AS row "
+        f"CALL {{ {branches} }} "
+        "OPTIONAL MATCH (n)-[rel]-(other) "
+        "WHERE row.limit > 0 AND (row.direction = 'all' "
+        "OR (row.direction = 'outgoing' AND startNode(rel) = n) "
+        "OR (row.direction = 'incoming' AND endNode(rel) = n)) "
+        "WITH row, n, collect(CASE WHEN rel IS NULL THEN NULL ELSE {relationship: rel, node: other} END) AS rels "
+        "RETURN row.index AS index, n AS node, rels[..row.limit] AS relationships"
+    )
+
+
+def _fetch_nodes_batch(tx: ManagedTransaction, /, rows: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    labels = sorted({str(row["label"]) for row in rows})
+    result = tx.run(_nodes_batch_query(labels), rows=list(rows))
+    return [{"index": record["index"], "node": record["node"], "relationships": list(record["relationships"] or [])} for record in result]
+
+
+def _node_lookup_error(node_id: str, error_code: str, detail: str) -> dict[str, Any]:
+    return {"id": node_id, "error": {"detail": detail, "error_code": error_code}}
+
+
+def _fulltext_query(term: str) -> str | None:
+    """Build a Lucene query matching every token exactly, by prefix, or (when long enough) fuzzily."""
+
+    tokens = [token.strip(".") for token in _SEARCH_TOKEN_PATTERN.findall(term)]
+    clauses = []
+    for token in filter(None, tokens):
+        alternatives = [f"{token}^4", f"{token}*"]
+        if len(token) >= _FUZZY_MIN_TOKEN_LENGTH:
+            alternatives.append(f"{token}~1")
+        clauses.append(f"({' OR '.join(alternatives)})")
+    return " AND ".join(clauses) or None
+
+
+def _search_entities_fulltext(tx: ManagedTransaction, /, query: str, limit: int) -> list[dict[str, Any]]:
+    cypher = (
+        "CALL db.index.fulltext.queryNodes($index, $query) YIELD node, score "
+        "WITH node, score, [label IN labels(node) WHERE label IN $labels][0] AS label "
+        "RETURN node, label, score, "
+        "CASE label WHEN 'Subsystem' THEN node.description ELSE node.path END AS snippet "
+        "LIMIT $limit"
+    )
+    result = tx.run(
+        cypher,
+        parameters={"index": ENTITY_SEARCH_INDEX, "query": query, "labels": list(_SEARCH_LABELS), "limit": limit},
+    )
+    return [
+        {
+            "node": record["node"],
+            "label": record["label"],
+            "score": record["score"],
+            "snippet": record.get("snippet"),
+        }
+        for record in result
+    ]
+
+
 def _search_entities(tx: ManagedTransaction, /, term: str, limit: int) -> list[dict[str, Any]]:
     query = (
         "CALL {"
@@ -572,119 +981,7 @@ def _search_entities(tx: ManagedTransaction, /, term: str, limit: int) -> list[d
     ]
 
 
-# --- Serialization helpers -------------------------------------------------
-
-
-def _serialize_related(record: dict[str, Any], subsystem_node: Node) -> dict[str, Any]:
-    relationship = record["relationship"]
-    node = _ensure_node(record["node"])
-    if isinstance(relationship, Relationship):
-        start_element = _node_element_id(relationship.start_node)
-        subsystem_element = subsystem_node.element_id
-        direction = "OUT" if start_element == subsystem_element else "IN"
-        rel_type = relationship.type
-    else:  # tolerate legacy tuple/dict encodings emitted by Neo4j drivers
-        direction = "OUT"
-        rel_type = getattr(relationship, "type", "UNKNOWN")
-    return {
-        "relationship": rel_type,
-        "direction": direction,
-        "target": _serialize_node(node),
-    }
-
-
-def _serialize_node(node: Node) -> dict[str, Any]:
-    return {
-        "id": _canonical_node_id(node),
-        "labels": list(node.labels),
-        "properties": dict(node),
-    }
-
-
-def _serialize_relationship(record: dict[str, Any]) -> dict[str, Any]:
-    relationship = record["relationship"]
-    node = _ensure_node(record["node"])
-    if isinstance(relationship, Relationship):
-        end_element = _node_element_id(relationship.end_node)
-        start_element = _node_element_id(relationship.start_node)
-        node_element = node.element_id
-        if end_element == node_element:
-            direction = "OUT"
-        elif start_element == node_element:
-            direction = "IN"
-        else:  # pragma: no cover - fallback for undirected or unexpected shapes
-            direction = "BOTH"
-        rel_type = relationship.type
-    else:  # pragma: no cover - defensive against legacy tuple encodings
-        direction = "OUT"
-        rel_type = getattr(relationship, "type", "UNKNOWN")
-    return {
-        "type": rel_type,
-        "direction": direction,
-        "target": _serialize_node(node),
-    }
-
-
-def _serialize_value(value: object) -> object:
-    if isinstance(value, Node):
-        return _serialize_node(value)
-    if isinstance(value, Relationship):
-        return {
-            "type": value.type,
-            "start": _canonical_node_id(_ensure_node(value.start_node)),
-            "end": _canonical_node_id(_ensure_node(value.end_node)),
-            "properties": dict(value),
-        }
-    if isinstance(value, list):
-        return [_serialize_value(item) for item in value]
-    return value
-
-
-def _ensure_node(value: object) -> Node:
-    if not isinstance(value, Node):
-        raise GraphServiceError("Expected Neo4j node from query result")
-    return value
-
-
-def _node_element_id(node: Node | None) -> str:
-    if node is None:
-        raise GraphServiceError("Neo4j relationship missing node reference")
-    return node.element_id
-
-
-def _canonical_node_id(node: Node) -> str:
-    labels = list(node.labels)
-    props = dict(node)
-    if "Subsystem" in labels and "name" in props:
-        return f"Subsystem:{props['name']}"
-    if "DesignDoc" in labels and "path" in props:
-        return f"DesignDoc:{props['path']}"
-    if "SourceFile" in labels and "path" in props:
-        return f"SourceFile:{props['path']}"
-    if "TestCase" in labels and "path" in props:
-        return f"TestCase:{props['path']}"
-    if "Chunk" in labels and "chunk_id" in props:
-        return f"Chunk:{props['chunk_id']}"
-    return node.element_id
-
-
-def _parse_node_id(node_id: str) -> tuple[str, str, str]:
-    if ":" not in node_id:
-        raise GraphQueryError("Invalid node identifier")
-    label, value = node_id.split(":", 1)
-    label = label.strip()
-    value = value.strip()
-    key_map = {
-        "Subsystem": "name",
-        "DesignDoc": "path",
-        "SourceFile": "path",
-        "TestCase": "path",
-        "Chunk": "chunk_id",
-    }
-    key = key_map.get(label)
-    if key is None:
-        raise GraphQueryError(f"Unsupported node label '{label}'")
-    return label, key, value
+# --- Cursor and Cypher helpers ---------------------------------------------
 
 
 def _encode_cursor(offset: int) -> str:
@@ -700,6 +997,42 @@ def _decode_cursor(cursor: str | None) -> int:
         return 0
 
 
+def _encode_keyset_cursor(label: str, after: str) -> str:
+    payload = json.dumps([label, after], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_keyset_cursor(cursor: str | None, labels: Sequence[str]) -> tuple[str, str]:
+    """Return the label to resume from and the key to seek past (``""`` from the start)."""
+
+    if not cursor:
+        return labels[0], ""
+    try:
+        label, after = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, TypeError) as exc:
+        raise GraphQueryError("Invalid cursor") from exc
+    if label not in labels or not isinstance(after, str):
+        raise GraphQueryError("Invalid cursor")
+    return label, after
+
+
+def _cypher_summary(summary: object | None, default_database: str) -> dict[str, Any]:
+    consumed_ms = getattr(summary, "result_available_after", None)
+    database_name = default_database
+    db_name = getattr(getattr(summary, "database", None), "name", None)
+    if isinstance(db_name, str):
+        database_name = db_name
+    return {
+        "resultConsumedAfterMs": consumed_ms,
+        "database": database_name,
+    }
+
+
+def _ndjson_line(event: Mapping[str, Any]) -> str:
+    # ASCII-only JSON, so the string length is also the encoded byte count used by the byte cap.
+    return json.dumps(event, default=str, ensure_ascii=True) + "\n"
+
+
 def _validate_cypher(query: str) -> None:
     forbidden = {"CREATE", "MERGE", "DELETE", "SET", "DROP", "REMOVE"}
     normalized = query.upper()
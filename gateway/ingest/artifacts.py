@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from gateway.ingest.lexical import SparseEncoding
+
 
 @dataclass(slots=True)
 class Artifact:
@@ -34,7 +36,8 @@ class Chunk:
 
 @dataclass(slots=True)
 class ChunkEmbedding:
-    """Chunk plus embedding vector."""
+    """Chunk plus embedding vector and optional sparse lexical vector."""
 
     chunk: Chunk
     vector: list[float]
+    sparse: SparseEncoding | None = None
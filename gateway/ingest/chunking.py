@@ -26,13 +26,18 @@ class Chunker:
         self.window = window
         self.overlap = overlap
 
+    @property
+    def step(self) -> int:
+        """Character offset between the starts of consecutive chunks."""
+        return self.window - self.overlap if self.window > self.overlap else self.window
+
     def split(self, artifact: Artifact) -> Iterable[Chunk]:
         """Split the artifact content into `Chunk` instances."""
         text = artifact.content
         if not text.strip():
             return []
 
-        step = self.window - self.overlap if self.window > self.overlap else self.window
+        step = self.step
         chunks: list[Chunk] = []
         namespace = _derive_namespace(artifact.path)
         tags = _build_tags(artifact.extra_metadata)
@@ -0,0 +1,178 @@
+"""BM25-style sparse lexical vectors shared by ingestion and search."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_VECTOR_NAME = "lexical"
+"""Name of the sparse vector stored alongside the dense embedding in Qdrant."""
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"\w+", flags=re.ASCII)
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+_MIN_TOKEN_LENGTH = 2
+
+
+@dataclass(slots=True)
+class SparseEncoding:
+    """Sparse vector expressed as parallel index/value lists."""
+
+    indices: list[int]
+    values: list[float]
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, expanding snake_case and camelCase identifiers.
+
+    ``IngestionPipeline`` yields ``ingestionpipeline``, ``ingestion`` and ``pipeline`` so
+    both exact identifier queries and natural-language queries match.
+    """
+
+    tokens: list[str] = []
+    for raw in _TOKEN_PATTERN.findall(text):
+        lowered = raw.lower()
+        if len(lowered) >= _MIN_TOKEN_LENGTH:
+            tokens.append(lowered)
+        parts = [part for piece in raw.split("_") for part in _CAMEL_BOUNDARY.split(piece) if part]
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts if len(part) >= _MIN_TOKEN_LENGTH)
+    return tokens
+
+
+def lexical_vocabulary_path(state_path: Path, collection_name: str) -> Path:
+    """Return the on-disk location of the vocabulary for a Qdrant collection."""
+
+    return state_path / "lexical" / f"{collection_name}.json"
+
+
+class LexicalVocabulary:
+    """Append-only term dictionary plus corpus statistics for BM25 term weighting.
+
+    Term ids are stable across runs so previously written sparse vectors stay valid.
+    Inverse document frequency is applied server-side by Qdrant (``Modifier.IDF``);
+    the vocabulary only tracks the average document length needed for BM25 length
+    normalisation. Statistics accumulate over every chunk encoded, so they drift
+    slightly when artifacts are removed; this only affects length normalisation.
+    """
+
+    def __init__(
+        self,
+        terms: dict[str, int] | None = None,
+        *,
+        document_count: int = 0,
+        total_length: int = 0,
+    ) -> None:
+        self._terms: dict[str, int] = dict(terms or {})
+        self.document_count = max(0, int(document_count))
+        self.total_length = max(0, int(total_length))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    @property
+    def average_length(self) -> float:
+        if self.document_count <= 0:
+            return 0.0
+        return self.total_length / self.document_count
+
+    def term_id(self, term: str) -> int | None:
+        """Return the id for ``term`` without growing the vocabulary."""
+
+        return self._terms.get(term)
+
+    def encode_document(self, text: str, *, extra_terms: Iterable[str] = ()) -> SparseEncoding:
+        """Encode a chunk into BM25 term-frequency weights, growing the vocabulary."""
+
+        tokens = tokenize(text)
+        for extra in extra_terms:
+            tokens.extend(tokenize(extra))
+        counts = Counter(tokens)
+        length = len(tokens)
+
+        with self._lock:
+            self.document_count += 1
+            self.total_length += length
+            average = self.average_length or float(length or 1)
+            weights: dict[int, float] = {}
+            for term, frequency in counts.items():
+                index = self._terms.get(term)
+                if index is None:
+                    index = len(self._terms)
+                    self._terms[term] = index
+                norm = 1.0 - BM25_B + BM25_B * (length / average)
+                weights[index] = frequency * (BM25_K1 + 1.0) / (frequency + BM25_K1 * norm)
+        return _to_encoding(weights)
+
+    def encode_query(self, text: str) -> SparseEncoding | None:
+        """Encode a query against the existing vocabulary; unknown terms are dropped."""
+
+        weights: dict[int, float] = {}
+        for term, frequency in Counter(tokenize(text)).items():
+            index = self._terms.get(term)
+            if index is not None:
+                weights[index] = float(frequency)
+        if not weights:
+            return None
+        return _to_encoding(weights)
+
+    def save(self, path: Path) -> None:
+        """Persist the vocabulary atomically."""
+
+        with self._lock:
+            payload = {
+                "version": 1,
+                "document_count": self.document_count,
+                "total_length": self.total_length,
+                "terms": self._terms,
+            }
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> LexicalVocabulary | None:
+        """Load a persisted vocabulary, returning ``None`` when missing or unreadable."""
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Failed to read lexical vocabulary %s: %s", path, exc)
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("terms"), dict):
+            logger.warning("Lexical vocabulary %s has an unexpected format", path)
+            return None
+        terms = {str(term): int(index) for term, index in data["terms"].items()}
+        return cls(
+            terms,
+            document_count=int(data.get("document_count", 0) or 0),
+            total_length=int(data.get("total_length", 0) or 0),
+        )
+
+
+def _to_encoding(weights: dict[int, float]) -> SparseEncoding:
+    indices = sorted(weights)
+    return SparseEncoding(indices=indices, values=[weights[index] for index in indices])
+
+
+__all__ = [
+    "LEXICAL_VECTOR_NAME",
+    "LexicalVocabulary",
+    "SparseEncoding",
+    "lexical_vocabulary_path",
+    "tokenize",
+]
@@ -27,6 +27,8 @@ from gateway.observability.metrics import (
 )
 
 SECONDS_PER_DAY = 60 * 60 * 24
+ISOLATED_LABELS: tuple[str, ...] = ("DesignDoc", "SourceFile", "TestCase", "IntegrationMessage")
+_ISOLATED_PAGE_SIZE = 200
 
 
 @dataclass(slots=True)
@@ -37,6 +39,7 @@ class LifecycleConfig:
     stale_days: int
     graph_enabled: bool
     history_limit: int | None = None
+    isolated_limit: int | None = None
 
 
 def write_lifecycle_report(
@@ -52,7 +55,9 @@ def write_lifecycle_report(
     generated_at = time.time()
     generated_at_iso = datetime.fromtimestamp(generated_at, tz=UTC).isoformat()
 
-    isolated = _fetch_isolated_nodes(graph_service) if config.graph_enabled else {}
+    graph_service = graph_service if config.graph_enabled else None
+    isolated_totals = _count_isolated_nodes(graph_service)
+    isolated = _fetch_isolated_nodes(graph_service, config.isolated_limit, isolated_totals)
     stale_docs = _find_stale_docs(result.artifacts, config.stale_days, generated_at)
     missing_tests = _find_missing_tests(result.artifacts)
     removed_artifacts = list(result.removed_artifacts)
@@ -62,6 +67,7 @@ def write_lifecycle_report(
         stale_docs=stale_docs,
         missing_tests=missing_tests,
         removed=removed_artifacts,
+        isolated_totals=isolated_totals,
     )
 
     payload = {
@@ -76,6 +82,7 @@ def write_lifecycle_report(
             "stale_days": config.stale_days,
         },
         "isolated": isolated,
+        "isolated_totals": isolated_totals,
         "stale_docs": stale_docs,
         "missing_tests": missing_tests,
         "removed_artifacts": removed_artifacts,
@@ -104,9 +111,9 @@ def write_lifecycle_report(
         LIFECYCLE_HISTORY_SNAPSHOTS.labels(profile).set(0)
 
 
-def build_graph_service(*, driver: Driver, database: str, cache_ttl: float) -> GraphService:
+def build_graph_service(*, driver: Driver, database: str, cache_ttl: float, chunk_nodes: bool = True) -> GraphService:
     """Construct a graph service with sensible defaults for lifecycle usage."""
-    return get_graph_service(driver, database, cache_ttl=cache_ttl, cache_max_entries=256)
+    return get_graph_service(driver, database, cache_ttl=cache_ttl, cache_max_entries=256, chunk_nodes=chunk_nodes)
 
 
 def summarize_lifecycle(payload: dict[str, Any]) -> dict[str, Any]:
@@ -116,6 +123,7 @@ def summarize_lifecycle(payload: dict[str, Any]) -> dict[str, Any]:
         stale_docs=payload.get("stale_docs") or [],
         missing_tests=payload.get("missing_tests") or [],
         removed=payload.get("removed_artifacts") or [],
+        isolated_totals=payload.get("isolated_totals"),
     )
     return {
         "generated_at": payload.get("generated_at"),
@@ -126,19 +134,32 @@ def summarize_lifecycle(payload: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def _fetch_isolated_nodes(graph_service: GraphService | None) -> dict[str, list[dict[str, Any]]]:
-    """Collect isolated graph nodes grouped by label."""
+def _count_isolated_nodes(graph_service: GraphService | None) -> dict[str, int] | None:
+    """Count isolated graph nodes per label with a single aggregated query."""
     if graph_service is None:
+        return None
+    return graph_service.count_orphan_nodes(ISOLATED_LABELS)
+
+
+def _fetch_isolated_nodes(
+    graph_service: GraphService | None,
+    limit: int | None,
+    totals: dict[str, int] | None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Collect up to ``limit`` isolated graph nodes per label (``0`` lists none)."""
+    if graph_service is None or limit == 0:
         return {}
 
-    labels = ["DesignDoc", "SourceFile", "TestCase", "IntegrationMessage"]
     isolated: dict[str, list[dict[str, Any]]] = {}
 
-    for label in labels:
+    for label in ISOLATED_LABELS:
+        if totals is not None and not totals.get(label):
+            continue
         nodes: list[dict[str, Any]] = []
         cursor: str | None = None
-        while True:
-            page = graph_service.list_orphan_nodes(label=label, cursor=cursor, limit=200)
+        while limit is None or len(nodes) < limit:
+            page_size = _ISOLATED_PAGE_SIZE if limit is None else min(_ISOLATED_PAGE_SIZE, limit - len(nodes))
+            page = graph_service.list_orphan_nodes(label=label, cursor=cursor, limit=page_size)
             nodes.extend(page["nodes"])
             cursor = page.get("cursor")
             if not cursor:
@@ -232,9 +253,13 @@ def _lifecycle_counts(
     stale_docs: list[dict[str, Any]],
     missing_tests: list[dict[str, Any]],
     removed: list[dict[str, Any]],
+    isolated_totals: dict[str, int] | None = None,
 ) -> dict[str, int]:
     """Aggregate lifecycle metrics into counters."""
-    isolated_count = sum(len(entries) for entries in isolated.values())
+    if isolated_totals is not None:
+        isolated_count = sum(isolated_totals.values())
+    else:
+        isolated_count = sum(len(entries) for entries in isolated.values())
     return {
         "stale_docs": len(stale_docs),
         "isolated_nodes": isolated_count,
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from collections.abc import Iterable, Mapping, Sequence
 
 from neo4j import Driver
@@ -11,14 +12,29 @@ from gateway.ingest.artifacts import Artifact, ChunkEmbedding
 
 logger = logging.getLogger(__name__)
 
+# Every label an artifact node can carry; each has a constraint or index on ``path``.
+ARTIFACT_LABELS: tuple[str, ...] = ("DesignDoc", "SourceFile", "TestCase", "ConfigFile", "Artifact")
+
+_DELETE_WITH_CHUNKS = (
+    "OPTIONAL MATCH (n)-[:HAS_CHUNK]->(c:Chunk)\n"
+    "WITH n, collect(c) AS chunks\n"
+    "FOREACH (chunk IN chunks | DETACH DELETE chunk)\n"
+    "DETACH DELETE n"
+)
+
 
 class Neo4jWriter:
     """Persist artifacts and derived data into a Neo4j database."""
 
-    def __init__(self, driver: Driver, database: str = "knowledge") -> None:
-        """Initialise the writer with a driver and target database."""
+    def __init__(self, driver: Driver, database: str = "knowledge", *, chunk_nodes: bool = True) -> None:
+        """Initialise the writer with a driver and target database.
+
+        With ``chunk_nodes`` disabled, chunks are summarised on their artifact
+        node instead of being stored as ``Chunk`` nodes.
+        """
         self.driver = driver
         self.database = database
+        self.chunk_nodes = chunk_nodes
 
     def ensure_constraints(self) -> None:
         """Create required uniqueness constraints if they do not exist."""
@@ -31,6 +47,7 @@ class Neo4jWriter:
             "CREATE CONSTRAINT IF NOT EXISTS FOR (m:IntegrationMessage) REQUIRE m.name IS UNIQUE",
             "CREATE CONSTRAINT IF NOT EXISTS FOR (tc:TelemetryChannel) REQUIRE tc.name IS UNIQUE",
             "CREATE CONSTRAINT IF NOT EXISTS FOR (cfg:ConfigFile) REQUIRE cfg.path IS UNIQUE",
+            "CREATE INDEX artifact_path IF NOT EXISTS FOR (a:Artifact) ON (a.path)",
         ]
         with self.driver.session(database=self.database) as session:
             for stmt in cypher_statements:
@@ -124,6 +141,9 @@ class Neo4jWriter:
 
     def sync_chunks(self, chunk_embeddings: Iterable[ChunkEmbedding]) -> None:
         """Upsert chunk nodes and connect them to their owning artifacts."""
+        if not self.chunk_nodes:
+            self._sync_chunk_summaries(chunk_embeddings)
+            return
         with self.driver.session(database=self.database) as session:
             for item in chunk_embeddings:
                 artifact_type = item.chunk.metadata.get("artifact_type", "code")
@@ -143,18 +163,52 @@ class Neo4jWriter:
                     parameters=params,
                 )
 
-    def delete_artifact(self, path: str) -> None:
-        """Remove an artifact node and its chunks."""
+    def _sync_chunk_summaries(self, chunk_embeddings: Iterable[ChunkEmbedding]) -> None:
+        """Record chunk counts and ordered chunk digests on each artifact node.
+
+        The pipeline hands over every chunk of an artifact in one call, so the
+        summary replaces the previous one; leftover ``Chunk`` nodes are removed.
+        """
+        by_artifact: dict[tuple[str, str], list[tuple[int, str]]] = defaultdict(list)
+        for item in chunk_embeddings:
+            label = _label_for_type(str(item.chunk.metadata.get("artifact_type", "code")))
+            path = str(item.chunk.metadata.get("path"))
+            by_artifact[(label, path)].append((item.chunk.sequence, item.chunk.content_digest))
+
+        rows_by_label: dict[str, list[dict[str, object]]] = defaultdict(list)
+        for (label, path), chunks in by_artifact.items():
+            digests = [digest for _, digest in sorted(chunks)]
+            rows_by_label[label].append({"path": path, "count": len(digests), "digests": digests})
 
         with self.driver.session(database=self.database) as session:
-            session.run(
-                "MATCH (n {path: $path})\n"
-                "OPTIONAL MATCH (n)-[:HAS_CHUNK]->(c:Chunk)\n"
-                "WITH n, collect(c) AS chunks\n"
-                "FOREACH (chunk IN chunks | DETACH DELETE chunk)\n"
-                "DETACH DELETE n",
-                path=path,
-            )
+            for label, rows in rows_by_label.items():
+                session.run(
+                    "UNWIND $rows AS row\n"
+                    f"MATCH (f:{label} {{path: row.path}})\n"
+                    "SET f.chunk_count = row.count, f.chunk_digests = row.digests\n"
+                    "WITH f\n"
+                    "OPTIONAL MATCH (f)-[:HAS_CHUNK]->(c:Chunk)\n"
+                    "DETACH DELETE c",
+                    rows=rows,
+                )
+
+    def delete_artifact(self, path: str, artifact_type: str | None = None) -> None:
+        """Remove an artifact node and its chunks.
+
+        The node is looked up by ``path`` under the label implied by
+        ``artifact_type`` (as recorded in the artifact ledger). When the type
+        is unknown, or nothing was deleted under that label, every artifact
+        label is probed through its ``path`` index instead of scanning all nodes.
+        """
+
+        with self.driver.session(database=self.database) as session:
+            if artifact_type:
+                label = _label_for_type(artifact_type)
+                summary = session.run(f"MATCH (n:{label} {{path: $path}})\n{_DELETE_WITH_CHUNKS}", path=path).consume()
+                if summary.counters.nodes_deleted:
+                    return
+            probes = " UNION ".join(f"MATCH (n:{label} {{path: $path}}) RETURN n" for label in ARTIFACT_LABELS)
+            session.run(f"CALL {{ {probes} }}\n{_DELETE_WITH_CHUNKS}", path=path)
 
 
 def _artifact_label(artifact: Artifact) -> str:
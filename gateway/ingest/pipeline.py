@@ -21,8 +21,10 @@ from gateway.ingest.artifacts import Chunk, ChunkEmbedding
 from gateway.ingest.chunking import Chunker
 from gateway.ingest.discovery import DiscoveryConfig, discover
 from gateway.ingest.embedding import DummyEmbedder, Embedder
+from gateway.ingest.lexical import LexicalVocabulary
 from gateway.ingest.neo4j_writer import Neo4jWriter
 from gateway.ingest.qdrant_writer import QdrantWriter
+from gateway.ingest.symbols import SymbolIndex, SymbolIndexBuilder, extract_symbols
 from gateway.observability.metrics import (
     INGEST_ARTIFACTS_TOTAL,
     INGEST_CHUNKS_TOTAL,
@@ -57,9 +59,12 @@ class IngestionConfig:
     coverage_path: Path | None = None
     coverage_history_limit: int = 5
     ledger_path: Path | None = None
+    lexical_vocabulary_path: Path | None = None
+    symbol_index_path: Path | None = None
     incremental: bool = True
     embed_parallel_workers: int = 2
     max_pending_batches: int = 4
+    subsystem_centroids: bool = False
 
 
 @dataclass(slots=True)
@@ -77,6 +82,22 @@ class IngestionResult:
     artifacts: list[dict[str, object]] = field(default_factory=list)
     removed_artifacts: list[dict[str, object]] = field(default_factory=list)
 
+    def touched_subsystems(self) -> set[str] | None:
+        """Return the subsystems whose artifacts were rewritten or removed.
+
+        Returns ``None`` when a changed artifact has no subsystem, since such
+        artifacts can still surface in any subsystem's graph neighbourhood.
+        """
+
+        touched: set[str] = set()
+        changed = [item for item in self.artifacts if not item.get("skipped")]
+        for item in (*changed, *self.removed_artifacts):
+            subsystem = item.get("subsystem")
+            if not subsystem:
+                return None
+            touched.add(str(subsystem))
+        return touched
+
 
 class IngestionPipeline:
     """Execute the ingestion workflow end-to-end."""
@@ -90,6 +111,7 @@ class IngestionPipeline:
         self.qdrant_writer = qdrant_writer
         self.neo4j_writer = neo4j_writer
         self.config = config
+        self._lexical_vocabulary: LexicalVocabulary | None = None
 
     def run(self) -> IngestionResult:
         """Execute discovery, chunking, embedding, and persistence for a repo."""
@@ -155,6 +177,20 @@ class IngestionPipeline:
                 embedder = self._build_embedder()
                 if self.qdrant_writer and not self.config.dry_run:
                     self.qdrant_writer.ensure_collection(embedder.dimension)
+                incremental = self.config.incremental
+                self._lexical_vocabulary, lexical_backfill = self._load_lexical_vocabulary(bool(ledger_previous))
+                symbol_builder, symbol_backfill = self._load_symbol_builder(bool(ledger_previous))
+                if incremental and (lexical_backfill or symbol_backfill):
+                    logger.info(
+                        "Derived search indexes missing; re-indexing unchanged artifacts to backfill them",
+                        extra={
+                            "ingest_run_id": run_id,
+                            "profile": profile,
+                            "lexical_backfill": lexical_backfill,
+                            "symbol_backfill": symbol_backfill,
+                        },
+                    )
+                    incremental = False
 
                 pending_batches: deque[tuple[Future[list[list[float]]], list[Chunk]]] = deque()
 
@@ -176,7 +212,7 @@ class IngestionPipeline:
 
                             chunk_count_existing: int | None = None
                             coverage_ratio_existing: float | None = None
-                            if self.config.incremental and existing_entry and existing_entry.get("digest") == artifact_digest:
+                            if incremental and existing_entry and existing_entry.get("digest") == artifact_digest:
                                 existing_chunk_count_raw = existing_entry.get("chunk_count")
                                 chunk_count_existing = _coerce_int(existing_chunk_count_raw)
                                 if chunk_count_existing is not None:
@@ -223,6 +259,11 @@ class IngestionPipeline:
 
                             if self.neo4j_writer and not self.config.dry_run:
                                 self.neo4j_writer.sync_artifact(artifact)
+                            if symbol_builder is not None:
+                                symbol_builder.replace(
+                                    path_text,
+                                    extract_symbols(artifact, artifact_chunks, step=chunker.step),
+                                )
 
                             artifact_details.append(
                                 {
@@ -275,7 +316,13 @@ class IngestionPipeline:
 
                 chunk_count = total_chunk_count
                 removed_artifacts = self._handle_stale_artifacts(ledger_previous, current_ledger_entries, profile)
+                self._refresh_subsystem_centroids(changed=bool(chunk_count or removed_artifacts))
 
+                self._save_lexical_vocabulary()
+                if symbol_builder is not None:
+                    for removed in removed_artifacts:
+                        symbol_builder.remove(str(removed.get("path")))
+                    self._save_symbol_index(symbol_builder)
                 success = True
                 return IngestionResult(
                     run_id=run_id,
@@ -331,10 +378,67 @@ class IngestionPipeline:
 
     def _build_embeddings(self, chunks: Sequence[Chunk], vectors: Sequence[Sequence[float]]) -> list[ChunkEmbedding]:
         embeddings: list[ChunkEmbedding] = []
+        vocabulary = self._lexical_vocabulary
         for chunk, vector in zip(chunks, vectors, strict=True):
-            embeddings.append(ChunkEmbedding(chunk=chunk, vector=list(vector)))
+            sparse = None
+            if vocabulary is not None:
+                sparse = vocabulary.encode_document(chunk.text, extra_terms=_lexical_extra_terms(chunk))
+            embeddings.append(ChunkEmbedding(chunk=chunk, vector=list(vector), sparse=sparse))
         return embeddings
 
+    def _load_lexical_vocabulary(self, has_ledger: bool) -> tuple[LexicalVocabulary | None, bool]:
+        """Return the vocabulary to extend this run and whether a backfill is required."""
+
+        path = self.config.lexical_vocabulary_path
+        if path is None or self.config.dry_run or self.qdrant_writer is None:
+            return None, False
+        if not getattr(self.qdrant_writer, "sparse_enabled", False):
+            return None, False
+        vocabulary = LexicalVocabulary.load(path)
+        if vocabulary is None:
+            return LexicalVocabulary(), has_ledger
+        return vocabulary, False
+
+    def _load_symbol_builder(self, has_ledger: bool) -> tuple[SymbolIndexBuilder | None, bool]:
+        """Return a builder seeded from the previous index and whether a backfill is required."""
+
+        path = self.config.symbol_index_path
+        if path is None or self.config.dry_run:
+            return None, False
+        existing = SymbolIndex.load(path)
+        return SymbolIndexBuilder(existing), existing is None and has_ledger
+
+    def _save_symbol_index(self, builder: SymbolIndexBuilder) -> None:
+        path = self.config.symbol_index_path
+        if path is None:
+            return
+        try:
+            builder.build().save(path)
+        except OSError as exc:  # pragma: no cover - filesystem failures are logged
+            logger.warning("Failed to write symbol index %s: %s", path, exc)
+
+    def _save_lexical_vocabulary(self) -> None:
+        path = self.config.lexical_vocabulary_path
+        if self._lexical_vocabulary is None or path is None:
+            return
+        try:
+            self._lexical_vocabulary.save(path)
+        except OSError as exc:  # pragma: no cover - filesystem failures are logged
+            logger.warning("Failed to write lexical vocabulary %s: %s", path, exc)
+
+    def _refresh_subsystem_centroids(self, *, changed: bool) -> None:
+        """Recompute routing centroids when the index changed (or they were never built)."""
+
+        writer = self.qdrant_writer
+        if writer is None or self.config.dry_run or not self.config.subsystem_centroids:
+            return
+        if not changed and writer.has_subsystem_centroids():
+            return
+        try:
+            writer.refresh_subsystem_centroids()
+        except Exception as exc:  # pragma: no cover - network failures are logged
+            logger.warning("Failed to refresh subsystem centroids: %s", exc)
+
     def _persist_embeddings(self, embeddings: Sequence[ChunkEmbedding]) -> int:
         if not embeddings:
             return 0
@@ -366,11 +470,15 @@ class IngestionPipeline:
 
         for path in stale_paths:
             entry = previous.get(path, {})
-            status = "dry-run" if self.config.dry_run else self._delete_artifact_from_backends(path)
+            artifact_type = entry.get("artifact_type")
+            if self.config.dry_run:
+                status = "dry-run"
+            else:
+                status = self._delete_artifact_from_backends(path, str(artifact_type) if artifact_type else None)
             removed.append(
                 {
                     "path": path,
-                    "artifact_type": entry.get("artifact_type"),
+                    "artifact_type": artifact_type,
                     "subsystem": entry.get("subsystem"),
                     "digest": entry.get("digest"),
                     "status": status,
@@ -386,12 +494,12 @@ class IngestionPipeline:
 
         return removed
 
-    def _delete_artifact_from_backends(self, path: str) -> str:
+    def _delete_artifact_from_backends(self, path: str, artifact_type: str | None = None) -> str:
         errors: list[str] = []
 
         if self.neo4j_writer is not None:
             try:
-                self.neo4j_writer.delete_artifact(path)
+                self.neo4j_writer.delete_artifact(path, artifact_type)
             except Exception as exc:  # pragma: no cover - driver/network error
                 errors.append(f"neo4j: {exc}")
 
@@ -458,6 +566,16 @@ def _current_repo_head(repo_root: Path) -> str | None:
         return None
 
 
+def _lexical_extra_terms(chunk: Chunk) -> list[str]:
+    terms = [str(chunk.metadata.get("path") or "")]
+    tags = chunk.metadata.get("tags")
+    if isinstance(tags, (list, tuple)):
+        terms.extend(str(tag) for tag in tags)
+    elif isinstance(tags, str):
+        terms.append(tags)
+    return terms
+
+
 def _coerce_int(value: object) -> int | None:
     if isinstance(value, (int, float)):
         return int(value)
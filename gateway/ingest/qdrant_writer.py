@@ -6,14 +6,35 @@ import logging
 import uuid
 from collections.abc import Iterable
 
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from gateway.ingest.artifacts import ChunkEmbedding
+from gateway.ingest.lexical import LEXICAL_VECTOR_NAME
 
 logger = logging.getLogger(__name__)
 
+# Payload indexes backing filtered lookups: artifact deletes and grouping use
+# `path`; neighbour-chunk expansion ranges over `chunk_index` within a path;
+# similar-chunk search resolves seed points by `chunk_id`; subsystem routing
+# restricts retrieval by `subsystem`.
+PAYLOAD_INDEXES: dict[str, qmodels.PayloadSchemaType] = {
+    "path": qmodels.PayloadSchemaType.KEYWORD,
+    "chunk_index": qmodels.PayloadSchemaType.INTEGER,
+    "chunk_id": qmodels.PayloadSchemaType.KEYWORD,
+    "subsystem": qmodels.PayloadSchemaType.KEYWORD,
+    "artifact_type": qmodels.PayloadSchemaType.KEYWORD,
+}
+CENTROID_SCROLL_PAGE = 512
+
+
+def centroid_collection_name(collection_name: str) -> str:
+    """Return the side collection holding one centroid vector per subsystem."""
+
+    return f"{collection_name}_subsystems"
+
 
 class QdrantWriter:
     """Lightweight adapter around the Qdrant client."""
@@ -21,13 +42,19 @@ class QdrantWriter:
     def __init__(self, client: QdrantClient, collection_name: str) -> None:
         self.client = client
         self.collection_name = collection_name
+        self.sparse_enabled = False
 
     def ensure_collection(self, vector_size: int) -> None:
-        """Ensure the collection exists with the desired vector dimensionality."""
+        """Ensure the collection exists with the desired vector dimensionality and payload indexes."""
+        self._ensure_collection(vector_size)
+        self._ensure_payload_indexes()
+
+    def _ensure_collection(self, vector_size: int) -> None:
         collection_exists = getattr(self.client, "collection_exists", None)
         if callable(collection_exists):
             try:
                 if collection_exists(self.collection_name):
+                    self.sparse_enabled = self._collection_has_sparse_vectors()
                     return
             except UnexpectedResponse:
                 logger.info("Collection check failed for %s; recreating", self.collection_name)
@@ -35,10 +62,14 @@ class QdrantWriter:
                 logger.warning("Unexpected error checking Qdrant collection existence", exc_info=True)
         else:
             try:
-                self.client.get_collection(self.collection_name)
-                return
+                info = self.client.get_collection(self.collection_name)
             except Exception:  # pragma: no cover - fallback for older clients
                 logger.info("Collection lookup failed for %s; recreating", self.collection_name)
+            else:
+                self.sparse_enabled = _has_lexical_sparse_vector(info)
+                if not self.sparse_enabled:
+                    _warn_missing_sparse_vector(self.collection_name)
+                return
 
         logger.info("Creating Qdrant collection %s", self.collection_name)
         vectors_config = qmodels.VectorParams(size=vector_size, distance=qmodels.Distance.COSINE)
@@ -46,7 +77,34 @@ class QdrantWriter:
             collection_name=self.collection_name,
             vectors_config=vectors_config,
             optimizers_config=qmodels.OptimizersConfigDiff(default_segment_number=2),
+            sparse_vectors_config={
+                LEXICAL_VECTOR_NAME: qmodels.SparseVectorParams(modifier=qmodels.Modifier.IDF),
+            },
         )
+        self.sparse_enabled = True
+
+    def _ensure_payload_indexes(self) -> None:
+        # Index creation is idempotent, so existing collections pick up new indexes on the next ingest.
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            try:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+            except Exception:  # pragma: no cover - defensive
+                logger.warning("Unable to create Qdrant payload index %s on %s", field_name, self.collection_name, exc_info=True)
+
+    def _collection_has_sparse_vectors(self) -> bool:
+        try:
+            info = self.client.get_collection(self.collection_name)
+        except Exception:  # pragma: no cover - defensive
+            logger.warning("Unable to inspect Qdrant collection %s; sparse vectors disabled", self.collection_name, exc_info=True)
+            return False
+        if _has_lexical_sparse_vector(info):
+            return True
+        _warn_missing_sparse_vector(self.collection_name)
+        return False
 
     def upsert_chunks(self, chunks: Iterable[ChunkEmbedding]) -> None:
         """Upsert chunk embeddings into the configured collection."""
@@ -54,10 +112,16 @@ class QdrantWriter:
         for item in chunks:
             payload = {**item.chunk.metadata, "chunk_id": item.chunk.chunk_id, "text": item.chunk.text}
             point_id = str(uuid.UUID(item.chunk.content_digest[:32]))
+            vector: list[float] | dict[str, list[float] | qmodels.SparseVector] = item.vector
+            if self.sparse_enabled and item.sparse is not None:
+                vector = {
+                    "": item.vector,
+                    LEXICAL_VECTOR_NAME: qmodels.SparseVector(indices=item.sparse.indices, values=item.sparse.values),
+                }
             points.append(
                 qmodels.PointStruct(
                     id=point_id,
-                    vector=item.vector,
+                    vector=vector,
                     payload=payload,
                 )
             )
@@ -66,6 +130,68 @@ class QdrantWriter:
         self.client.upsert(collection_name=self.collection_name, points=points)
         logger.info("Upserted %d chunk(s) into Qdrant", len(points))
 
+    def has_subsystem_centroids(self) -> bool:
+        """Return whether the subsystem centroid side collection exists."""
+        try:
+            return bool(self.client.collection_exists(centroid_collection_name(self.collection_name)))
+        except Exception:  # pragma: no cover - defensive
+            logger.warning("Unable to check subsystem centroid collection", exc_info=True)
+            return False
+
+    def refresh_subsystem_centroids(self) -> dict[str, int]:
+        """Recompute the mean dense vector of every subsystem into the side collection.
+
+        Scrolls the stored vectors once (so incremental runs still average the
+        whole index), recreates the side collection, and upserts one point per
+        subsystem. Returns the chunk count behind each centroid.
+        """
+        sums: dict[str, np.ndarray] = {}
+        counts: dict[str, int] = {}
+        offset: qmodels.ExtendedPointId | None = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=CENTROID_SCROLL_PAGE,
+                offset=offset,
+                with_payload=["subsystem"],
+                with_vectors=True,
+            )
+            for record in records:
+                subsystem = (record.payload or {}).get("subsystem")
+                vector = _dense_vector(record.vector)
+                if not subsystem or vector is None:
+                    continue
+                key = str(subsystem)
+                if key in sums:
+                    sums[key] += vector
+                else:
+                    sums[key] = vector.copy()
+                counts[key] = counts.get(key, 0) + 1
+            if offset is None:
+                break
+
+        if not sums:
+            return {}
+        side_collection = centroid_collection_name(self.collection_name)
+        dimension = len(next(iter(sums.values())))
+        self.client.recreate_collection(
+            collection_name=side_collection,
+            vectors_config=qmodels.VectorParams(size=dimension, distance=qmodels.Distance.COSINE),
+        )
+        self.client.upsert(
+            collection_name=side_collection,
+            points=[
+                qmodels.PointStruct(
+                    id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"subsystem:{subsystem}")),
+                    vector=(total / counts[subsystem]).tolist(),
+                    payload={"subsystem": subsystem, "chunk_count": counts[subsystem]},
+                )
+                for subsystem, total in sorted(sums.items())
+            ],
+        )
+        logger.info("Refreshed %d subsystem centroid(s) in %s", len(sums), side_collection)
+        return counts
+
     def delete_artifact(self, artifact_path: str) -> None:
         """Delete all points belonging to an artifact path."""
         filter_ = qmodels.Filter(
@@ -82,3 +208,28 @@ class QdrantWriter:
             wait=True,
         )
         logger.info("Deleted chunks for artifact %s", artifact_path)
+
+
+def _dense_vector(vector: object) -> np.ndarray | None:
+    """Extract the unnamed dense vector from a record (collections with sparse vectors return a dict)."""
+
+    if isinstance(vector, dict):
+        vector = vector.get("")
+    if not isinstance(vector, list) or not vector:
+        return None
+    return np.asarray(vector, dtype=np.float64)
+
+
+def _has_lexical_sparse_vector(info: object) -> bool:
+    config = getattr(info, "config", None)
+    params = getattr(config, "params", None)
+    sparse_vectors = getattr(params, "sparse_vectors", None) or {}
+    return LEXICAL_VECTOR_NAME in sparse_vectors
+
+
+def _warn_missing_sparse_vector(collection_name: str) -> None:
+    logger.warning(
+        "Qdrant collection %s has no '%s' sparse vector; lexical retrieval stays disabled until the collection is recreated",
+        collection_name,
+        LEXICAL_VECTOR_NAME,
+    )
@@ -11,10 +11,13 @@ from qdrant_client import QdrantClient
 from gateway.config.settings import AppSettings
 from gateway.ingest.audit import AuditLogger
 from gateway.ingest.coverage import write_coverage_report
+from gateway.ingest.lexical import lexical_vocabulary_path
 from gateway.ingest.lifecycle import LifecycleConfig, build_graph_service, write_lifecycle_report
 from gateway.ingest.neo4j_writer import Neo4jWriter
 from gateway.ingest.pipeline import IngestionConfig, IngestionPipeline, IngestionResult
 from gateway.ingest.qdrant_writer import QdrantWriter
+from gateway.ingest.state_files import bump_index_generation, index_generation_path
+from gateway.ingest.symbols import symbol_index_path
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +48,16 @@ def execute_ingestion(
     neo4j_writer = None
     driver = None
     if not dry:
-        driver = GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_password))
-        neo4j_writer = Neo4jWriter(driver, database=settings.neo4j_database)
+        driver = GraphDatabase.driver(
+            settings.neo4j_uri,
+            auth=(settings.neo4j_user, settings.neo4j_password),
+            **settings.neo4j_driver_options(),
+        )
+        neo4j_writer = Neo4jWriter(
+            driver,
+            database=settings.neo4j_database,
+            chunk_nodes=settings.graph_chunk_mode == "nodes",
+        )
 
     audit_logger = None
     audit_path = None
@@ -71,16 +82,24 @@ def execute_ingestion(
         coverage_path=coverage_path,
         coverage_history_limit=settings.coverage_history_limit,
         ledger_path=ledger_path,
+        lexical_vocabulary_path=lexical_vocabulary_path(state_path, settings.qdrant_collection),
+        symbol_index_path=symbol_index_path(state_path, settings.qdrant_collection),
         incremental=incremental_enabled,
         embed_parallel_workers=max(1, settings.ingest_parallel_workers),
         max_pending_batches=max(1, settings.ingest_max_pending_batches),
+        subsystem_centroids=settings.search_routing_mode == "subsystem",
     )
 
     pipeline = IngestionPipeline(qdrant_writer=qdrant_writer, neo4j_writer=neo4j_writer, config=config)
 
     graph_service = None
     if driver is not None and settings.lifecycle_report_enabled:
-        graph_service = build_graph_service(driver=driver, database=settings.neo4j_database, cache_ttl=0)
+        graph_service = build_graph_service(
+            driver=driver,
+            database=settings.neo4j_database,
+            cache_ttl=0,
+            chunk_nodes=settings.graph_chunk_mode == "nodes",
+        )
 
     try:
         if neo4j_writer and not dry:
@@ -88,6 +107,11 @@ def execute_ingestion(
         result = pipeline.run()
         if audit_logger and result.success:
             audit_logger.record(result)
+        if not dry and result.success:
+            try:
+                bump_index_generation(index_generation_path(state_path), subsystems=result.touched_subsystems())
+            except OSError as exc:  # pragma: no cover - filesystem failures are logged
+                logger.warning("Failed to bump index generation: %s", exc)
         if not dry and settings.coverage_enabled and coverage_path is not None:
             write_coverage_report(
                 result,
@@ -101,6 +125,7 @@ def execute_ingestion(
                 stale_days=settings.lifecycle_stale_days,
                 graph_enabled=graph_service is not None,
                 history_limit=settings.lifecycle_history_limit,
+                isolated_limit=settings.lifecycle_isolated_limit,
             )
             write_lifecycle_report(
                 result,
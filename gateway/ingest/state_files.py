@@ -0,0 +1,106 @@
+"""Helpers for sharing ingestion-produced state files with the API process."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ReloadingFileCache[T]:
+    """Serve the parsed contents of a state file, reloading when ingestion rewrites it."""
+
+    def __init__(self, path: Path, loader: Callable[[Path], T | None]) -> None:
+        self.path = path
+        self._loader = loader
+        self._value: T | None = None
+        self._mtime_ns: int | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T | None:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            if mtime_ns != self._mtime_ns:
+                self._value = self._loader(self.path)
+                self._mtime_ns = mtime_ns
+            return self._value
+
+
+@dataclass(frozen=True, slots=True)
+class IndexGeneration:
+    """Index generation counter plus the subsystems its ingestion run touched.
+
+    ``subsystems`` is ``None`` when the run could not attribute every change
+    to a subsystem, in which case readers must treat everything as changed.
+    """
+
+    generation: int
+    subsystems: frozenset[str] | None
+
+
+def index_generation_path(state_path: Path) -> Path:
+    """Return the file recording how many ingestion runs have updated the indexes."""
+
+    return state_path / "reports" / "index_generation.json"
+
+
+def read_index_generation(path: Path) -> int | None:
+    """Read the index generation counter, returning ``None`` when unavailable."""
+
+    state = read_index_generation_state(path)
+    return state.generation if state is not None else None
+
+
+def read_index_generation_state(path: Path) -> IndexGeneration | None:
+    """Read the generation counter and touched subsystems, ``None`` when unavailable."""
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        generation = int(data["generation"])
+        raw_subsystems = data.get("subsystems")
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+        logger.warning("Failed to read index generation %s: %s", path, exc)
+        return None
+    subsystems = frozenset(str(name) for name in raw_subsystems) if isinstance(raw_subsystems, list) else None
+    return IndexGeneration(generation=generation, subsystems=subsystems)
+
+
+def bump_index_generation(path: Path, *, subsystems: Iterable[str] | None = None) -> int:
+    """Increment the index generation after a successful ingestion run.
+
+    ``subsystems`` names the subsystems whose artifacts changed; leave it as
+    ``None`` when the changes cannot be attributed so readers drop everything.
+    """
+
+    generation = (read_index_generation(path) or 0) + 1
+    payload = {
+        "generation": generation,
+        "updated_at": time.time(),
+        "subsystems": sorted(set(subsystems)) if subsystems is not None else None,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    tmp_path.replace(path)
+    return generation
+
+
+__all__ = [
+    "IndexGeneration",
+    "ReloadingFileCache",
+    "bump_index_generation",
+    "index_generation_path",
+    "read_index_generation",
+    "read_index_generation_state",
+]
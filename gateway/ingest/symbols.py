@@ -0,0 +1,276 @@
+"""Trigram index over paths, Python definitions, and discovered message/telemetry names."""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import re
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from gateway.ingest.artifacts import Artifact, Chunk
+
+logger = logging.getLogger(__name__)
+
+SYMBOL_KINDS = ("class", "function", "message", "telemetry", "path")
+"""Symbol kinds in tie-break order: definitions outrank mentions and bare paths."""
+
+_DEFINITION_PATTERN = re.compile(r"^[ \t]*(?:async[ \t]+)?(def|class)[ \t]+([A-Za-z_]\w*)", flags=re.MULTILINE)
+_SNIPPET_LENGTH = 160
+_FORMAT_VERSION = 1
+
+
+@dataclass(slots=True, frozen=True)
+class SymbolEntry:
+    """Indexed symbol pointing at the chunk that contains it."""
+
+    symbol: str
+    kind: str
+    path: str
+    line: int
+    chunk_sequence: int
+    artifact_type: str
+    subsystem: str | None
+    snippet: str
+
+    @property
+    def chunk_id(self) -> str:
+        return f"{self.path}::{self.chunk_sequence}"
+
+
+@dataclass(slots=True)
+class SymbolMatch:
+    """Index entry matched by a lookup along with its match quality."""
+
+    entry: SymbolEntry
+    score: float
+    match: str
+
+
+def symbol_index_path(state_path: Path, collection_name: str) -> Path:
+    """Return the on-disk location of the symbol index for a Qdrant collection."""
+
+    return state_path / "symbols" / f"{collection_name}.json"
+
+
+def extract_symbols(artifact: Artifact, chunks: Sequence[Chunk], *, step: int) -> list[SymbolEntry]:
+    """Collect symbol entries for an artifact, mapping each to the chunk containing it."""
+
+    if not chunks:
+        return []
+    content = artifact.content
+    path_text = artifact.path.as_posix()
+    last_sequence = len(chunks) - 1
+
+    def _entry(symbol: str, kind: str, offset: int) -> SymbolEntry:
+        line_start = content.rfind("\n", 0, offset) + 1
+        line_end = content.find("\n", offset)
+        snippet = content[line_start : line_end if line_end >= 0 else len(content)].strip()
+        return SymbolEntry(
+            symbol=symbol,
+            kind=kind,
+            path=path_text,
+            line=content.count("\n", 0, offset) + 1,
+            chunk_sequence=min(offset // max(step, 1), last_sequence),
+            artifact_type=artifact.artifact_type,
+            subsystem=artifact.subsystem,
+            snippet=snippet[:_SNIPPET_LENGTH],
+        )
+
+    entries = [_entry(path_text, "path", 0)]
+    if artifact.path.suffix == ".py":
+        for match in _DEFINITION_PATTERN.finditer(content):
+            kind = "class" if match.group(1) == "class" else "function"
+            entries.append(_entry(match.group(2), kind, match.start(2)))
+    for key, kind in (("message_entities", "message"), ("telemetry_signals", "telemetry")):
+        names = artifact.extra_metadata.get(key)
+        if not isinstance(names, list):
+            continue
+        for name in names:
+            offset = content.find(str(name))
+            if offset >= 0:
+                entries.append(_entry(str(name), kind, offset))
+    return entries
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+class SymbolIndex:
+    """In-memory trigram index answering exact, suffix, prefix, and substring lookups."""
+
+    def __init__(self, entries: Sequence[SymbolEntry], postings: dict[str, array] | None = None) -> None:
+        self.entries = list(entries)
+        self._keys = [entry.symbol.lower() for entry in self.entries]
+        self._postings = postings if postings is not None else self._build_postings(self._keys)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _build_postings(keys: Sequence[str]) -> dict[str, array]:
+        postings: dict[str, array] = {}
+        for entry_id, key in enumerate(keys):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, array("I")).append(entry_id)
+        return postings
+
+    def lookup(self, term: str, *, limit: int) -> list[SymbolMatch]:
+        """Return the best entries containing ``term`` (case-insensitive)."""
+
+        needle = term.strip().lower()
+        if not needle or limit <= 0:
+            return []
+        grams = _trigrams(needle)
+        if grams:
+            posting_lists: list[array] = []
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []  # some trigram of the term occurs in no symbol
+                posting_lists.append(posting)
+            posting_lists.sort(key=len)
+            candidate_ids: Iterable[int] = set(posting_lists[0]).intersection(*posting_lists[1:])
+        else:
+            candidate_ids = range(len(self.entries))
+
+        matches: list[SymbolMatch] = []
+        for entry_id in candidate_ids:
+            key = self._keys[entry_id]
+            if needle not in key:
+                continue
+            entry = self.entries[entry_id]
+            if key == needle:
+                score, kind = 1.0, "exact"
+            elif entry.kind == "path" and key.endswith("/" + needle):
+                score, kind = 0.9, "suffix"
+            elif key.startswith(needle):
+                score, kind = 0.75, "prefix"
+            else:
+                score, kind = 0.5, "substring"
+            matches.append(SymbolMatch(entry=entry, score=score, match=kind))
+
+        matches.sort(
+            key=lambda item: (
+                -item.score,
+                SYMBOL_KINDS.index(item.entry.kind) if item.entry.kind in SYMBOL_KINDS else len(SYMBOL_KINDS),
+                len(item.entry.symbol),
+                item.entry.path,
+                item.entry.line,
+            )
+        )
+        return matches[:limit]
+
+    def entries_by_path(self) -> dict[str, list[SymbolEntry]]:
+        grouped: dict[str, list[SymbolEntry]] = {}
+        for entry in self.entries:
+            grouped.setdefault(entry.path, []).append(entry)
+        return grouped
+
+    def save(self, path: Path) -> None:
+        """Persist entries with string tables and base64-packed trigram postings."""
+
+        paths: dict[str, int] = {}
+        labels: dict[str, int] = {}
+        rows: list[list[object]] = []
+        for entry in self.entries:
+            path_id = paths.setdefault(entry.path, len(paths))
+            type_id = labels.setdefault(entry.artifact_type, len(labels))
+            subsystem_id = labels.setdefault(entry.subsystem, len(labels)) if entry.subsystem else -1
+            rows.append([entry.symbol, entry.kind, path_id, entry.line, entry.chunk_sequence, type_id, subsystem_id, entry.snippet])
+        payload = {
+            "version": _FORMAT_VERSION,
+            "paths": list(paths),
+            "labels": list(labels),
+            "entries": rows,
+            "trigrams": {gram: _pack(ids) for gram, ids in self._postings.items()},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> SymbolIndex | None:
+        """Load a persisted index, returning ``None`` when missing or unreadable."""
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Failed to read symbol index %s: %s", path, exc)
+            return None
+        if not isinstance(data, dict) or data.get("version") != _FORMAT_VERSION:
+            logger.warning("Symbol index %s has an unexpected format; ignoring", path)
+            return None
+        try:
+            paths = data["paths"]
+            labels = data["labels"]
+            entries = [
+                SymbolEntry(
+                    symbol=symbol,
+                    kind=kind,
+                    path=paths[path_id],
+                    line=int(line),
+                    chunk_sequence=int(sequence),
+                    artifact_type=labels[type_id],
+                    subsystem=labels[subsystem_id] if subsystem_id >= 0 else None,
+                    snippet=snippet,
+                )
+                for symbol, kind, path_id, line, sequence, type_id, subsystem_id, snippet in data["entries"]
+            ]
+            postings = {gram: _unpack(encoded) for gram, encoded in data["trigrams"].items()}
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            logger.warning("Symbol index %s is corrupt: %s", path, exc)
+            return None
+        return cls(entries, postings)
+
+
+class SymbolIndexBuilder:
+    """Incrementally maintain per-artifact symbol entries across ingestion runs."""
+
+    def __init__(self, existing: SymbolIndex | None = None) -> None:
+        self._entries: dict[str, list[SymbolEntry]] = existing.entries_by_path() if existing else {}
+
+    def replace(self, path: str, entries: Sequence[SymbolEntry]) -> None:
+        if entries:
+            self._entries[path] = list(entries)
+        else:
+            self._entries.pop(path, None)
+
+    def remove(self, path: str) -> None:
+        self._entries.pop(path, None)
+
+    def build(self) -> SymbolIndex:
+        return SymbolIndex([entry for path in sorted(self._entries) for entry in self._entries[path]])
+
+
+def _pack(ids: array) -> str:
+    packed = array("I", ids)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def _unpack(encoded: str) -> array:
+    ids = array("I")
+    ids.frombytes(base64.b64decode(encoded))
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        ids.byteswap()
+    return ids
+
+
+__all__ = [
+    "SymbolEntry",
+    "SymbolIndex",
+    "SymbolIndexBuilder",
+    "SymbolMatch",
+    "extract_symbols",
+    "symbol_index_path",
+]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
-from collections.abc import Mapping
+from collections.abc import Awaitable, Callable, Mapping
 from types import TracebackType
 from typing import Any
 from urllib.parse import quote as _quote
@@ -61,6 +61,74 @@ class GatewayClient:
         )
         return _expect_dict(data, "search")
 
+    async def search_stream(
+        self,
+        payload: dict[str, Any],
+        on_event: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    ) -> dict[str, Any]:
+        """Perform a streaming search, passing each NDJSON event to ``on_event``.
+
+        Returns the assembled response in the same shape as :meth:`search`. Gateways
+        that cannot stream answer with single-shot JSON, which is returned unchanged.
+        """
+        if self._client is None:
+            raise RuntimeError("GatewayClient is not running")
+        headers = self._auth_headers(require_admin=False, require_reader=True)
+        headers["Accept"] = "application/x-ndjson, application/json"
+        if self._settings.log_requests:
+            logger.debug("MCP -> Gateway POST /search (stream)")
+
+        async with self._client.stream("POST", "/search", json=payload, headers=headers) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise GatewayRequestError(
+                    status_code=response.status_code,
+                    detail=_extract_error_detail(response),
+                    payload=_safe_json(response),
+                )
+            if not response.headers.get("content-type", "").startswith("application/x-ndjson"):
+                await response.aread()
+                return _expect_dict(response.json(), "search")
+
+            query = str(payload.get("query", ""))
+            results: list[dict[str, Any]] = []
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if on_event is not None:
+                    await on_event(event)
+                kind = event.get("event")
+                if kind == "header":
+                    query = event.get("query", query)
+                elif kind == "score":
+                    results.append(event["result"])
+                elif kind == "final":
+                    return {"query": query, "results": results, "metadata": event.get("metadata", {})}
+                elif kind == "error":
+                    raise GatewayRequestError(status_code=500, detail=str(event.get("detail")), payload=event)
+        raise GatewayRequestError(status_code=502, detail="Search stream ended before the final event", payload=None)
+
+    async def search_batch(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Perform a batch search request against the gateway."""
+        data = await self._request(
+            "POST",
+            "/search/batch",
+            json_payload=payload,
+            require_reader=True,
+        )
+        return _expect_dict(data, "search-batch")
+
+    async def search_similar(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Find chunks similar to stored chunk ids."""
+        data = await self._request(
+            "POST",
+            "/search/similar",
+            json_payload=payload,
+            require_reader=True,
+        )
+        return _expect_dict(data, "search-similar")
+
     async def graph_node(self, node_id: str, *, relationships: str, limit: int) -> dict[str, Any]:
         """Fetch a graph node by ID."""
         data = await self._request(
@@ -71,6 +139,16 @@ class GatewayClient:
         )
         return _expect_dict(data, "graph-node")
 
+    async def graph_nodes(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Fetch several graph nodes in one request."""
+        data = await self._request(
+            "POST",
+            "/graph/nodes:batch",
+            json_payload=payload,
+            require_reader=True,
+        )
+        return _expect_dict(data, "graph-nodes")
+
     async def graph_subsystem(
         self,
         name: str,
@@ -150,18 +228,7 @@ class GatewayClient:
         if self._client is None:
             raise RuntimeError("GatewayClient is not running")
 
-        headers: dict[str, str] = {}
-        token: str | None = None
-        if require_admin:
-            token = self._settings.admin_token
-            if token is None:
-                raise MissingTokenError("Maintainer")
-        elif require_reader:
-            token = self._settings.reader_token or self._settings.admin_token
-            if token is None:
-                logger.debug("No reader token configured; issuing unauthenticated request")
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
+        headers = self._auth_headers(require_admin=require_admin, require_reader=require_reader)
 
         if self._settings.log_requests:
             logger.debug("MCP -> Gateway %s %s", method, path)
@@ -188,6 +255,21 @@ class GatewayClient:
             return response.json()
         return response.text
 
+    def _auth_headers(self, *, require_admin: bool, require_reader: bool) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        token: str | None = None
+        if require_admin:
+            token = self._settings.admin_token
+            if token is None:
+                raise MissingTokenError("Maintainer")
+        elif require_reader:
+            token = self._settings.reader_token or self._settings.admin_token
+            if token is None:
+                logger.debug("No reader token configured; issuing unauthenticated request")
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+
 
 def _extract_error_detail(response: httpx.Response) -> str:
     """Extract a human-readable error detail from an HTTP response."""
@@ -29,125 +29,137 @@ from .upload import handle_upload
 TOOL_USAGE = {
     "km-search": {
         "description": "Hybrid search across the knowledge base with optional filters and graph context",
-        "details": dedent(
-            """
+        "details": dedent("""
             Required: `query` text. Optional: `limit` (default 10, max 25), `include_graph`, structured `filters`, `sort_by_vector`.
+            Set `stream` to receive vector hits as progress messages before graph enrichment completes.
+            `verbosity` trims results to save context: `ids` (chunk id, path, score), `compact` (snippet, headline scores,
+            graph context without relationships), or `full` (default); `snippet_chars` sets the text truncation length.
+            `group_by="artifact"` returns the best chunk per file (with up to `group_siblings` sibling chunk ids) so more
+            distinct files fit in `limit`.
+            `expand_context` (0-5) attaches the neighbouring chunks around each hit as one stitched `context` text.
+            `mode` trades latency for recall: `fast`, `balanced` (default), or `exhaustive`.
             Example: `/sys mcp run duskmantle km-search --query "ingest pipeline" --limit 5`.
             Returns scored chunks with metadata and optional graph enrichments.
-            """
-        ).strip(),
+            """).strip(),
+    },
+    "km-search-batch": {
+        "description": "Run several searches in one request with shared embedding, retrieval, and graph lookups",
+        "details": dedent("""
+            Required: `queries`, a list of query strings or objects with `query` plus optional `limit`, `include_graph`, `filters`.
+            Optional: default `limit` (default 10, max 25), `include_graph`, and `verbosity` applied to entries that omit them,
+            plus `sort_by_vector`.
+            Example: `/sys mcp run duskmantle km-search-batch --queries '["ingest pipeline", {"query": "backup", "limit": 3}]'`.
+            Returns one search response per query plus batch metadata; rate limits count each query.
+            """).strip(),
+    },
+    "km-search-similar": {
+        "description": "Find chunks similar to one or more result chunk ids using their stored vectors",
+        "details": dedent("""
+            Required: `chunk_ids`, one or more `chunk_id` values from earlier results (max 10).
+            Optional: `limit` (default 10, max 25), `include_graph`, structured `filters`, `sort_by_vector`, `verbosity`,
+            `snippet_chars`, and `expand_context`, as for `km-search`. No text is re-embedded; the seeds are excluded.
+            Example: `/sys mcp run duskmantle km-search-similar --chunk-ids '["gateway/ingest/pipeline.py::3"]'`.
+            Returns scored chunks in the `km-search` shape; `metadata.missing_chunk_ids` lists unknown seeds.
+            """).strip(),
     },
     "km-graph-node": {
         "description": "Fetch a graph node by ID and inspect incoming/outgoing relationships",
-        "details": dedent(
-            """
+        "details": dedent("""
             Required: `node_id` such as `DesignDoc:docs/archive/WP6/WP6_RELEASE_TOOLING_PLAN.md`.
             Optional: `relationships` (`outgoing`, `incoming`, `all`, `none`) and `limit` (default 50, max 200).
             Example: `/sys mcp run duskmantle km-graph-node --node-id "Code:gateway/mcp/server.py"`.
-            """
-        ).strip(),
+            """).strip(),
+    },
+    "km-graph-nodes": {
+        "description": "Fetch several graph nodes and their relationships in one request",
+        "details": dedent("""
+            Required: `nodes`, a list of node ids or objects with `id` plus optional `relationships` and `limit` (max 100 entries).
+            Optional: default `relationships` (`outgoing`, `incoming`, `all`, `none`) and `limit` (default 50, max 200).
+            Example: `/sys mcp run duskmantle km-graph-nodes --nodes '["Subsystem:Kasmina", {"id": "DesignDoc:docs/README.md"}]'`.
+            Returns `nodes` in request order; unknown or invalid ids carry an inline `error` instead of failing the batch.
+            """).strip(),
     },
     "km-graph-subsystem": {
         "description": "Review a subsystem, related artifacts, and connected subsystems",
-        "details": dedent(
-            """
+        "details": dedent("""
             Required: `name` of the subsystem.
             Optional: `depth` (default 1, max 5), `include_artifacts`, pagination `cursor`, `limit` (default 25, max 100).
             Example: `/sys mcp run duskmantle km-graph-subsystem --name Kasmina --depth 2`.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-graph-search": {
         "description": "Search graph entities (artifacts, subsystems, teams) by term",
-        "details": dedent(
-            """
+        "details": dedent("""
             Required: `term` to match against graph nodes.
             Optional: `limit` (default 20, max 50).
             Example: `/sys mcp run duskmantle km-graph-search --term coverage`.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-coverage-summary": {
         "description": "Summarise ingestion coverage (artifact and chunk counts, freshness)",
-        "details": dedent(
-            """
+        "details": dedent("""
             No parameters. Returns the same payload as `/coverage` including summary counts and stale thresholds.
             Example: `/sys mcp run duskmantle km-coverage-summary`.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-lifecycle-report": {
         "description": "Summarise isolated nodes, stale docs, and missing tests",
-        "details": dedent(
-            """
+        "details": dedent("""
             No parameters. Mirrors the `/lifecycle` endpoint and highlights isolated graph nodes, stale design docs, and subsystems missing tests.
             Example: `/sys mcp run duskmantle km-lifecycle-report`.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-ingest-status": {
         "description": "Show the most recent ingest run (profile, status, timestamps)",
-        "details": dedent(
-            """
+        "details": dedent("""
             Optional: `profile` to scope results to a specific ingest profile.
             Example: `/sys mcp run duskmantle km-ingest-status --profile demo`.
             Returns `status: ok` with run metadata or `status: not_found` when history is empty.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-ingest-trigger": {
         "description": "Kick off a manual ingest run (full rebuild via gateway-ingest)",
-        "details": dedent(
-            """
+        "details": dedent("""
             Optional: `profile` (defaults to MCP settings), `dry_run`, `use_dummy_embeddings`.
             Example: `/sys mcp run duskmantle km-ingest-trigger --profile local --dry-run true`.
             Requires maintainer token (`KM_ADMIN_TOKEN`).
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-backup-trigger": {
         "description": "Create a compressed backup of gateway state (Neo4j/Qdrant data)",
-        "details": dedent(
-            """
+        "details": dedent("""
             No parameters. Returns archive path and metadata.
             Example: `/sys mcp run duskmantle km-backup-trigger`.
             Requires maintainer token; mirrors the `bin/km-backup` helper.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-feedback-submit": {
         "description": "Vote on a search result and attach optional notes for training data",
-        "details": dedent(
-            """
+        "details": dedent("""
             Required: `request_id` (search request) and `chunk_id` (result identifier).
             Optional: numeric `vote` (-1.0 to 1.0) and freeform `note`.
             Example: `/sys mcp run duskmantle km-feedback-submit --request-id req123 --chunk-id chunk456 --vote 1`.
             Maintainer token required when auth is enforced.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-upload": {
         "description": "Copy an existing file into the knowledge workspace and optionally trigger ingest",
-        "details": dedent(
-            """
+        "details": dedent("""
             Required: `source_path` (file visible to the MCP host). Optional: `destination` (relative path inside the
             content root), `overwrite`, `ingest`. Default behaviour stores the file under the configured docs directory.
             Example: `/sys mcp run duskmantle km-upload --source-path ./notes/design.md --destination docs/uploads/`.
             Maintainer scope recommended because this writes to the repository volume and may trigger ingestion.
-            """
-        ).strip(),
+            """).strip(),
     },
     "km-storetext": {
         "description": "Persist raw text as a document within the knowledge workspace",
-        "details": dedent(
-            """
+        "details": dedent("""
             Required: `content` (text body). Optional: `title`, `destination`, `subsystem`, `tags`, `metadata` map,
             `overwrite`, `ingest`. Defaults write markdown into the configured docs directory with YAML front matter
             derived from the provided metadata.
             Example: `/sys mcp run duskmantle km-storetext --title "Release Notes" --content "## Summary"`.
             Maintainer scope recommended because this writes to the repository volume.
-            """
-        ).strip(),
+            """).strip(),
     },
 }
 
@@ -227,11 +239,19 @@ def build_server(settings: MCPSettings | None = None) -> FastMCP:
         include_graph: bool = True,
         filters: dict[str, Any] | None = None,
         sort_by_vector: bool | None = None,
+        stream: bool = False,
+        verbosity: str = "full",
+        snippet_chars: int | None = None,
+        group_by: str | None = None,
+        group_siblings: int = 0,
+        expand_context: int = 0,
+        mode: str | None = None,
         context: Context | None = None,
     ) -> dict[str, Any]:
         if not query or not query.strip():
             raise ValueError("query must be a non-empty string")
         limit = _clamp(limit, minimum=1, maximum=25)
+        verbosity = _normalise_verbosity(verbosity)
 
         payload: dict[str, Any] = {
             "query": query.strip(),
@@ -242,10 +262,24 @@ def build_server(settings: MCPSettings | None = None) -> FastMCP:
             payload["filters"] = _normalise_filters(filters)
         if sort_by_vector is not None:
             payload["sort_by_vector"] = bool(sort_by_vector)
+        if verbosity != "full":
+            payload["verbosity"] = verbosity
+        if snippet_chars is not None:
+            payload["snippet_chars"] = max(0, int(snippet_chars))
+        payload.update(_normalise_grouping(group_by, group_siblings))
+        if expand_context:
+            payload["expand_context"] = _clamp(int(expand_context), minimum=0, maximum=5)
+        if mode is not None:
+            payload["mode"] = _normalise_search_mode(mode)
+
+        async def _relay(event: dict[str, Any]) -> None:
+            if event.get("event") == "hits":
+                await _report_info(context, f"Search found {len(event.get('results', []))} vector hit(s); adding graph context")
 
         start = perf_counter()
         try:
-            response = await state.require_client().search(payload)
+            client = state.require_client()
+            response = await (client.search_stream(payload, _relay) if stream else client.search(payload))
         except GatewayRequestError as exc:  # pragma: no cover - network errors exercised in integration tests
             await _report_error(context, f"Search failed: {exc.detail}")
             _record_failure("km-search", exc, start)
@@ -257,6 +291,88 @@ def build_server(settings: MCPSettings | None = None) -> FastMCP:
         await _report_info(context, f"Search returned {len(response.get('results', []))} result(s)")
         return response
 
+    @server.tool(name="km-search-batch", description=TOOL_USAGE["km-search-batch"]["description"])
+    async def km_search_batch(
+        queries: list[str | dict[str, Any]],
+        limit: int = 10,
+        include_graph: bool = True,
+        sort_by_vector: bool | None = None,
+        verbosity: str = "full",
+        context: Context | None = None,
+    ) -> dict[str, Any]:
+        if not queries:
+            raise ValueError("queries must contain at least one entry")
+        verbosity = _normalise_verbosity(verbosity)
+        payload: dict[str, Any] = {
+            "queries": [_normalise_batch_entry(entry) for entry in queries],
+            "limit": _clamp(limit, minimum=1, maximum=25),
+            "include_graph": include_graph,
+        }
+        if sort_by_vector is not None:
+            payload["sort_by_vector"] = bool(sort_by_vector)
+        if verbosity != "full":
+            payload["verbosity"] = verbosity
+
+        start = perf_counter()
+        try:
+            response = await state.require_client().search_batch(payload)
+        except GatewayRequestError as exc:  # pragma: no cover - network errors exercised in integration tests
+            await _report_error(context, f"Batch search failed: {exc.detail}")
+            _record_failure("km-search-batch", exc, start)
+            raise
+        except Exception as exc:  # pragma: no cover - defensive
+            _record_failure("km-search-batch", exc, start)
+            raise
+        _record_success("km-search-batch", start)
+        await _report_info(context, f"Batch search answered {len(response.get('responses', []))} quer(ies)")
+        return response
+
+    @server.tool(name="km-search-similar", description=TOOL_USAGE["km-search-similar"]["description"])
+    async def km_search_similar(
+        chunk_ids: list[str],
+        limit: int = 10,
+        include_graph: bool = True,
+        filters: dict[str, Any] | None = None,
+        sort_by_vector: bool | None = None,
+        verbosity: str = "full",
+        snippet_chars: int | None = None,
+        expand_context: int = 0,
+        context: Context | None = None,
+    ) -> dict[str, Any]:
+        seeds = [chunk_id.strip() for chunk_id in chunk_ids if isinstance(chunk_id, str) and chunk_id.strip()]
+        if not seeds:
+            raise ValueError("chunk_ids must contain at least one chunk id")
+        verbosity = _normalise_verbosity(verbosity)
+        payload: dict[str, Any] = {
+            "chunk_ids": seeds[:10],
+            "limit": _clamp(limit, minimum=1, maximum=25),
+            "include_graph": include_graph,
+        }
+        if filters:
+            payload["filters"] = _normalise_filters(filters)
+        if sort_by_vector is not None:
+            payload["sort_by_vector"] = bool(sort_by_vector)
+        if verbosity != "full":
+            payload["verbosity"] = verbosity
+        if snippet_chars is not None:
+            payload["snippet_chars"] = max(0, int(snippet_chars))
+        if expand_context:
+            payload["expand_context"] = _clamp(int(expand_context), minimum=0, maximum=5)
+
+        start = perf_counter()
+        try:
+            response = await state.require_client().search_similar(payload)
+        except GatewayRequestError as exc:  # pragma: no cover - network errors exercised in integration tests
+            await _report_error(context, f"Similar search failed: {exc.detail}")
+            _record_failure("km-search-similar", exc, start)
+            raise
+        except Exception as exc:  # pragma: no cover - defensive
+            _record_failure("km-search-similar", exc, start)
+            raise
+        _record_success("km-search-similar", start)
+        await _report_info(context, f"Similar search returned {len(response.get('results', []))} result(s)")
+        return response
+
     @server.tool(name="km-graph-node", description=TOOL_USAGE["km-graph-node"]["description"])
     async def km_graph_node(
         node_id: str,
@@ -266,9 +382,7 @@ def build_server(settings: MCPSettings | None = None) -> FastMCP:
     ) -> dict[str, Any]:
         if not node_id or not node_id.strip():
             raise ValueError("node_id must be a non-empty string")
-        relationships_normalised = relationships.lower()
-        if relationships_normalised not in {"outgoing", "incoming", "all", "none"}:
-            raise ValueError("relationships must be one of outgoing, incoming, all, none")
+        relationships_normalised = _normalise_relationships(relationships)
         limit = _clamp(limit, minimum=1, maximum=200)
         start = perf_counter()
         try:
@@ -287,6 +401,36 @@ def build_server(settings: MCPSettings | None = None) -> FastMCP:
         _record_success("km-graph-node", start)
         return result
 
+    @server.tool(name="km-graph-nodes", description=TOOL_USAGE["km-graph-nodes"]["description"])
+    async def km_graph_nodes(
+        nodes: list[str | dict[str, Any]],
+        relationships: str = "outgoing",
+        limit: int = 50,
+        context: Context | None = None,
+    ) -> dict[str, Any]:
+        if not nodes:
+            raise ValueError("nodes must contain at least one entry")
+        payload = {
+            "nodes": [_normalise_node_entry(entry) for entry in nodes],
+            "relationships": _normalise_relationships(relationships),
+            "limit": _clamp(limit, minimum=1, maximum=200),
+        }
+        start = perf_counter()
+        try:
+            result = await state.require_client().graph_nodes(payload)
+        except GatewayRequestError as exc:
+            await _report_error(context, f"Graph node batch lookup failed: {exc.detail}")
+            _record_failure("km-graph-nodes", exc, start)
+            raise
+        except Exception as exc:  # pragma: no cover - defensive
+            _record_failure("km-graph-nodes", exc, start)
+            raise
+        _record_success("km-graph-nodes", start)
+        entries = result.get("nodes", [])
+        resolved = sum(1 for entry in entries if "error" not in entry)
+        await _report_info(context, f"Resolved {resolved} of {len(entries)} node(s)")
+        return result
+
     @server.tool(name="km-graph-subsystem", description=TOOL_USAGE["km-graph-subsystem"]["description"])
     async def km_graph_subsystem(
         name: str,
@@ -607,6 +751,71 @@ def _normalise_filters(payload: dict[str, Any]) -> dict[str, Any]:
     return result
 
 
+def _normalise_relationships(value: str) -> str:
+    normalised = value.lower()
+    if normalised not in {"outgoing", "incoming", "all", "none"}:
+        raise ValueError("relationships must be one of outgoing, incoming, all, none")
+    return normalised
+
+
+def _normalise_node_entry(entry: str | dict[str, Any]) -> dict[str, Any]:
+    if isinstance(entry, str):
+        entry = {"id": entry}
+    node_id = entry.get("id")
+    if not isinstance(node_id, str) or not node_id.strip():
+        raise ValueError("each node entry requires a non-empty id")
+    result: dict[str, Any] = {"id": node_id.strip()}
+    if entry.get("relationships") is not None:
+        result["relationships"] = _normalise_relationships(str(entry["relationships"]))
+    if entry.get("limit") is not None:
+        result["limit"] = _clamp(int(entry["limit"]), minimum=1, maximum=200)
+    return result
+
+
+def _normalise_batch_entry(entry: str | dict[str, Any]) -> dict[str, Any]:
+    if isinstance(entry, str):
+        entry = {"query": entry}
+    query = entry.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("each batch entry requires a non-empty query")
+    result: dict[str, Any] = {"query": query.strip()}
+    if entry.get("limit") is not None:
+        result["limit"] = _clamp(int(entry["limit"]), minimum=1, maximum=25)
+    if entry.get("include_graph") is not None:
+        result["include_graph"] = bool(entry["include_graph"])
+    filters = entry.get("filters")
+    if isinstance(filters, dict) and filters:
+        result["filters"] = _normalise_filters(filters)
+    if entry.get("verbosity") is not None:
+        result["verbosity"] = _normalise_verbosity(entry["verbosity"])
+    result.update(_normalise_grouping(entry.get("group_by"), entry.get("group_siblings") or 0))
+    if entry.get("expand_context"):
+        result["expand_context"] = _clamp(int(entry["expand_context"]), minimum=0, maximum=5)
+    return result
+
+
+def _normalise_grouping(group_by: object, group_siblings: int) -> dict[str, Any]:
+    if group_by is None:
+        return {}
+    if str(group_by).strip().lower() != "artifact":
+        raise ValueError("group_by must be 'artifact' when provided")
+    return {"group_by": "artifact", "group_siblings": _clamp(int(group_siblings), minimum=0, maximum=10)}
+
+
+def _normalise_verbosity(value: object) -> str:
+    verbosity = str(value).strip().lower()
+    if verbosity not in {"ids", "compact", "full"}:
+        raise ValueError("verbosity must be one of 'ids', 'compact', or 'full'")
+    return verbosity
+
+
+def _normalise_search_mode(value: object) -> str:
+    mode = str(value).strip().lower()
+    if mode not in {"fast", "balanced", "exhaustive"}:
+        raise ValueError("mode must be one of 'fast', 'balanced', or 'exhaustive'")
+    return mode
+
+
 def _resolve_usage(tool: str | None) -> dict[str, Any]:
     if tool:
         key = tool.strip()
@@ -7,6 +7,10 @@ from .metrics import (
     COVERAGE_MISSING_ARTIFACTS,
     GRAPH_MIGRATION_LAST_STATUS,
     GRAPH_MIGRATION_LAST_TIMESTAMP,
+    GRAPH_PROJECTION_BYTES,
+    GRAPH_PROJECTION_LOOKUPS,
+    GRAPH_SUBSYSTEM_CACHE_EVENTS,
+    GRAPH_SUBSYSTEM_SNAPSHOT_SECONDS,
     INGEST_ARTIFACTS_TOTAL,
     INGEST_CHUNKS_TOTAL,
     INGEST_DURATION_SECONDS,
@@ -19,10 +23,20 @@ from .metrics import (
     LIFECYCLE_MISSING_TEST_SUBSYSTEMS_TOTAL,
     LIFECYCLE_REMOVED_ARTIFACTS_TOTAL,
     LIFECYCLE_STALE_DOCS_TOTAL,
+    SEARCH_EMBED_BATCH_SIZE,
+    SEARCH_EMBED_CACHE_BYTES,
+    SEARCH_EMBED_CACHE_EVENTS,
+    SEARCH_EMBED_QUEUE_SECONDS,
+    SEARCH_GRAPH_BREAKER_STATE,
+    SEARCH_GRAPH_BREAKER_TRANSITIONS,
     SEARCH_GRAPH_CACHE_EVENTS,
     SEARCH_GRAPH_LOOKUP_SECONDS,
     SEARCH_REQUESTS_TOTAL,
+    SEARCH_RESPONSE_CACHE_EVENTS,
+    SEARCH_RETRIEVAL_SECONDS,
+    SEARCH_ROUTING_TOTAL,
     SEARCH_SCORE_DELTA,
+    SEARCH_SYMBOL_QUERIES_TOTAL,
     UI_EVENTS_TOTAL,
     UI_REQUESTS_TOTAL,
 )
@@ -40,11 +54,25 @@ __all__ = [
     "COVERAGE_LAST_RUN_TIMESTAMP",
     "COVERAGE_MISSING_ARTIFACTS",
     "SEARCH_REQUESTS_TOTAL",
+    "SEARCH_GRAPH_BREAKER_STATE",
+    "SEARCH_GRAPH_BREAKER_TRANSITIONS",
     "SEARCH_GRAPH_CACHE_EVENTS",
     "SEARCH_GRAPH_LOOKUP_SECONDS",
     "SEARCH_SCORE_DELTA",
+    "SEARCH_RETRIEVAL_SECONDS",
+    "SEARCH_ROUTING_TOTAL",
+    "SEARCH_SYMBOL_QUERIES_TOTAL",
+    "SEARCH_EMBED_CACHE_EVENTS",
+    "SEARCH_EMBED_CACHE_BYTES",
+    "SEARCH_EMBED_BATCH_SIZE",
+    "SEARCH_EMBED_QUEUE_SECONDS",
+    "SEARCH_RESPONSE_CACHE_EVENTS",
     "GRAPH_MIGRATION_LAST_STATUS",
     "GRAPH_MIGRATION_LAST_TIMESTAMP",
+    "GRAPH_PROJECTION_BYTES",
+    "GRAPH_PROJECTION_LOOKUPS",
+    "GRAPH_SUBSYSTEM_CACHE_EVENTS",
+    "GRAPH_SUBSYSTEM_SNAPSHOT_SECONDS",
     "LIFECYCLE_LAST_RUN_STATUS",
     "LIFECYCLE_LAST_RUN_TIMESTAMP",
     "LIFECYCLE_STALE_DOCS_TOTAL",
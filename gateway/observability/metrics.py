@@ -88,11 +88,92 @@ SEARCH_GRAPH_LOOKUP_SECONDS = Histogram(
     "Latency of graph lookups for search enrichment",
 )
 
+SEARCH_GRAPH_BREAKER_STATE = Gauge(
+    "km_search_graph_breaker_state",
+    "Search graph circuit breaker state (0 closed, 1 half-open, 2 open)",
+)
+
+SEARCH_GRAPH_BREAKER_TRANSITIONS = Counter(
+    "km_search_graph_breaker_transitions_total",
+    "Search graph circuit breaker state changes partitioned by the state entered",
+    labelnames=["state"],
+)
+
 SEARCH_SCORE_DELTA = Histogram(
     "km_search_adjusted_minus_vector",
     "Distribution of adjusted minus vector scores",
 )
 
+SEARCH_EMBED_CACHE_EVENTS = Counter(
+    "km_search_embedding_cache_events_total",
+    "Query embedding cache events partitioned by status (hit, miss, evict)",
+    labelnames=["status"],
+)
+
+SEARCH_EMBED_CACHE_BYTES = Gauge(
+    "km_search_embedding_cache_bytes",
+    "Approximate memory held by cached query embeddings",
+)
+
+SEARCH_EMBED_BATCH_SIZE = Histogram(
+    "km_search_embedding_batch_size",
+    "Number of distinct queries encoded per model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+SEARCH_EMBED_QUEUE_SECONDS = Histogram(
+    "km_search_embedding_queue_seconds",
+    "Time query encodes waited for a micro-batch to be dispatched",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+SEARCH_RESPONSE_CACHE_EVENTS = Counter(
+    "km_search_response_cache_events_total",
+    "Search response cache lookups partitioned by status (hit, miss, coalesced, bypass)",
+    labelnames=["status"],
+)
+
+SEARCH_SYMBOL_QUERIES_TOTAL = Counter(
+    "km_search_symbol_queries_total",
+    "Identifier/path queries handled by the symbol index partitioned by outcome",
+    labelnames=["outcome"],
+)
+
+SEARCH_RETRIEVAL_SECONDS = Histogram(
+    "km_search_retrieval_seconds",
+    "Latency of Qdrant candidate retrieval by search mode and HNSW ef (or exact)",
+    labelnames=["mode", "ef"],
+)
+
+SEARCH_ROUTING_TOTAL = Counter(
+    "km_search_routing_total",
+    "Subsystem routing decisions partitioned by outcome (routed, fallback, low_confidence, unavailable)",
+    labelnames=["outcome"],
+)
+
+GRAPH_SUBSYSTEM_CACHE_EVENTS = Counter(
+    "km_graph_subsystem_cache_events_total",
+    "Subsystem snapshot cache events partitioned by event (hit, miss, warm, invalidate)",
+    labelnames=["event"],
+)
+
+GRAPH_SUBSYSTEM_SNAPSHOT_SECONDS = Histogram(
+    "km_graph_subsystem_snapshot_seconds",
+    "Time spent building subsystem graph snapshots by source (request, warm)",
+    labelnames=["source"],
+)
+
+GRAPH_PROJECTION_BYTES = Gauge(
+    "km_graph_projection_bytes",
+    "Approximate memory held by the in-process graph projection",
+)
+
+GRAPH_PROJECTION_LOOKUPS = Counter(
+    "km_graph_projection_lookups_total",
+    "Graph reads by outcome (served from the projection, or fallback to Neo4j)",
+    labelnames=["result"],
+)
+
 GRAPH_MIGRATION_LAST_STATUS = Gauge(
     "km_graph_migration_last_status",
     "Graph migration result (1=success, 0=failure, -1=skipped)",
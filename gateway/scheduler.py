@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 import subprocess
 import time
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from contextlib import suppress
 from pathlib import Path
 
@@ -16,6 +16,7 @@ from apscheduler.triggers.interval import IntervalTrigger  # type: ignore[import
 from filelock import FileLock, Timeout
 
 from gateway.config.settings import AppSettings
+from gateway.ingest.pipeline import IngestionResult
 from gateway.ingest.service import execute_ingestion
 from gateway.observability.metrics import INGEST_SKIPS_TOTAL, SCHEDULER_LAST_SUCCESS_TIMESTAMP, SCHEDULER_RUNS_TOTAL
 
@@ -25,9 +26,15 @@ logger = logging.getLogger(__name__)
 class IngestionScheduler:
     """APScheduler wrapper that coordinates repo-aware ingestion jobs."""
 
-    def __init__(self, settings: AppSettings) -> None:
+    def __init__(
+        self,
+        settings: AppSettings,
+        *,
+        on_success: Callable[[IngestionResult], None] | None = None,
+    ) -> None:
         """Initialise scheduler state and ensure the scratch directory exists."""
         self.settings = settings
+        self._on_success = on_success
         self.scheduler = BackgroundScheduler(timezone="UTC")
         self._started = False
         self._state_dir = self.settings.state_path / "scheduler"
@@ -111,6 +118,8 @@ class IngestionScheduler:
             if result.success:
                 SCHEDULER_RUNS_TOTAL.labels(result="success").inc()
                 SCHEDULER_LAST_SUCCESS_TIMESTAMP.set(time.time())
+                if self._on_success is not None and not self.settings.dry_run:
+                    self._on_success(result)
             else:
                 SCHEDULER_RUNS_TOTAL.labels(result="failure").inc()
         except (RuntimeError, subprocess.SubprocessError, OSError, ValueError) as exc:  # pragma: no cover - defensive
@@ -1,18 +1,40 @@
 """Search service exposing vector search with graph context."""
 
+from .async_service import AsyncSearchService
 from .dataset import DatasetLoadError, build_feature_matrix, load_dataset_records
-from .evaluation import EvaluationMetrics, evaluate_model
+from .evaluation import EvaluationMetrics, RankingComparison, compare_rankings, evaluate_model
 from .exporter import ExportOptions, ExportStats, export_training_dataset
 from .feedback import SearchFeedbackStore
 from .maintenance import PruneOptions, PruneStats, RedactOptions, RedactStats, prune_feedback_log, redact_dataset
-from .service import SearchOptions, SearchResponse, SearchResult, SearchService, SearchWeights
+from .service import (
+    SEARCH_MODES,
+    SEARCH_VERBOSITY_LEVELS,
+    SearchBatchResponse,
+    SearchMode,
+    SearchOptions,
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+    SearchService,
+    SearchVerbosity,
+    SearchWeights,
+    project_result,
+)
 
 __all__ = [
+    "AsyncSearchService",
     "SearchService",
     "SearchResult",
     "SearchOptions",
     "SearchWeights",
     "SearchResponse",
+    "SearchRequest",
+    "SearchBatchResponse",
+    "SearchVerbosity",
+    "SEARCH_VERBOSITY_LEVELS",
+    "SearchMode",
+    "SEARCH_MODES",
+    "project_result",
     "SearchFeedbackStore",
     "DatasetLoadError",
     "load_dataset_records",
@@ -27,5 +49,7 @@ __all__ = [
     "prune_feedback_log",
     "redact_dataset",
     "EvaluationMetrics",
+    "RankingComparison",
+    "compare_rankings",
     "evaluate_model",
 ]
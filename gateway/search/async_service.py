@@ -0,0 +1,863 @@
+"""Asyncio search path built on the async Qdrant and Neo4j clients."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from concurrent.futures import Executor
+from typing import Any, Literal
+
+from neo4j.exceptions import Neo4jError
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Filter, Record, SearchParams
+
+from gateway.graph.async_service import AsyncGraphService
+from gateway.graph.service import GraphServiceError
+from gateway.search.pipeline import (
+    BatchItem,
+    CandidateRanking,
+    EnrichmentPlan,
+    GraphEntry,
+    GraphLookupRounds,
+    RetrievalTuning,
+    RetrievedPoint,
+    SearchBatchResponse,
+    SearchGroupBy,
+    SearchMode,
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+    SearchVerbosity,
+    SubsystemRoute,
+    attach_context,
+    batch_context_entries,
+    context_scroll,
+    elapsed_ms,
+    graph_node_id,
+    group_size_for,
+    grouped_points,
+    label_similar,
+    merge_filters,
+    record_batch_context,
+    record_route,
+    record_tuning,
+    retrieval_filter,
+    seed_query,
+    seed_scroll,
+    split_grouped,
+)
+from gateway.search.service import SearchService
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSearchService:
+    """Run :class:`SearchService` requests without blocking the event loop.
+
+    Scoring, filtering, and response shape come from the wrapped service's
+    :class:`~gateway.search.pipeline.SearchPipeline`, so both paths rank
+    identically. Only the I/O differs: retrieval uses :class:`AsyncQdrantClient`,
+    query encoding runs on ``encode_executor``, and each round of graph lookups
+    is issued concurrently (at most ``graph_concurrency`` at a time). The
+    synchronous service remains the entry point for the CLI.
+    """
+
+    def __init__(
+        self,
+        service: SearchService,
+        qdrant_client: AsyncQdrantClient,
+        *,
+        encode_executor: Executor | None = None,
+        graph_concurrency: int = 8,
+    ) -> None:
+        self.service = service
+        self.pipeline = service.pipeline
+        self.qdrant_client = qdrant_client
+        self.encode_executor = encode_executor
+        self.graph_concurrency = max(1, int(graph_concurrency))
+
+    def cache_scope(self) -> dict[str, Any]:
+        return self.pipeline.cache_scope()
+
+    async def search(
+        self,
+        *,
+        query: str,
+        limit: int,
+        include_graph: bool,
+        graph_service: AsyncGraphService | None,
+        sort_by_vector: bool = False,
+        request_id: str | None = None,
+        filters: dict[str, Any] | None = None,
+        enrichment_mode: Literal["lazy", "eager"] | None = None,
+        overfetch_factor: float | None = None,
+        enrich_top_n: int | None = None,
+        verbosity: SearchVerbosity = "full",
+        group_by: SearchGroupBy | None = None,
+        group_siblings: int = 0,
+        expand_context: int = 0,
+        mode: SearchMode | None = None,
+    ) -> SearchResponse:
+        """Async counterpart of :meth:`SearchService.search` with the same semantics."""
+
+        pipeline = self.pipeline
+        started = time.perf_counter()
+        limit = max(1, min(limit, pipeline.max_limit))
+        timings: dict[str, float] = {}
+        context_radius = expand_context if verbosity != "ids" else 0
+
+        query_kind, symbol_matches, shortcut = pipeline.symbol_phase(
+            query,
+            limit=limit,
+            filters=filters,
+            request_id=request_id,
+            timings=timings,
+        )
+        if shortcut is not None:
+            response = pipeline.finalize_response(shortcut, started=started, timings=timings, query_kind=query_kind)
+            await self._expand_context([(response, context_radius)], request_id=request_id)
+            return response
+
+        plan = pipeline.plan_enrichment(
+            limit,
+            mode=enrichment_mode,
+            overfetch_factor=overfetch_factor,
+            enrich_top_n=enrich_top_n,
+        )
+        ranking, retrieval, route, tuning = await self._candidate_phase(
+            query,
+            mode=mode,
+            limit=limit,
+            plan=plan,
+            include_graph=include_graph,
+            graph_available=graph_service is not None,
+            sort_by_vector=sort_by_vector,
+            filters=filters,
+            request_id=request_id,
+            timings=timings,
+            with_text=verbosity != "ids",
+            group_size=group_size_for(group_by, group_siblings),
+        )
+        await self._resolve_graph([ranking], graph_service, request_id=request_id, timings=timings)
+        response = pipeline.enrich_candidates(ranking, request_id=request_id, timings=timings)
+        response = pipeline.finalize_response(
+            response,
+            started=started,
+            timings=timings,
+            query_kind=query_kind,
+            retrieval=retrieval,
+            symbol_matches=symbol_matches,
+            sort_by_vector=sort_by_vector,
+            limit=limit,
+        )
+        record_route(response, route)
+        record_tuning(response, tuning, timings["vector_search"])
+        await self._expand_context([(response, context_radius)], request_id=request_id)
+        return response
+
+    async def search_similar(
+        self,
+        *,
+        chunk_ids: Sequence[str],
+        limit: int,
+        include_graph: bool,
+        graph_service: AsyncGraphService | None,
+        sort_by_vector: bool = False,
+        request_id: str | None = None,
+        filters: dict[str, Any] | None = None,
+        enrichment_mode: Literal["lazy", "eager"] | None = None,
+        overfetch_factor: float | None = None,
+        enrich_top_n: int | None = None,
+        verbosity: SearchVerbosity = "full",
+        expand_context: int = 0,
+    ) -> SearchResponse:
+        """Async counterpart of :meth:`SearchService.search_similar` with the same semantics."""
+
+        pipeline = self.pipeline
+        started = time.perf_counter()
+        limit = max(1, min(limit, pipeline.max_limit))
+        timings: dict[str, float] = {}
+        plan = pipeline.plan_enrichment(
+            limit,
+            mode=enrichment_mode,
+            overfetch_factor=overfetch_factor,
+            enrich_top_n=enrich_top_n,
+        )
+
+        lookup_started = time.perf_counter()
+        seeds = await self._resolve_seeds(chunk_ids, request_id=request_id)
+        timings["seed_lookup"] = elapsed_ms(lookup_started)
+
+        search_started = time.perf_counter()
+        hits = await self._recommend(seeds, limit=plan.candidate_limit, request_id=request_id) if seeds else []
+        timings["vector_search"] = elapsed_ms(search_started)
+
+        ranking = pipeline.rank_candidates(
+            query=seed_query(seeds),
+            hits=hits,
+            limit=limit,
+            plan=plan,
+            include_graph=include_graph,
+            graph_available=graph_service is not None,
+            sort_by_vector=sort_by_vector,
+            filters=filters,
+            timings=timings,
+        )
+        await self._resolve_graph([ranking], graph_service, request_id=request_id, timings=timings)
+        response = pipeline.enrich_candidates(ranking, request_id=request_id, timings=timings)
+        response = pipeline.finalize_response(
+            label_similar(response, chunk_ids, seeds),
+            started=started,
+            timings=timings,
+            query_kind="similar",
+            retrieval="similar",
+        )
+        await self._expand_context([(response, expand_context if verbosity != "ids" else 0)], request_id=request_id)
+        return response
+
+    async def search_events(
+        self,
+        *,
+        query: str,
+        limit: int,
+        include_graph: bool,
+        graph_service: AsyncGraphService | None,
+        sort_by_vector: bool = False,
+        request_id: str | None = None,
+        filters: dict[str, Any] | None = None,
+        enrichment_mode: Literal["lazy", "eager"] | None = None,
+        overfetch_factor: float | None = None,
+        enrich_top_n: int | None = None,
+        verbosity: SearchVerbosity = "full",
+        group_by: SearchGroupBy | None = None,
+        group_siblings: int = 0,
+        expand_context: int = 0,
+        mode: SearchMode | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Run :meth:`search` incrementally, yielding events as each stage completes.
+
+        Events, in order: ``header`` (query, retrieval mode, timings so far),
+        ``hits`` (phase-one candidates in vector/lexical order, no graph context),
+        one ``graph`` event per displayed hit as its node lookup resolves, one
+        ``score`` event per final result with its re-ranked scoring, and ``final``
+        (result order plus the metadata :meth:`search` would return). The final
+        ranking is identical to :meth:`search`.
+        """
+
+        pipeline = self.pipeline
+        started = time.perf_counter()
+        limit = max(1, min(limit, pipeline.max_limit))
+        timings: dict[str, float] = {}
+        context_radius = expand_context if verbosity != "ids" else 0
+
+        query_kind, symbol_matches, shortcut = pipeline.symbol_phase(
+            query,
+            limit=limit,
+            filters=filters,
+            request_id=request_id,
+            timings=timings,
+        )
+        if shortcut is not None:
+            response = pipeline.finalize_response(shortcut, started=started, timings=timings, query_kind=query_kind)
+            await self._expand_context([(response, context_radius)], request_id=request_id)
+            yield _header_event(response.query, query_kind=query_kind, retrieval="symbol", timings=timings)
+            yield {"event": "hits", "results": [_result_payload(result) for result in response.results]}
+            for event in _result_events(response):
+                yield event
+            return
+
+        plan = pipeline.plan_enrichment(
+            limit,
+            mode=enrichment_mode,
+            overfetch_factor=overfetch_factor,
+            enrich_top_n=enrich_top_n,
+        )
+        ranking, retrieval, route, tuning = await self._candidate_phase(
+            query,
+            mode=mode,
+            limit=limit,
+            plan=plan,
+            include_graph=include_graph,
+            graph_available=graph_service is not None,
+            sort_by_vector=sort_by_vector,
+            filters=filters,
+            request_id=request_id,
+            timings=timings,
+            with_text=verbosity != "ids",
+            group_size=group_size_for(group_by, group_siblings),
+        )
+        yield _header_event(query, query_kind=query_kind, retrieval=retrieval, timings=timings)
+        displayed = ranking.candidates[:limit]
+        yield {
+            "event": "hits",
+            "results": [
+                {"chunk": candidate.chunk, "graph_context": None, "scoring": pipeline.candidate_scoring(candidate)}
+                for candidate in displayed
+            ],
+        }
+
+        prefetch_started = time.perf_counter()
+        rounds = GraphLookupRounds(pipeline, [ranking])
+        if graph_service is not None:
+            hits_by_node: dict[str, list[str]] = {}
+            for candidate in displayed:
+                node_id = graph_node_id(candidate.payload)
+                if node_id is not None:
+                    hits_by_node.setdefault(node_id, []).append(candidate.chunk["chunk_id"])
+            semaphore = asyncio.Semaphore(self.graph_concurrency)
+            while node_ids := rounds.pending():
+                entries: dict[str, GraphEntry] = {}
+                lookups = [
+                    asyncio.ensure_future(self._lookup_graph_entry(node_id, graph_service, semaphore, request_id=request_id))
+                    for node_id in node_ids
+                ]
+                try:
+                    for completed in asyncio.as_completed(lookups):
+                        node_id, entry, lookup_warnings = await completed
+                        entries[node_id] = (entry, lookup_warnings)
+                        for chunk_id in hits_by_node.get(node_id, ()):
+                            yield {
+                                "event": "graph",
+                                "chunk_id": chunk_id,
+                                "node_id": node_id,
+                                "graph_context": entry["graph_context"],
+                                "warnings": lookup_warnings,
+                            }
+                finally:
+                    for lookup in lookups:
+                        lookup.cancel()
+                rounds.resolve(entries)
+        timings["graph_prefetch"] = elapsed_ms(prefetch_started)
+
+        response = pipeline.enrich_candidates(ranking, request_id=request_id, timings=timings)
+        response = pipeline.finalize_response(
+            response,
+            started=started,
+            timings=timings,
+            query_kind=query_kind,
+            retrieval=retrieval,
+            symbol_matches=symbol_matches,
+            sort_by_vector=sort_by_vector,
+            limit=limit,
+        )
+        record_route(response, route)
+        record_tuning(response, tuning, timings["vector_search"])
+        await self._expand_context([(response, context_radius)], request_id=request_id)
+        for event in _result_events(response):
+            yield event
+
+    async def _candidate_phase(
+        self,
+        query: str,
+        *,
+        mode: SearchMode | None,
+        limit: int,
+        plan: EnrichmentPlan,
+        include_graph: bool,
+        graph_available: bool,
+        sort_by_vector: bool,
+        filters: dict[str, Any] | None,
+        request_id: str | None,
+        timings: dict[str, float],
+        with_text: bool = True,
+        group_size: int | None = None,
+    ) -> tuple[CandidateRanking, str, SubsystemRoute | None, RetrievalTuning]:
+        """Encode, tune, route, retrieve, and rank phase-one candidates."""
+
+        encode_started = time.perf_counter()
+        vector = await self._encode(query)
+        timings["embed"] = elapsed_ms(encode_started)
+
+        tuning = await self._tune_retrieval(
+            mode,
+            filters=filters,
+            candidate_limit=plan.candidate_limit,
+            request_id=request_id,
+            timings=timings,
+        )
+        route = await self._route(vector, filters=filters, request_id=request_id, timings=timings)
+        search_started = time.perf_counter()
+        retrieve_options: dict[str, Any] = {
+            "limit": plan.candidate_limit,
+            "request_id": request_id,
+            "with_text": with_text,
+            "group_size": group_size,
+            "search_params": tuning.search_params(),
+        }
+        routed_filter = merge_filters(tuning.query_filter, route.query_filter() if route else None)
+        hits, retrieval = await self._retrieve(query, vector, query_filter=routed_filter, **retrieve_options)
+        if route is not None and route.outcome == "routed" and len(hits) < limit:
+            route.outcome = "fallback"
+            hits, retrieval = await self._retrieve(query, vector, query_filter=tuning.query_filter, **retrieve_options)
+        timings["vector_search"] = elapsed_ms(search_started)
+
+        ranking = self.pipeline.rank_candidates(
+            query=query,
+            hits=hits,
+            limit=limit,
+            plan=plan,
+            include_graph=include_graph,
+            graph_available=graph_available,
+            sort_by_vector=sort_by_vector,
+            filters=filters,
+            timings=timings,
+        )
+        return ranking, retrieval, route, tuning
+
+    async def _tune_retrieval(
+        self,
+        mode: SearchMode | None,
+        *,
+        filters: dict[str, Any] | None,
+        candidate_limit: int,
+        request_id: str | None,
+        timings: dict[str, float],
+    ) -> RetrievalTuning:
+        collection_name = self.service.collection_name
+        query_filter = retrieval_filter(filters)
+        matching = total = None
+        if query_filter is not None:
+            started = time.perf_counter()
+            try:
+                matching_result, total_result = await asyncio.gather(
+                    self.qdrant_client.count(collection_name=collection_name, count_filter=query_filter, exact=False),
+                    self.qdrant_client.count(collection_name=collection_name, exact=False),
+                )
+            except Exception as exc:
+                self.pipeline.selectivity_failed(exc, request_id=request_id)
+            else:
+                matching, total = matching_result.count, total_result.count
+            timings["selectivity"] = elapsed_ms(started)
+        return self.pipeline.select_tuning(
+            mode or "balanced",
+            query_filter=query_filter,
+            matching=matching,
+            total=total,
+            candidate_limit=candidate_limit,
+        )
+
+    async def _route(
+        self,
+        vector: Sequence[float],
+        *,
+        filters: dict[str, Any] | None,
+        request_id: str | None,
+        timings: dict[str, float],
+    ) -> SubsystemRoute | None:
+        pipeline = self.pipeline
+        if pipeline.routing_mode != "subsystem" or (filters and filters.get("subsystems")):
+            return None
+        started = time.perf_counter()
+        try:
+            response = await self.qdrant_client.query_points(**pipeline.routing_request(vector))
+        except Exception as exc:
+            route = pipeline.routing_failed(exc, request_id=request_id)
+        else:
+            route = pipeline.select_route(response.points)
+        timings["routing"] = elapsed_ms(started)
+        return route
+
+    async def search_batch(
+        self,
+        requests: Sequence[SearchRequest],
+        *,
+        graph_service: AsyncGraphService | None,
+        sort_by_vector: bool = False,
+        request_id: str | None = None,
+    ) -> SearchBatchResponse:
+        """Async counterpart of :meth:`SearchService.search_batch`.
+
+        Each round of graph lookups fans out once over the union of node ids,
+        so a node shared by several queries is looked up once.
+        """
+
+        pipeline = self.pipeline
+        started = time.perf_counter()
+        timings: dict[str, float] = {}
+        items = pipeline.prepare_batch(requests, request_id=request_id)
+        pending = [item for item in items if item.response is None]
+
+        graph_lookups = 0
+        if pending:
+            encode_started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            vectors = await loop.run_in_executor(
+                self.encode_executor,
+                self.service.embedder.encode,
+                [item.request.query for item in pending],
+            )
+            timings["embed"] = elapsed_ms(encode_started)
+
+            await self._route_batch(pending, vectors, request_id=request_id, timings=timings)
+            search_started = time.perf_counter()
+            await self._retrieve_batch(pending, vectors, request_id=request_id)
+            fallback, fallback_vectors = pipeline.batch_fallbacks(pending, vectors)
+            if fallback:
+                await self._retrieve_batch(fallback, fallback_vectors, request_id=request_id)
+            timings["vector_search"] = elapsed_ms(search_started)
+
+            graph_lookups = await self._rank_batch(
+                pending,
+                graph_service,
+                sort_by_vector=sort_by_vector,
+                request_id=request_id,
+                timings=timings,
+            )
+
+        batch = pipeline.finalize_batch(
+            items,
+            started=started,
+            timings=timings,
+            graph_lookups=graph_lookups,
+            request_id=request_id,
+            sort_by_vector=sort_by_vector,
+        )
+        elapsed = await self._expand_context(batch_context_entries(batch, requests), request_id=request_id)
+        record_batch_context(batch, elapsed)
+        return batch
+
+    async def _expand_context(self, entries: Sequence[tuple[SearchResponse, int]], *, request_id: str | None) -> float | None:
+        """Async counterpart of :meth:`SearchService._expand_context`."""
+
+        active = [(response, radius) for response, radius in entries if radius > 0]
+        scroll = context_scroll(active)
+        if scroll is None:
+            return None
+        started = time.perf_counter()
+        try:
+            records, _ = await self.qdrant_client.scroll(collection_name=self.service.collection_name, **scroll)
+        except Exception as exc:  # pragma: no cover - network failure path
+            self.pipeline.context_failed(active, exc, request_id=request_id)
+            return None
+        return attach_context(active, records, overlap=self.pipeline.chunk_overlap, started=started)
+
+    async def _rank_batch(
+        self,
+        items: Sequence[BatchItem],
+        graph_service: AsyncGraphService | None,
+        *,
+        sort_by_vector: bool,
+        request_id: str | None,
+        timings: dict[str, float],
+    ) -> int:
+        """Async counterpart of :meth:`SearchService._rank_batch`."""
+
+        pipeline = self.pipeline
+        ranking_started = time.perf_counter()
+        rankings: list[CandidateRanking] = []
+        for item in items:
+            assert item.plan is not None
+            rankings.append(
+                pipeline.rank_candidates(
+                    query=item.request.query,
+                    hits=item.hits,
+                    limit=item.limit,
+                    plan=item.plan,
+                    include_graph=item.request.include_graph,
+                    graph_available=graph_service is not None and item.request.include_graph,
+                    sort_by_vector=sort_by_vector,
+                    filters=item.request.filters,
+                    timings=item.timings,
+                )
+            )
+        graph_lookups = await self._resolve_graph(rankings, graph_service, request_id=request_id, timings=timings)
+        for item, ranking in zip(items, rankings, strict=True):
+            item.response = pipeline.enrich_candidates(ranking, request_id=item.request_id, timings=item.timings)
+        timings["ranking"] = elapsed_ms(ranking_started)
+        return graph_lookups
+
+    async def _encode(self, query: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(self.encode_executor, self.service.embedder.encode, [query])
+        return list(vectors[0])
+
+    async def _route_batch(
+        self,
+        items: Sequence[BatchItem],
+        vectors: Sequence[Sequence[float]],
+        *,
+        request_id: str | None,
+        timings: dict[str, float],
+    ) -> None:
+        pipeline = self.pipeline
+        routed, requests = pipeline.batch_routing(items, vectors)
+        if not routed:
+            return
+        started = time.perf_counter()
+        try:
+            responses = await self.qdrant_client.query_batch_points(collection_name=pipeline.routing_collection, requests=requests)
+        except Exception as exc:
+            routes = [pipeline.routing_failed(exc, request_id=request_id)] + [SubsystemRoute(outcome="unavailable") for _ in routed[1:]]
+        else:
+            routes = [pipeline.select_route(response.points) for response in responses]
+        pipeline.assign_routes(routed, routes)
+        timings["routing"] = elapsed_ms(started)
+
+    async def _retrieve_batch(
+        self,
+        items: Sequence[BatchItem],
+        vectors: Sequence[Sequence[float]],
+        *,
+        request_id: str | None,
+    ) -> None:
+        pipeline = self.pipeline
+        collection_name = self.service.collection_name
+        grouped, items, vectors = split_grouped(items, vectors)
+        # The groups API has no batch form, so grouped queries run concurrently on their own.
+        searches = []
+        for item, vector, group_size in grouped:
+            assert item.plan is not None
+            searches.append(
+                self._grouped_search(
+                    vector,
+                    limit=item.plan.candidate_limit,
+                    group_size=group_size,
+                    request_id=item.request_id,
+                    query_filter=item.query_filter,
+                )
+            )
+        for (item, _vector, _size), hits in zip(grouped, await asyncio.gather(*searches), strict=True):
+            item.hits = hits
+            item.retrieval = "grouped"
+        if not items:
+            return
+        try:
+            responses = await self.qdrant_client.query_batch_points(
+                collection_name=collection_name,
+                requests=pipeline.batch_query_requests(items, vectors),
+            )
+        except Exception as exc:
+            if not any(item.sparse is not None for item in items):
+                logger.error(
+                    "Batch search query failed: %s",
+                    exc,
+                    extra={"component": "search", "event": "vector_search_error", "request_id": request_id},
+                )
+                raise
+            logger.warning(
+                "Hybrid batch retrieval failed; falling back to dense search: %s",
+                exc,
+                extra={"component": "search", "event": "hybrid_search_fallback", "request_id": request_id},
+            )
+            for item in items:
+                item.sparse = None
+            responses = await self.qdrant_client.query_batch_points(
+                collection_name=collection_name,
+                requests=pipeline.batch_query_requests(items, vectors),
+            )
+        pipeline.assign_batch_results(items, responses)
+
+    async def _resolve_seeds(self, chunk_ids: Sequence[str], *, request_id: str | None) -> list[Record]:
+        try:
+            records, _ = await self.qdrant_client.scroll(collection_name=self.service.collection_name, **seed_scroll(chunk_ids))
+        except Exception as exc:  # pragma: no cover - network errors handled upstream
+            logger.error(
+                "Seed chunk lookup failed: %s",
+                exc,
+                extra={"component": "search", "event": "vector_search_error", "request_id": request_id},
+            )
+            raise
+        return list(records)
+
+    async def _recommend(self, seeds: Sequence[Record], *, limit: int, request_id: str | None) -> list[RetrievedPoint]:
+        try:
+            response = await self.qdrant_client.query_points(**self.pipeline.recommend_request(seeds, limit=limit))
+        except Exception as exc:  # pragma: no cover - network errors handled upstream
+            logger.error(
+                "Similar search query failed: %s",
+                exc,
+                extra={"component": "search", "event": "vector_search_error", "request_id": request_id},
+            )
+            raise
+        return [RetrievedPoint(payload=point.payload or {}, score=float(point.score)) for point in response.points]
+
+    async def _grouped_search(
+        self,
+        vector: Sequence[float],
+        *,
+        limit: int,
+        group_size: int,
+        request_id: str | None,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+    ) -> list[RetrievedPoint]:
+        try:
+            result = await self.qdrant_client.query_points_groups(
+                **self.pipeline.groups_request(
+                    vector,
+                    limit=limit,
+                    group_size=group_size,
+                    query_filter=query_filter,
+                    search_params=search_params,
+                )
+            )
+        except Exception as exc:  # pragma: no cover - network errors handled upstream
+            logger.error(
+                "Grouped search query failed: %s",
+                exc,
+                extra={"component": "search", "event": "vector_search_error", "request_id": request_id},
+            )
+            raise
+        return grouped_points(result, group_size=group_size)
+
+    async def _retrieve(
+        self,
+        query: str,
+        vector: Sequence[float],
+        *,
+        limit: int,
+        request_id: str | None,
+        with_text: bool = True,
+        group_size: int | None = None,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+    ) -> tuple[list[RetrievedPoint], str]:
+        pipeline = self.pipeline
+        if group_size is not None:
+            points = await self._grouped_search(
+                vector,
+                limit=limit,
+                group_size=group_size,
+                request_id=request_id,
+                query_filter=query_filter,
+                search_params=search_params,
+            )
+            return points, "grouped"
+        vocabulary = pipeline.lexical_vocabulary
+        sparse = vocabulary.encode_query(query) if vocabulary is not None else None
+        if sparse is not None:
+            try:
+                dense_response, sparse_response = await self.qdrant_client.query_batch_points(
+                    collection_name=self.service.collection_name,
+                    requests=pipeline.hybrid_requests(
+                        vector,
+                        sparse,
+                        limit=limit,
+                        with_text=with_text,
+                        query_filter=query_filter,
+                        search_params=search_params,
+                    ),
+                )
+            except Exception as exc:
+                logger.warning(
+                    "Hybrid retrieval failed; falling back to dense search: %s",
+                    exc,
+                    extra={"component": "search", "event": "hybrid_search_fallback", "request_id": request_id},
+                )
+            else:
+                return pipeline.merge_hybrid(dense_response, sparse_response, limit=limit), "hybrid"
+
+        try:
+            response = await self.qdrant_client.query_points(
+                **pipeline.dense_request(vector, limit=limit, query_filter=query_filter, search_params=search_params)
+            )
+        except Exception as exc:  # pragma: no cover - network errors handled upstream
+            logger.error(
+                "Search query failed: %s",
+                exc,
+                extra={"component": "search", "event": "vector_search_error", "request_id": request_id},
+            )
+            raise
+        return [RetrievedPoint(payload=point.payload or {}, score=float(point.score)) for point in response.points], "dense"
+
+    async def _resolve_graph(
+        self,
+        rankings: Sequence[CandidateRanking],
+        graph_service: AsyncGraphService | None,
+        *,
+        request_id: str | None,
+        timings: dict[str, float],
+    ) -> int:
+        """Async counterpart of :meth:`SearchService._resolve_graph`; each round runs concurrently."""
+
+        started = time.perf_counter()
+        rounds = GraphLookupRounds(self.pipeline, rankings)
+        if graph_service is not None:
+            while node_ids := rounds.pending():
+                rounds.resolve(await self._lookup_graph_entries(node_ids, graph_service, request_id=request_id))
+        timings["graph_prefetch"] = elapsed_ms(started)
+        return len(rounds.entries)
+
+    async def _lookup_graph_entries(
+        self,
+        node_ids: Sequence[str],
+        graph_service: AsyncGraphService,
+        *,
+        request_id: str | None,
+    ) -> dict[str, GraphEntry]:
+        """Fetch cache entries and their warnings for each node id, bounded by a semaphore."""
+
+        semaphore = asyncio.Semaphore(self.graph_concurrency)
+        results = await asyncio.gather(
+            *(self._lookup_graph_entry(node_id, graph_service, semaphore, request_id=request_id) for node_id in node_ids)
+        )
+        return {node_id: (entry, lookup_warnings) for node_id, entry, lookup_warnings in results}
+
+    async def _lookup_graph_entry(
+        self,
+        node_id: str,
+        graph_service: AsyncGraphService,
+        semaphore: asyncio.Semaphore,
+        *,
+        request_id: str | None,
+    ) -> tuple[str, dict[str, Any], list[str]]:
+        """Async counterpart of :meth:`SearchService._lookup_graph_entry`."""
+
+        pipeline = self.pipeline
+        lookup_warnings: list[str] = []
+        async with semaphore:
+            if not pipeline.graph_lookup_admitted(lookup_warnings):
+                return node_id, {"graph_context": None, "path_depth": None}, lookup_warnings
+            started = time.perf_counter()
+            try:
+                node_data = await graph_service.get_node(node_id, relationships="all", limit=10)
+            except (GraphServiceError, Neo4jError) as exc:
+                pipeline.record_graph_outcome(started, exc)
+                entry = pipeline.graph_lookup_failed(
+                    node_id,
+                    exc,
+                    started=started,
+                    request_id=request_id,
+                    warnings=lookup_warnings,
+                )
+                return node_id, entry, lookup_warnings
+            entry = pipeline.graph_lookup_succeeded(node_id, node_data, started=started, request_id=request_id)
+            depth_error: Exception | None = None
+            try:
+                depth = await graph_service.shortest_path_depth(node_id, max_depth=4)
+            except (GraphServiceError, Neo4jError) as exc:
+                depth_error = exc
+                pipeline.path_depth_failed(node_id, exc, request_id=request_id, warnings=lookup_warnings)
+            else:
+                entry["path_depth"] = float(depth) if depth is not None else None
+            pipeline.record_graph_outcome(started, depth_error)
+        return node_id, entry, lookup_warnings
+
+
+def _header_event(query: str, *, query_kind: str, retrieval: str, timings: dict[str, float]) -> dict[str, Any]:
+    return {
+        "event": "header",
+        "query": query,
+        "query_kind": query_kind,
+        "retrieval": retrieval,
+        "timings_ms": {key: round(value, 3) for key, value in timings.items()},
+    }
+
+
+def _result_payload(result: SearchResult) -> dict[str, Any]:
+    return {"chunk": result.chunk, "graph_context": result.graph_context, "scoring": result.scoring}
+
+
+def _result_events(response: SearchResponse) -> Iterator[dict[str, Any]]:
+    for rank, result in enumerate(response.results):
+        yield {"event": "score", "rank": rank, "chunk_id": result.chunk.get("chunk_id"), "result": _result_payload(result)}
+    yield {
+        "event": "final",
+        "order": [result.chunk.get("chunk_id") for result in response.results],
+        "metadata": response.metadata,
+    }
+
+
+__all__ = ["AsyncSearchService"]
@@ -0,0 +1,121 @@
+"""Closed-loop concurrency benchmark for the `/search` endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from statistics import quantiles
+
+import httpx
+
+DEFAULT_CONCURRENCY_LEVELS = (8, 64, 256)
+
+
+@dataclass(slots=True)
+class ConcurrencyResult:
+    """Throughput and latency observed at one in-flight request level."""
+
+    concurrency: int
+    requests: int
+    elapsed_seconds: float
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    rate_limited: int = 0
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def percentile(self, pct: int) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        if len(self.latencies_ms) == 1:
+            return self.latencies_ms[0]
+        return quantiles(self.latencies_ms, n=100, method="inclusive")[pct - 1]
+
+
+async def run_concurrency_level(
+    send: Callable[[str], Awaitable[int]],
+    queries: Sequence[str],
+    *,
+    concurrency: int,
+    total_requests: int,
+) -> ConcurrencyResult:
+    """Keep ``concurrency`` requests in flight until ``total_requests`` have completed.
+
+    ``send`` issues one request and returns its HTTP status code; queries are
+    replayed round-robin.
+    """
+
+    if not queries:
+        raise ValueError("At least one query is required")
+    counter = itertools.count()
+    result = ConcurrencyResult(concurrency=concurrency, requests=0, elapsed_seconds=0.0)
+
+    async def _worker() -> None:
+        while (index := next(counter)) < total_requests:
+            query = queries[index % len(queries)]
+            started = time.perf_counter()
+            try:
+                status = await send(query)
+            except (httpx.HTTPError, OSError):
+                result.errors += 1
+                continue
+            if status == 429:
+                result.rate_limited += 1
+            elif status >= 400:
+                result.errors += 1
+            else:
+                result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(max(1, concurrency))))
+    result.elapsed_seconds = time.perf_counter() - started
+    result.requests = len(result.latencies_ms)
+    return result
+
+
+async def benchmark_search_endpoint(
+    *,
+    base_url: str,
+    queries: Sequence[str],
+    concurrency_levels: Sequence[int] = DEFAULT_CONCURRENCY_LEVELS,
+    requests_per_level: int = 512,
+    limit: int = 10,
+    include_graph: bool = True,
+    token: str | None = None,
+    cache_bust: bool = False,
+    timeout: float = 30.0,
+) -> list[ConcurrencyResult]:
+    """Replay ``queries`` against a running gateway at each concurrency level.
+
+    With ``cache_bust`` every request carries a unique query suffix so the
+    response and embedding caches cannot short-circuit the work being measured.
+    """
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    sequence = itertools.count()
+    limits = httpx.Limits(max_connections=max(concurrency_levels, default=1))
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=timeout, limits=limits) as client:
+
+        async def _send(query: str) -> int:
+            text = f"{query} #{next(sequence)}" if cache_bust else query
+            response = await client.post("/search", json={"query": text, "limit": limit, "include_graph": include_graph})
+            return response.status_code
+
+        await _send(queries[0])  # warm the model and connection pool
+        return [
+            await run_concurrency_level(_send, queries, concurrency=level, total_requests=requests_per_level)
+            for level in concurrency_levels
+        ]
+
+
+__all__ = [
+    "ConcurrencyResult",
+    "DEFAULT_CONCURRENCY_LEVELS",
+    "benchmark_search_endpoint",
+    "run_concurrency_level",
+]
@@ -0,0 +1,138 @@
+"""Circuit breaker guarding the graph lookups search issues for enrichment."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Literal
+
+from gateway.observability import SEARCH_GRAPH_BREAKER_STATE, SEARCH_GRAPH_BREAKER_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+_STATE_VALUES: dict[BreakerState, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class GraphCircuitBreaker:
+    """Stop search from waiting on Neo4j while it is failing or slow.
+
+    Closed, every lookup is admitted and its outcome is kept for ``window_seconds``.
+    Once the window holds at least ``min_calls`` outcomes and the share of failed
+    or slow ones (slower than ``slow_call_seconds``) reaches ``error_rate``, the
+    breaker opens and :meth:`allow` refuses lookups for ``cooldown_seconds``.
+    It then turns half-open and admits up to ``half_open_probes`` lookups: all of
+    them succeeding closes it again, any failure re-opens it for another cooldown.
+    Probes that never report back are re-issued after a further cooldown.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 30.0,
+        min_calls: int = 10,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 1.0,
+        cooldown_seconds: float = 15.0,
+        half_open_probes: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.min_calls = max(1, int(min_calls))
+        self.error_rate = min(max(float(error_rate), 0.0), 1.0)
+        self.slow_call_seconds = max(0.0, float(slow_call_seconds))
+        self.cooldown_seconds = max(0.0, float(cooldown_seconds))
+        self.half_open_probes = max(1, int(half_open_probes))
+        self._clock = clock
+        self._state: BreakerState = "closed"
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._changed_at = clock()
+        self._probes_issued = 0
+        self._probes_passed = 0
+        self._lock = threading.Lock()
+        SEARCH_GRAPH_BREAKER_STATE.set(_STATE_VALUES["closed"])
+
+    @property
+    def state(self) -> BreakerState:
+        """Current state, reporting an open breaker whose cooldown elapsed as half-open."""
+
+        with self._lock:
+            if self._state == "open" and self._clock() - self._changed_at >= self.cooldown_seconds:
+                return "half_open"
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a graph lookup may be issued now."""
+
+        with self._lock:
+            now = self._clock()
+            if self._state == "closed":
+                return True
+            if self._state == "open" or self._probes_issued >= self.half_open_probes:
+                if now - self._changed_at < self.cooldown_seconds:
+                    return False
+                self._transition("half_open", now)
+            self._probes_issued += 1
+            return True
+
+    def record(self, duration: float, *, failed: bool) -> None:
+        """Report the outcome of an admitted lookup that took ``duration`` seconds."""
+
+        failed = failed or duration > self.slow_call_seconds
+        with self._lock:
+            now = self._clock()
+            if self._state == "open":
+                return  # admitted before the breaker opened
+            if self._state == "half_open":
+                if failed:
+                    self._transition("open", now)
+                    return
+                self._probes_passed += 1
+                if self._probes_passed >= self.half_open_probes:
+                    self._transition("closed", now)
+                return
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            self._expire(now)
+            calls = len(self._outcomes)
+            if calls >= self.min_calls and self._failures >= self.error_rate * calls:
+                logger.warning(
+                    "Graph circuit breaker opened",
+                    extra={
+                        "component": "search",
+                        "event": "graph_breaker_open",
+                        "calls": calls,
+                        "failures": self._failures,
+                        "cooldown_seconds": self.cooldown_seconds,
+                    },
+                )
+                self._transition("open", now)
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _transition(self, state: BreakerState, now: float) -> None:
+        self._changed_at = now
+        self._probes_issued = 0
+        self._probes_passed = 0
+        if state == "closed":
+            self._outcomes.clear()
+            self._failures = 0
+        if state == self._state:
+            return
+        self._state = state
+        SEARCH_GRAPH_BREAKER_STATE.set(_STATE_VALUES[state])
+        SEARCH_GRAPH_BREAKER_TRANSITIONS.labels(state=state).inc()
+        if state == "closed":
+            logger.info("Graph circuit breaker closed", extra={"component": "search", "event": "graph_breaker_closed"})
+
+
+__all__ = ["BreakerState", "GraphCircuitBreaker"]
@@ -0,0 +1,230 @@
+"""Versioned full-response cache with single-flight coalescing for search requests."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal
+
+from gateway.observability import SEARCH_RESPONSE_CACHE_EVENTS
+from gateway.search.encoder import normalise_query
+from gateway.search.service import SearchResponse
+
+CacheStatus = Literal["hit", "miss", "coalesced", "bypass"]
+
+
+def search_fingerprint(
+    *,
+    query: str,
+    limit: int,
+    include_graph: bool,
+    graph_available: bool,
+    sort_by_vector: bool,
+    filters: Mapping[str, Any] | None,
+    options: Mapping[str, Any] | None = None,
+) -> str:
+    """Return a canonical digest of everything that influences a search response."""
+
+    payload = {
+        "query": normalise_query(query),
+        "limit": limit,
+        "include_graph": include_graph,
+        "graph_available": graph_available,
+        "sort_by_vector": sort_by_vector,
+        "filters": filters or {},
+        "options": options or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return sorted(str(item) for item in value)
+    return str(value)
+
+
+@dataclass(slots=True)
+class _Entry:
+    response: SearchResponse
+    stored_at: float
+
+
+class SearchResponseCache:
+    """LRU of search responses keyed by request fingerprint and index generation.
+
+    Entries from earlier generations are never served because the generation is
+    part of the key; they age out through LRU eviction or ``ttl_seconds``.
+    Concurrent misses for the same key wait on a single execution. Callers always
+    receive a private deep copy whose ``request_id`` is rewritten to their own.
+    """
+
+    def __init__(self, *, max_entries: int = 256, ttl_seconds: float = 300.0) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._entries: OrderedDict[tuple[str, int | None], _Entry] = OrderedDict()
+        self._inflight: dict[tuple[str, int | None], Future[SearchResponse]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self,
+        fingerprint: str,
+        *,
+        generation: int | None,
+        request_id: str | None,
+        compute: Callable[[], SearchResponse],
+    ) -> SearchResponse:
+        """Return a cached response or run ``compute`` once for all concurrent callers."""
+
+        if self.max_entries == 0:
+            return self._finish(compute(), status="bypass", generation=generation, request_id=request_id, age=None)
+
+        key = (fingerprint, generation)
+        while True:
+            cached, age, future, owner = self._claim(key)
+            if cached is not None:
+                return self._finish(cached, status="hit", generation=generation, request_id=request_id, age=age)
+            if owner:
+                break
+            try:
+                shared = future.result()
+            except CancelledError:
+                if future.cancelled():
+                    continue  # the owner was interrupted; claim the key again
+                raise
+            return self._finish(shared, status="coalesced", generation=generation, request_id=request_id, age=None)
+
+        try:
+            response = compute()
+        except Exception as exc:
+            self._abandon(key, future, exc)
+            raise
+        except BaseException:
+            self._release(key, future)
+            raise
+        self._store(key, future, response)
+        return self._finish(response, status="miss", generation=generation, request_id=request_id, age=None)
+
+    async def get_or_compute_async(
+        self,
+        fingerprint: str,
+        *,
+        generation: int | None,
+        request_id: str | None,
+        compute: Callable[[], Awaitable[SearchResponse]],
+    ) -> SearchResponse:
+        """Coroutine variant of :meth:`get_or_compute`; waiters never block the event loop.
+
+        Sync and async callers share entries and in-flight executions.
+        """
+
+        if self.max_entries == 0:
+            return self._finish(await compute(), status="bypass", generation=generation, request_id=request_id, age=None)
+
+        key = (fingerprint, generation)
+        while True:
+            cached, age, future, owner = self._claim(key)
+            if cached is not None:
+                return self._finish(cached, status="hit", generation=generation, request_id=request_id, age=age)
+            if owner:
+                break
+            try:
+                # Shielded so a cancelled waiter does not cancel the shared execution.
+                shared = await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue  # the owner was cancelled; claim the key again
+                raise
+            return self._finish(shared, status="coalesced", generation=generation, request_id=request_id, age=None)
+
+        try:
+            response = await compute()
+        except Exception as exc:
+            self._abandon(key, future, exc)
+            raise
+        except BaseException:
+            self._release(key, future)
+            raise
+        self._store(key, future, response)
+        return self._finish(response, status="miss", generation=generation, request_id=request_id, age=None)
+
+    def _claim(self, key: tuple[str, int | None]) -> tuple[SearchResponse | None, float | None, Future[SearchResponse], bool]:
+        """Return a live entry, or the in-flight future and whether the caller must compute it."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry):
+                self._entries.move_to_end(key)
+                return entry.response, time.monotonic() - entry.stored_at, Future(), False
+            if entry is not None:
+                del self._entries[key]
+            future = self._inflight.get(key)
+            if future is not None:
+                return None, None, future, False
+            future = Future()
+            self._inflight[key] = future
+            return None, None, future, True
+
+    def _abandon(self, key: tuple[str, int | None], future: Future[SearchResponse], exc: Exception) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_exception(exc)
+
+    def _release(self, key: tuple[str, int | None], future: Future[SearchResponse]) -> None:
+        """Drop an interrupted execution so its waiters claim the key again instead of failing."""
+
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.cancel()
+
+    def _store(self, key: tuple[str, int | None], future: Future[SearchResponse], response: SearchResponse) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._entries[key] = _Entry(response=response, stored_at=time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.set_result(response)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _expired(self, entry: _Entry) -> bool:
+        return self.ttl_seconds > 0 and (time.monotonic() - entry.stored_at) > self.ttl_seconds
+
+    @staticmethod
+    def _finish(
+        response: SearchResponse,
+        *,
+        status: CacheStatus,
+        generation: int | None,
+        request_id: str | None,
+        age: float | None,
+    ) -> SearchResponse:
+        SEARCH_RESPONSE_CACHE_EVENTS.labels(status=status).inc()
+        result = copy.deepcopy(response)
+        if request_id:
+            result.metadata["request_id"] = request_id
+        cache_info: dict[str, Any] = {"status": status, "generation": generation}
+        if age is not None:
+            cache_info["age_ms"] = round(age * 1000.0, 3)
+        result.metadata["cache"] = cache_info
+        return result
+
+
+__all__ = ["SearchResponseCache", "search_fingerprint"]
@@ -1,19 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import json
 import logging
 from datetime import UTC, datetime
 from pathlib import Path
+from statistics import mean
+from typing import TYPE_CHECKING
 
+import httpx
 from rich.console import Console
+from rich.table import Table
 
 from gateway.config.settings import AppSettings, get_settings
 from gateway.observability import configure_logging, configure_tracing
-from gateway.search.evaluation import evaluate_model
+from gateway.search.benchmark import DEFAULT_CONCURRENCY_LEVELS, benchmark_search_endpoint
+from gateway.search.evaluation import compare_rankings, evaluate_model
 from gateway.search.exporter import ExportOptions, export_training_dataset
 from gateway.search.maintenance import PruneOptions, RedactOptions, prune_feedback_log, redact_dataset
 from gateway.search.trainer import DatasetLoadError, save_artifact, train_from_dataset
 
+if TYPE_CHECKING:
+    from neo4j import Driver
+
+    from gateway.graph.service import GraphService
+    from gateway.search.service import SearchService
+
 logger = logging.getLogger(__name__)
 console = Console()
 
@@ -128,6 +141,78 @@ def build_parser() -> argparse.ArgumentParser:
         help="Path to the model artifact JSON",
     )
 
+    compare_parser = subparsers.add_parser(
+        "compare-enrichment",
+        help="Replay queries in eager and lazy graph enrichment modes and compare rankings",
+    )
+    compare_parser.add_argument(
+        "--queries",
+        type=Path,
+        help="File with one query per line (defaults to queries recorded in the feedback log)",
+    )
+    compare_parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Results per query (default: 10)",
+    )
+    compare_parser.add_argument(
+        "--max-queries",
+        type=int,
+        default=50,
+        help="Maximum number of distinct queries to replay (default: 50)",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench-concurrency",
+        help="Measure /search throughput of a running gateway at several in-flight request levels",
+    )
+    bench_parser.add_argument(
+        "--url",
+        default="http://localhost:8000",
+        help="Gateway base URL (default: http://localhost:8000)",
+    )
+    bench_parser.add_argument(
+        "--queries",
+        type=Path,
+        help="File with one query per line (defaults to queries recorded in the feedback log)",
+    )
+    bench_parser.add_argument(
+        "--max-queries",
+        type=int,
+        default=50,
+        help="Maximum number of distinct queries to replay (default: 50)",
+    )
+    bench_parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_CONCURRENCY_LEVELS),
+        help="In-flight request levels to measure (default: 8 64 256)",
+    )
+    bench_parser.add_argument(
+        "--requests",
+        type=int,
+        default=512,
+        help="Completed requests per concurrency level (default: 512)",
+    )
+    bench_parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Results per query (default: 10)",
+    )
+    bench_parser.add_argument(
+        "--no-graph",
+        action="store_true",
+        help="Send include_graph=false to measure retrieval without graph enrichment",
+    )
+    bench_parser.add_argument(
+        "--cache-bust",
+        action="store_true",
+        help="Make every query unique so response and embedding caches are bypassed",
+    )
+
     subparsers.add_parser(
         "show-weights",
         help="Display the active search weight profile and resolved weights",
@@ -228,6 +313,10 @@ def show_weights(*, settings: AppSettings) -> None:
     ]:
         value = weights.get(key)
         console.print(f"  • {label}: {value:.3f}")
+    enrichment = settings.resolved_search_enrichment()
+    console.print(
+        f"Graph enrichment: {enrichment['mode']} (over-fetch ×{enrichment['overfetch_factor']}, top {enrichment['enrich_top_n']})",
+    )
 
 
 def prune_feedback(*, settings: AppSettings, max_age_days: int | None, max_requests: int | None, output: Path | None) -> None:
@@ -314,6 +403,198 @@ def evaluate_trained_model(*, dataset: Path, model: Path) -> None:
     )
 
 
+def load_replay_queries(*, settings: AppSettings, queries_path: Path | None, max_queries: int) -> list[str]:
+    """Return distinct queries from a file or from the recorded feedback log."""
+    candidates: list[str] = []
+    if queries_path is not None:
+        candidates = [line.strip() for line in queries_path.read_text(encoding="utf-8").splitlines()]
+    else:
+        events_log = settings.state_path / "feedback" / "events.log"
+        if events_log.exists():
+            for line in events_log.read_text(encoding="utf-8").splitlines():
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                query = event.get("query") if isinstance(event, dict) else None
+                if isinstance(query, str):
+                    candidates.append(query.strip())
+
+    seen: set[str] = set()
+    queries: list[str] = []
+    for query in candidates:
+        if not query or query in seen:
+            continue
+        seen.add(query)
+        queries.append(query)
+        if len(queries) >= max(1, max_queries):
+            break
+    return queries
+
+
+def compare_enrichment_modes(
+    *,
+    settings: AppSettings,
+    queries: list[str],
+    limit: int,
+    search_service: SearchService | None = None,
+    graph_service: GraphService | None = None,
+) -> None:
+    if not queries:
+        console.print("No queries to replay", style="yellow")
+        return
+
+    driver = None
+    if search_service is None:
+        search_service, graph_service, driver = _build_live_search(settings)
+
+    pairs: list[tuple[list[str], list[str]]] = []
+    timings: dict[str, list[float]] = {"eager": [], "lazy": []}
+    try:
+        for query in queries:
+            ranked: dict[str, list[str]] = {}
+            for mode in ("eager", "lazy"):
+                response = search_service.search(
+                    query=query,
+                    limit=limit,
+                    include_graph=graph_service is not None,
+                    graph_service=graph_service,
+                    enrichment_mode=mode,
+                )
+                ranked[mode] = [str(result.chunk.get("chunk_id")) for result in response.results]
+                timings[mode].append(float(response.metadata.get("timings_ms", {}).get("total", 0.0)))
+            pairs.append((ranked["eager"], ranked["lazy"]))
+    finally:
+        if driver is not None:
+            driver.close()
+
+    comparison = compare_rankings(pairs, k=limit)
+    spearman_display = "n/a" if comparison.spearman is None else f"{comparison.spearman:.4f}"
+    console.print(
+        f"Lazy vs eager enrichment ({comparison.queries} queries, k={comparison.k}):\n"
+        f"  Overlap@k: {comparison.overlap_at_k:.4f}\n"
+        f"  NDCG@k vs eager: {comparison.ndcg_at_k:.4f}\n"
+        f"  Spearman (shared results): {spearman_display}\n"
+        f"  Mean latency eager: {mean(timings['eager']):.1f} ms\n"
+        f"  Mean latency lazy: {mean(timings['lazy']):.1f} ms",
+        style="green",
+    )
+    logger.info(
+        "Enrichment comparison: queries=%d overlap=%.4f ndcg=%.4f spearman=%s",
+        comparison.queries,
+        comparison.overlap_at_k,
+        comparison.ndcg_at_k,
+        spearman_display,
+    )
+
+
+def bench_concurrency(
+    *,
+    settings: AppSettings,
+    url: str,
+    queries: list[str],
+    concurrency_levels: list[int],
+    requests_per_level: int,
+    limit: int,
+    include_graph: bool,
+    cache_bust: bool,
+) -> None:
+    if not queries:
+        console.print("No queries to replay", style="yellow")
+        return
+    try:
+        results = asyncio.run(
+            benchmark_search_endpoint(
+                base_url=url,
+                queries=queries,
+                concurrency_levels=concurrency_levels,
+                requests_per_level=requests_per_level,
+                limit=limit,
+                include_graph=include_graph,
+                token=settings.reader_token or settings.maintainer_token,
+                cache_bust=cache_bust,
+            )
+        )
+    except httpx.HTTPError as exc:
+        console.print(f"Benchmark failed: {exc}", style="red")
+        return
+
+    table = Table(title=f"/search concurrency ({len(queries)} queries, {requests_per_level} requests per level)")
+    for column in ("In-flight", "Req/s", "p50 ms", "p95 ms", "p99 ms", "Errors", "429s"):
+        table.add_column(column, justify="right")
+    for result in results:
+        table.add_row(
+            str(result.concurrency),
+            f"{result.throughput:.1f}",
+            f"{result.percentile(50):.1f}",
+            f"{result.percentile(95):.1f}",
+            f"{result.percentile(99):.1f}",
+            str(result.errors),
+            str(result.rate_limited),
+        )
+        logger.info(
+            "Search concurrency benchmark: in_flight=%d throughput=%.1f p95_ms=%.1f errors=%d rate_limited=%d",
+            result.concurrency,
+            result.throughput,
+            result.percentile(95),
+            result.errors,
+            result.rate_limited,
+        )
+    console.print(table)
+    if any(result.rate_limited for result in results):
+        console.print("Some requests were rate limited; raise KM_RATE_LIMIT_REQUESTS for benchmarking", style="yellow")
+
+
+def _build_live_search(settings: AppSettings) -> tuple[SearchService, GraphService, Driver]:
+    """Construct a search service wired to the configured backends."""
+    from neo4j import GraphDatabase
+    from qdrant_client import QdrantClient
+
+    from gateway.graph.service import get_graph_service
+    from gateway.ingest.embedding import Embedder
+    from gateway.ingest.lexical import LexicalVocabulary, lexical_vocabulary_path
+    from gateway.ingest.symbols import SymbolIndex, symbol_index_path
+    from gateway.search.service import SearchOptions, SearchService, SearchWeights
+
+    profile, weights = settings.resolved_search_weights()
+    enrichment = settings.resolved_search_enrichment()
+    vocabulary = None
+    if settings.search_sparse_enabled:
+        vocabulary = LexicalVocabulary.load(lexical_vocabulary_path(settings.state_path, settings.qdrant_collection))
+    symbol_index = None
+    if settings.search_symbol_fastpath:
+        symbol_index = SymbolIndex.load(symbol_index_path(settings.state_path, settings.qdrant_collection))
+    service = SearchService(
+        qdrant_client=QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key),
+        collection_name=settings.qdrant_collection,
+        embedder=Embedder(settings.embedding_model),
+        options=SearchOptions(
+            hnsw_ef_search=settings.search_hnsw_ef_search,
+            weight_profile=profile,
+            overfetch_factor=float(enrichment["overfetch_factor"]),  # type: ignore[arg-type]
+            enrich_top_n=int(enrichment["enrich_top_n"]),  # type: ignore[call-overload]
+        ),
+        weights=SearchWeights(
+            subsystem=weights["weight_subsystem"],
+            relationship=weights["weight_relationship"],
+            support=weights["weight_support"],
+            coverage_penalty=weights["weight_coverage_penalty"],
+            criticality=weights["weight_criticality"],
+            vector=settings.search_vector_weight,
+            lexical=settings.search_lexical_weight,
+        ),
+        lexical_vocabulary=vocabulary,
+        symbol_index=symbol_index,
+    )
+    driver = GraphDatabase.driver(
+        settings.neo4j_uri,
+        auth=(settings.neo4j_user, settings.neo4j_password),
+        **settings.neo4j_driver_options(),
+    )
+    graph_service = get_graph_service(driver, settings.neo4j_database)
+    return service, graph_service, driver
+
+
 def main(argv: list[str] | None = None) -> None:
     configure_logging()
     settings = get_settings()
@@ -355,6 +636,21 @@ def main(argv: list[str] | None = None) -> None:
         )
     elif args.command == "evaluate-model":
         evaluate_trained_model(dataset=args.dataset, model=args.model)
+    elif args.command == "compare-enrichment":
+        queries = load_replay_queries(settings=settings, queries_path=args.queries, max_queries=args.max_queries)
+        compare_enrichment_modes(settings=settings, queries=queries, limit=max(1, args.limit))
+    elif args.command == "bench-concurrency":
+        queries = load_replay_queries(settings=settings, queries_path=args.queries, max_queries=args.max_queries)
+        bench_concurrency(
+            settings=settings,
+            url=args.url,
+            queries=queries,
+            concurrency_levels=[max(1, level) for level in args.concurrency],
+            requests_per_level=max(1, args.requests),
+            limit=max(1, args.limit),
+            include_graph=not args.no_graph,
+            cache_bust=args.cache_bust,
+        )
     elif args.command == "show-weights":
         show_weights(settings=settings)
     else:  # pragma: no cover
@@ -0,0 +1,236 @@
+"""Query embedding front-end with an LRU vector cache and micro-batched model calls."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from gateway.ingest.embedding import Embedder
+from gateway.observability import (
+    SEARCH_EMBED_BATCH_SIZE,
+    SEARCH_EMBED_CACHE_BYTES,
+    SEARCH_EMBED_CACHE_EVENTS,
+    SEARCH_EMBED_QUEUE_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_OVERHEAD_BYTES = 160
+"""Approximate per-entry bookkeeping cost (dict slot, key object, array header)."""
+
+
+def normalise_query(text: str) -> str:
+    """Return the cache key for a query: NFC-normalised with whitespace collapsed."""
+
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class VectorCache:
+    """Thread-safe LRU of query vectors bounded by approximate memory use."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: OrderedDict[str, array] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> list[float] | None:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                return None
+            self._entries.move_to_end(key)
+            return vector.tolist()
+
+    def put(self, key: str, vector: Sequence[float]) -> None:
+        packed = array("f", vector)
+        cost = _entry_cost(key, packed)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= _entry_cost(key, previous)
+            self._entries[key] = packed
+            self._bytes += cost
+            while self._bytes > self.max_bytes and self._entries:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= _entry_cost(evicted_key, evicted)
+                SEARCH_EMBED_CACHE_EVENTS.labels(status="evict").inc()
+            SEARCH_EMBED_CACHE_BYTES.set(self._bytes)
+
+
+def _entry_cost(key: str, vector: array) -> int:
+    return sys.getsizeof(key) + vector.itemsize * len(vector) + _ENTRY_OVERHEAD_BYTES
+
+
+@dataclass(slots=True)
+class _PendingEncode:
+    text: str
+    future: Future[list[float]]
+    enqueued_at: float
+
+
+class QueryEncoder:
+    """Drop-in ``encode`` front-end for the search embedder.
+
+    Cached queries skip the model entirely. Misses from concurrent requests are
+    queued and encoded together: the dispatcher thread waits up to
+    ``batch_window_ms`` after the first pending query (or until
+    ``max_batch_size`` queries are waiting) and issues a single model call.
+    A window of ``0`` disables batching and encodes on the calling thread.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        cache_max_bytes: int = 32 * 1024 * 1024,
+        batch_window_ms: float = 3.0,
+        max_batch_size: int = 32,
+    ) -> None:
+        self.embedder = embedder
+        self.model_name = getattr(embedder, "model_name", "unknown")
+        self.cache = VectorCache(cache_max_bytes)
+        self.batch_window_seconds = max(0.0, float(batch_window_ms)) / 1000.0
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._queue: queue.SimpleQueue[_PendingEncode | None] = queue.SimpleQueue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    def encode(self, texts: Iterable[str]) -> list[list[float]]:
+        """Embed ``texts``, serving repeats from the cache and batching misses."""
+
+        keys = [normalise_query(text) for text in texts]
+        vectors: dict[str, list[float]] = {}
+        misses: list[str] = []
+        for key in keys:
+            if key in vectors or key in misses:
+                continue
+            cached = self.cache.get(key) if self.cache.max_bytes else None
+            if cached is None:
+                SEARCH_EMBED_CACHE_EVENTS.labels(status="miss").inc()
+                misses.append(key)
+            else:
+                SEARCH_EMBED_CACHE_EVENTS.labels(status="hit").inc()
+                vectors[key] = cached
+
+        if misses:
+            for key, vector in zip(misses, self._encode_misses(misses), strict=True):
+                vectors[key] = vector
+                if self.cache.max_bytes:
+                    self.cache.put(key, vector)
+        return [vectors[key] for key in keys]
+
+    def close(self) -> None:
+        """Stop the dispatcher thread; pending requests are still answered."""
+
+        with self._worker_lock:
+            self._closed = True
+            worker = self._worker
+            self._worker = None
+            if worker is not None:
+                self._queue.put(None)
+        if worker is not None:
+            worker.join(timeout=5)
+        leftovers: list[_PendingEncode] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftovers.append(item)
+        if leftovers:
+            self._dispatch(leftovers)
+
+    def _encode_misses(self, texts: Sequence[str]) -> list[list[float]]:
+        pending = self._enqueue(texts) if self.batch_window_seconds > 0 else None
+        if pending is None:
+            SEARCH_EMBED_BATCH_SIZE.observe(len(texts))
+            return [list(vector) for vector in self.embedder.encode(list(texts))]
+        return [item.future.result() for item in pending]
+
+    def _enqueue(self, texts: Sequence[str]) -> list[_PendingEncode] | None:
+        """Queue ``texts`` for the dispatcher, or return ``None`` once closed.
+
+        Enqueueing happens under ``_worker_lock`` so :meth:`close` cannot slip
+        in between the closed check and the put: anything queued here lands
+        ahead of the stop sentinel and is answered by the worker or the drain.
+        """
+
+        with self._worker_lock:
+            if self._closed:
+                return None
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="query-encoder", daemon=True)
+                self._worker.start()
+            now = time.perf_counter()
+            pending = [_PendingEncode(text=text, future=Future(), enqueued_at=now) for text in texts]
+            for item in pending:
+                self._queue.put(item)
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = first.enqueued_at + self.batch_window_seconds
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: Sequence[_PendingEncode]) -> None:
+        started = time.perf_counter()
+        for item in batch:
+            SEARCH_EMBED_QUEUE_SECONDS.observe(started - item.enqueued_at)
+        unique = list(dict.fromkeys(item.text for item in batch))
+        SEARCH_EMBED_BATCH_SIZE.observe(len(unique))
+        try:
+            encoded = dict(zip(unique, self.embedder.encode(unique), strict=True))
+        except Exception as exc:  # pragma: no cover - surfaced to every waiting request
+            logger.warning("Batched query encoding failed: %s", exc)
+            for item in batch:
+                item.future.set_exception(exc)
+            return
+        for item in batch:
+            item.future.set_result(list(encoded[item.text]))
+
+
+__all__ = ["QueryEncoder", "VectorCache", "normalise_query"]
@@ -60,6 +60,72 @@ def evaluate_model(dataset_path: Path, model_path: Path) -> EvaluationMetrics:
     return EvaluationMetrics(mse=mse, r2=r2, ndcg_at_5=ndcg5, ndcg_at_10=ndcg10, spearman=spearman)
 
 
+@dataclass(slots=True)
+class RankingComparison:
+    """Agreement between a baseline ranking and a candidate ranking across queries."""
+
+    queries: int
+    k: int
+    overlap_at_k: float
+    ndcg_at_k: float
+    spearman: float | None
+
+
+def compare_rankings(
+    pairs: Sequence[tuple[Sequence[str], Sequence[str]]],
+    *,
+    k: int = 10,
+) -> RankingComparison:
+    """Compare candidate rankings against baseline rankings for the same queries.
+
+    Each pair holds the ordered result identifiers of the baseline (e.g. eager graph
+    enrichment) and of the candidate strategy. Baseline positions act as graded
+    relevance, so an NDCG of 1.0 means the candidate reproduced the baseline top-k.
+    """
+
+    if k <= 0:
+        raise ValueError("k must be positive")
+
+    overlaps: list[float] = []
+    ndcgs: list[float] = []
+    correlations: list[float] = []
+    for baseline, candidate in pairs:
+        baseline_top = list(baseline[:k])
+        candidate_top = list(candidate[:k])
+        if not baseline_top:
+            continue
+        overlaps.append(len(set(baseline_top) & set(candidate_top)) / len(baseline_top))
+
+        grades = {item: float(len(baseline_top) - index) for index, item in enumerate(baseline_top)}
+        gains = cast(FloatArray, np.asarray([grades.get(item, 0.0) for item in candidate_top], dtype=np.float64))
+        ideal_gains = cast(FloatArray, np.asarray(sorted(grades.values(), reverse=True), dtype=np.float64))
+        ideal = _dcg(_normalise_grades(ideal_gains, len(baseline_top)), k)
+        ndcgs.append(_dcg(_normalise_grades(gains, len(baseline_top)), k) / ideal if ideal else 0.0)
+
+        shared = [item for item in baseline_top if item in candidate_top]
+        if len(shared) >= 2:
+            baseline_ranks = cast(FloatArray, np.asarray([baseline_top.index(item) for item in shared], dtype=np.float64))
+            candidate_ranks = cast(FloatArray, np.asarray([candidate_top.index(item) for item in shared], dtype=np.float64))
+            correlation = _spearman_correlation(baseline_ranks, candidate_ranks)
+            if correlation is not None:
+                correlations.append(correlation)
+
+    return RankingComparison(
+        queries=len(overlaps),
+        k=k,
+        overlap_at_k=float(mean(overlaps)) if overlaps else 0.0,
+        ndcg_at_k=float(mean(ndcgs)) if ndcgs else 0.0,
+        spearman=float(mean(correlations)) if correlations else None,
+    )
+
+
+def _normalise_grades(grades: FloatArray, scale: int) -> FloatArray:
+    """Scale positional grades into [0, 1] so exponential gains stay bounded."""
+    if scale <= 0:
+        return grades
+    return cast(FloatArray, grades / float(scale))
+
+
 def _mean_ndcg(request_ids: Sequence[str], relevance: FloatArray, scores: FloatArray, *, k: int) -> float:
     """Compute mean NDCG@k for groups identified by request ids."""
     groups: dict[str, list[int]] = {}
@@ -107,6 +173,6 @@ def _spearman_correlation(y_true: FloatArray, y_pred: FloatArray) -> float | Non
     return float(1 - numerator / denominator)
 
 
-__all__ = ["EvaluationMetrics", "evaluate_model"]
+__all__ = ["EvaluationMetrics", "RankingComparison", "compare_rankings", "evaluate_model"]
 
 FloatArray = npt.NDArray[np.float64]
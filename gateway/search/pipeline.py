@@ -0,0 +1,2004 @@
+"""Search planning, request building, ranking, and response shaping without I/O."""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
+
+from qdrant_client.http.models import (
+    FieldCondition,
+    Filter,
+    GroupsResult,
+    HasIdCondition,
+    MatchAny,
+    MatchValue,
+    Prefetch,
+    QueryRequest,
+    QueryResponse,
+    Range,
+    RecommendInput,
+    RecommendQuery,
+    Record,
+    ScoredPoint,
+    SearchParams,
+    SparseVector,
+)
+
+from gateway.graph.service import GraphNotFoundError, GraphServiceError
+from gateway.ingest.lexical import LEXICAL_VECTOR_NAME, LexicalVocabulary, SparseEncoding
+from gateway.ingest.qdrant_writer import centroid_collection_name
+from gateway.ingest.symbols import SymbolIndex, SymbolMatch
+from gateway.observability import (
+    SEARCH_GRAPH_CACHE_EVENTS,
+    SEARCH_GRAPH_LOOKUP_SECONDS,
+    SEARCH_RETRIEVAL_SECONDS,
+    SEARCH_ROUTING_TOTAL,
+    SEARCH_SCORE_DELTA,
+    SEARCH_SYMBOL_QUERIES_TOTAL,
+)
+from gateway.search.breaker import GraphCircuitBreaker
+from gateway.search.scoring import (
+    HeuristicWeights,
+    LinearModel,
+    ScoringRow,
+    _parse_iso_datetime,
+    base_scoring,
+    phase_one_scores,
+    score_candidates,
+)
+from gateway.search.trainer import ModelArtifact
+
+logger = logging.getLogger(__name__)
+
+_MAX_OVERFETCH_FACTOR = 10
+_SYMBOL_RRF_K = 60
+_GRAPH_BREAKER_WARNING = "graph enrichment skipped: graph circuit breaker open"
+
+SearchVerbosity = Literal["ids", "compact", "full"]
+SearchGroupBy = Literal["artifact"]
+MAX_GROUP_SIBLINGS = 10
+# Payload key each grouping mode collapses on.
+_GROUP_BY_FIELDS: dict[str, str] = {"artifact": "path"}
+SEARCH_VERBOSITY_LEVELS: tuple[str, ...] = ("ids", "compact", "full")
+SearchMode = Literal["fast", "balanced", "exhaustive"]
+SEARCH_MODES: tuple[str, ...] = ("fast", "balanced", "exhaustive")
+# Reference HNSW ef when none is configured (Qdrant's own default is close to it).
+DEFAULT_HNSW_EF = 128
+_MODE_EF_FACTORS: dict[str, float] = {"fast": 0.5, "balanced": 1.0, "exhaustive": 4.0}
+# Exhaustive mode brute-forces filtered subsets up to this multiple of the exact-search threshold.
+_EXHAUSTIVE_EXACT_FACTOR = 10
+_MIN_SELECTIVITY = 0.01
+DEFAULT_SNIPPET_CHARS = 240
+MAX_EXPAND_CONTEXT = 5
+MAX_SIMILAR_SEEDS = 10
+# Payload keys neighbour-chunk expansion needs to stitch windows back together.
+_CONTEXT_PAYLOAD_FIELDS: tuple[str, ...] = ("path", "chunk_index", "chunk_id", "text")
+
+# Payload keys ranking and `_build_chunk` read; everything else stays in Qdrant.
+_SEARCH_PAYLOAD_FIELDS: tuple[str, ...] = (
+    "chunk_id",
+    "path",
+    "artifact_type",
+    "subsystem",
+    "namespace",
+    "tags",
+    "text",
+    "coverage_missing",
+    "subsystem_criticality",
+    "coverage_ratio",
+    "git_timestamp",
+)
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """Single ranked chunk returned from the search pipeline."""
+
+    chunk: dict[str, Any]
+    graph_context: dict[str, Any] | None
+    scoring: dict[str, Any]
+
+
+@dataclass(slots=True)
+class SearchResponse:
+    """API-friendly container for search results and metadata."""
+
+    query: str
+    results: list[SearchResult]
+    metadata: dict[str, Any]
+
+
+@dataclass(slots=True)
+class SearchRequest:
+    """A single query within a batch search."""
+
+    query: str
+    limit: int = 10
+    include_graph: bool = True
+    filters: dict[str, Any] | None = None
+    enrichment_mode: Literal["lazy", "eager"] | None = None
+    overfetch_factor: float | None = None
+    enrich_top_n: int | None = None
+    verbosity: SearchVerbosity = "full"
+    snippet_chars: int | None = None
+    group_by: SearchGroupBy | None = None
+    group_siblings: int = 0
+    expand_context: int = 0
+    mode: SearchMode | None = None
+
+
+@dataclass(slots=True)
+class SearchBatchResponse:
+    """Per-query responses of a batch search plus batch-wide metadata."""
+
+    responses: list[SearchResponse]
+    metadata: dict[str, Any]
+
+
+@dataclass(slots=True)
+class SearchOptions:
+    """Runtime options controlling the search service behaviour."""
+
+    max_limit: int = 25
+    graph_timeout_seconds: float = 0.25
+    hnsw_ef_search: int | None = None
+    scoring_mode: Literal["heuristic", "ml"] = "heuristic"
+    weight_profile: str = "custom"
+    slow_graph_warn_seconds: float = 0.25
+    enrichment_mode: Literal["lazy", "eager"] = "lazy"
+    overfetch_factor: float = 2.0
+    enrich_top_n: int = 10
+    chunk_overlap: int = 200
+    routing_mode: Literal["off", "subsystem"] = "off"
+    routing_top_k: int = 2
+    routing_min_score: float = 0.3
+    routing_min_margin: float = 0.05
+    exact_search_max_points: int = 2000
+    max_hnsw_ef: int = 1024
+
+
+@dataclass(slots=True)
+class RetrievalTuning:
+    """HNSW settings chosen for one request from its search mode and filter selectivity."""
+
+    mode: SearchMode
+    hnsw_ef: int | None = None
+    exact: bool = False
+    query_filter: Filter | None = None
+    matching_points: int | None = None
+    selectivity: float | None = None
+
+    def search_params(self) -> SearchParams | None:
+        if self.exact:
+            return SearchParams(exact=True)
+        return SearchParams(hnsw_ef=self.hnsw_ef) if self.hnsw_ef is not None else None
+
+    def latency_label(self) -> str:
+        if self.exact:
+            return "exact"
+        return str(self.hnsw_ef) if self.hnsw_ef is not None else "default"
+
+    def as_metadata(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "hnsw_ef": self.hnsw_ef,
+            "exact": self.exact,
+            "matching_points": self.matching_points,
+            "selectivity": self.selectivity,
+        }
+
+
+@dataclass(slots=True)
+class SubsystemRoute:
+    """Outcome of matching a query vector against the subsystem centroids."""
+
+    outcome: Literal["routed", "fallback", "low_confidence", "unavailable"]
+    subsystems: list[str] = field(default_factory=list)
+    confidence: float | None = None
+
+    def query_filter(self) -> Filter | None:
+        """Return the payload filter restricting retrieval to the routed subsystems."""
+
+        if self.outcome != "routed":
+            return None
+        return Filter(must=[FieldCondition(key="subsystem", match=MatchAny(any=self.subsystems))])
+
+    def as_metadata(self) -> dict[str, Any]:
+        return {"outcome": self.outcome, "subsystems": self.subsystems, "confidence": self.confidence}
+
+
+@dataclass(slots=True)
+class SearchWeights:
+    """Weighting configuration for hybrid scoring."""
+
+    subsystem: float = 0.30
+    relationship: float = 0.05
+    support: float = 0.10
+    coverage_penalty: float = 0.15
+    criticality: float = 0.12
+    vector: float = 1.0
+    lexical: float = 0.25
+
+
+@dataclass(slots=True)
+class EnrichmentPlan:
+    """Resolved candidate and graph enrichment budget for a single request."""
+
+    mode: Literal["lazy", "eager"]
+    candidate_limit: int
+    enrich_limit: int | None
+    overfetch_factor: float
+
+
+@dataclass(slots=True)
+class RetrievedPoint:
+    """Point returned by retrieval with its dense and (optional) sparse scores."""
+
+    payload: dict[str, Any]
+    score: float
+    lexical_score: float | None = None
+    siblings: list[str] | None = None
+
+
+@dataclass(slots=True)
+class Candidate:
+    """Phase-one candidate ranked without graph context."""
+
+    payload: dict[str, Any]
+    vector_score: float
+    lexical_score: float
+    chunk: dict[str, Any]
+    rank_score: float = 0.0
+
+
+@dataclass(slots=True)
+class BatchItem:
+    """Per-query state carried through the shared stages of a batch search."""
+
+    request: SearchRequest
+    request_id: str | None
+    limit: int
+    query_kind: str
+    symbol_matches: list[SymbolMatch]
+    timings: dict[str, float]
+    response: SearchResponse | None = None
+    plan: EnrichmentPlan | None = None
+    sparse: SparseEncoding | None = None
+    query_filter: Filter | None = None
+    hits: list[RetrievedPoint] = field(default_factory=list)
+    retrieval: str = "dense"
+    route: SubsystemRoute | None = None
+
+
+@dataclass(slots=True)
+class CandidateRanking:
+    """Phase-one output: candidates in rank order plus the request state enrichment needs.
+
+    ``graph_available`` says whether graph lookups may run at all (they can decide
+    subsystem filters even when ``include_graph`` is off); ``graph_cache`` holds the
+    context resolved so far and ``warnings`` the lookup warnings for the response.
+    """
+
+    query: str
+    candidates: list[Candidate]
+    filter_state: FilterState
+    query_tokens: set[str]
+    fetched: int
+    limit: int
+    plan: EnrichmentPlan
+    include_graph: bool
+    graph_available: bool
+    sort_by_vector: bool
+    graph_cache: dict[str, dict[str, Any]] = field(default_factory=dict)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def graph_context_included(self) -> bool:
+        return self.include_graph and self.graph_available
+
+
+@dataclass(slots=True)
+class FilterState:
+    """Preprocessed filter collections derived from request parameters."""
+
+    allowed_subsystems: set[str]
+    allowed_types: set[str]
+    allowed_namespaces: set[str]
+    allowed_tags: set[str]
+    filters_applied: dict[str, Any]
+    recency_cutoff: datetime | None
+    recency_warning_emitted: bool = False
+
+
+class SearchPipeline:
+    """The I/O-free stages of a search, shared by the sync and async services.
+
+    Planning, Qdrant request building, phase-one ranking, graph enrichment from
+    already-resolved lookups, and response finalisation live here; the services
+    only issue the requests these stages build and feed the results back in.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        *,
+        options: SearchOptions | None = None,
+        weights: SearchWeights | None = None,
+        model_artifact: ModelArtifact | None = None,
+        lexical_vocabulary: LexicalVocabulary | None = None,
+        symbol_index: SymbolIndex | None = None,
+        graph_breaker: GraphCircuitBreaker | None = None,
+    ) -> None:
+        self.collection_name = collection_name
+        self.lexical_vocabulary = lexical_vocabulary
+        self.symbol_index = symbol_index
+        self.graph_breaker = graph_breaker
+        resolved_options = options or SearchOptions()
+        resolved_weights = weights or SearchWeights()
+
+        self.max_limit = resolved_options.max_limit
+        self.graph_timeout_seconds = resolved_options.graph_timeout_seconds
+        self.weight_subsystem = resolved_weights.subsystem
+        self.weight_relationship = resolved_weights.relationship
+        self.weight_support = resolved_weights.support
+        self.weight_coverage_penalty = resolved_weights.coverage_penalty
+        self.weight_criticality = resolved_weights.criticality
+        self.vector_weight, self.lexical_weight = _normalise_hybrid_weights(
+            resolved_weights.vector,
+            resolved_weights.lexical,
+        )
+        hnsw_value = resolved_options.hnsw_ef_search
+        self.hnsw_ef_search = int(hnsw_value) if hnsw_value and hnsw_value > 0 else None
+        self.weight_profile = resolved_options.weight_profile
+        self.slow_graph_warn_seconds = max(0.0, resolved_options.slow_graph_warn_seconds)
+        self.enrichment_mode = resolved_options.enrichment_mode
+        self.overfetch_factor = max(1.0, min(float(resolved_options.overfetch_factor), _MAX_OVERFETCH_FACTOR))
+        self.enrich_top_n = max(0, int(resolved_options.enrich_top_n))
+        self.chunk_overlap = max(0, int(resolved_options.chunk_overlap))
+        self.routing_mode = resolved_options.routing_mode
+        self.routing_top_k = max(1, int(resolved_options.routing_top_k))
+        self.routing_min_score = float(resolved_options.routing_min_score)
+        self.routing_min_margin = max(0.0, float(resolved_options.routing_min_margin))
+        self.routing_collection = centroid_collection_name(collection_name)
+        self.exact_search_max_points = max(0, int(resolved_options.exact_search_max_points))
+        self.max_hnsw_ef = max(1, int(resolved_options.max_hnsw_ef))
+        self.scoring_mode = resolved_options.scoring_mode if model_artifact is not None else "heuristic"
+        self._model_artifact = model_artifact if model_artifact and self.scoring_mode == "ml" else None
+        if self.scoring_mode == "ml" and self._model_artifact is None:
+            logger.warning(
+                "Search scoring mode set to 'ml' but no model artifact provided; falling back to heuristic mode",
+                extra={"component": "search", "event": "ml_model_missing"},
+            )
+            self.scoring_mode = "heuristic"
+
+        self._weight_snapshot = {
+            "weight_subsystem": self.weight_subsystem,
+            "weight_relationship": self.weight_relationship,
+            "weight_support": self.weight_support,
+            "weight_coverage_penalty": self.weight_coverage_penalty,
+            "weight_criticality": self.weight_criticality,
+            "vector_weight": self.vector_weight,
+            "lexical_weight": self.lexical_weight,
+        }
+
+        self._heuristic_weights = HeuristicWeights(
+            vector=self.vector_weight,
+            lexical=self.lexical_weight,
+            subsystem=self.weight_subsystem,
+            relationship=self.weight_relationship,
+            support=self.weight_support,
+            coverage_penalty=self.weight_coverage_penalty,
+            criticality=self.weight_criticality,
+        )
+        self._model = LinearModel.from_artifact(self._model_artifact) if self._model_artifact is not None else None
+
+    def cache_scope(self) -> dict[str, Any]:
+        """Describe the configuration that shapes responses, for cache fingerprints."""
+
+        return {
+            "weight_profile": self.weight_profile,
+            "weights": self._weight_snapshot,
+            "scoring_mode": self.scoring_mode,
+            "hnsw_ef_search": [self.hnsw_ef_search, self.exact_search_max_points, self.max_hnsw_ef],
+            "enrichment": [self.enrichment_mode, self.overfetch_factor, self.enrich_top_n],
+            "chunk_overlap": self.chunk_overlap,
+            "routing": [self.routing_mode, self.routing_top_k, self.routing_min_score, self.routing_min_margin],
+            "max_limit": self.max_limit,
+            "sparse": self.lexical_vocabulary is not None,
+            "symbols": self.symbol_index is not None,
+            # Responses built while graph lookups are being refused must not outlive the outage.
+            "graph_degraded": self.graph_breaker is not None and self.graph_breaker.state != "closed",
+        }
+
+    def recommend_request(self, seeds: Sequence[Record], *, limit: int) -> dict[str, Any]:
+        seed_ids = [record.id for record in seeds]
+        return {
+            "collection_name": self.collection_name,
+            "query": RecommendQuery(recommend=RecommendInput(positive=seed_ids)),
+            "query_filter": Filter(must_not=[HasIdCondition(has_id=seed_ids)]),
+            "limit": limit,
+            "with_payload": payload_selector(),
+            "search_params": self.search_params(),
+        }
+
+    def prepare_batch(self, requests: Sequence[SearchRequest], *, request_id: str | None) -> list[BatchItem]:
+        """Answer symbol fast-path queries and plan retrieval for the rest."""
+
+        items: list[BatchItem] = []
+        for index, request in enumerate(requests):
+            limit = max(1, min(request.limit, self.max_limit))
+            item_request_id = f"{request_id}:{index}" if request_id else None
+            timings: dict[str, float] = {}
+            query_kind, symbol_matches, shortcut = self.symbol_phase(
+                request.query,
+                limit=limit,
+                filters=request.filters,
+                request_id=item_request_id,
+                timings=timings,
+            )
+            item = BatchItem(
+                request=request,
+                request_id=item_request_id,
+                limit=limit,
+                query_kind=query_kind,
+                symbol_matches=symbol_matches,
+                timings=timings,
+                response=shortcut,
+            )
+            if shortcut is None:
+                item.plan = self.plan_enrichment(
+                    limit,
+                    mode=request.enrichment_mode,
+                    overfetch_factor=request.overfetch_factor,
+                    enrich_top_n=request.enrich_top_n,
+                )
+                if self.lexical_vocabulary is not None and request.group_by is None:
+                    item.sparse = self.lexical_vocabulary.encode_query(request.query)
+                item.query_filter = retrieval_filter(request.filters)
+            items.append(item)
+        return items
+
+    def batch_routing(
+        self,
+        items: Sequence[BatchItem],
+        vectors: Sequence[Sequence[float]],
+    ) -> tuple[list[BatchItem], list[QueryRequest]]:
+        """Pick the batch queries subsystem routing applies to and build their centroid lookups."""
+
+        routed: list[BatchItem] = []
+        requests: list[QueryRequest] = []
+        if self.routing_mode != "subsystem":
+            return routed, requests
+        for item, vector in zip(items, vectors, strict=True):
+            if item.request.filters and item.request.filters.get("subsystems"):
+                continue
+            routed.append(item)
+            requests.append(QueryRequest(query=list(vector), limit=self.routing_top_k + 1, with_payload=["subsystem"]))
+        return routed, requests
+
+    def assign_routes(self, items: Sequence[BatchItem], routes: Sequence[SubsystemRoute]) -> None:
+        for item, route in zip(items, routes, strict=True):
+            item.route = route
+            item.query_filter = merge_filters(item.query_filter, route.query_filter())
+
+    def batch_fallbacks(
+        self,
+        items: Sequence[BatchItem],
+        vectors: Sequence[Sequence[float]],
+    ) -> tuple[list[BatchItem], list[Sequence[float]]]:
+        """Return routed queries that came back short of ``limit``, reset to global retrieval."""
+
+        fallback: list[BatchItem] = []
+        fallback_vectors: list[Sequence[float]] = []
+        for item, vector in zip(items, vectors, strict=True):
+            if item.route is None or item.route.outcome != "routed" or len(item.hits) >= item.limit:
+                continue
+            item.route.outcome = "fallback"
+            item.query_filter = retrieval_filter(item.request.filters)
+            fallback.append(item)
+            fallback_vectors.append(vector)
+        return fallback, fallback_vectors
+
+    def batch_query_requests(self, items: Sequence[BatchItem], vectors: Sequence[Sequence[float]]) -> list[QueryRequest]:
+        """Flatten per-query retrieval into one request list (two entries per hybrid query)."""
+
+        requests: list[QueryRequest] = []
+        for item, vector in zip(items, vectors, strict=True):
+            assert item.plan is not None
+            if item.sparse is not None:
+                requests.extend(
+                    self.hybrid_requests(
+                        vector,
+                        item.sparse,
+                        limit=item.plan.candidate_limit,
+                        with_text=item.request.verbosity != "ids",
+                        query_filter=item.query_filter,
+                    )
+                )
+            else:
+                requests.append(
+                    QueryRequest(
+                        query=list(vector),
+                        filter=item.query_filter,
+                        limit=item.plan.candidate_limit,
+                        with_payload=payload_selector(),
+                        params=self.search_params(),
+                    )
+                )
+        return requests
+
+    def assign_batch_results(self, items: Sequence[BatchItem], responses: Sequence[QueryResponse]) -> None:
+        cursor = 0
+        for item in items:
+            assert item.plan is not None
+            if item.sparse is not None:
+                item.hits = self.merge_hybrid(responses[cursor], responses[cursor + 1], limit=item.plan.candidate_limit)
+                item.retrieval = "hybrid"
+                cursor += 2
+            else:
+                item.hits = [RetrievedPoint(payload=point.payload or {}, score=float(point.score)) for point in responses[cursor].points]
+                item.retrieval = "dense"
+                cursor += 1
+
+    def finalize_batch(
+        self,
+        items: Sequence[BatchItem],
+        *,
+        started: float,
+        timings: dict[str, float],
+        graph_lookups: int,
+        request_id: str | None,
+        sort_by_vector: bool,
+    ) -> SearchBatchResponse:
+        responses: list[SearchResponse] = []
+        for item in items:
+            assert item.response is not None
+            if item.plan is None:
+                responses.append(self.finalize_response(item.response, started=started, timings=item.timings, query_kind=item.query_kind))
+                continue
+            responses.append(
+                self.finalize_response(
+                    item.response,
+                    started=started,
+                    timings=item.timings,
+                    query_kind=item.query_kind,
+                    retrieval=item.retrieval,
+                    symbol_matches=item.symbol_matches,
+                    sort_by_vector=sort_by_vector,
+                    limit=item.limit,
+                )
+            )
+            record_route(responses[-1], item.route)
+        timings["total"] = elapsed_ms(started)
+        metadata: dict[str, Any] = {
+            "query_count": len(items),
+            "embedded": sum(1 for item in items if item.plan is not None),
+            "graph_lookups": graph_lookups,
+            "timings_ms": {key: round(value, 3) for key, value in timings.items()},
+        }
+        if request_id:
+            metadata["request_id"] = request_id
+        return SearchBatchResponse(responses=responses, metadata=metadata)
+
+    def context_failed(self, entries: Sequence[tuple[SearchResponse, int]], exc: Exception, *, request_id: str | None) -> None:
+        logger.warning(
+            "Context expansion failed: %s",
+            exc,
+            extra={"component": "search", "event": "context_expansion_failed", "request_id": request_id},
+        )
+        for response, _ in entries:
+            response.metadata.setdefault("warnings", []).append("context expansion unavailable")
+
+    def symbol_phase(
+        self,
+        query: str,
+        *,
+        limit: int,
+        filters: dict[str, Any] | None,
+        request_id: str | None,
+        timings: dict[str, float],
+    ) -> tuple[str, list[SymbolMatch], SearchResponse | None]:
+        """Classify the query and consult the symbol index.
+
+        Returns the query kind, any symbol matches to fuse later, and a complete
+        response when the fast path can answer without embedding.
+        """
+
+        query_kind, symbol_terms = classify_query(query)
+        symbol_matches: list[SymbolMatch] = []
+        if self.symbol_index is not None and symbol_terms and not filters:
+            lookup_started = time.perf_counter()
+            symbol_matches = _lookup_symbols(self.symbol_index, symbol_terms, limit=limit)
+            timings["symbol_lookup"] = elapsed_ms(lookup_started)
+            if symbol_matches and query_kind != "mixed":
+                SEARCH_SYMBOL_QUERIES_TOTAL.labels(outcome="fast_path").inc()
+                return query_kind, symbol_matches, self._symbol_response(query, symbol_matches, limit=limit, request_id=request_id)
+            SEARCH_SYMBOL_QUERIES_TOTAL.labels(outcome="merged" if symbol_matches else "miss").inc()
+        return query_kind, symbol_matches, None
+
+    def finalize_response(
+        self,
+        response: SearchResponse,
+        *,
+        started: float,
+        timings: dict[str, float],
+        query_kind: str,
+        retrieval: str | None = None,
+        symbol_matches: Sequence[SymbolMatch] = (),
+        sort_by_vector: bool = False,
+        limit: int = 0,
+    ) -> SearchResponse:
+        """Fuse symbol matches, fold phase timings, and stamp the response metadata."""
+
+        if retrieval is not None:
+            if "graph_prefetch" in timings:
+                # Graph lookups run ahead of phase two but belong to the enrichment phase.
+                timings["enrichment_phase"] = timings.get("enrichment_phase", 0.0) + timings["graph_prefetch"]
+            timings["candidate_phase"] = (
+                timings.get("embed", 0.0) + timings.get("vector_search", 0.0) + timings.pop("candidate_ranking", 0.0)
+            )
+            if symbol_matches and not sort_by_vector:
+                response.results = _fuse_symbol_matches(response.results, symbol_matches, limit=limit)
+                response.metadata["result_count"] = len(response.results)
+                response.metadata["symbol_matches"] = len(symbol_matches)
+            response.metadata["retrieval"] = retrieval
+        timings["total"] = elapsed_ms(started)
+        response.metadata["query_kind"] = query_kind
+        response.metadata["timings_ms"] = {key: round(value, 3) for key, value in timings.items()}
+        return response
+
+    def _symbol_response(
+        self,
+        query: str,
+        matches: Sequence[SymbolMatch],
+        *,
+        limit: int,
+        request_id: str | None,
+    ) -> SearchResponse:
+        results = [_symbol_result(match) for match in matches[:limit]]
+        metadata: dict[str, Any] = {
+            "result_count": len(results),
+            "graph_context_included": False,
+            "warnings": [],
+            "scoring_mode": "symbol",
+            "weight_profile": self.weight_profile,
+            "weights": self._weight_snapshot,
+            "hybrid_weights": {
+                "vector": self.vector_weight,
+                "lexical": self.lexical_weight,
+            },
+            "retrieval": "symbol",
+            "symbol_matches": len(matches),
+        }
+        if request_id:
+            metadata["request_id"] = request_id
+        return SearchResponse(query=query, results=results, metadata=metadata)
+
+    def plan_enrichment(
+        self,
+        limit: int,
+        *,
+        mode: Literal["lazy", "eager"] | None,
+        overfetch_factor: float | None,
+        enrich_top_n: int | None,
+    ) -> EnrichmentPlan:
+        """Resolve per-request enrichment overrides against the configured defaults."""
+
+        resolved_mode = mode or self.enrichment_mode
+        if resolved_mode == "eager":
+            return EnrichmentPlan(mode="eager", candidate_limit=limit, enrich_limit=None, overfetch_factor=1.0)
+
+        factor = self.overfetch_factor if overfetch_factor is None else float(overfetch_factor)
+        factor = max(1.0, min(factor, _MAX_OVERFETCH_FACTOR))
+        candidate_limit = max(limit, min(math.ceil(limit * factor), self.max_limit * _MAX_OVERFETCH_FACTOR))
+        top_n = self.enrich_top_n if enrich_top_n is None else int(enrich_top_n)
+        top_n = max(0, min(top_n, candidate_limit))
+        return EnrichmentPlan(mode="lazy", candidate_limit=candidate_limit, enrich_limit=top_n, overfetch_factor=factor)
+
+    def select_tuning(
+        self,
+        mode: SearchMode,
+        *,
+        query_filter: Filter | None,
+        matching: int | None,
+        total: int | None,
+        candidate_limit: int,
+    ) -> RetrievalTuning:
+        """Scale ``ef`` by the mode and the inverse filter selectivity; brute-force tiny subsets.
+
+        ``balanced`` without filters keeps the configured ``ef``. Adaptive values
+        are rounded up to a power of two (bounding the latency histogram's label
+        set) and capped at ``max_hnsw_ef``.
+        """
+
+        tuning = RetrievalTuning(mode=mode, query_filter=query_filter, matching_points=matching)
+        if matching is not None and total:
+            tuning.selectivity = min(1.0, matching / total)
+        exact_limit = self.exact_search_max_points * (_EXHAUSTIVE_EXACT_FACTOR if mode == "exhaustive" else 1)
+        if matching is not None and matching <= exact_limit:
+            tuning.exact = True
+            return tuning
+        if mode == "balanced" and tuning.selectivity is None:
+            tuning.hnsw_ef = self.hnsw_ef_search
+            return tuning
+        ef = (self.hnsw_ef_search or DEFAULT_HNSW_EF) * _MODE_EF_FACTORS[mode]
+        if tuning.selectivity is not None:
+            ef /= max(tuning.selectivity, _MIN_SELECTIVITY)
+        ef = max(ef, candidate_limit, 1)
+        tuning.hnsw_ef = min(self.max_hnsw_ef, 1 << math.ceil(math.log2(ef)))
+        return tuning
+
+    def selectivity_failed(self, exc: Exception, *, request_id: str | None) -> None:
+        logger.warning(
+            "Filter selectivity estimate failed; using mode defaults: %s",
+            exc,
+            extra={"component": "search", "event": "selectivity_unavailable", "request_id": request_id},
+        )
+
+    def routing_request(self, vector: Sequence[float]) -> dict[str, Any]:
+        return {
+            "collection_name": self.routing_collection,
+            "query": list(vector),
+            "limit": self.routing_top_k + 1,
+            "with_payload": ["subsystem"],
+        }
+
+    def select_route(self, points: Sequence[ScoredPoint]) -> SubsystemRoute:
+        """Route to the ``routing_top_k`` closest subsystems when the match is clear.
+
+        Confidence is the best centroid similarity; it must reach
+        ``routing_min_score`` and the last chosen subsystem must lead the next
+        one by ``routing_min_margin``, otherwise the search stays global.
+        """
+
+        scored = [
+            (str((point.payload or {}).get("subsystem")), float(point.score)) for point in points if (point.payload or {}).get("subsystem")
+        ]
+        if not scored:
+            return SubsystemRoute(outcome="unavailable")
+        top_k = self.routing_top_k
+        chosen = scored[:top_k]
+        route = SubsystemRoute(outcome="routed", subsystems=[name for name, _ in chosen], confidence=chosen[0][1])
+        if chosen[0][1] < self.routing_min_score or len(scored) <= top_k or chosen[-1][1] - scored[top_k][1] < self.routing_min_margin:
+            route.outcome = "low_confidence"
+        return route
+
+    def routing_failed(self, exc: Exception, *, request_id: str | None) -> SubsystemRoute:
+        logger.warning(
+            "Subsystem routing unavailable; searching globally: %s",
+            exc,
+            extra={"component": "search", "event": "routing_unavailable", "request_id": request_id},
+        )
+        return SubsystemRoute(outcome="unavailable")
+
+    def groups_request(
+        self,
+        vector: Sequence[float],
+        *,
+        limit: int,
+        group_size: int,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+    ) -> dict[str, Any]:
+        return {
+            "collection_name": self.collection_name,
+            "group_by": _GROUP_BY_FIELDS["artifact"],
+            "query": list(vector),
+            "query_filter": query_filter,
+            "limit": limit,
+            "group_size": group_size,
+            "with_payload": payload_selector(),
+            "search_params": self.search_params(search_params),
+        }
+
+    def dense_request(
+        self,
+        vector: Sequence[float],
+        *,
+        limit: int,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+    ) -> dict[str, Any]:
+        return {
+            "collection_name": self.collection_name,
+            "query": list(vector),
+            "query_filter": query_filter,
+            "with_payload": payload_selector(),
+            "limit": limit,
+            "search_params": self.search_params(search_params),
+        }
+
+    def hybrid_requests(
+        self,
+        vector: Sequence[float],
+        sparse: SparseEncoding,
+        *,
+        limit: int,
+        with_text: bool = True,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+    ) -> list[QueryRequest]:
+        dense_query = list(vector)
+        sparse_query = SparseVector(indices=sparse.indices, values=sparse.values)
+        prefetch = [
+            Prefetch(query=dense_query, filter=query_filter, limit=limit, params=self.search_params(search_params)),
+            Prefetch(query=sparse_query, using=LEXICAL_VECTOR_NAME, filter=query_filter, limit=limit),
+        ]
+        union_limit = limit * 2
+        return [
+            QueryRequest(
+                prefetch=prefetch,
+                query=dense_query,
+                limit=union_limit,
+                with_payload=payload_selector(with_text=with_text),
+            ),
+            QueryRequest(
+                prefetch=prefetch,
+                query=sparse_query,
+                using=LEXICAL_VECTOR_NAME,
+                limit=union_limit,
+                with_payload=False,
+            ),
+        ]
+
+    def merge_hybrid(self, dense_response: QueryResponse, sparse_response: QueryResponse, *, limit: int) -> list[RetrievedPoint]:
+        sparse_scores = {str(point.id): float(point.score) for point in sparse_response.points}
+        max_sparse = max(sparse_scores.values(), default=0.0)
+
+        retrieved = [
+            RetrievedPoint(
+                payload=point.payload or {},
+                score=float(point.score),
+                lexical_score=(sparse_scores.get(str(point.id), 0.0) / max_sparse) if max_sparse > 0 else 0.0,
+            )
+            for point in dense_response.points
+        ]
+        retrieved.sort(
+            key=lambda item: self.vector_weight * item.score + self.lexical_weight * (item.lexical_score or 0.0),
+            reverse=True,
+        )
+        return retrieved[:limit]
+
+    def search_params(self, override: SearchParams | None = None) -> SearchParams | None:
+        if override is not None:
+            return override
+        return SearchParams(hnsw_ef=self.hnsw_ef_search) if self.hnsw_ef_search is not None else None
+
+    def rank_candidates(
+        self,
+        *,
+        query: str,
+        hits: Iterable[RetrievedPoint],
+        limit: int,
+        plan: EnrichmentPlan,
+        include_graph: bool,
+        graph_available: bool,
+        sort_by_vector: bool,
+        filters: dict[str, Any] | None,
+        timings: dict[str, float],
+    ) -> CandidateRanking:
+        """Phase one: filter and order candidates using vector, lexical, and payload signals."""
+
+        phase_started = time.perf_counter()
+        filter_state = _prepare_filter_state(filters or {})
+        query_tokens = _detect_query_subsystems(query)
+
+        candidates: list[Candidate] = []
+        fetched = 0
+        for point in hits:
+            fetched += 1
+            payload = point.payload
+            if not _passes_payload_filters(payload, filter_state):
+                continue
+            chunk = _build_chunk(payload, point.score)
+            if point.siblings is not None:
+                chunk["sibling_chunk_ids"] = point.siblings
+            lexical_score = point.lexical_score if point.lexical_score is not None else _lexical_score(query, chunk)
+            candidates.append(
+                Candidate(
+                    payload=payload,
+                    vector_score=float(point.score),
+                    lexical_score=lexical_score,
+                    chunk=chunk,
+                )
+            )
+
+        rank_scores = phase_one_scores(
+            [candidate.vector_score for candidate in candidates],
+            [candidate.lexical_score for candidate in candidates],
+            [candidate.chunk for candidate in candidates],
+            weights=self._heuristic_weights,
+            query_tokens=query_tokens,
+            payload_signals=include_graph and graph_available,
+        )
+        for candidate, rank_score in zip(candidates, rank_scores.tolist(), strict=True):
+            candidate.rank_score = rank_score
+        if sort_by_vector:
+            candidates.sort(key=lambda item: item.vector_score, reverse=True)
+        else:
+            candidates.sort(key=lambda item: item.rank_score, reverse=True)
+        timings["candidate_ranking"] = elapsed_ms(phase_started)
+        return CandidateRanking(
+            query=query,
+            candidates=candidates,
+            filter_state=filter_state,
+            query_tokens=query_tokens,
+            fetched=fetched,
+            limit=limit,
+            plan=plan,
+            include_graph=include_graph,
+            graph_available=graph_available,
+            sort_by_vector=sort_by_vector,
+        )
+
+    def candidate_scoring(self, candidate: Candidate) -> dict[str, Any]:
+        """Return the graph-free ``scoring`` block for a phase-one candidate."""
+
+        return base_scoring(
+            vector_score=candidate.vector_score,
+            lexical_score=candidate.lexical_score,
+            weighted_vector=self.vector_weight * candidate.vector_score,
+            weighted_lexical=self.lexical_weight * candidate.lexical_score,
+        )
+
+    def pending_graph_lookups(self, ranking: CandidateRanking) -> list[str]:
+        """Return the node ids :meth:`enrich_candidates` still needs, in candidate order.
+
+        The enrichment head is always looked up. Beyond it, candidates whose filters
+        can only be decided from graph context are looked up while fewer than
+        ``limit`` rows may have survived, counting every unresolved candidate as a
+        survivor. Callers resolve the returned ids into ``ranking.graph_cache`` and
+        ask again until nothing is pending (see :class:`GraphLookupRounds`).
+        """
+
+        if not ranking.graph_available:
+            return []
+        filter_state = ranking.filter_state
+        graph_cache = ranking.graph_cache
+        recency_required = filter_state.recency_cutoff is not None
+        enrich_limit = _enrich_limit(ranking)
+        pending: dict[str, None] = {}
+        survivors = 0
+        unresolved = 0
+        for position, candidate in enumerate(ranking.candidates):
+            if position >= enrich_limit and survivors + unresolved >= ranking.limit:
+                break
+            payload = candidate.payload
+            node_id = graph_node_id(payload)
+            subsystem_value = (payload.get("subsystem") or "").lower()
+            subsystem_match = bool(filter_state.allowed_subsystems and subsystem_value in filter_state.allowed_subsystems)
+            needs_lookup = node_id is not None and (
+                position < enrich_limit
+                or (filter_state.allowed_subsystems and not subsystem_match)
+                or (ranking.include_graph and recency_required and not payload.get("git_timestamp"))
+            )
+            cache_entry = graph_cache.get(node_id) if node_id is not None else None
+            if needs_lookup and cache_entry is None:
+                assert node_id is not None
+                pending.setdefault(node_id, None)
+                unresolved += 1
+                continue
+            graph_context = cache_entry.get("graph_context") if cache_entry is not None else None
+            if _filter_rejection(candidate.chunk, graph_context, filter_state, subsystem_match=subsystem_match) is None:
+                survivors += 1
+        return list(pending)
+
+    def enrich_candidates(
+        self,
+        ranking: CandidateRanking,
+        *,
+        request_id: str | None,
+        timings: dict[str, float],
+    ) -> SearchResponse:
+        """Phase two: attach graph context to the leading candidates, apply filters, and re-rank.
+
+        Graph context comes from ``ranking.graph_cache`` only; resolve
+        :meth:`pending_graph_lookups` first. Candidates whose lookup is still
+        missing are ranked without graph context.
+        """
+
+        candidates = ranking.candidates
+        filter_state = ranking.filter_state
+        query_tokens = ranking.query_tokens
+        graph_context_included = ranking.graph_context_included
+        include_graph = ranking.include_graph
+        limit = ranking.limit
+        plan = ranking.plan
+
+        enrichment_started = time.perf_counter()
+        warnings = ranking.warnings
+        recency_required = filter_state.recency_cutoff is not None
+        enrich_limit = _enrich_limit(ranking)
+        enriched_count = 0
+        rows: list[ScoringRow] = []
+        in_head: list[bool] = []
+
+        for candidate in candidates:
+            payload = candidate.payload
+            chunk = candidate.chunk
+            enrich = enriched_count < enrich_limit
+
+            subsystem_value = (payload.get("subsystem") or "").lower()
+            subsystem_direct_match = bool(filter_state.allowed_subsystems and subsystem_value in filter_state.allowed_subsystems)
+            if not enrich and len(rows) >= limit:
+                needs_lookup = (filter_state.allowed_subsystems and not subsystem_direct_match) or (
+                    include_graph and recency_required and not payload.get("git_timestamp")
+                )
+                if needs_lookup:
+                    # Enough results already survived; avoid graph lookups that only decide filtering.
+                    continue
+            if enrich:
+                enriched_count += 1
+
+            graph_context_internal, path_depth_value = _cached_graph_context(ranking, payload)
+
+            rejection = _filter_rejection(chunk, graph_context_internal, filter_state, subsystem_match=subsystem_direct_match)
+            if rejection == "undated" and not filter_state.recency_warning_emitted:
+                warnings.append("recency filter skipped results lacking timestamps")
+                filter_state.recency_warning_emitted = True
+            if rejection is not None:
+                continue
+
+            rows.append(
+                ScoringRow(
+                    chunk=chunk,
+                    vector_score=candidate.vector_score,
+                    lexical_score=candidate.lexical_score,
+                    graph_context=graph_context_internal,
+                    graph_scored=include_graph and graph_context_internal is not None,
+                    path_depth=path_depth_value,
+                    warnings_count=len(warnings),
+                )
+            )
+            in_head.append(enrich or not graph_context_included)
+
+        # Surviving candidates are scored in one vectorised pass; explanation dicts are
+        # only built for the results actually returned.
+        scored = score_candidates(
+            rows,
+            weights=self._heuristic_weights,
+            query_tokens=query_tokens,
+            graph_context_included=graph_context_included,
+            model=self._model,
+        )
+        if scored.model_error is not None:
+            logger.warning(
+                "Model scoring failed; falling back to heuristic",
+                extra={
+                    "component": "search",
+                    "event": "ml_model_error",
+                    "error": scored.model_error,
+                    "request_id": request_id,
+                },
+            )
+            warnings.append("ml scoring unavailable")
+
+        # Enriched candidates are re-ranked among themselves; the un-enriched tail keeps
+        # its cheaper phase-one ordering behind them.
+        order = scored.order(in_head, sort_by_vector=ranking.sort_by_vector, limit=limit)
+        results = [
+            SearchResult(
+                chunk=rows[index].chunk,
+                graph_context=rows[index].graph_context if include_graph else None,
+                scoring=scored.explain(index, mode=self.scoring_mode, include_graph=include_graph),
+            )
+            for index in order
+        ]
+        timings["enrichment_phase"] = elapsed_ms(enrichment_started)
+
+        for index in order:
+            SEARCH_SCORE_DELTA.observe(scored.score_delta(index))
+
+        metadata: dict[str, Any] = {
+            "result_count": len(results),
+            "graph_context_included": graph_context_included,
+            "warnings": warnings,
+            "scoring_mode": self.scoring_mode,
+            "weight_profile": self.weight_profile,
+            "weights": self._weight_snapshot,
+            "hybrid_weights": {
+                "vector": self.vector_weight,
+                "lexical": self.lexical_weight,
+            },
+            "enrichment": {
+                "mode": plan.mode,
+                "overfetch_factor": plan.overfetch_factor,
+                "enrich_top_n": plan.enrich_limit,
+                "candidates": ranking.fetched,
+                "enriched": enriched_count,
+                "graph_lookups": len(ranking.graph_cache),
+            },
+        }
+        if self.hnsw_ef_search is not None:
+            metadata["hnsw_ef_search"] = self.hnsw_ef_search
+        if filter_state.filters_applied:
+            metadata["filters_applied"] = filter_state.filters_applied
+        if request_id:
+            metadata["request_id"] = request_id
+        return SearchResponse(query=ranking.query, results=results, metadata=metadata)
+
+    def graph_lookup_admitted(self, warnings: list[str]) -> bool:
+        """Ask the circuit breaker whether to look up a node; refusals add one warning per response."""
+
+        if self.graph_breaker is None or self.graph_breaker.allow():
+            return True
+        SEARCH_GRAPH_CACHE_EVENTS.labels(status="skipped").inc()
+        if _GRAPH_BREAKER_WARNING not in warnings:
+            warnings.append(_GRAPH_BREAKER_WARNING)
+        return False
+
+    def record_graph_outcome(self, started: float, exc: Exception | None) -> None:
+        """Report an admitted lookup to the circuit breaker; a missing node is an answer, not a failure."""
+
+        if self.graph_breaker is not None:
+            failed = exc is not None and not isinstance(exc, GraphNotFoundError)
+            self.graph_breaker.record(time.perf_counter() - started, failed=failed)
+
+    def graph_lookup_succeeded(
+        self,
+        node_id: str,
+        node_data: dict[str, Any],
+        *,
+        started: float,
+        request_id: str | None,
+    ) -> dict[str, Any]:
+        """Record a successful node lookup and return its (depth-less) cache entry."""
+
+        cache_entry: dict[str, Any] = {"graph_context": _summarize_graph_context(node_data), "path_depth": None}
+        SEARCH_GRAPH_CACHE_EVENTS.labels(status="miss").inc()
+        lookup_duration = time.perf_counter() - started
+        SEARCH_GRAPH_LOOKUP_SECONDS.observe(lookup_duration)
+        if lookup_duration > self.slow_graph_warn_seconds:
+            logger.warning(
+                "Graph lookup slow",
+                extra={
+                    "component": "search",
+                    "event": "graph_lookup_slow",
+                    "node_id": node_id,
+                    "lookup_seconds": lookup_duration,
+                    "request_id": request_id,
+                },
+            )
+        return cache_entry
+
+    def graph_lookup_failed(
+        self,
+        node_id: str,
+        exc: Exception,
+        *,
+        started: float,
+        request_id: str | None,
+        warnings: list[str],
+    ) -> dict[str, Any]:
+        """Record a failed node lookup, append the user-facing warning, and return an empty entry."""
+
+        SEARCH_GRAPH_LOOKUP_SECONDS.observe(time.perf_counter() - started)
+        SEARCH_GRAPH_CACHE_EVENTS.labels(status="error").inc()
+        if isinstance(exc, GraphServiceError):
+            message, event, warning = "Graph context unavailable", "graph_context_missing", str(exc)
+        else:  # pragma: no cover - defensive
+            message, event, warning = "Unexpected graph error", "graph_context_error", "graph context lookup failed"
+        logger.warning(
+            message,
+            extra={
+                "component": "search",
+                "event": event,
+                "node_id": node_id,
+                "error": str(exc),
+                "request_id": request_id,
+            },
+        )
+        warnings.append(warning)
+        return {"graph_context": None, "path_depth": None}
+
+    def path_depth_failed(
+        self,
+        node_id: str,
+        exc: Exception,
+        *,
+        request_id: str | None,
+        warnings: list[str],
+    ) -> None:
+        if isinstance(exc, GraphServiceError):
+            message, event, warning = "Graph path depth unavailable", "graph_path_depth_missing", "graph path depth unavailable"
+        else:  # pragma: no cover - defensive
+            message, event, warning = "Graph path depth error", "graph_path_depth_error", "graph path depth error"
+        logger.warning(
+            message,
+            extra={
+                "component": "search",
+                "event": event,
+                "node_id": node_id,
+                "error": str(exc),
+                "request_id": request_id,
+            },
+        )
+        warnings.append(warning)
+
+
+GraphEntry = tuple[dict[str, Any], list[str]]
+"""A resolved graph-cache entry and the warnings its lookup produced."""
+
+
+class GraphLookupRounds:
+    """Resolve the graph lookups of one or more rankings in rounds.
+
+    Each round, :meth:`pending` returns the union of node ids the rankings still
+    need (see :meth:`SearchPipeline.pending_graph_lookups`), so a node shared by
+    several rankings is looked up once. The caller fetches them however it likes
+    and passes the entries to :meth:`resolve`; repeat until nothing is pending.
+    """
+
+    def __init__(self, pipeline: SearchPipeline, rankings: Sequence[CandidateRanking]) -> None:
+        self.pipeline = pipeline
+        self.rankings = list(rankings)
+        self.entries: dict[str, GraphEntry] = {}
+
+    def pending(self) -> list[str]:
+        """Return the node ids no earlier round has resolved, in candidate order."""
+
+        fresh: dict[str, None] = {}
+        for ranking in self.rankings:
+            while node_ids := self.pipeline.pending_graph_lookups(ranking):
+                known = [node_id for node_id in node_ids if node_id in self.entries]
+                if not known:
+                    break
+                # Resolved for another ranking in an earlier round: a cache hit here.
+                self._deliver(ranking, known, fresh=set())
+            for node_id in node_ids:
+                fresh.setdefault(node_id, None)
+        return list(fresh)
+
+    def resolve(self, entries: dict[str, GraphEntry]) -> None:
+        """Hand freshly looked-up entries to every ranking waiting on them."""
+
+        self.entries.update(entries)
+        first_use = set(entries)
+        for ranking in self.rankings:
+            waiting = [node_id for node_id in self.pipeline.pending_graph_lookups(ranking) if node_id in entries]
+            self._deliver(ranking, waiting, fresh=first_use)
+
+    def _deliver(self, ranking: CandidateRanking, node_ids: Sequence[str], *, fresh: set[str]) -> None:
+        # Warnings keep candidate order regardless of which lookup finished first.
+        for node_id in node_ids:
+            entry, lookup_warnings = self.entries[node_id]
+            cache_entry = dict(entry)
+            if node_id in fresh:
+                # Already counted as a miss; the first ranking to use it must not count a hit.
+                cache_entry["prefetched"] = True
+                fresh.discard(node_id)
+            ranking.graph_cache[node_id] = cache_entry
+            _extend_warnings(ranking.warnings, lookup_warnings)
+
+
+def _enrich_limit(ranking: CandidateRanking) -> int:
+    """Number of leading candidates that receive graph context (``0`` without graph context)."""
+
+    if not ranking.graph_context_included:
+        return 0
+    return len(ranking.candidates) if ranking.plan.enrich_limit is None else ranking.plan.enrich_limit
+
+
+def _cached_graph_context(ranking: CandidateRanking, payload: dict[str, Any]) -> tuple[dict[str, Any] | None, float | None]:
+    """Return the resolved graph context and path depth for a candidate, if it was looked up."""
+
+    node_id = graph_node_id(payload)
+    cache_entry = ranking.graph_cache.get(node_id) if node_id is not None else None
+    if cache_entry is None:
+        return None, None
+    if not cache_entry.pop("prefetched", False):
+        SEARCH_GRAPH_CACHE_EVENTS.labels(status="hit").inc()
+    return cache_entry.get("graph_context"), cache_entry.get("path_depth")
+
+
+def _extend_warnings(warnings: list[str], lookup_warnings: list[str]) -> None:
+    """Append per-lookup warnings, keeping the circuit-breaker notice to one entry."""
+
+    for warning in lookup_warnings:
+        if warning != _GRAPH_BREAKER_WARNING or warning not in warnings:
+            warnings.append(warning)
+
+
+_PATH_TOKEN = re.compile(r"^[\w.\-]*[\w\-]/[\w./\-]*$|^[\w\-]+\.[A-Za-z][A-Za-z0-9]{0,4}$")
+_IDENTIFIER_TOKEN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*$")
+_CAMEL_CASE = re.compile(r"[a-z0-9][A-Z]|[A-Z]{2}[a-z]")
+
+
+def classify_query(query: str) -> tuple[Literal["identifier", "path", "mixed", "natural"], list[str]]:
+    """Classify a query and return the identifier/path terms worth a symbol lookup.
+
+    A single camelCase, snake_case, dotted, or path-like token is an ``identifier``
+    or ``path`` query; such tokens embedded in prose make the query ``mixed``.
+    """
+
+    tokens = [token.strip("`'\"()[]{},:;") for token in query.split()]
+    tokens = [token for token in tokens if token]
+    terms: list[str] = []
+    kinds: set[str] = set()
+    for token in tokens:
+        if _PATH_TOKEN.match(token):
+            terms.append(token)
+            kinds.add("path")
+        elif _IDENTIFIER_TOKEN.match(token) and ("_" in token.strip("_") or "." in token or _CAMEL_CASE.search(token)):
+            terms.append(token)
+            kinds.add("identifier")
+    if not terms:
+        return "natural", []
+    if len(terms) < len(tokens):
+        return "mixed", terms
+    return ("path" if kinds == {"path"} else "identifier"), terms
+
+
+_COMPACT_CHUNK_FIELDS = (
+    "chunk_id",
+    "artifact_path",
+    "artifact_type",
+    "subsystem",
+    "namespace",
+    "score",
+    "symbol",
+    "sibling_chunk_ids",
+    "context",
+)
+_COMPACT_SCORING_FIELDS = ("adjusted_score", "vector_score", "lexical_score")
+
+
+def project_result(
+    result: SearchResult,
+    verbosity: SearchVerbosity = "full",
+    *,
+    snippet_chars: int | None = None,
+) -> dict[str, Any]:
+    """Shape a result for clients according to ``verbosity``.
+
+    ``full`` returns everything; ``compact`` keeps identifying chunk fields, a text
+    snippet, any expanded context, graph context without its relationship list,
+    and the headline scores; ``ids`` keeps only the chunk identity and final score. ``snippet_chars``
+    truncates text (``0`` disables truncation; ``compact`` defaults to
+    ``DEFAULT_SNIPPET_CHARS``).
+    """
+
+    chunk = result.chunk
+    if verbosity == "ids":
+        ids_chunk = {"chunk_id": chunk.get("chunk_id"), "artifact_path": chunk.get("artifact_path")}
+        if "sibling_chunk_ids" in chunk:
+            ids_chunk["sibling_chunk_ids"] = chunk["sibling_chunk_ids"]
+        return {
+            "chunk": ids_chunk,
+            "graph_context": None,
+            "scoring": {"adjusted_score": result.scoring.get("adjusted_score")},
+        }
+    if verbosity == "full":
+        if snippet_chars:
+            chunk = {**chunk, "text": _snippet(chunk.get("text"), snippet_chars)}
+        return {"chunk": chunk, "graph_context": result.graph_context, "scoring": result.scoring}
+
+    limit = DEFAULT_SNIPPET_CHARS if snippet_chars is None else snippet_chars
+    compact_chunk = {name: chunk[name] for name in _COMPACT_CHUNK_FIELDS if name in chunk}
+    compact_chunk["text"] = _snippet(chunk.get("text"), limit) if limit else chunk.get("text")
+    graph_context = result.graph_context
+    if graph_context is not None:
+        graph_context = {key: value for key, value in graph_context.items() if key != "relationships"}
+    scoring = {name: result.scoring[name] for name in _COMPACT_SCORING_FIELDS if name in result.scoring}
+    return {"chunk": compact_chunk, "graph_context": graph_context, "scoring": scoring}
+
+
+def _snippet(text: object, limit: int) -> object:
+    if not isinstance(text, str) or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + "…"
+
+
+def _lookup_symbols(index: SymbolIndex, terms: Sequence[str], *, limit: int) -> list[SymbolMatch]:
+    """Look up each identifier term, keeping the best match per chunk."""
+
+    best: dict[str, SymbolMatch] = {}
+    for term in terms:
+        matches = index.lookup(term, limit=limit)
+        if not matches and "." in term and "/" not in term:
+            # Dotted module paths map onto file paths; qualified names onto their last segment.
+            matches = index.lookup(term.replace(".", "/"), limit=limit)
+            matches = matches or index.lookup(term.rsplit(".", 1)[-1], limit=limit)
+        for match in matches:
+            current = best.get(match.entry.chunk_id)
+            if current is None or match.score > current.score:
+                best[match.entry.chunk_id] = match
+    ordered = sorted(best.values(), key=lambda item: item.score, reverse=True)
+    return ordered[:limit]
+
+
+def _symbol_result(match: SymbolMatch) -> SearchResult:
+    entry = match.entry
+    chunk = {
+        "chunk_id": entry.chunk_id,
+        "artifact_path": entry.path,
+        "artifact_type": entry.artifact_type,
+        "subsystem": entry.subsystem,
+        "namespace": None,
+        "tags": None,
+        "text": entry.snippet,
+        "coverage_missing": False,
+        "score": match.score,
+        "subsystem_criticality": None,
+        "coverage_ratio": None,
+        "git_timestamp": None,
+        "symbol": {"name": entry.symbol, "kind": entry.kind, "line": entry.line, "match": match.match},
+    }
+    scoring: dict[str, Any] = {
+        "mode": "symbol",
+        "vector_score": 0.0,
+        "lexical_score": 0.0,
+        "adjusted_score": match.score,
+        "symbol_score": match.score,
+        "symbol_match": match.match,
+        "signals": {"symbol_score": match.score},
+        "graph_enriched": False,
+    }
+    return SearchResult(chunk=chunk, graph_context=None, scoring=scoring)
+
+
+def _fuse_symbol_matches(
+    results: Sequence[SearchResult],
+    matches: Sequence[SymbolMatch],
+    *,
+    limit: int,
+) -> list[SearchResult]:
+    """Reciprocal-rank fuse hybrid results with symbol matches (weighted by match quality)."""
+
+    fused: dict[str, tuple[float, SearchResult]] = {}
+    for rank, result in enumerate(results):
+        key = str(result.chunk.get("chunk_id"))
+        fused[key] = (1.0 / (_SYMBOL_RRF_K + rank + 1), result)
+    for rank, match in enumerate(matches):
+        key = match.entry.chunk_id
+        contribution = match.score / (_SYMBOL_RRF_K + rank + 1)
+        if key in fused:
+            score, result = fused[key]
+            result.scoring["symbol_score"] = match.score
+            result.scoring["symbol_match"] = match.match
+            result.chunk.setdefault(
+                "symbol",
+                {"name": match.entry.symbol, "kind": match.entry.kind, "line": match.entry.line, "match": match.match},
+            )
+            fused[key] = (score + contribution, result)
+        else:
+            fused[key] = (contribution, _symbol_result(match))
+    ordered = sorted(fused.values(), key=lambda item: item[0], reverse=True)[:limit]
+    for score, result in ordered:
+        result.scoring["fusion_score"] = score
+    return [result for _, result in ordered]
+
+
+def elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000.0
+
+
+def graph_node_id(payload: dict[str, Any]) -> str | None:
+    path = payload.get("path")
+    if not path:
+        return None
+    return f"{_label_for_artifact(payload.get('artifact_type'))}:{path}"
+
+
+def _label_for_artifact(artifact_type: str | None) -> str:
+    mapping = {
+        "doc": "DesignDoc",
+        "code": "SourceFile",
+        "test": "TestCase",
+        "proto": "SourceFile",
+        "config": "SourceFile",
+    }
+    return mapping.get(artifact_type or "", "SourceFile")
+
+
+def _summarize_graph_context(data: dict[str, Any]) -> dict[str, Any]:
+    node = data.get("node", {})
+    relationships = data.get("relationships", [])
+
+    neighbor_subsystems = sorted(
+        {
+            rel.get("target", {}).get("properties", {}).get("name")
+            for rel in relationships
+            if "Subsystem" in rel.get("target", {}).get("labels", [])
+        }
+        - {None}
+    )
+
+    related_artifacts = [
+        {
+            "id": rel.get("target", {}).get("id"),
+            "relationship": rel.get("type"),
+        }
+        for rel in relationships
+        if rel.get("type") in {"DESCRIBES", "VALIDATES"}
+    ]
+
+    return {
+        "primary_node": node,
+        "relationships": relationships,
+        "neighbor_subsystems": neighbor_subsystems,
+        "related_artifacts": related_artifacts,
+    }
+
+
+def _filter_rejection(
+    chunk: dict[str, Any],
+    graph_context: dict[str, Any] | None,
+    filter_state: FilterState,
+    *,
+    subsystem_match: bool,
+) -> Literal["subsystem", "undated", "stale"] | None:
+    """Return why the subsystem/recency filters drop a candidate, or ``None`` when it survives."""
+
+    if filter_state.allowed_subsystems and not subsystem_match:
+        if not _subsystems_from_context(graph_context).intersection(filter_state.allowed_subsystems):
+            return "subsystem"
+    if filter_state.recency_cutoff is not None:
+        chunk_datetime = _resolve_chunk_datetime(chunk, graph_context)
+        if chunk_datetime is None:
+            return "undated"
+        if chunk_datetime < filter_state.recency_cutoff:
+            return "stale"
+    return None
+
+
+def _subsystems_from_context(graph_context: dict[str, Any] | None) -> set[str]:
+    if not graph_context:
+        return set()
+    subsystems: set[str] = set()
+    primary = graph_context.get("primary_node", {})
+    props = primary.get("properties") or {}
+    for key in ("subsystem", "name"):
+        value = props.get(key)
+        if isinstance(value, str) and value.strip():
+            subsystems.add(value.strip().lower())
+            break
+    neighbor = graph_context.get("neighbor_subsystems") or []
+    for value in neighbor:
+        if isinstance(value, str) and value.strip():
+            subsystems.add(value.strip().lower())
+    return subsystems
+
+
+def _detect_query_subsystems(query: str) -> set[str]:
+    tokens = {token for token in re.split(r"[^a-zA-Z0-9]+", query.lower()) if token}
+    return tokens
+
+
+def _normalise_hybrid_weights(vector_weight: float, lexical_weight: float) -> tuple[float, float]:
+    vector = max(0.0, float(vector_weight))
+    lexical = max(0.0, float(lexical_weight))
+    if (vector + lexical) <= 0.0:
+        vector = 1.0
+    return vector, lexical
+
+
+def _prepare_filter_state(filters: dict[str, Any]) -> FilterState:
+    if not isinstance(filters, dict):
+        filters = dict(filters) if hasattr(filters, "items") else {}
+
+    raw_subsystems = filters.get("subsystems") or []
+    raw_types = filters.get("artifact_types") or []
+    raw_namespaces = filters.get("namespaces") or []
+    raw_tags = filters.get("tags") or []
+    updated_after_filter = filters.get("updated_after")
+    max_age_filter = filters.get("max_age_days")
+
+    allowed_subsystems = {str(value).strip().lower() for value in raw_subsystems if isinstance(value, str)}
+    allowed_types = {str(value).strip().lower() for value in raw_types if isinstance(value, str)}
+    allowed_namespaces = {str(value).strip().lower() for value in raw_namespaces if isinstance(value, str)}
+    allowed_tags = {str(value).strip().lower() for value in raw_tags if isinstance(value, str)}
+
+    parsed_updated_after: datetime | None = None
+    if isinstance(updated_after_filter, datetime):
+        parsed_updated_after = updated_after_filter.astimezone(UTC)
+    elif isinstance(updated_after_filter, str):
+        parsed_updated_after = _parse_iso_datetime(updated_after_filter)
+
+    recency_cutoff: datetime | None = parsed_updated_after
+    recency_max_age_days: float | None = None
+    if max_age_filter is not None:
+        try:
+            recency_max_age_days = float(max_age_filter)
+        except (TypeError, ValueError):
+            recency_max_age_days = None
+    if recency_max_age_days is not None:
+        now = datetime.now(UTC)
+        age_cutoff = now - timedelta(days=recency_max_age_days)
+        if recency_cutoff is None or age_cutoff > recency_cutoff:
+            recency_cutoff = age_cutoff
+
+    filters_applied: dict[str, Any] = {}
+    if allowed_subsystems:
+        filters_applied["subsystems"] = sorted(
+            {str(value).strip() for value in raw_subsystems if isinstance(value, str) and value.strip()},
+        )
+    if allowed_types:
+        filters_applied["artifact_types"] = sorted(
+            {str(value).strip().lower() for value in raw_types if isinstance(value, str) and value.strip()},
+        )
+    if allowed_namespaces:
+        filters_applied["namespaces"] = sorted(
+            {str(value).strip() for value in raw_namespaces if isinstance(value, str) and value.strip()},
+        )
+    if allowed_tags:
+        filters_applied["tags"] = sorted(
+            {str(value).strip() for value in raw_tags if isinstance(value, str) and value.strip()},
+        )
+    if parsed_updated_after is not None:
+        filters_applied["updated_after"] = parsed_updated_after.astimezone(UTC).isoformat()
+    if max_age_filter is not None:
+        try:
+            filters_applied["max_age_days"] = int(max_age_filter)
+        except (TypeError, ValueError):  # pragma: no cover - defensive
+            pass
+
+    return FilterState(
+        allowed_subsystems=allowed_subsystems,
+        allowed_types=allowed_types,
+        allowed_namespaces=allowed_namespaces,
+        allowed_tags=allowed_tags,
+        filters_applied=filters_applied,
+        recency_cutoff=recency_cutoff,
+    )
+
+
+def _passes_payload_filters(payload: dict[str, Any], state: FilterState) -> bool:
+    artifact_type = (payload.get("artifact_type") or "").lower()
+    if state.allowed_types and artifact_type not in state.allowed_types:
+        return False
+
+    namespace_value = (payload.get("namespace") or "").strip().lower()
+    if state.allowed_namespaces and namespace_value not in state.allowed_namespaces:
+        return False
+
+    if state.allowed_tags:
+        payload_tags = _normalise_payload_tags(payload.get("tags"))
+        if not payload_tags.intersection(state.allowed_tags):
+            return False
+
+    return True
+
+
+def _normalise_payload_tags(raw_tags: Sequence[object] | set[object] | None) -> set[str]:
+    if isinstance(raw_tags, (list, tuple, set)):
+        return {str(tag).strip().lower() for tag in raw_tags if str(tag).strip()}
+    return set()
+
+
+def group_size_for(group_by: SearchGroupBy | None, group_siblings: int) -> int | None:
+    """Return the Qdrant ``group_size`` for a grouping request (``None`` when ungrouped)."""
+
+    if group_by is None:
+        return None
+    return 1 + max(0, min(int(group_siblings), MAX_GROUP_SIBLINGS))
+
+
+def split_grouped(
+    items: Sequence[BatchItem],
+    vectors: Sequence[Sequence[float]],
+) -> tuple[list[tuple[BatchItem, Sequence[float], int]], list[BatchItem], list[Sequence[float]]]:
+    """Separate grouped batch items (with their group size) from those sharing one batched request."""
+
+    grouped: list[tuple[BatchItem, Sequence[float], int]] = []
+    shared: list[BatchItem] = []
+    shared_vectors: list[Sequence[float]] = []
+    for item, vector in zip(items, vectors, strict=True):
+        group_size = group_size_for(item.request.group_by, item.request.group_siblings)
+        if group_size is None:
+            shared.append(item)
+            shared_vectors.append(vector)
+        else:
+            grouped.append((item, vector, group_size))
+    return grouped, shared, shared_vectors
+
+
+def grouped_points(result: GroupsResult, *, group_size: int) -> list[RetrievedPoint]:
+    """Flatten grouped hits to one point per group, best chunk first."""
+
+    points: list[RetrievedPoint] = []
+    for group in result.groups:
+        if not group.hits:
+            continue
+        best, *others = group.hits
+        siblings = [str((hit.payload or {}).get("chunk_id")) for hit in others] if group_size > 1 else None
+        points.append(RetrievedPoint(payload=best.payload or {}, score=float(best.score), siblings=siblings))
+    return points
+
+
+def retrieval_filter(filters: dict[str, Any] | None) -> Filter | None:
+    """Return the Qdrant filter for request filters that match payload values exactly.
+
+    Only artifact types qualify (ingest stores them lower-cased); the other
+    filters are case-insensitive or graph-aware and stay post-retrieval checks.
+    """
+
+    types = sorted({str(value).strip().lower() for value in (filters or {}).get("artifact_types") or [] if str(value).strip()})
+    if not types:
+        return None
+    return Filter(must=[FieldCondition(key="artifact_type", match=MatchAny(any=types))])
+
+
+def merge_filters(*filters: Filter | None) -> Filter | None:
+    conditions = [condition for query_filter in filters if query_filter is not None for condition in query_filter.must or []]
+    return Filter(must=conditions) if conditions else None
+
+
+def record_tuning(response: SearchResponse, tuning: RetrievalTuning, retrieval_ms: float) -> None:
+    SEARCH_RETRIEVAL_SECONDS.labels(mode=tuning.mode, ef=tuning.latency_label()).observe(retrieval_ms / 1000.0)
+    response.metadata["search_mode"] = tuning.as_metadata()
+    if tuning.hnsw_ef is not None:
+        response.metadata["hnsw_ef_search"] = tuning.hnsw_ef
+    else:
+        response.metadata.pop("hnsw_ef_search", None)
+
+
+def record_route(response: SearchResponse, route: SubsystemRoute | None) -> None:
+    if route is None:
+        return
+    SEARCH_ROUTING_TOTAL.labels(outcome=route.outcome).inc()
+    response.metadata["routing"] = route.as_metadata()
+
+
+def seed_scroll(chunk_ids: Sequence[str]) -> dict[str, Any]:
+    """Build the ``scroll`` request resolving seed chunk ids to stored points."""
+
+    return {
+        "scroll_filter": Filter(must=[FieldCondition(key="chunk_id", match=MatchAny(any=list(chunk_ids)))]),
+        "limit": len(chunk_ids),
+        "with_payload": ["chunk_id", "text"],
+        "with_vectors": False,
+    }
+
+
+def seed_query(seeds: Sequence[Record]) -> str:
+    """Return the seed text used in place of a query for lexical scoring."""
+
+    return "\n".join(str((record.payload or {}).get("text") or "") for record in seeds)
+
+
+def label_similar(response: SearchResponse, chunk_ids: Sequence[str], seeds: Sequence[Record]) -> SearchResponse:
+    """Replace the seed-text query with the seed ids and report ids that matched nothing."""
+
+    found = {str((record.payload or {}).get("chunk_id")) for record in seeds}
+    missing = [chunk_id for chunk_id in chunk_ids if chunk_id not in found]
+    response.query = " ".join(chunk_ids)
+    response.metadata["seed_chunk_ids"] = [chunk_id for chunk_id in chunk_ids if chunk_id in found]
+    if missing:
+        response.metadata["missing_chunk_ids"] = missing
+        response.metadata.setdefault("warnings", []).append(f"No stored chunk for {len(missing)} seed id(s)")
+    return response
+
+
+def _chunk_position(chunk: dict[str, Any]) -> tuple[str, int] | None:
+    """Return ``(path, chunk_index)`` parsed from a ``path::index`` chunk id."""
+
+    chunk_id = chunk.get("chunk_id")
+    if not isinstance(chunk_id, str):
+        return None
+    path, _, index = chunk_id.rpartition("::")
+    if not path or not index.isdigit():
+        return None
+    return path, int(index)
+
+
+def _context_windows(entries: Sequence[tuple[SearchResponse, int]]) -> dict[str, list[tuple[int, int]]]:
+    """Merge each result's ``chunk_index ± radius`` window into disjoint ranges per path."""
+
+    spans: dict[str, list[tuple[int, int]]] = {}
+    for response, radius in entries:
+        for result in response.results:
+            position = _chunk_position(result.chunk)
+            if position is None:
+                continue
+            path, index = position
+            spans.setdefault(path, []).append((max(0, index - radius), index + radius))
+    windows: dict[str, list[tuple[int, int]]] = {}
+    for path, ranges in spans.items():
+        ranges.sort()
+        merged = [ranges[0]]
+        for low, high in ranges[1:]:
+            if low <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+            else:
+                merged.append((low, high))
+        windows[path] = merged
+    return windows
+
+
+def context_scroll(entries: Sequence[tuple[SearchResponse, int]]) -> dict[str, Any] | None:
+    """Build the single ``scroll`` request that fetches every neighbour window."""
+
+    windows = _context_windows(entries)
+    if not windows:
+        return None
+    scroll_filter = Filter(
+        should=[
+            Filter(
+                must=[
+                    FieldCondition(key="path", match=MatchValue(value=path)),
+                    FieldCondition(key="chunk_index", range=Range(gte=low, lte=high)),
+                ]
+            )
+            for path, ranges in windows.items()
+            for low, high in ranges
+        ]
+    )
+    limit = sum(high - low + 1 for ranges in windows.values() for low, high in ranges)
+    return {
+        "scroll_filter": scroll_filter,
+        "limit": limit,
+        "with_payload": list(_CONTEXT_PAYLOAD_FIELDS),
+        "with_vectors": False,
+    }
+
+
+def attach_context(
+    entries: Sequence[tuple[SearchResponse, int]],
+    records: Sequence[Record],
+    *,
+    overlap: int,
+    started: float,
+) -> float:
+    """Stitch fetched neighbours into ``chunk["context"]`` and record the timing."""
+
+    texts: dict[tuple[str, int], tuple[str, str]] = {}
+    for record in records:
+        payload = record.payload or {}
+        path = payload.get("path")
+        index = payload.get("chunk_index")
+        if isinstance(path, str) and isinstance(index, int):
+            texts[(path, index)] = (str(payload.get("chunk_id") or f"{path}::{index}"), str(payload.get("text") or ""))
+
+    for response, radius in entries:
+        for result in response.results:
+            position = _chunk_position(result.chunk)
+            if position is None:
+                continue
+            path, index = position
+            window = [(i, texts[(path, i)]) for i in range(max(0, index - radius), index + radius + 1) if (path, i) in texts]
+            if not window:
+                continue
+            result.chunk["context"] = {
+                "start_index": window[0][0],
+                "end_index": window[-1][0],
+                "chunk_ids": [chunk_id for _, (chunk_id, _) in window],
+                "text": _stitch_chunks([(i, text) for i, (_, text) in window], overlap=overlap),
+            }
+
+    elapsed = elapsed_ms(started)
+    for response, radius in entries:
+        timings = response.metadata.setdefault("timings_ms", {})
+        timings["context_expansion"] = round(elapsed, 3)
+        timings["total"] = round(timings.get("total", 0.0) + elapsed, 3)
+        response.metadata["expand_context"] = radius
+    return elapsed
+
+
+def _stitch_chunks(pieces: Sequence[tuple[int, str]], *, overlap: int) -> str:
+    """Join consecutive chunk texts, dropping the prefix each repeats from its predecessor.
+
+    Consecutive chunks share ``overlap`` characters (fewer near the end of a
+    file); the shared prefix is only dropped when it actually matches, and a
+    missing chunk index is marked with an ellipsis line.
+    """
+
+    text = ""
+    previous: int | None = None
+    for index, piece in pieces:
+        if previous is None:
+            text = piece
+        elif index != previous + 1:
+            text += "\n…\n" + piece
+        else:
+            shared = min(overlap, len(text), len(piece))
+            text += piece[shared:] if shared and text.endswith(piece[:shared]) else piece
+        previous = index
+    return text
+
+
+def batch_context_entries(batch: SearchBatchResponse, requests: Sequence[SearchRequest]) -> list[tuple[SearchResponse, int]]:
+    return [
+        (response, request.expand_context if request.verbosity != "ids" else 0)
+        for response, request in zip(batch.responses, requests, strict=True)
+    ]
+
+
+def record_batch_context(batch: SearchBatchResponse, elapsed: float | None) -> None:
+    if elapsed is None:
+        return
+    timings = batch.metadata.setdefault("timings_ms", {})
+    timings["context_expansion"] = round(elapsed, 3)
+    timings["total"] = round(timings.get("total", 0.0) + elapsed, 3)
+
+
+def payload_selector(*, with_text: bool = True) -> list[str]:
+    """Return the Qdrant ``with_payload`` include-list for search retrieval."""
+
+    return [name for name in _SEARCH_PAYLOAD_FIELDS if with_text or name != "text"]
+
+
+def _build_chunk(payload: dict[str, Any], score: float) -> dict[str, Any]:
+    return {
+        "chunk_id": payload.get("chunk_id"),
+        "artifact_path": payload.get("path"),
+        "artifact_type": payload.get("artifact_type"),
+        "subsystem": payload.get("subsystem"),
+        "namespace": payload.get("namespace"),
+        "tags": payload.get("tags"),
+        "text": payload.get("text"),
+        "coverage_missing": bool(payload.get("coverage_missing")),
+        "score": score,
+        "subsystem_criticality": payload.get("subsystem_criticality"),
+        "coverage_ratio": payload.get("coverage_ratio"),
+        "git_timestamp": payload.get("git_timestamp"),
+    }
+
+
+_TOKEN_PATTERN = re.compile(r"\w+", flags=re.ASCII)
+
+
+def _lexical_score(query: str, chunk: dict[str, Any]) -> float:
+    query_terms = {_token for _token in _TOKEN_PATTERN.findall(query.lower()) if _token}
+    if not query_terms:
+        return 0.0
+
+    doc_tokens: set[str] = set()
+    text = chunk.get("text") or ""
+    doc_tokens.update(_TOKEN_PATTERN.findall(text.lower()))
+    artifact_path = chunk.get("artifact_path") or ""
+    doc_tokens.update(_TOKEN_PATTERN.findall(str(artifact_path).lower()))
+    tags = chunk.get("tags")
+    if isinstance(tags, (list, tuple)):
+        doc_tokens.update(_TOKEN_PATTERN.findall(" ".join(str(tag).lower() for tag in tags)))
+    elif isinstance(tags, str):
+        doc_tokens.update(_TOKEN_PATTERN.findall(tags.lower()))
+
+    doc_tokens = {token for token in doc_tokens if token}
+    if not doc_tokens:
+        return 0.0
+
+    matches = 0.0
+    for term in query_terms:
+        if term in doc_tokens:
+            matches += 1.0
+        else:
+            # Partial overlap bonus
+            if any(term in token or token in term for token in doc_tokens):
+                matches += 0.5
+
+    score = matches / len(query_terms)
+    return max(0.0, min(1.0, score))
+
+
+def _resolve_chunk_datetime(
+    chunk: dict[str, Any],
+    graph_context: dict[str, Any] | None,
+) -> datetime | None:
+    candidates = [
+        chunk.get("git_timestamp"),
+        chunk.get("last_modified"),
+        chunk.get("last_modified_at"),
+        chunk.get("updated_at"),
+    ]
+    if graph_context:
+        primary = graph_context.get("primary_node", {})
+        props = primary.get("properties") or {}
+        candidates.extend(
+            [
+                props.get("git_timestamp"),
+                props.get("last_modified"),
+                props.get("updated_at"),
+            ]
+        )
+    for value in candidates:
+        parsed = _parse_iso_datetime(value)
+        if parsed is not None:
+            return parsed
+    return None
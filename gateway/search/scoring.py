@@ -0,0 +1,475 @@
+"""Columnar scoring for search candidates.
+
+Signals for every surviving candidate are gathered into NumPy columns so the
+heuristic and linear-model scores are computed for the whole set in one pass.
+Explanation dicts (the ``scoring`` block of each result) are only materialised
+for the results a response actually returns.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from gateway.search.trainer import ModelArtifact
+
+FloatArray = npt.NDArray[np.float64]
+
+
+@dataclass(slots=True)
+class CoverageInfo:
+    """Coverage characteristics used during scoring."""
+
+    ratio: float
+    penalty: float
+    missing_flag: float
+
+
+@dataclass(slots=True, frozen=True)
+class HeuristicWeights:
+    """Weights applied by the heuristic scorer."""
+
+    vector: float
+    lexical: float
+    subsystem: float
+    relationship: float
+    support: float
+    coverage_penalty: float
+    criticality: float
+
+
+@dataclass(slots=True, frozen=True)
+class LinearModel:
+    """Linear ranking model with coefficients aligned to ``feature_names``."""
+
+    feature_names: tuple[str, ...]
+    coefficients: FloatArray
+    intercept: float
+
+    @classmethod
+    def from_artifact(cls, artifact: ModelArtifact) -> LinearModel:
+        names = list(getattr(artifact, "feature_names", []))
+        coefficients = list(getattr(artifact, "coefficients", []))
+        # Mirrors zip(): a mismatched artifact scores the overlapping prefix only.
+        width = min(len(names), len(coefficients))
+        return cls(
+            feature_names=tuple(names[:width]),
+            coefficients=np.asarray(coefficients[:width], dtype=np.float64),
+            intercept=float(getattr(artifact, "intercept", 0.0)),
+        )
+
+
+@dataclass(slots=True)
+class ScoringRow:
+    """One candidate that survived filtering, with the context scoring needs."""
+
+    chunk: dict[str, Any]
+    vector_score: float
+    lexical_score: float
+    graph_context: dict[str, Any] | None
+    graph_scored: bool
+    path_depth: float | None
+    warnings_count: int
+
+
+class ScoredCandidates:
+    """Scores for a candidate set, with explanations built on demand."""
+
+    def __init__(
+        self,
+        rows: Sequence[ScoringRow],
+        *,
+        weights: HeuristicWeights,
+        query_tokens: set[str],
+        graph_context_included: bool,
+        model: LinearModel | None,
+    ) -> None:
+        self.rows = rows
+        self.model = model
+        self.model_error: str | None = None
+        count = len(rows)
+
+        self.vector = np.fromiter((row.vector_score for row in rows), dtype=np.float64, count=count)
+        self.lexical = np.fromiter((row.lexical_score for row in rows), dtype=np.float64, count=count)
+        self.graph_scored = np.fromiter((row.graph_scored for row in rows), dtype=np.bool_, count=count)
+        self.weighted_vector = weights.vector * self.vector
+        self.weighted_lexical = weights.lexical * self.lexical
+        self.base = self.weighted_vector + self.weighted_lexical
+
+        # Graph-derived signals only exist for rows scored with graph context.
+        self.subsystem_affinity = np.zeros(count)
+        self.relationship_count = np.zeros(count)
+        self.supporting_bonus = np.zeros(count)
+        self.coverage_missing = np.zeros(count)
+        self.coverage_ratio = np.zeros(count)
+        self.coverage_penalty = np.zeros(count)
+        self.criticality = np.zeros(count)
+        for index in np.flatnonzero(self.graph_scored).tolist():
+            row = rows[index]
+            context = row.graph_context or {}
+            coverage = _calculate_coverage_info(row.chunk, weights.coverage_penalty)
+            self.subsystem_affinity[index] = _calculate_subsystem_affinity((row.chunk.get("subsystem") or "").lower(), query_tokens)
+            self.relationship_count[index] = len(context.get("relationships", []))
+            self.supporting_bonus[index] = _calculate_supporting_bonus(context.get("related_artifacts", []))
+            self.coverage_missing[index] = coverage.missing_flag
+            self.coverage_ratio[index] = coverage.ratio
+            self.coverage_penalty[index] = coverage.penalty
+            self.criticality[index] = _calculate_criticality_score(row.chunk, context)
+
+        graph_adjusted = (
+            self.base
+            + weights.subsystem * self.subsystem_affinity
+            + weights.relationship * np.minimum(self.relationship_count, 5)
+            + weights.support * self.supporting_bonus
+            + weights.criticality * self.criticality
+            - self.coverage_penalty
+        )
+        self.heuristic = np.where(self.graph_scored, graph_adjusted, self.base)
+        self.adjusted = self.heuristic
+        self.model_scores: FloatArray | None = None
+        self.contributions: FloatArray | None = None
+        if model is not None:
+            self._apply_model(model, graph_context_included=graph_context_included)
+
+    def _apply_model(self, model: LinearModel, *, graph_context_included: bool) -> None:
+        features = self._model_features(graph_context_included=graph_context_included)
+        missing = [name for name in model.feature_names if name not in features]
+        if missing:
+            self.model_error = f"Missing features for model scoring: {missing}"
+            return
+        columns = [features[name] for name in model.feature_names]
+        matrix = np.column_stack(columns) if columns else np.zeros((len(self.rows), 0))
+        contributions = matrix * model.coefficients
+        scores = np.full(len(self.rows), model.intercept)
+        # Accumulate column by column so scores match a sequential per-hit sum exactly.
+        for column in contributions.T:
+            scores = scores + column
+        self.contributions = contributions
+        self.model_scores = scores
+        self.adjusted = scores
+
+    def _model_features(self, *, graph_context_included: bool) -> dict[str, FloatArray]:
+        rows = self.rows
+        count = len(rows)
+        signal_ratio = np.fromiter((_coverage_ratio_signal(self, index) or 0.0 for index in range(count)), dtype=np.float64, count=count)
+        signal_criticality = np.fromiter(
+            (
+                self.criticality[index] if self.graph_scored[index] else _calculate_criticality_score(row.chunk, row.graph_context)
+                for index, row in enumerate(rows)
+            ),
+            dtype=np.float64,
+            count=count,
+        )
+        path_depth = np.fromiter((_path_depth_signal(row) for row in rows), dtype=np.float64, count=count)
+        return {
+            "vector_score": self.vector,
+            "lexical_score": self.lexical,
+            "weighted_vector_score": self.weighted_vector,
+            "weighted_lexical_score": self.weighted_lexical,
+            "signal_subsystem_affinity": self.subsystem_affinity,
+            "signal_relationship_count": self.relationship_count,
+            "signal_supporting_bonus": self.supporting_bonus,
+            "signal_coverage_missing": self.coverage_missing,
+            "signal_coverage_ratio": signal_ratio,
+            "signal_criticality_score": signal_criticality,
+            "signal_path_depth": path_depth,
+            "graph_context_present": np.fromiter((1.0 if row.graph_context else 0.0 for row in rows), dtype=np.float64, count=count),
+            "metadata_graph_context_included": np.full(count, 1.0 if graph_context_included else 0.0),
+            "metadata_warnings_count": np.fromiter((float(row.warnings_count) for row in rows), dtype=np.float64, count=count),
+        }
+
+    def order(self, head: Sequence[bool], *, sort_by_vector: bool, limit: int) -> list[int]:
+        """Return row indices in result order: sorted head rows, then sorted tail rows, truncated to ``limit``."""
+
+        key = self.vector if sort_by_vector else self.adjusted
+        head_mask = np.asarray(head, dtype=np.bool_)
+        ordered: list[int] = []
+        for mask in (head_mask, ~head_mask):
+            indices = np.flatnonzero(mask)
+            # Stable descending sort keeps phase-one order among ties, as list.sort(reverse=True) does.
+            ordered.extend(int(index) for index in indices[np.argsort(-key[indices], kind="stable")])
+            if len(ordered) >= limit:
+                break
+        return ordered[:limit]
+
+    def score_delta(self, index: int) -> float:
+        return float(self.adjusted[index] - self.base[index])
+
+    def explain(self, index: int, *, mode: str, include_graph: bool) -> dict[str, Any]:
+        """Materialise the ``scoring`` block for one row."""
+
+        row = self.rows[index]
+        scoring = base_scoring(
+            vector_score=row.vector_score,
+            lexical_score=row.lexical_score,
+            weighted_vector=float(self.weighted_vector[index]),
+            weighted_lexical=float(self.weighted_lexical[index]),
+        )
+        signals = scoring["signals"]
+        if self.graph_scored[index]:
+            scoring["adjusted_score"] = float(self.heuristic[index])
+            signals.update(
+                {
+                    "subsystem_affinity": float(self.subsystem_affinity[index]),
+                    "relationship_count": int(self.relationship_count[index]),
+                    "supporting_bonus": float(self.supporting_bonus[index]),
+                    "coverage_missing": float(self.coverage_missing[index]),
+                    "coverage_ratio": float(self.coverage_ratio[index]),
+                    "criticality_score": float(self.criticality[index]),
+                    "coverage_penalty": float(self.coverage_penalty[index]),
+                }
+            )
+        signals["path_depth"] = _path_depth_signal(row)
+        if "criticality_score" not in signals:
+            signals["criticality_score"] = _calculate_criticality_score(row.chunk, row.graph_context)
+        signals.setdefault("subsystem_criticality", signals.get("criticality_score"))
+        signals["freshness_days"] = _compute_freshness_days(row.chunk, row.graph_context)
+        if "coverage_ratio" not in signals:
+            signals["coverage_ratio"] = _coverage_ratio_signal(self, index)
+        scoring["graph_enriched"] = include_graph and row.graph_context is not None
+        scoring["mode"] = mode
+        if self.model is not None and self.model_scores is not None and self.contributions is not None:
+            scoring["model"] = {
+                "score": float(self.model_scores[index]),
+                "intercept": self.model.intercept,
+                "contributions": {
+                    name: float(value) for name, value in zip(self.model.feature_names, self.contributions[index], strict=True)
+                },
+            }
+            scoring["adjusted_score"] = float(self.model_scores[index])
+        return scoring
+
+
+def score_candidates(
+    rows: Sequence[ScoringRow],
+    *,
+    weights: HeuristicWeights,
+    query_tokens: set[str],
+    graph_context_included: bool,
+    model: LinearModel | None = None,
+) -> ScoredCandidates:
+    """Score ``rows`` in one vectorised pass; see :class:`ScoredCandidates`."""
+
+    return ScoredCandidates(
+        rows,
+        weights=weights,
+        query_tokens=query_tokens,
+        graph_context_included=graph_context_included,
+        model=model,
+    )
+
+
+def phase_one_scores(
+    vector_scores: Sequence[float],
+    lexical_scores: Sequence[float],
+    chunks: Sequence[dict[str, Any]],
+    *,
+    weights: HeuristicWeights,
+    query_tokens: set[str],
+    payload_signals: bool,
+) -> FloatArray:
+    """Rank scores for phase one: hybrid score plus payload-only approximations of the graph boosts."""
+
+    count = len(chunks)
+    vector = np.fromiter(vector_scores, dtype=np.float64, count=count)
+    lexical = np.fromiter(lexical_scores, dtype=np.float64, count=count)
+    scores = weights.vector * vector + weights.lexical * lexical
+    if not payload_signals:
+        return scores
+    boosts = np.fromiter(
+        (
+            weights.subsystem * _calculate_subsystem_affinity((chunk.get("subsystem") or "").lower(), query_tokens)
+            + weights.criticality * _normalise_criticality(chunk.get("subsystem_criticality"))
+            - _calculate_coverage_info(chunk, weights.coverage_penalty).penalty
+            for chunk in chunks
+        ),
+        dtype=np.float64,
+        count=count,
+    )
+    return scores + boosts
+
+
+def base_scoring(
+    *,
+    vector_score: float,
+    lexical_score: float,
+    weighted_vector: float,
+    weighted_lexical: float,
+) -> dict[str, Any]:
+    """Return the graph-free ``scoring`` block for a hit."""
+
+    return {
+        "vector_score": vector_score,
+        "lexical_score": lexical_score,
+        "weighted_vector_score": weighted_vector,
+        "weighted_lexical_score": weighted_lexical,
+        "adjusted_score": weighted_vector + weighted_lexical,
+        "signals": {
+            "lexical_score": lexical_score,
+            "weighted_vector_component": weighted_vector,
+            "weighted_lexical_component": weighted_lexical,
+        },
+    }
+
+
+def _path_depth_signal(row: ScoringRow) -> float:
+    return float(row.path_depth) if row.path_depth is not None else _estimate_path_depth(row.graph_context)
+
+
+def _coverage_ratio_signal(scored: ScoredCandidates, index: int) -> float | None:
+    if scored.graph_scored[index]:
+        return float(scored.coverage_ratio[index])
+    coverage_ratio = scored.rows[index].chunk.get("coverage_ratio")
+    if coverage_ratio is None:
+        return 1.0
+    try:
+        return float(coverage_ratio)
+    except (TypeError, ValueError):
+        return None
+
+
+def _calculate_subsystem_affinity(subsystem: str, query_tokens: set[str]) -> float:
+    if not subsystem:
+        return 0.0
+    if subsystem in query_tokens:
+        return 1.0
+    if any(subsystem in token or token in subsystem for token in query_tokens):
+        return 0.5
+    return 0.0
+
+
+def _calculate_supporting_bonus(related_artifacts: Iterable[dict[str, Any]]) -> float:
+    design_docs = 0
+    test_cases = 0
+    for item in related_artifacts:
+        identifier = item.get("id", "")
+        if isinstance(identifier, str) and identifier.startswith("DesignDoc:"):
+            design_docs += 1
+        elif isinstance(identifier, str) and identifier.startswith("TestCase:"):
+            test_cases += 1
+    return min(design_docs, 2) * 0.2 + min(test_cases, 2) * 0.1
+
+
+def _calculate_coverage_info(chunk: dict[str, Any], weight_coverage_penalty: float) -> CoverageInfo:
+    coverage_missing_flag = 1.0 if chunk.get("coverage_missing") else 0.0
+    coverage_ratio_raw = chunk.get("coverage_ratio")
+    coverage_ratio = _coerce_ratio_value(coverage_ratio_raw)
+    if coverage_ratio is None:
+        coverage_ratio = 0.0 if coverage_missing_flag else 1.0
+    penalty = weight_coverage_penalty * (1.0 - coverage_ratio)
+    return CoverageInfo(ratio=coverage_ratio, penalty=penalty, missing_flag=coverage_missing_flag)
+
+
+def _coerce_ratio_value(value: object) -> float | None:
+    if isinstance(value, bool):
+        # Prevent bools masquerading as integers
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return max(0.0, min(1.0, float(value)))
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        try:
+            numeric = float(text)
+        except ValueError:
+            return None
+        return max(0.0, min(1.0, numeric))
+    return None
+
+
+def _calculate_criticality_score(chunk: dict[str, Any], graph_context: dict[str, Any] | None) -> float:
+    criticality_value = chunk.get("subsystem_criticality")
+    if criticality_value is None:
+        criticality_value = _extract_subsystem_criticality(graph_context)
+    return _normalise_criticality(criticality_value)
+
+
+def _estimate_path_depth(graph_context: dict[str, Any] | None) -> float:
+    if not graph_context:
+        return 0.0
+    relationships = graph_context.get("relationships") or []
+    if any(rel.get("type") == "BELONGS_TO" for rel in relationships):
+        return 1.0
+    return 0.0
+
+
+def _extract_subsystem_criticality(graph_context: dict[str, Any] | None) -> str | None:
+    if not graph_context:
+        return None
+    primary = graph_context.get("primary_node", {})
+    props = primary.get("properties") or {}
+    if props.get("criticality"):
+        return props.get("criticality")
+    relationships = graph_context.get("relationships") or []
+    for rel in relationships:
+        target_props = rel.get("target", {}).get("properties") or {}
+        if target_props.get("criticality"):
+            return target_props.get("criticality")
+    return None
+
+
+def _normalise_criticality(value: str | float | None) -> float:
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    lookup = {
+        "low": 0.2,
+        "medium": 0.5,
+        "high": 0.8,
+        "critical": 1.0,
+    }
+    return lookup.get(str(value).lower(), 0.0)
+
+
+def _compute_freshness_days(
+    chunk: dict[str, Any],
+    graph_context: dict[str, Any] | None,
+) -> float | None:
+    timestamp = chunk.get("git_timestamp") or chunk.get("last_modified") or chunk.get("last_modified_at") or chunk.get("updated_at")
+    if timestamp is None and graph_context:
+        primary = graph_context.get("primary_node", {})
+        props = primary.get("properties") or {}
+        timestamp = props.get("git_timestamp") or props.get("last_modified") or props.get("updated_at")
+    parsed = _parse_iso_datetime(timestamp)
+    if parsed is None:
+        return None
+    delta = datetime.now(UTC) - parsed
+    return max(delta.total_seconds() / 86400.0, 0.0)
+
+
+def _parse_iso_datetime(value: object) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        try:
+            return datetime.fromtimestamp(float(value), tz=UTC)
+        except (OverflowError, ValueError):
+            return None
+    text = str(value).strip()
+    if not text:
+        return None
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+__all__ = [
+    "CoverageInfo",
+    "HeuristicWeights",
+    "LinearModel",
+    "ScoredCandidates",
+    "ScoringRow",
+    "base_scoring",
+    "phase_one_scores",
+    "score_candidates",
+]
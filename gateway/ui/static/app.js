@@ -1,5 +1,5 @@
 /* eslint-env browser */
-/* global document, window, console, sessionStorage, fetch, navigator, Blob, URL, URLSearchParams, FormData, Intl */
+/* global document, window, console, sessionStorage, fetch, navigator, Blob, URL, URLSearchParams, FormData, Intl, TextDecoder */
 
 (function () {
   const scope = document.querySelector('[data-dm-scope="layout"]');
@@ -18,6 +18,7 @@
     search_error_auth: 'Access denied. Provide a reader token for search.',
     search_error_generic: 'Search failed. Check logs for details.',
     search_no_results: 'No results found.',
+    search_enriching: 'Showing vector hits; adding graph context…',
     search_before_copy: 'Run a search before copying the command.',
     search_copy_success: 'Copied MCP command to clipboard.',
     search_copy_failure: 'Clipboard copy failed.',
@@ -345,12 +346,18 @@
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          Accept: 'application/x-ndjson, application/json',
           ...authHeader('reader')
         },
         body: JSON.stringify(body)
       });
 
-      await processSearchResponse(response, { query, limit, includeGraph });
+      const contentType = response.headers.get('content-type') || '';
+      if (response.ok && response.body && contentType.startsWith('application/x-ndjson')) {
+        await processSearchStream(response, { query, limit, includeGraph });
+      } else {
+        await processSearchResponse(response, { query, limit, includeGraph });
+      }
     } catch (error) {
       await handleSearchException(error);
     }
@@ -465,6 +472,75 @@
     await recordUiEvent('search_success', { params });
   }
 
+  async function processSearchStream(response, params) {
+    updateRequestIdFromResponse(response);
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const state = { query: params.query, results: [], finalResults: [], payload: null };
+    let buffer = '';
+
+    for (;;) {
+      const { value, done } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      for (const line of lines) {
+        if (line.trim()) {
+          applySearchEvent(state, JSON.parse(line));
+        }
+      }
+      if (done) {
+        break;
+      }
+    }
+
+    if (state.error || !state.payload) {
+      updateStatus(state.error || t('search_error_generic'));
+      await recordUiEvent('search_error', { message: state.error || 'incomplete stream' });
+      return;
+    }
+    lastSearchParams = params;
+    lastSearchPayload = state.payload;
+    renderSearchResults(state.payload);
+    if (elements.searchActions) {
+      elements.searchActions.hidden = false;
+    }
+    updateStatus(`Found ${state.payload.results.length} match(es).`);
+    await recordUiEvent('search_success', { params, streamed: true });
+  }
+
+  function applySearchEvent(state, event) {
+    switch (event.event) {
+      case 'header':
+        state.query = event.query;
+        break;
+      case 'hits':
+        state.results = Array.isArray(event.results) ? event.results : [];
+        renderSearchResults({ results: state.results });
+        updateStatus(t('search_enriching'));
+        break;
+      case 'graph': {
+        const hit = state.results.find((entry) => entry?.chunk?.chunk_id === event.chunk_id);
+        if (hit) {
+          hit.graph_context = event.graph_context;
+          renderSearchResults({ results: state.results });
+        }
+        break;
+      }
+      case 'score':
+        state.finalResults.push(event.result);
+        break;
+      case 'final':
+        state.payload = { query: state.query, results: state.finalResults, metadata: event.metadata || {} };
+        break;
+      case 'error':
+        state.error = event.detail;
+        break;
+      default:
+        break;
+    }
+  }
+
   function updateRequestIdFromResponse(response) {
     const requestId = response.headers.get('x-request-id');
     if (requestId && elements.requestId) {
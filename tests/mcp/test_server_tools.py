@@ -138,6 +138,162 @@ async def test_km_search_success_records_metrics(
     assert _histogram_sum(MCP_REQUEST_SECONDS, "km-search") > 0.0
 
 
+@pytest.mark.asyncio
+async def test_km_search_forwards_verbosity(
+    mcp_server: ServerFixture,
+) -> None:
+    server, state = mcp_server
+    payloads: list[dict[str, object]] = []
+
+    class StubClient:
+        async def search(self, payload: dict[str, object]) -> dict[str, object]:
+            payloads.append(payload)
+            return {"results": [], "metadata": {}}
+
+    state.client = cast(Any, StubClient())
+
+    tool_fn = _tool_fn(await server.get_tool("km-search"))
+    await tool_fn(query="design docs", verbosity="Compact", snippet_chars=80, context=None)
+    await tool_fn(query="design docs", context=None)
+
+    assert payloads[0]["verbosity"] == "compact"
+    assert payloads[0]["snippet_chars"] == 80
+    assert "verbosity" not in payloads[1]
+    with pytest.raises(ValueError):
+        await tool_fn(query="design docs", verbosity="everything", context=None)
+
+
+@pytest.mark.asyncio
+async def test_gateway_client_assembles_streamed_search_and_falls_back_to_json() -> None:
+    import json
+
+    import httpx
+
+    from gateway.mcp.client import GatewayClient
+
+    events = [
+        {"event": "header", "query": "design docs", "retrieval": "dense"},
+        {"event": "hits", "results": [{"chunk": {"chunk_id": "a"}, "graph_context": None, "scoring": {}}]},
+        {"event": "graph", "chunk_id": "a", "node_id": "DesignDoc:a", "graph_context": {"subsystem": "core"}},
+        {"event": "score", "rank": 0, "chunk_id": "a", "result": {"chunk": {"chunk_id": "a"}, "graph_context": {"subsystem": "core"}}},
+        {"event": "final", "order": ["a"], "metadata": {"request_id": "r-1"}},
+    ]
+    streaming = True
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        assert "application/x-ndjson" in request.headers["accept"]
+        if streaming:
+            body = "".join(json.dumps(event) + "\n" for event in events)
+            return httpx.Response(200, text=body, headers={"content-type": "application/x-ndjson"})
+        return httpx.Response(200, json={"query": "design docs", "results": [], "metadata": {}})
+
+    client = GatewayClient(MCPSettings())
+    client._client = httpx.AsyncClient(base_url="http://gateway", transport=httpx.MockTransport(_handler))
+    seen: list[str] = []
+
+    async def _on_event(event: dict[str, Any]) -> None:
+        seen.append(event["event"])
+
+    try:
+        streamed = await client.search_stream({"query": "design docs"}, _on_event)
+        streaming = False
+        fallback = await client.search_stream({"query": "design docs"}, _on_event)
+    finally:
+        await client._client.aclose()
+
+    assert seen == ["header", "hits", "graph", "score", "final"]
+    assert streamed == {
+        "query": "design docs",
+        "results": [{"chunk": {"chunk_id": "a"}, "graph_context": {"subsystem": "core"}}],
+        "metadata": {"request_id": "r-1"},
+    }
+    assert fallback == {"query": "design docs", "results": [], "metadata": {}}
+
+
+@pytest.mark.asyncio
+async def test_km_search_batch_normalises_entries(
+    mcp_server: ServerFixture,
+) -> None:
+    server, state = mcp_server
+    captured: dict[str, Any] = {}
+
+    class StubClient:
+        async def search_batch(self, payload: dict[str, Any]) -> dict[str, Any]:
+            captured.update(payload)
+            return {"responses": [{}, {}], "metadata": {"query_count": 2}}
+
+    state.client = cast(Any, StubClient())
+
+    tool_fn = _tool_fn(await server.get_tool("km-search-batch"))
+    result = await tool_fn(
+        queries=[" design docs ", {"query": "backup", "limit": 99, "filters": {"tags": ["ops"], "unknown": 1}}],
+        limit=5,
+        context=None,
+    )
+
+    assert result["metadata"] == {"query_count": 2}
+    assert captured == {
+        "queries": [{"query": "design docs"}, {"query": "backup", "limit": 25, "filters": {"tags": ["ops"]}}],
+        "limit": 5,
+        "include_graph": True,
+    }
+    assert _counter_value(MCP_REQUESTS_TOTAL, "km-search-batch", "success") == 1
+
+
+@pytest.mark.asyncio
+async def test_km_graph_nodes_normalises_entries(
+    mcp_server: ServerFixture,
+) -> None:
+    server, state = mcp_server
+    captured: dict[str, Any] = {}
+
+    class StubClient:
+        async def graph_nodes(self, payload: dict[str, Any]) -> dict[str, Any]:
+            captured.update(payload)
+            return {"nodes": [{"id": "Subsystem:Kasmina"}, {"id": "DesignDoc:missing.md", "error": {"error_code": "GRAPH_NODE_NOT_FOUND"}}]}
+
+    state.client = cast(Any, StubClient())
+
+    tool_fn = _tool_fn(await server.get_tool("km-graph-nodes"))
+    result = await tool_fn(
+        nodes=[" Subsystem:Kasmina ", {"id": "DesignDoc:missing.md", "relationships": "ALL", "limit": 999}],
+        relationships="incoming",
+        context=None,
+    )
+
+    assert len(result["nodes"]) == 2
+    assert captured == {
+        "nodes": [{"id": "Subsystem:Kasmina"}, {"id": "DesignDoc:missing.md", "relationships": "all", "limit": 200}],
+        "relationships": "incoming",
+        "limit": 50,
+    }
+    assert _counter_value(MCP_REQUESTS_TOTAL, "km-graph-nodes", "success") == 1
+    with pytest.raises(ValueError):
+        await tool_fn(nodes=[{"id": "Subsystem:Kasmina", "relationships": "sideways"}], context=None)
+
+
+@pytest.mark.asyncio
+async def test_km_search_similar_forwards_seed_ids(
+    mcp_server: ServerFixture,
+) -> None:
+    server, state = mcp_server
+    captured: dict[str, Any] = {}
+
+    class StubClient:
+        async def search_similar(self, payload: dict[str, Any]) -> dict[str, Any]:
+            captured.update(payload)
+            return {"results": [{}], "metadata": {"seed_chunk_ids": payload["chunk_ids"]}}
+
+    state.client = cast(Any, StubClient())
+
+    tool_fn = _tool_fn(await server.get_tool("km-search-similar"))
+    result = await tool_fn(chunk_ids=[" src/a.py::0 ", ""], limit=50, verbosity="compact", context=None)
+
+    assert result["metadata"] == {"seed_chunk_ids": ["src/a.py::0"]}
+    assert captured == {"chunk_ids": ["src/a.py::0"], "limit": 25, "include_graph": True, "verbosity": "compact"}
+    assert _counter_value(MCP_REQUESTS_TOTAL, "km-search-similar", "success") == 1
+
+
 @pytest.mark.asyncio
 async def test_km_search_gateway_error_records_failure(
     mcp_server: ServerFixture,
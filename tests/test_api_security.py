@@ -155,6 +155,9 @@ def test_rate_limiting_search(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -
 
     def _dummy_search_service() -> object:
         class _Dummy:
+            def cache_scope(self) -> dict[str, object]:
+                return {}
+
             def search(
                 self,
                 *,
@@ -165,6 +168,7 @@ def test_rate_limiting_search(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -
                 sort_by_vector: bool = False,
                 request_id: str | None = None,
                 filters: dict[str, Any] | None = None,
+                **_options: object,
             ) -> SearchResponse:
                 metadata = {
                     "result_count": 0,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +11,7 @@ from fastapi.testclient import TestClient
 from neo4j import GraphDatabase
 
 from gateway.api.app import create_app
-from gateway.graph import GraphNotFoundError
+from gateway.graph import GraphNotFoundError, GraphQueryError, NodeLookup
 from gateway.graph.migrations.runner import MigrationRunner
 from gateway.ingest.neo4j_writer import Neo4jWriter
 from gateway.ingest.pipeline import IngestionConfig, IngestionPipeline
@@ -20,6 +21,8 @@ class DummyGraphService:
     def __init__(self, responses: dict[str, Any]) -> None:
         self._responses = responses
         self.last_node_id: str | None = None
+        self.last_lookups: list[NodeLookup] = []
+        self.stream_caps: dict[str, Any] = {}
 
     def get_subsystem(self, name: str, **kwargs: object) -> dict[str, Any]:
         if name == "missing":
@@ -32,10 +35,14 @@ class DummyGraphService:
             raise GraphNotFoundError("Node not found")
         return self._responses["node"]
 
+    def get_nodes(self, lookups: list[NodeLookup]) -> list[dict[str, Any]]:
+        self.last_lookups = lookups
+        return [{"id": lookup.node_id, **self._responses["node"]} for lookup in lookups]
+
     def search(self, term: str, *, limit: int) -> dict[str, Any]:
         return {"results": self._responses.get("search", [])}
 
-    def get_subsystem_graph(self, name: str, *, depth: int) -> dict[str, Any]:
+    def get_subsystem_graph(self, name: str, *, depth: int, include_chunks: bool = False) -> dict[str, Any]:
         return self._responses["subsystem_graph"]
 
     def list_orphan_nodes(self, *, label: str | None, cursor: str | None, limit: int) -> dict[str, Any]:
@@ -44,6 +51,20 @@ class DummyGraphService:
     def run_cypher(self, query: str, parameters: dict[str, Any] | None) -> dict[str, Any]:
         return {"data": [{"row": ["ok"]}], "summary": {"resultConsumedAfterMs": 1, "database": "knowledge"}}
 
+    def stream_cypher(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None,
+        *,
+        max_rows: int,
+        max_bytes: int,
+        timeout_seconds: float | None,
+    ) -> Iterator[str]:
+        if "DELETE" in query:
+            raise GraphQueryError("Only read-only Cypher is permitted")
+        self.stream_caps = {"max_rows": max_rows, "max_bytes": max_bytes, "timeout_seconds": timeout_seconds}
+        return iter(['{"event": "header", "columns": ["n"]}\n', '{"event": "row", "row": ["ok"]}\n', '{"event": "final", "rows": 1}\n'])
+
 
 @pytest.fixture()
 def app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
@@ -184,7 +205,7 @@ def test_graph_subsystem_not_found(app: FastAPI) -> None:
 
 def test_graph_subsystem_graph_endpoint(app: FastAPI) -> None:
     client = TestClient(app)
-    response = client.get("/graph/subsystems/telemetry/graph")
+    response = client.get("/graph/subsystems/telemetry/graph", params={"include_chunks": "true"})
     assert response.status_code == 200
     data = response.json()
     assert any(edge["type"] == "DEPENDS_ON" for edge in data["edges"])
@@ -216,6 +237,24 @@ def test_graph_node_accepts_slash_encoded_ids(app: FastAPI) -> None:
     assert service.last_node_id == "DesignDoc:docs/design.md"
 
 
+def test_graph_nodes_batch_endpoint(app: FastAPI) -> None:
+    client = TestClient(app)
+    response = client.post(
+        "/graph/nodes:batch",
+        json={"nodes": ["Subsystem:telemetry", {"id": "DesignDoc:docs/a.md", "relationships": "ALL", "limit": 500}], "limit": 10},
+    )
+    assert response.status_code == 200
+    assert [entry["id"] for entry in response.json()["nodes"]] == ["Subsystem:telemetry", "DesignDoc:docs/a.md"]
+    assert app.state._dummy_graph_service.last_lookups == [
+        NodeLookup("Subsystem:telemetry", relationships="outgoing", limit=10),
+        NodeLookup("DesignDoc:docs/a.md", relationships="all", limit=200),
+    ]
+
+    assert client.post("/graph/nodes:batch", json={"nodes": []}).status_code == 422
+    assert client.post("/graph/nodes:batch", json={"nodes": ["Subsystem:a"] * 101}).status_code == 422
+    assert client.post("/graph/nodes:batch", json={"nodes": [{"id": "Subsystem:a", "relationships": "sideways"}]}).status_code == 422
+
+
 @pytest.mark.neo4j
 def test_graph_node_endpoint_live(monkeypatch: pytest.MonkeyPatch, tmp_path: pytest.PathLike[str]) -> None:
     uri = os.getenv("NEO4J_TEST_URI")
@@ -341,6 +380,16 @@ def test_graph_cypher_requires_maintainer_token(monkeypatch: pytest.MonkeyPatch)
     assert resp.status_code == 200
     assert resp.json()["data"][0]["row"] == ["ok"]
 
+    # NDJSON clients get bounded, streamed rows; invalid queries still fail before the stream starts.
+    headers = {"Authorization": "Bearer admin-token", "Accept": "application/x-ndjson"}
+    resp = client.post("/graph/cypher", json={"query": "MATCH (n) RETURN n LIMIT 1"}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    assert resp.text.splitlines()[-1] == '{"event": "final", "rows": 1}'
+    assert dummy_service.stream_caps == {"max_rows": 10_000, "max_bytes": 8 * 1024 * 1024, "timeout_seconds": 30.0}
+    resp = client.post("/graph/cypher", json={"query": "MATCH (n) DETACH DELETE n RETURN 1 LIMIT 1"}, headers=headers)
+    assert resp.status_code == 400
+
 
 def test_graph_reader_scope(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("KM_AUTH_ENABLED", "true")
@@ -12,6 +12,7 @@ class DummySettings:
     neo4j_user = "neo4j"
     neo4j_password = "password"
     neo4j_database = "knowledge"
+    graph_chunk_mode = "nodes"
 
 
 def test_graph_cli_migrate_runs_runner(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -94,12 +94,26 @@ def test_migration_runner_applies_pending_migrations() -> None:
     runner = MigrationRunner(driver=driver, database="knowledge")
 
     pending_before = runner.pending_ids()
-    assert pending_before == [migration.id for migration in MIGRATIONS]
+    assert pending_before == [migration.id for migration in MIGRATIONS if migration.chunk_mode is None]
+    assert "005_collapse_chunks" not in pending_before
 
     runner.run()
 
-    assert driver.applied_ids == {migration.id for migration in MIGRATIONS}
+    assert driver.applied_ids == set(pending_before)
     assert len(driver.records) >= len(MIGRATIONS[0].statements)
 
     pending_after = runner.pending_ids()
     assert pending_after == []
+
+
+def test_migration_runner_collapses_chunks_only_in_summary_mode() -> None:
+    driver = FakeDriver()
+    runner = MigrationRunner(driver=driver, database="knowledge", chunk_mode="summary")
+
+    assert runner.pending_ids()[-1] == "005_collapse_chunks"
+
+    runner.run()
+
+    assert "005_collapse_chunks" in driver.applied_ids
+    statements = [query for query, _ in driver.records]
+    assert any("SET f.chunk_count = size(chunks)" in query for query in statements)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from types import TracebackType
+from typing import Any
+
+import pytest
+from prometheus_client import REGISTRY
+
+from gateway.graph import projection as graph_projection
+from gateway.graph.projection import GraphProjection, GraphProjectionStore
+from gateway.graph.service import GraphService
+from gateway.ingest.state_files import IndexGeneration
+
+NODES: list[tuple[str, list[str], dict[str, Any]]] = [
+    ("e:core", ["Subsystem"], {"name": "core"}),
+    ("e:other", ["Subsystem"], {"name": "other"}),
+    ("e:doc", ["DesignDoc"], {"path": "docs/core.md"}),
+    ("e:app", ["SourceFile"], {"path": "src/app.py", "subsystem": "core"}),
+    ("e:lib", ["SourceFile"], {"path": "src/lib.py", "subsystem": "other"}),
+    ("e:chunk", ["Chunk"], {"chunk_id": "src/app.py::0", "sequence": 0}),
+    ("e:history", ["Subsystem"], {"name": "unlinked"}),
+]
+RELATIONSHIPS = [
+    ("e:doc", "DESCRIBES", "e:core"),
+    ("e:app", "BELONGS_TO", "e:core"),
+    ("e:app", "HAS_CHUNK", "e:chunk"),
+    ("e:lib", "BELONGS_TO", "e:other"),
+    ("e:core", "DEPENDS_ON", "e:other"),
+    ("e:app", "BELONGS_TO", "e:missing"),
+]
+
+
+class FakeTx:
+    def run(self, query: str, **params: object) -> list[dict[str, object]]:
+        if "labels(n)" in query:
+            return [{"id": element_id, "labels": labels, "properties": props} for element_id, labels, props in NODES]
+        return [{"start": start, "type": rel_type, "end": end} for start, rel_type, end in RELATIONSHIPS]
+
+
+class FakeSession:
+    def __enter__(self) -> FakeSession:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+    def execute_read(self, func: Callable[..., object], *args: object) -> object:
+        return func(FakeTx(), *args)
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.sessions = 0
+
+    def session(self, **kwargs: object) -> FakeSession:
+        self.sessions += 1
+        return FakeSession()
+
+
+class SyncThread:
+    def __init__(self, target: Callable[..., None], args: tuple[object, ...], **kwargs: object) -> None:
+        self._target = target
+        self._args = args
+
+    def start(self) -> None:
+        self._target(*self._args)
+
+
+@pytest.fixture
+def projection() -> GraphProjection:
+    return GraphProjection(NODES, RELATIONSHIPS, generation=3)
+
+
+def test_projection_serves_node_relationships(projection: GraphProjection) -> None:
+    app = projection.lookup("SourceFile:src/app.py")
+    assert app is not None
+    assert projection.lookup("SourceFile:src/missing.py") is None
+    assert projection.relationship_count == 5  # the dangling relationship is dropped
+
+    node = projection.serialize(app)
+    assert node == {"id": "SourceFile:src/app.py", "labels": ["SourceFile"], "properties": {"path": "src/app.py", "subsystem": "core"}}
+
+    outgoing = projection.relationships(app, "outgoing", 10)
+    assert [(rel["type"], rel["direction"], rel["target"]["id"]) for rel in outgoing] == [
+        ("BELONGS_TO", "OUT", "Subsystem:core"),
+        ("HAS_CHUNK", "OUT", "Chunk:src/app.py::0"),
+    ]
+    core = projection.lookup("Subsystem:core")
+    assert core is not None
+    assert [rel["direction"] for rel in projection.relationships(core, "incoming", 10)] == ["IN", "IN"]
+    assert len(projection.relationships(core, "all", 2)) == 2
+
+
+def test_projection_path_depth_matches_shortest_path_rules(projection: GraphProjection) -> None:
+    def depth(node_id: str, max_depth: int = 4) -> int | None:
+        index = projection.lookup(node_id)
+        assert index is not None
+        return projection.path_depth(index, max_depth)
+
+    assert depth("SourceFile:src/app.py") == 1
+    assert depth("Chunk:src/app.py::0") == 2
+    assert depth("Chunk:src/app.py::0", max_depth=1) is None
+    # DEPENDS_ON is not a path-depth relationship and HAS_CHUNK is only followed from chunks.
+    assert depth("Subsystem:core") is None
+
+
+def test_projection_subsystem_snapshot(projection: GraphProjection) -> None:
+    service = GraphService(driver=None, database="knowledge")  # type: ignore[arg-type]
+    store = GraphProjectionStore(None, "knowledge", lambda: IndexGeneration(3, None))  # type: ignore[arg-type]
+    store._projection = projection
+    service.projection = store
+
+    graph = service.get_subsystem_graph("core", depth=2)
+
+    assert [node["id"] for node in graph["nodes"]] == [
+        "Subsystem:core",
+        "DesignDoc:docs/core.md",
+        "Subsystem:other",
+        "SourceFile:src/app.py",
+        "SourceFile:src/lib.py",
+    ]
+    assert {"type": "BELONGS_TO", "direction": "IN", "source": "Subsystem:other", "target": "SourceFile:src/lib.py"} in graph["edges"]
+    assert [artifact["id"] for artifact in graph["artifacts"]] == ["DesignDoc:docs/core.md", "SourceFile:src/app.py"]
+
+    with_chunks = service.get_subsystem_graph("core", depth=2, include_chunks=True)
+    assert "Chunk:src/app.py::0" in [node["id"] for node in with_chunks["nodes"]]
+
+
+def test_projection_store_tracks_index_generation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(graph_projection, "Thread", SyncThread)
+    driver = FakeDriver()
+    state = {"generation": IndexGeneration(3, None)}
+    store = GraphProjectionStore(driver, "knowledge", lambda: state["generation"])  # type: ignore[arg-type]
+
+    assert store.resolve("Subsystem", "core") is None  # nothing built yet: fall back, build in the background
+    resolved = store.resolve("Subsystem", "core")
+    assert resolved is not None
+    assert resolved[0].generation == 3
+    assert REGISTRY.get_sample_value("km_graph_projection_bytes") == resolved[0].nbytes > 0
+
+    state["generation"] = IndexGeneration(4, frozenset({"core"}))
+    assert store.current() is None  # stale projections are never served
+    current = store.current()
+    assert current is not None and current.generation == 4
+    assert driver.sessions == 2
+
+    store.refresh(background=False)
+    assert driver.sessions == 2
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
+import json
+from collections.abc import Callable, Iterable, Iterator
 from types import SimpleNamespace, TracebackType
 
 import pytest
+from neo4j.exceptions import Neo4jError
 
+from gateway.graph import nodes as graph_nodes
 from gateway.graph import service as graph_service
-from gateway.graph.service import GraphNotFoundError, GraphQueryError, GraphService
+from gateway.graph.service import GraphNotFoundError, GraphQueryError, GraphService, NodeLookup
 
 DriverFixture = tuple[GraphService, "DummySession", "DummyDriver"]
 
@@ -79,6 +82,8 @@ class DummyDriver:
 def patch_graph_types(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(graph_service, "Node", DummyNode)
     monkeypatch.setattr(graph_service, "Relationship", DummyRelationship)
+    monkeypatch.setattr(graph_nodes, "Node", DummyNode)
+    monkeypatch.setattr(graph_nodes, "Relationship", DummyRelationship)
 
 
 @pytest.fixture
@@ -106,18 +111,18 @@ def test_get_subsystem_paginates_and_includes_artifacts(
         assert name == "Kasmina"
         return subsystem
 
-    def fake_fetch_paths(_tx: object, name: str, depth: int) -> list[dict[str, object]]:
-        assert depth == 2
+    def fake_fetch_frontier(_tx: object, subsystem_id: str, depth: int, fanout: int, include_chunks: bool) -> list[dict[str, object]]:
+        assert (subsystem_id, depth, include_chunks) == ("Subsystem:Kasmina", 2, False)
         return [
-            {"node": related_node, "nodes": [subsystem, related_node], "relationships": [relationship]},
-            {"node": sibling_node, "nodes": [subsystem, sibling_node], "relationships": [sibling_relationship]},
+            {"source_id": "Subsystem:Kasmina", "relationship": sibling_relationship, "node": sibling_node},
+            {"source_id": "Subsystem:Kasmina", "relationship": relationship, "node": related_node},
         ]
 
     def fake_fetch_artifacts(_tx: object, name: str) -> list[DummyNode]:
         return [artifact_node]
 
     monkeypatch.setattr(graph_service, "_fetch_subsystem_node", fake_fetch_subsystem_node)
-    monkeypatch.setattr(graph_service, "_fetch_subsystem_paths", fake_fetch_paths)
+    monkeypatch.setattr(graph_service, "_fetch_subsystem_frontier", fake_fetch_frontier)
     monkeypatch.setattr(graph_service, "_fetch_artifacts_for_subsystem", fake_fetch_artifacts)
 
     result = service.get_subsystem(
@@ -169,25 +174,28 @@ def test_get_subsystem_graph_returns_nodes_and_edges(
         assert name == "Kasmina"
         return subsystem
 
-    def fake_fetch_paths(_tx: object, name: str, depth: int) -> list[dict[str, object]]:
-        assert depth == 3
+    def fake_fetch_frontier(_tx: object, subsystem_id: str, depth: int, fanout: int, include_chunks: bool) -> list[dict[str, object]]:
+        assert (depth, fanout, include_chunks) == (3, graph_service.DEFAULT_SUBSYSTEM_FANOUT, True)
         return [
-            {"node": target, "nodes": [subsystem, mid, target], "relationships": [rel_one, rel_two]},
+            {"source_id": "Subsystem:Kasmina", "relationship": rel_one, "node": mid},
+            {"source_id": "Subsystem:Telemetry", "relationship": rel_two, "node": target},
+            {"source_id": "Subsystem:Kasmina", "relationship": rel_one, "node": mid},
         ]
 
     def fake_fetch_artifacts(_tx: object, name: str) -> list[DummyNode]:
         return [artifact_node]
 
     monkeypatch.setattr(graph_service, "_fetch_subsystem_node", fake_fetch_subsystem_node)
-    monkeypatch.setattr(graph_service, "_fetch_subsystem_paths", fake_fetch_paths)
+    monkeypatch.setattr(graph_service, "_fetch_subsystem_frontier", fake_fetch_frontier)
     monkeypatch.setattr(graph_service, "_fetch_artifacts_for_subsystem", fake_fetch_artifacts)
 
-    graph_payload = service.get_subsystem_graph("Kasmina", depth=3)
+    graph_payload = service.get_subsystem_graph("Kasmina", depth=3, include_chunks=True)
 
     edge_types = {edge["type"] for edge in graph_payload["edges"]}
     assert {"DEPENDS_ON", "IMPLEMENTS"}.issubset(edge_types)
     node_ids = {node["id"] for node in graph_payload["nodes"]}
     assert node_ids.issuperset({"Subsystem:Kasmina", "Subsystem:Telemetry", "IntegrationMessage:Sync"})
+    assert len(graph_payload["edges"]) == 2
     assert graph_payload["artifacts"][0]["id"] == "DesignDoc:docs/telemetry.md"
 
 
@@ -240,11 +248,11 @@ def test_list_orphan_nodes_serializes_results(
 
     orphan = DummyNode(["DesignDoc"], "DesignDoc:docs/orphan.md", path="docs/orphan.md")
 
-    def fake_fetch_orphans(_tx: object, label: str | None, skip: int, limit: int) -> list[DummyNode]:
-        assert label is None
-        assert skip == 0
-        assert limit == 5
-        return [orphan]
+    def fake_fetch_orphans(_tx: object, labels: tuple[str, ...], after: str, limit: int) -> list[tuple[str, DummyNode]]:
+        assert labels == graph_service.ORPHAN_DEFAULT_LABELS
+        assert after == ""
+        assert limit == 6
+        return [("DesignDoc", orphan)]
 
     monkeypatch.setattr(graph_service, "_fetch_orphan_nodes", fake_fetch_orphans)
 
@@ -253,6 +261,65 @@ def test_list_orphan_nodes_serializes_results(
     assert payload["cursor"] is None
 
 
+def test_list_orphan_nodes_pages_by_keyset_across_labels(dummy_driver: DriverFixture) -> None:
+    service, session, _ = dummy_driver
+    orphans = {
+        "DesignDoc": [DummyNode(["DesignDoc"], f"d{i}", path=f"docs/{i}.md") for i in range(3)],
+        "TestCase": [DummyNode(["TestCase"], "t0", path="tests/test_a.py")],
+        "IntegrationMessage": [DummyNode(["IntegrationMessage"], "m0", name="Sync")],
+    }
+    queries: list[tuple[str, dict[str, object]]] = []
+
+    class OrphanTx:
+        def run(self, query: str, parameters: dict[str, object]) -> list[dict[str, object]]:
+            queries.append((query, parameters))
+            label = query.split("(n:", 1)[1].split(")", 1)[0]
+            key = graph_service._ORPHAN_KEY_PROPERTIES[label]
+            matches = sorted(
+                (node for node in orphans.get(label, []) if str(node[key]) > str(parameters["after"])),
+                key=lambda node: str(node[key]),
+            )
+            return [{"n": node} for node in matches[: int(parameters["limit"])]]  # type: ignore[call-overload]
+
+    session.execute_read = lambda func, *args: func(OrphanTx(), *args)  # type: ignore[method-assign]
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = service.list_orphan_nodes(label=None, cursor=cursor, limit=2)
+        seen.extend(node["id"] for node in page["nodes"])
+        cursor = page["cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ["DesignDoc:docs/0.md", "DesignDoc:docs/1.md", "DesignDoc:docs/2.md", "TestCase:tests/test_a.py", "m0"]
+    assert all("SKIP" not in query for query, _ in queries)
+    # The second page resumes inside DesignDoc, seeking past the last key returned.
+    assert any(params["after"] == "docs/1.md" and "(n:DesignDoc)" in query for query, params in queries)
+
+    with pytest.raises(GraphQueryError):
+        service.list_orphan_nodes(label="TestCase", cursor=graph_service._encode_keyset_cursor("DesignDoc", "x"), limit=2)
+    with pytest.raises(GraphQueryError):
+        service.list_orphan_nodes(label=None, cursor="not-a-cursor", limit=2)
+
+
+def test_count_orphan_nodes_uses_one_aggregated_query(dummy_driver: DriverFixture) -> None:
+    service, session, _ = dummy_driver
+    queries: list[str] = []
+
+    class CountTx:
+        def run(self, query: str) -> list[dict[str, object]]:
+            queries.append(query)
+            return [{"label": "DesignDoc", "total": 4}]
+
+    session.execute_read = lambda func, *args: func(CountTx(), *args)  # type: ignore[method-assign]
+
+    assert service.count_orphan_nodes(["DesignDoc", "TestCase"]) == {"DesignDoc": 4, "TestCase": 0}
+    assert len(queries) == 1 and queries[0].count("UNION ALL") == 1
+    with pytest.raises(GraphQueryError):
+        service.count_orphan_nodes(["Subsystem"])
+
+
 def test_get_node_missing_raises(
     monkeypatch: pytest.MonkeyPatch,
     dummy_driver: DriverFixture,
@@ -268,6 +335,48 @@ def test_get_node_missing_raises(
         service.get_node("SourceFile:missing.py", relationships="all", limit=5)
 
 
+def test_get_nodes_batches_one_query_and_reports_errors_inline(dummy_driver: DriverFixture) -> None:
+    service, session, _ = dummy_driver
+    doc = DummyNode(["DesignDoc"], "e:doc", path="docs/a.md")
+    subsystem = DummyNode(["Subsystem"], "e:core", name="core")
+    relationship = DummyRelationship(doc, subsystem, "DESCRIBES")
+    captured: list[tuple[str, dict[str, object]]] = []
+
+    class FakeTx:
+        def run(self, query: str, **params: object) -> list[dict[str, object]]:
+            captured.append((query, params))
+            return [
+                {"index": 3, "node": subsystem, "relationships": []},
+                {"index": 0, "node": doc, "relationships": [{"relationship": relationship, "node": subsystem}]},
+            ]
+
+    session.execute_read = lambda func, *args: func(FakeTx(), *args)  # type: ignore[method-assign]
+
+    results = service.get_nodes(
+        [
+            NodeLookup("DesignDoc:docs/a.md", relationships="all", limit=5),
+            NodeLookup("Team:ops"),
+            NodeLookup("SourceFile:missing.py", relationships="none"),
+            NodeLookup("Subsystem:core", relationships="incoming"),
+        ]
+    )
+
+    assert len(captured) == 1
+    query, params = captured[0]
+    assert query.startswith("UNWIND $rows AS row")
+    assert query.count("UNION") == 2  # one index-backed branch per label in the batch
+    assert params["rows"] == [
+        {"index": 0, "label": "DesignDoc", "value": "docs/a.md", "direction": "all", "limit": 5},
+        {"index": 2, "label": "SourceFile", "value": "missing.py", "direction": "none", "limit": 0},
+        {"index": 3, "label": "Subsystem", "value": "core", "direction": "incoming", "limit": 50},
+    ]
+    assert [entry["id"] for entry in results] == ["DesignDoc:docs/a.md", "Team:ops", "SourceFile:missing.py", "Subsystem:core"]
+    assert results[0]["relationships"][0]["direction"] == "OUT"
+    assert results[1]["error"]["error_code"] == "GRAPH_QUERY_INVALID"
+    assert results[2]["error"]["error_code"] == "GRAPH_NODE_NOT_FOUND"
+    assert results[3]["node"]["id"] == "Subsystem:core"
+
+
 def test_search_serializes_results(
     monkeypatch: pytest.MonkeyPatch,
     dummy_driver: DriverFixture,
@@ -276,17 +385,44 @@ def test_search_serializes_results(
 
     node = DummyNode(["Subsystem"], "Subsystem:Kasmina", name="Kasmina")
 
-    def fake_search_entities(_tx: object, term: str, limit: int) -> list[dict[str, object]]:
-        assert term == "kasmina"
+    def fake_search_fulltext(_tx: object, query: str, limit: int) -> list[dict[str, object]]:
+        assert query == "(kasmina^4 OR kasmina* OR kasmina~1)"
         assert limit == 4
-        return [{"node": node, "label": "Subsystem", "score": 0.95, "snippet": "Kasmina"}]
+        return [{"node": node, "label": "Subsystem", "score": 2.4, "snippet": "Kasmina"}]
 
-    monkeypatch.setattr(graph_service, "_search_entities", fake_search_entities)
+    monkeypatch.setattr(graph_service, "_search_entities_fulltext", fake_search_fulltext)
 
     result = service.search("Kasmina", limit=4)
 
     assert result["results"][0]["id"] == "Subsystem:Kasmina"
-    assert result["results"][0]["score"] == 0.95
+    assert result["results"][0]["score"] == 2.4
+
+
+def test_search_scans_when_fulltext_index_missing(
+    monkeypatch: pytest.MonkeyPatch,
+    dummy_driver: DriverFixture,
+) -> None:
+    from neo4j.exceptions import ClientError
+
+    service, _, _ = dummy_driver
+    node = DummyNode(["SourceFile"], "SourceFile:src/kasmina/ui-sync.py", path="src/kasmina/ui-sync.py")
+    queries: list[str] = []
+
+    def missing_index(_tx: object, query: str, limit: int) -> list[dict[str, object]]:
+        queries.append(query)
+        raise ClientError("There is no such fulltext schema index: graph_entity_search")
+
+    def fake_scan(_tx: object, term: str, limit: int) -> list[dict[str, object]]:
+        assert term == "kasmina/ui-sync.py"
+        return [{"node": node, "label": "SourceFile", "score": 0.8, "snippet": "src/kasmina/ui-sync.py"}]
+
+    monkeypatch.setattr(graph_service, "_search_entities_fulltext", missing_index)
+    monkeypatch.setattr(graph_service, "_search_entities", fake_scan)
+
+    result = service.search("Kasmina/UI-sync.py", limit=5)
+
+    assert queries == ["(kasmina^4 OR kasmina* OR kasmina~1) AND (ui^4 OR ui*) AND (sync.py^4 OR sync.py* OR sync.py~1)"]
+    assert [item["id"] for item in result["results"]] == ["SourceFile:src/kasmina/ui-sync.py"]
 
 
 def test_shortest_path_depth(monkeypatch: pytest.MonkeyPatch, dummy_driver: DriverFixture) -> None:
@@ -300,9 +436,24 @@ def test_shortest_path_depth(monkeypatch: pytest.MonkeyPatch, dummy_driver: Driv
 
     query, params = session.run_calls[0]
     assert "shortestPath" in query
+    assert "HAS_CHUNK" not in query
     assert params == {"value": "gateway/app.py"}
     assert depth == 3
 
+    service.shortest_path_depth("Chunk:gateway/app.py::0", max_depth=5)
+    assert "BELONGS_TO|DESCRIBES|VALIDATES|HAS_CHUNK*1..5" in session.run_calls[1][0]
+
+
+def test_summary_chunk_mode_skips_chunk_lookups() -> None:
+    session = DummySession()
+    service = graph_service.get_graph_service(DummyDriver(session), "knowledge", chunk_nodes=False)  # type: ignore[arg-type]
+
+    assert "Chunk" not in service.orphan_labels
+    assert service.shortest_path_depth("Chunk:gateway/app.py::0") is None
+    assert session.run_calls == []
+    with pytest.raises(GraphQueryError):
+        service.list_orphan_nodes(label="Chunk", cursor=None, limit=5)
+
 
 def test_shortest_path_depth_none(monkeypatch: pytest.MonkeyPatch, dummy_driver: DriverFixture) -> None:
     service, session, _ = dummy_driver
@@ -336,8 +487,216 @@ def test_run_cypher_serializes_records(monkeypatch: pytest.MonkeyPatch, dummy_dr
     assert driver.last_execute_query[0] == "MATCH (n) RETURN n LIMIT 1"
 
 
+class StreamRecord:
+    def __init__(self, *values: object) -> None:
+        self._values = list(values)
+
+    def values(self) -> list[object]:
+        return self._values
+
+
+class StreamResult:
+    def __init__(self, records: list[StreamRecord], *, fail_after: int | None = None) -> None:
+        self.records = records
+        self.fail_after = fail_after
+        self.pulled = 0
+
+    def keys(self) -> list[str]:
+        return ["n"]
+
+    def __iter__(self) -> Iterator[StreamRecord]:
+        for record in self.records:
+            if self.fail_after is not None and self.pulled >= self.fail_after:
+                raise Neo4jError("transaction timed out")
+            self.pulled += 1
+            yield record
+
+    def consume(self) -> SimpleNamespace:
+        return SimpleNamespace(result_available_after=3, database=SimpleNamespace(name="knowledge"))
+
+
+class StreamTransaction:
+    """Mirrors the driver: a normal exit commits, an exception exit or ``close()`` rolls back."""
+
+    def __init__(self, result: StreamResult) -> None:
+        self.result = result
+        self.outcome: str | None = None
+
+    def run(self, query: str, parameters: dict[str, object]) -> StreamResult:
+        return self.result
+
+    def rollback(self) -> None:
+        assert self.outcome is None, "transaction already closed"
+        self.outcome = "rollback"
+
+    def close(self) -> None:
+        if self.outcome is None:
+            self.outcome = "rollback"
+
+    def __enter__(self) -> StreamTransaction:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        if self.outcome is None:
+            self.outcome = "rollback" if exc_type is not None else "commit"
+
+
+def _stream(dummy_driver: DriverFixture, result: StreamResult, **caps: int) -> tuple[list[dict[str, object]], StreamTransaction]:
+    service, session, driver = dummy_driver
+    tx = StreamTransaction(result)
+    opened: list[dict[str, object]] = []
+    session.begin_transaction = lambda timeout=None: tx  # type: ignore[attr-defined]
+    original_session = driver.session
+
+    def session_factory(**kwargs: object) -> DummySession:
+        opened.append(kwargs)
+        return original_session(**kwargs)
+
+    driver.session = session_factory  # type: ignore[method-assign]
+    lines = service.stream_cypher("MATCH (n) RETURN n LIMIT 50", None, timeout_seconds=5, **caps)
+    events = [json.loads(line) for line in lines]
+    assert opened[0]["default_access_mode"] == "READ"
+    return events, tx
+
+
+def test_stream_cypher_caps_rows_and_reports_trailer(dummy_driver: DriverFixture) -> None:
+    result = StreamResult([StreamRecord(index) for index in range(5)])
+    events, tx = _stream(dummy_driver, result, max_rows=2, max_bytes=1_000_000)
+
+    assert events[0] == {"event": "header", "columns": ["n"]}
+    assert [event["row"] for event in events[1:-1]] == [[0], [1]]
+    assert events[-1]["event"] == "final"
+    assert events[-1]["rows"] == 2
+    assert events[-1]["truncated_by"] == "rows"
+    assert result.pulled == 3  # stopped pulling one record past the cap
+    assert tx.outcome == "rollback"  # a commit would drain the unread records first
+
+
+def test_stream_cypher_caps_bytes_and_reports_errors(dummy_driver: DriverFixture) -> None:
+    line_bytes = len(json.dumps({"event": "row", "row": [0]})) + 1
+    events, tx = _stream(dummy_driver, StreamResult([StreamRecord(0), StreamRecord(1)]), max_rows=10, max_bytes=line_bytes)
+    assert tx.outcome == "rollback"
+    assert events[-1] == {
+        "event": "final",
+        "rows": 1,
+        "bytes": line_bytes,
+        "truncated": True,
+        "truncated_by": "bytes",
+        "summary": {"resultConsumedAfterMs": None, "database": "knowledge"},
+    }
+
+    events, tx = _stream(dummy_driver, StreamResult([StreamRecord(0), StreamRecord(1)]), max_rows=10, max_bytes=10_000)
+    assert tx.outcome == "commit"
+    assert events[-1]["truncated"] is False
+    assert events[-1]["summary"]["resultConsumedAfterMs"] == 3
+
+    events, tx = _stream(dummy_driver, StreamResult([StreamRecord(0), StreamRecord(1)], fail_after=1), max_rows=10, max_bytes=10_000)
+    assert events[-1] == {"event": "error", "detail": "transaction timed out", "rows": 1, "bytes": line_bytes}
+    assert tx.outcome == "rollback"
+
+
+def test_stream_cypher_rolls_back_when_the_client_goes_away(dummy_driver: DriverFixture) -> None:
+    service, session, _ = dummy_driver
+    result = StreamResult([StreamRecord(index) for index in range(5)])
+    tx = StreamTransaction(result)
+    session.begin_transaction = lambda timeout=None: tx  # type: ignore[attr-defined]
+
+    lines = service.stream_cypher("MATCH (n) RETURN n LIMIT 50", None, max_rows=10, max_bytes=10_000, timeout_seconds=None)
+    next(lines)
+    next(lines)
+    lines.close()
+
+    assert tx.outcome == "rollback"
+    assert result.pulled == 1
+
+
+def test_stream_cypher_validates_before_streaming(dummy_driver: DriverFixture) -> None:
+    service, _, _ = dummy_driver
+
+    with pytest.raises(GraphQueryError):
+        service.stream_cypher("MATCH (n) DETACH DELETE n RETURN 1 LIMIT 1", None, max_rows=1, max_bytes=1, timeout_seconds=None)
+
+
 def test_run_cypher_rejects_non_read_queries(dummy_driver: DriverFixture) -> None:
     service, _, _ = dummy_driver
 
     with pytest.raises(GraphQueryError):
         service.run_cypher("CREATE (n:Test) RETURN n LIMIT 1", parameters=None)
+
+
+def test_fetch_subsystem_frontier_visits_each_node_once() -> None:
+    hub = DummyNode(["Subsystem"], "s", name="Kasmina")
+    doc = DummyNode(["DesignDoc"], "d", path="docs/a.md")
+    source = DummyNode(["SourceFile"], "f", path="src/a.py")
+    hops = [
+        [(hub, doc), (hub, source)],
+        [(doc, source), (source, doc)],
+    ]
+
+    class FrontierTx:
+        def __init__(self) -> None:
+            self.calls: list[dict[str, object]] = []
+
+        def run(self, query: str, **params: object) -> list[dict[str, object]]:
+            self.calls.append(params)
+            edges = hops[len(self.calls) - 1] if len(self.calls) <= len(hops) else []
+            return [
+                {"source_id": start.element_id, "relationship": DummyRelationship(start, end, "REL"), "node": end}
+                for start, end in edges
+                if end.element_id not in params["visited"]  # type: ignore[operator]
+            ]
+
+    tx = FrontierTx()
+    rows = graph_service._fetch_subsystem_frontier(tx, "s", 3, 50, False)  # type: ignore[arg-type]
+
+    assert [row["node"].element_id for row in rows] == ["d", "f"]
+    assert len(tx.calls) == 2
+    assert tx.calls[1]["frontier"] == ["d", "f"]
+    assert tx.calls[1]["visited"] == ["s", "d", "f"]
+    assert tx.calls[0]["fanout"] == 50 and tx.calls[0]["include_chunks"] is False
+
+
+def test_subsystem_cache_invalidates_touched_subsystems_and_prewarms(monkeypatch: pytest.MonkeyPatch) -> None:
+    from prometheus_client import REGISTRY
+
+    from gateway.ingest.state_files import IndexGeneration
+
+    builds: list[tuple[str, str]] = []
+    members = {"core": ["core", "api"], "ui": ["ui"]}
+
+    def fake_snapshot(
+        self: GraphService, name: str, depth: int, *, include_chunks: bool, source: str
+    ) -> graph_service.SubsystemGraphSnapshot:
+        builds.append((name, source))
+        nodes = [{"id": f"Subsystem:{member}", "labels": ["Subsystem"], "properties": {"name": member}} for member in members[name]]
+        return graph_service.SubsystemGraphSnapshot(subsystem=nodes[0], related=[], nodes=nodes, edges=[], artifacts=[])
+
+    monkeypatch.setattr(GraphService, "_timed_snapshot", fake_snapshot)
+    state = [IndexGeneration(generation=1, subsystems=None)]
+    service = graph_service.get_graph_service(
+        DummyDriver(DummySession()),  # type: ignore[arg-type]
+        "knowledge",
+        cache_ttl=600,
+        generation_source=lambda: state[0],
+        prewarm_top_n=1,
+    )
+    warm_before = REGISTRY.get_sample_value("km_graph_subsystem_cache_events_total", {"event": "warm"}) or 0.0
+
+    for name in ("core", "ui", "core"):
+        service.get_subsystem_graph(name, depth=2)
+    assert builds == [("core", "request"), ("ui", "request")]
+
+    # Only snapshots that reach a touched subsystem are dropped; the hottest one is rebuilt.
+    state[0] = IndexGeneration(generation=2, subsystems=frozenset({"api"}))
+    assert service.refresh_generation(background=False) == [("core", 2, False)]
+    service.get_subsystem_graph("core", depth=2)
+    service.get_subsystem_graph("ui", depth=2)
+    assert builds[2:] == [("core", "warm")]
+
+    # A skipped generation cannot be attributed, so everything is dropped.
+    state[0] = IndexGeneration(generation=4, subsystems=frozenset({"ui"}))
+    assert service.refresh_generation(background=False) == [("core", 2, False)]
+    service.get_subsystem_graph("ui", depth=2)
+    assert builds[3:] == [("core", "warm"), ("ui", "request")]
+    warm_after = REGISTRY.get_sample_value("km_graph_subsystem_cache_events_total", {"event": "warm"}) or 0.0
+    assert warm_after >= warm_before + 1
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 from collections.abc import Sequence
 from pathlib import Path
+from types import SimpleNamespace
 from typing import cast
 
 import pytest
@@ -143,8 +144,8 @@ class _DummyQdrantClient:
     def __init__(self, points: list[_FakePoint]) -> None:
         self._points = points
 
-    def search(self, **_kwargs: object) -> list[_FakePoint]:
-        return self._points
+    def query_points(self, **_kwargs: object) -> SimpleNamespace:
+        return SimpleNamespace(points=self._points)
 
 
 @pytest.mark.neo4j
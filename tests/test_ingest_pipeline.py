@@ -7,6 +7,7 @@ import pytest
 from prometheus_client import REGISTRY
 
 from gateway.ingest.pipeline import IngestionConfig, IngestionPipeline, IngestionResult
+from gateway.ingest.symbols import SymbolIndex
 
 
 class StubQdrantWriter:
@@ -35,6 +36,7 @@ class StubNeo4jWriter:
         self.artifacts: list[str] = []
         self.chunk_ids: list[str] = []
         self.deleted_paths: list[str] = []
+        self.deleted_types: list[str | None] = []
 
     def ensure_constraints(self) -> None:  # pragma: no cover - not used in unit test
         pass
@@ -46,8 +48,9 @@ class StubNeo4jWriter:
         for item in chunk_embeddings:
             self.chunk_ids.append(item.chunk.chunk_id)
 
-    def delete_artifact(self, path: str) -> None:
+    def delete_artifact(self, path: str, artifact_type: str | None = None) -> None:
         self.deleted_paths.append(path)
+        self.deleted_types.append(artifact_type)
 
 
 @pytest.fixture()
@@ -129,6 +132,7 @@ def test_pipeline_removes_stale_artifacts(tmp_path: Path) -> None:
     assert "digest" in removed_entry
     assert "artifact_type" in removed_entry
     assert "docs/obsolete.md" in neo4j2.deleted_paths
+    assert neo4j2.deleted_types == ["doc"]
     assert "docs/obsolete.md" in qdrant2.deleted_paths
     assert metric_after == metric_before + 1
 
@@ -165,7 +169,115 @@ def test_pipeline_skips_unchanged_artifacts(tmp_path: Path) -> None:
     assert second.artifacts[0]["skipped"] is True
     assert metric_after == metric_before + 1
     assert second.chunk_count == 0
+    assert second.touched_subsystems() == set()
 
     # Full rebuild should bypass incremental skip
     third = _run(incremental=False)
     assert all(not entry.get("skipped") for entry in third.artifacts)
+    assert third.touched_subsystems() is None
+
+
+def test_touched_subsystems_round_trip_through_index_generation(tmp_path: Path) -> None:
+    from gateway.ingest.state_files import bump_index_generation, read_index_generation, read_index_generation_state
+
+    result = IngestionResult(
+        run_id="r",
+        profile="local",
+        started_at=0.0,
+        duration_seconds=0.1,
+        artifacts=[
+            {"path": "src/core/a.py", "subsystem": "core", "skipped": False},
+            {"path": "src/ui/b.py", "subsystem": "ui", "skipped": True},
+        ],
+        removed_artifacts=[{"path": "src/api/c.py", "subsystem": "api"}],
+    )
+    path = tmp_path / "index_generation.json"
+
+    assert bump_index_generation(path, subsystems=result.touched_subsystems()) == 1
+    state = read_index_generation_state(path)
+    assert state is not None and state.subsystems == frozenset({"api", "core"})
+
+    assert bump_index_generation(path) == 2
+    assert read_index_generation(path) == 2
+    assert read_index_generation_state(path).subsystems is None  # type: ignore[union-attr]
+
+
+class SparseStubQdrantWriter(StubQdrantWriter):
+    sparse_enabled = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sparse_vectors: list[object] = []
+
+    def upsert_chunks(self, chunks: Iterable[object]) -> None:
+        items = list(chunks)
+        self.sparse_vectors.extend(item.sparse for item in items)
+        self.upsert_payloads.append(len(items))
+
+
+def test_pipeline_encodes_sparse_vectors_and_backfills_vocabulary(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    (repo / "docs").mkdir(parents=True)
+    (repo / "docs" / "file.md").write_text("IngestionPipeline drains embedding batches")
+
+    ledger_path = tmp_path / "state" / "reports" / "artifact_ledger.json"
+    vocabulary_path = tmp_path / "state" / "lexical" / "km_test.json"
+
+    def _run(vocabulary: Path | None) -> tuple[SparseStubQdrantWriter, IngestionResult]:
+        qdrant = SparseStubQdrantWriter()
+        config = IngestionConfig(
+            repo_root=repo,
+            dry_run=False,
+            use_dummy_embeddings=True,
+            ledger_path=ledger_path,
+            lexical_vocabulary_path=vocabulary,
+        )
+        result = IngestionPipeline(qdrant_writer=qdrant, neo4j_writer=None, config=config).run()
+        return qdrant, result
+
+    # A ledger written before sparse vectors existed forces a one-off re-index.
+    _run(None)
+    qdrant, result = _run(vocabulary_path)
+
+    assert result.artifacts[0]["skipped"] is False
+    assert qdrant.sparse_vectors and all(vector is not None for vector in qdrant.sparse_vectors)
+    assert vocabulary_path.exists()
+
+    _, third = _run(vocabulary_path)
+    assert third.artifacts[0]["skipped"] is True
+
+
+def test_pipeline_maintains_symbol_index(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    (repo / "src" / "project").mkdir(parents=True)
+    module = repo / "src" / "project" / "module.py"
+    obsolete = repo / "src" / "project" / "obsolete.py"
+    module.write_text("class IngestionPipeline:\n    pass\n")
+    obsolete.write_text("def legacy_entrypoint():\n    pass\n")
+
+    ledger_path = tmp_path / "state" / "reports" / "artifact_ledger.json"
+    index_path = tmp_path / "state" / "symbols" / "km_test.json"
+
+    def _run() -> IngestionResult:
+        config = IngestionConfig(
+            repo_root=repo,
+            dry_run=False,
+            use_dummy_embeddings=True,
+            ledger_path=ledger_path,
+            symbol_index_path=index_path,
+        )
+        return IngestionPipeline(qdrant_writer=StubQdrantWriter(), neo4j_writer=None, config=config).run()
+
+    _run()
+    index = SymbolIndex.load(index_path)
+    assert index is not None
+    assert index.lookup("IngestionPipeline", limit=1)[0].entry.path == "src/project/module.py"
+    assert index.lookup("legacy_entrypoint", limit=1)
+
+    obsolete.unlink()
+    second = _run()
+    assert second.artifacts[0]["skipped"] is True
+    index = SymbolIndex.load(index_path)
+    assert index is not None
+    assert index.lookup("IngestionPipeline", limit=1), "unchanged artifacts keep their symbols"
+    assert not index.lookup("legacy_entrypoint", limit=1)
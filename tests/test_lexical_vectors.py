@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from gateway.ingest.lexical import LexicalVocabulary, lexical_vocabulary_path, tokenize
+from gateway.ingest.state_files import ReloadingFileCache
+
+
+def test_tokenize_expands_identifiers() -> None:
+    tokens = tokenize("IngestionPipeline.run_batch(x)")
+
+    assert "ingestionpipeline" in tokens
+    assert {"ingestion", "pipeline", "run_batch", "run", "batch"} <= set(tokens)
+    assert "x" not in tokens
+
+
+def test_vocabulary_assigns_stable_ids_and_saturates_term_frequency() -> None:
+    vocabulary = LexicalVocabulary()
+
+    first = vocabulary.encode_document("graph graph graph service")
+    second = vocabulary.encode_document("service layer")
+
+    graph_id = vocabulary.term_id("graph")
+    service_id = vocabulary.term_id("service")
+    assert graph_id is not None and service_id is not None
+    assert service_id in second.indices
+    weights = dict(zip(first.indices, first.values, strict=True))
+    assert weights[service_id] < weights[graph_id] < 3 * weights[service_id]
+
+
+def test_encode_query_drops_unknown_terms() -> None:
+    vocabulary = LexicalVocabulary()
+    vocabulary.encode_document("qdrant writer")
+
+    assert vocabulary.encode_query("neo4j") is None
+    encoded = vocabulary.encode_query("qdrant neo4j")
+    assert encoded is not None
+    assert encoded.indices == [vocabulary.term_id("qdrant")]
+
+
+def test_vocabulary_round_trip_and_store_reload(tmp_path: Path) -> None:
+    path = lexical_vocabulary_path(tmp_path, "km_test")
+    vocabulary = LexicalVocabulary()
+    vocabulary.encode_document("alpha beta")
+    vocabulary.save(path)
+
+    store = ReloadingFileCache(path, LexicalVocabulary.load)
+    loaded = store.get()
+    assert loaded is not None
+    assert loaded.term_id("beta") == vocabulary.term_id("beta")
+    assert loaded.document_count == 1
+    assert store.get() is loaded
+
+    vocabulary.encode_document("gamma")
+    vocabulary.save(path)
+    path.touch()
+    reloaded = store.get()
+    assert reloaded is not None
+    assert reloaded.term_id("gamma") is not None
+
+    assert ReloadingFileCache(tmp_path / "missing.json", LexicalVocabulary.load).get() is None
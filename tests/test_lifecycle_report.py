@@ -44,6 +44,11 @@ class DummyGraphService:
             "cursor": str(next_index) if next_index is not None else None,
         }
 
+    def count_orphan_nodes(self, labels: Iterable[str] | None = None) -> dict[str, int]:
+        """Total the seeded nodes per label, as the aggregated count query would."""
+
+        return {label: sum(len(batch) for batch in self._pages.get(label, [])) for label in labels or self._pages}
+
 
 @pytest.fixture(name="ingestion_result")
 def _ingestion_result() -> IngestionResult:
@@ -151,3 +156,27 @@ def test_write_lifecycle_report_with_graph(tmp_path: Path, ingestion_result: Ing
     assert payload["isolated"]["DesignDoc"][0]["path"] == "docs/orphan.md"
     summary = payload["summary"]
     assert summary["isolated_nodes"] == pytest.approx(1)
+
+
+def test_write_lifecycle_report_caps_isolated_listing(tmp_path: Path, ingestion_result: IngestionResult) -> None:
+    """Isolated totals come from the count query even when the listing is capped or disabled."""
+    output_path = tmp_path / "reports" / "lifecycle_report.json"
+    docs = [{"id": f"DesignDoc:docs/{index}.md", "properties": {"path": f"docs/{index}.md"}} for index in range(3)]
+    graph_service = cast(GraphService, DummyGraphService({"DesignDoc": [docs[:2], docs[2:]]}))
+
+    for isolated_limit, listed in ((2, 2), (0, None)):
+        config = LifecycleConfig(
+            output_path=output_path,
+            stale_days=30,
+            graph_enabled=True,
+            isolated_limit=isolated_limit,
+        )
+        write_lifecycle_report(ingestion_result, config=config, graph_service=graph_service)
+
+        payload = json.loads(output_path.read_text())
+        assert payload["isolated_totals"]["DesignDoc"] == 3
+        assert payload["summary"]["isolated_nodes"] == 3
+        if listed is None:
+            assert payload["isolated"] == {}
+        else:
+            assert len(payload["isolated"]["DesignDoc"]) == listed
@@ -156,3 +156,76 @@ def test_sync_chunks_links_chunk_to_artifact() -> None:
     cypher_text = "\n".join(query for query, _ in queries)
     assert "MERGE (c:Chunk" in cypher_text
     assert "HAS_CHUNK" in cypher_text
+
+
+def test_delete_artifact_uses_ledger_label_then_probes_indexed_labels() -> None:
+    """Deletes match by label and path, probing artifact labels only when needed."""
+
+    class DeletingSession(RecordingSession):
+        def __init__(self, deleted: list[int]) -> None:
+            super().__init__()
+            self._deleted = deleted
+
+        def run(self, query: str, **params: object) -> SimpleNamespace:  # type: ignore[override]
+            self.queries.append((query, params))
+            counters = SimpleNamespace(nodes_deleted=self._deleted.pop(0))
+            return SimpleNamespace(consume=lambda: SimpleNamespace(counters=counters))
+
+    class DeletingDriver(RecordingDriver):
+        def __init__(self, deleted: list[int]) -> None:
+            super().__init__()
+            self._deleted = deleted
+
+        def session(self, *, database: str | None = None) -> RecordingSession:
+            session = DeletingSession(self._deleted)
+            self.sessions.append(session)
+            return session
+
+    driver = DeletingDriver([2, 0, 1, 1])
+    writer = Neo4jWriter(driver=cast(Driver, driver), database="knowledge")
+
+    writer.delete_artifact("docs/a.md", "doc")
+    writer.delete_artifact("docs/moved.md", "code")
+    writer.delete_artifact("misc/b.txt")
+
+    queries = [query for session in driver.sessions for query, _ in session.queries]
+    assert queries[0].startswith("MATCH (n:DesignDoc {path: $path})")
+    assert queries[1].startswith("MATCH (n:SourceFile {path: $path})")
+    for probe in queries[2:]:
+        assert probe.startswith("CALL {")
+        assert all(f"MATCH (n:{label} {{path: $path}})" in probe for label in ("DesignDoc", "ConfigFile", "Artifact"))
+    assert len(queries) == 4
+    assert all("MATCH (n {path" not in query for query in queries)
+
+
+def test_sync_chunks_summary_mode_records_counts_without_chunk_nodes() -> None:
+    """Summary mode stores chunk counts and ordered digests on the artifact node."""
+    driver = RecordingDriver()
+    writer = Neo4jWriter(driver=cast(Driver, driver), database="knowledge", chunk_nodes=False)
+    chunks = [
+        Chunk(
+            chunk_id=f"src/a.py::{sequence}",
+            artifact=Artifact(
+                path=Path("src/a.py"),
+                artifact_type="code",
+                subsystem=None,
+                content="",
+                git_commit=None,
+                git_timestamp=None,
+            ),
+            text="",
+            sequence=sequence,
+            content_digest=f"digest-{sequence}",
+            metadata={"path": "src/a.py", "artifact_type": "code"},
+        )
+        for sequence in (1, 0)
+    ]
+
+    writer.sync_chunks([ChunkEmbedding(chunk=chunk, vector=[0.0]) for chunk in chunks])
+
+    queries = driver.sessions[0].queries
+    assert len(queries) == 1
+    query, params = queries[0]
+    assert "MERGE (c:Chunk" not in query
+    assert "MATCH (f:SourceFile {path: row.path})" in query
+    assert params["rows"] == [{"path": "src/a.py", "count": 2, "digests": ["digest-0", "digest-1"]}]
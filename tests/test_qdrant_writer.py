@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from unittest import mock
 
+from qdrant_client.http import models as qmodels
+
 from gateway.ingest.artifacts import Artifact, Chunk, ChunkEmbedding
+from gateway.ingest.lexical import SparseEncoding
 from gateway.ingest.qdrant_writer import QdrantWriter
 
 
@@ -11,6 +14,8 @@ class RecordingClient:
         self._collections = set()
         self.recreate_calls: list[dict[str, object]] = []
         self.upserts: list[dict[str, object]] = []
+        self.payload_indexes: dict[str, object] = {}
+        self.scroll_pages: list[list[object]] = []
 
     def get_collection(self, name: str) -> None:
         if name not in self._collections:
@@ -20,7 +25,8 @@ class RecordingClient:
         self,
         collection_name: str,
         vectors_config: object,
-        optimizers_config: object,
+        optimizers_config: object | None = None,
+        sparse_vectors_config: dict[str, object] | None = None,
     ) -> None:
         self._collections.add(collection_name)
         self.recreate_calls.append(
@@ -28,13 +34,22 @@ class RecordingClient:
                 "name": collection_name,
                 "size": vectors_config.size,
                 "distance": vectors_config.distance,
-                "segments": optimizers_config.default_segment_number,
+                "segments": getattr(optimizers_config, "default_segment_number", None),
+                "sparse": sparse_vectors_config or {},
             }
         )
 
+    def create_payload_index(self, collection_name: str, field_name: str, field_schema: object) -> None:
+        self.payload_indexes[field_name] = field_schema
+
     def upsert(self, collection_name: str, points: object) -> None:
         self.upserts.append({"collection": collection_name, "points": points})
 
+    def scroll(self, *, offset: int | None = None, **_kwargs: object) -> tuple[list[object], int | None]:
+        page = offset or 0
+        next_offset = page + 1 if page + 1 < len(self.scroll_pages) else None
+        return self.scroll_pages[page], next_offset
+
 
 def build_chunk(path: str, text: str, metadata: dict[str, object]) -> ChunkEmbedding:
     artifact = Artifact(
@@ -78,6 +93,13 @@ def test_ensure_collection_noop_when_exists() -> None:
     writer.ensure_collection(vector_size=256)
 
     assert not client.recreate_calls
+    assert client.payload_indexes == {
+        "path": qmodels.PayloadSchemaType.KEYWORD,
+        "chunk_index": qmodels.PayloadSchemaType.INTEGER,
+        "chunk_id": qmodels.PayloadSchemaType.KEYWORD,
+        "subsystem": qmodels.PayloadSchemaType.KEYWORD,
+        "artifact_type": qmodels.PayloadSchemaType.KEYWORD,
+    }
 
 
 def test_upsert_chunks_builds_points() -> None:
@@ -99,8 +121,67 @@ def test_upsert_chunks_builds_points() -> None:
     assert payload.payload["tags"] == ["intro"]
 
 
+def test_ensure_collection_configures_sparse_lexical_vector() -> None:
+    client = RecordingClient()
+    writer = QdrantWriter(client, "km_test")
+
+    writer.ensure_collection(vector_size=384)
+
+    sparse = client.recreate_calls[0]["sparse"]
+    assert sparse["lexical"].modifier == qmodels.Modifier.IDF
+    assert writer.sparse_enabled is True
+
+
+def test_existing_collection_without_sparse_vector_disables_sparse() -> None:
+    client = RecordingClient()
+    client._collections.add("km_test")
+    writer = QdrantWriter(client, "km_test")
+
+    writer.ensure_collection(vector_size=256)
+
+    assert writer.sparse_enabled is False
+
+
+def test_upsert_chunks_includes_named_sparse_vector() -> None:
+    client = RecordingClient()
+    writer = QdrantWriter(client, "km_test")
+    writer.ensure_collection(vector_size=2)
+
+    chunk = build_chunk("src/app.py", "def run(): pass", {"artifact_type": "code"})
+    chunk.sparse = SparseEncoding(indices=[0, 3], values=[1.2, 0.8])
+    writer.upsert_chunks([chunk])
+
+    point = client.upserts[0]["points"][0]
+    assert point.vector[""] == [0.1, 0.2]
+    assert point.vector["lexical"].indices == [0, 3]
+    assert point.vector["lexical"].values == [1.2, 0.8]
+
+
 def test_upsert_chunks_noop_on_empty() -> None:
     client = RecordingClient()
     writer = QdrantWriter(client, "km_test")
     writer.upsert_chunks([])
     assert not client.upserts
+
+
+def test_refresh_subsystem_centroids_averages_every_page() -> None:
+    client = RecordingClient()
+    client.scroll_pages = [
+        [
+            mock.Mock(payload={"subsystem": "core"}, vector={"": [1.0, 0.0], "lexical": object()}),
+            mock.Mock(payload={"subsystem": "core"}, vector=[0.0, 1.0]),
+        ],
+        [
+            mock.Mock(payload={"subsystem": "ops"}, vector=[0.5, 0.5]),
+            mock.Mock(payload={"subsystem": None}, vector=[9.0, 9.0]),
+        ],
+    ]
+    writer = QdrantWriter(client, "km_test")
+
+    counts = writer.refresh_subsystem_centroids()
+
+    assert counts == {"core": 2, "ops": 1}
+    assert client.recreate_calls[0]["name"] == "km_test_subsystems"
+    assert client.recreate_calls[0]["size"] == 2
+    points = client.upserts[0]["points"]
+    assert [(point.payload["subsystem"], point.vector) for point in points] == [("core", [0.5, 0.5]), ("ops", [0.5, 0.5])]
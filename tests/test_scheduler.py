@@ -101,7 +101,8 @@ def test_scheduler_skips_when_repo_head_unchanged(scheduler_settings: AppSetting
 
 def test_scheduler_runs_when_repo_head_changes(scheduler_settings: AppSettings) -> None:
     """Scheduler triggers ingestion when the repository head changes."""
-    scheduler = IngestionScheduler(scheduler_settings)
+    completed: list[IngestionResult] = []
+    scheduler = IngestionScheduler(scheduler_settings, on_success=completed.append)
     scheduler._write_last_head("abc")
 
     before_success = _metric_value("km_scheduler_runs_total", {"result": "success"})
@@ -112,6 +113,7 @@ def test_scheduler_runs_when_repo_head_changes(scheduler_settings: AppSettings)
         scheduler._run_ingestion()
         execute.assert_called_once()
         assert scheduler._read_last_head() == "def"
+    assert [result.repo_head for result in completed] == ["def"]
     after_success = _metric_value("km_scheduler_runs_total", {"result": "success"})
     assert after_success == pytest.approx(before_success + 1)
 
@@ -8,12 +8,18 @@ import pytest
 from fastapi.testclient import TestClient
 
 from gateway.api.app import create_app
-from gateway.search.service import SearchResponse, SearchResult
+from gateway.search.service import SearchBatchResponse, SearchRequest, SearchResponse, SearchResult
 
 
 class DummySearchService:
     def __init__(self) -> None:
         self.last_filters: dict[str, object] | None = None
+        self.calls = 0
+        self.batches: list[list[SearchRequest]] = []
+        self.similar_seeds: list[list[str]] = []
+
+    def cache_scope(self) -> dict[str, object]:
+        return {}
 
     def search(
         self,
@@ -25,8 +31,10 @@ class DummySearchService:
         sort_by_vector: bool = False,
         request_id: str | None = None,
         filters: dict[str, object] | None = None,
+        **_options: object,
     ) -> SearchResponse:
         self.last_filters = filters or {}
+        self.calls += 1
         return SearchResponse(
             query=query,
             results=[
@@ -55,6 +63,28 @@ class DummySearchService:
             },
         )
 
+    def search_batch(
+        self,
+        requests: list[SearchRequest],
+        *,
+        graph_service: object,
+        sort_by_vector: bool = False,
+        request_id: str | None = None,
+    ) -> SearchBatchResponse:
+        self.batches.append(list(requests))
+        responses = [
+            self.search(query=item.query, limit=item.limit, include_graph=item.include_graph, graph_service=graph_service)
+            for item in requests
+        ]
+        return SearchBatchResponse(responses=responses, metadata={"query_count": len(requests), "request_id": request_id})
+
+    def search_similar(self, *, chunk_ids: list[str], **options: object) -> SearchResponse:
+        self.similar_seeds.append(list(chunk_ids))
+        response = self.search(query=" ".join(chunk_ids), **options)
+        known = [chunk_id for chunk_id in chunk_ids if chunk_id != "missing::0"]
+        response.metadata["seed_chunk_ids"] = known
+        return response
+
 
 def test_search_endpoint_returns_results(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     monkeypatch.setenv("KM_AUTH_ENABLED", "false")
@@ -80,6 +110,38 @@ def test_search_endpoint_returns_results(monkeypatch: pytest.MonkeyPatch, tmp_pa
     assert data["metadata"]["request_id"] == request_id_header
 
 
+def test_search_endpoint_applies_verbosity(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    from gateway.config.settings import get_settings
+
+    get_settings.cache_clear()
+    app = create_app()
+    service = DummySearchService()
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    compact = client.post("/search", json={"query": "telemetry", "verbosity": "compact", "snippet_chars": 4}).json()
+    result = compact["results"][0]
+    assert result["chunk"]["text"] == "snip…"
+    assert result["scoring"] == {"vector_score": 0.9, "adjusted_score": 0.95}
+    assert result["graph_context"] == {"primary_node": {"id": "SourceFile:src/module.py"}}
+
+    ids = client.post("/search", json={"query": "telemetry", "verbosity": "ids"}).json()
+    assert ids["results"][0] == {
+        "chunk": {"chunk_id": "path::0", "artifact_path": "src/module.py"},
+        "graph_context": None,
+        "scoring": {"adjusted_score": 0.95},
+    }
+
+    invalid = client.post("/search", json={"query": "telemetry", "verbosity": "tiny"})
+    assert invalid.status_code == 422
+    assert client.post("/search", json={"query": "telemetry", "group_by": "subsystem"}).status_code == 422
+    assert client.post("/search", json={"query": "telemetry", "group_by": "artifact", "group_siblings": 11}).status_code == 422
+    assert client.post("/search", json={"query": "telemetry", "expand_context": 6}).status_code == 422
+    assert client.post("/search", json={"query": "telemetry", "mode": "thorough"}).status_code == 422
+
+
 def test_search_reuses_incoming_request_id(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     monkeypatch.setenv("KM_AUTH_ENABLED", "false")
     monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
@@ -325,3 +387,238 @@ def test_search_weights_endpoint(monkeypatch: pytest.MonkeyPatch, tmp_path: Path
     assert "profile" in payload
     assert "weights" in payload
     assert "weight_criticality" in payload["weights"]
+
+
+def test_search_response_cache_serves_repeats_until_ingestion(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    from gateway.config.settings import get_settings
+    from gateway.ingest.state_files import bump_index_generation, index_generation_path
+
+    get_settings.cache_clear()
+    app = create_app()
+    service = DummySearchService()
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    body = {"query": "telemetry", "feedback": {"vote": 1}}
+    first = client.post("/search", json=body).json()
+    second = client.post("/search", json={**body, "query": "  telemetry "}).json()
+
+    assert service.calls == 1
+    assert first["metadata"]["cache"]["status"] == "miss"
+    assert second["metadata"]["cache"]["status"] == "hit"
+    assert first["metadata"]["request_id"] != second["metadata"]["request_id"]
+
+    events_path = tmp_path / "feedback" / "events.log"
+    rows = [json.loads(line) for line in events_path.read_text(encoding="utf-8").splitlines() if line]
+    assert {row["request_id"] for row in rows} == {first["metadata"]["request_id"], second["metadata"]["request_id"]}
+
+    generation = bump_index_generation(index_generation_path(tmp_path))
+    third = client.post("/search", json=body).json()
+    assert service.calls == 2
+    assert third["metadata"]["cache"] == {"status": "miss", "generation": generation}
+
+
+def test_search_endpoint_uses_async_clients_for_live_service(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    from types import SimpleNamespace
+
+    from gateway.config.settings import get_settings
+    from gateway.search.service import SearchService
+
+    payload = {"chunk_id": "src/module.py::0", "path": "src/module.py", "artifact_type": "code", "text": "module body"}
+
+    class UnusedSyncClient:
+        def query_points(self, **kwargs: object) -> list[object]:  # pragma: no cover - must not be called
+            raise AssertionError("sync client used on the async path")
+
+    class AsyncClient:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def query_points(self, **kwargs: object) -> SimpleNamespace:
+            self.calls += 1
+            return SimpleNamespace(points=[SimpleNamespace(payload=payload, score=0.8)])
+
+    class Embedder:
+        def encode(self, texts: list[str]) -> list[list[float]]:
+            return [[0.1, 0.2] for _ in texts]
+
+    get_settings.cache_clear()
+    app = create_app()
+    async_client = AsyncClient()
+    app.state.async_qdrant_client = async_client
+    app.state.async_graph_driver = None
+    service = SearchService(UnusedSyncClient(), "collection", Embedder())  # type: ignore[arg-type]
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    data = client.post("/search", json={"query": "module body"}).json()
+
+    assert async_client.calls == 1
+    assert data["metadata"]["retrieval"] == "dense"
+    assert [result["chunk"]["chunk_id"] for result in data["results"]] == ["src/module.py::0"]
+    assert data["metadata"]["warnings"] == ["Graph context unavailable"]
+
+
+def test_search_batch_endpoint_returns_per_query_responses(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    from gateway.config.settings import get_settings
+
+    get_settings.cache_clear()
+    app = create_app()
+    service = DummySearchService()
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    resp = client.post(
+        "/search/batch",
+        json={
+            "queries": ["telemetry", {"query": "ingest", "limit": 3, "filters": {"subsystems": ["core"]}}],
+            "include_graph": False,
+        },
+        headers={"X-Request-ID": "batch-1"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["metadata"] == {"query_count": 2, "request_id": "batch-1"}
+    assert [item["metadata"]["request_id"] for item in data["responses"]] == ["batch-1:0", "batch-1:1"]
+    assert data["responses"][1]["metadata"]["filters_applied"] == {"subsystems": ["core"]}
+    (batch,) = service.batches
+    assert [(item.query, item.limit, item.include_graph) for item in batch] == [("telemetry", 10, False), ("ingest", 3, False)]
+
+
+def test_search_batch_endpoint_validates_entries(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    monkeypatch.setenv("KM_SEARCH_BATCH_MAX_QUERIES", "2")
+    from gateway.config.settings import get_settings
+
+    get_settings.cache_clear()
+    app = create_app()
+    service = DummySearchService()
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    assert client.post("/search/batch", json={"queries": []}).status_code == 422
+    assert client.post("/search/batch", json={"queries": ["a", "b", "c"]}).status_code == 422
+    invalid = client.post("/search/batch", json={"queries": ["a", {"query": "b", "filters": {"tags": "ops"}}]})
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"] == "filters.tags must be an array of strings"
+    assert client.post("/search/batch", json={"queries": [{"query": "a", "mode": "fast"}]}).status_code == 422
+    assert client.post("/search/batch", json={"queries": [{"query": 5}]}).status_code == 422
+    assert client.post("/search/batch", json={"queries": ["a"], "limit": "many"}).status_code == 422
+    assert client.post("/search/batch", json={"queries": ["a"], "verbosity": "loud"}).status_code == 422
+    assert service.batches == []
+
+
+def test_search_similar_endpoint(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    from gateway.config.settings import get_settings
+
+    get_settings.cache_clear()
+    app = create_app()
+    service = DummySearchService()
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    resp = client.post("/search/similar", json={"chunk_ids": ["path::0", "path::0"], "verbosity": "ids"})
+    assert resp.status_code == 200
+    assert resp.json()["results"][0]["chunk"] == {"chunk_id": "path::0", "artifact_path": "src/module.py"}
+    assert service.similar_seeds == [["path::0"]]
+
+    assert client.post("/search/similar", json={"chunk_ids": ["missing::0"]}).status_code == 404
+    assert client.post("/search/similar", json={"chunk_ids": []}).status_code == 422
+    assert client.post("/search/similar", json={"chunk_ids": [f"a::{i}" for i in range(11)]}).status_code == 422
+    assert client.post("/search/similar", json={"chunk_ids": ["path::0"], "group_by": "artifact"}).status_code == 422
+
+
+def test_search_batch_rate_limit_counts_weighted_cost(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    monkeypatch.setenv("KM_RATE_LIMIT_REQUESTS", "5")
+    monkeypatch.setenv("KM_RATE_LIMIT_WINDOW", "60")
+    from gateway.config.settings import get_settings
+
+    get_settings.cache_clear()
+    app = create_app()
+    service = DummySearchService()
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    # Two queries of 20 results each cost 2 + 2 = 4 of the 5 allowed requests.
+    first = client.post("/search/batch", json={"queries": ["a", "b"], "limit": 20})
+    assert first.status_code == 200
+    assert client.post("/search/batch", json={"queries": ["c"]}).status_code == 200
+    assert client.post("/search/batch", json={"queries": ["d"]}).status_code == 429
+
+
+def test_search_endpoint_streams_ndjson_events(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    from types import SimpleNamespace
+
+    from gateway.config.settings import get_settings
+    from gateway.search.service import SearchService
+
+    payload = {"chunk_id": "src/module.py::0", "path": "src/module.py", "artifact_type": "code", "text": "module body"}
+
+    class AsyncClient:
+        async def query_points(self, **kwargs: object) -> SimpleNamespace:
+            return SimpleNamespace(points=[SimpleNamespace(payload=payload, score=0.8)])
+
+    class Embedder:
+        def encode(self, texts: list[str]) -> list[list[float]]:
+            return [[0.1, 0.2] for _ in texts]
+
+    get_settings.cache_clear()
+    app = create_app()
+    app.state.async_qdrant_client = AsyncClient()
+    app.state.async_graph_driver = None
+    service = SearchService(object(), "collection", Embedder())  # type: ignore[arg-type]
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    resp = client.post(
+        "/search",
+        json={"query": "module body"},
+        headers={"Accept": "application/x-ndjson", "X-Request-ID": "stream-1"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines() if line]
+    assert [event["event"] for event in events] == ["header", "hits", "score", "final"]
+    assert events[0]["request_id"] == "stream-1"
+    assert events[1]["results"][0]["chunk"]["chunk_id"] == "src/module.py::0"
+    final = events[-1]
+    assert final["order"] == ["src/module.py::0"]
+    assert final["metadata"]["request_id"] == "stream-1"
+    assert final["metadata"]["warnings"] == ["Graph context unavailable"]
+
+    sse = client.post("/search", json={"query": "module body"}, headers={"Accept": "text/event-stream"})
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: header\ndata: ")
+
+
+def test_search_stream_request_falls_back_to_json_without_async_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KM_AUTH_ENABLED", "false")
+    monkeypatch.setenv("KM_STATE_PATH", str(tmp_path))
+    from gateway.config.settings import get_settings
+
+    get_settings.cache_clear()
+    app = create_app()
+    service = DummySearchService()
+    app.dependency_overrides[app.state.search_service_dependency] = lambda: service
+    client = TestClient(app)
+
+    resp = client.post("/search", json={"query": "telemetry"}, headers={"Accept": "application/x-ndjson, application/json"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/json")
+    assert resp.json()["results"][0]["chunk"]["artifact_path"] == "src/module.py"
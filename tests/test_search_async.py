@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from qdrant_client.http.models import Filter
+
+from gateway.graph.service import GraphNotFoundError
+from gateway.search import AsyncSearchService, SearchOptions, SearchRequest, SearchResponse, SearchService
+from gateway.search.benchmark import run_concurrency_level
+from gateway.search.breaker import GraphCircuitBreaker
+
+
+class ThreadRecordingEmbedder:
+    def __init__(self) -> None:
+        self.threads: list[str] = []
+
+    def encode(self, texts: Sequence[str]) -> list[list[float]]:
+        self.threads.append(threading.current_thread().name)
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+
+class FakePoint:
+    def __init__(self, payload: dict[str, Any], score: float) -> None:
+        self.payload = payload
+        self.score = score
+
+
+class FakeSyncQdrant:
+    def __init__(self, points: list[FakePoint]) -> None:
+        self._points = points
+
+    def query_batch_points(self, *, collection_name: str, requests: list[Any]) -> list[SimpleNamespace]:
+        return [SimpleNamespace(points=self._points[: request.limit]) for request in requests]
+
+    def query_points_groups(self, **kwargs: object) -> SimpleNamespace:
+        return _groups(self._points, **kwargs)
+
+    def scroll(self, **kwargs: object) -> tuple[list[SimpleNamespace], None]:
+        return _records(self._points), None
+
+    def query_points(self, *, limit: int, **kwargs: object) -> SimpleNamespace:
+        return SimpleNamespace(points=self._points[:limit])
+
+
+def _records(points: list[FakePoint]) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=point.payload["chunk_id"],
+            payload={**point.payload, "chunk_index": int(point.payload["chunk_id"].rsplit("::", 1)[1])},
+        )
+        for point in points
+    ]
+
+
+def _groups(points: list[FakePoint], *, group_by: str, limit: int, group_size: int, **_kwargs: object) -> SimpleNamespace:
+    grouped: dict[str, list[FakePoint]] = {}
+    for point in points:
+        grouped.setdefault(point.payload[group_by], []).append(point)
+    return SimpleNamespace(groups=[SimpleNamespace(id=key, hits=hits[:group_size]) for key, hits in list(grouped.items())[:limit]])
+
+
+class FakeAsyncQdrant:
+    def __init__(self, points: list[FakePoint]) -> None:
+        self._points = points
+        self.calls: list[dict[str, Any]] = []
+
+    async def query_points(self, *, limit: int, **kwargs: object) -> SimpleNamespace:
+        self.calls.append({"limit": limit, **kwargs})
+        await asyncio.sleep(0)
+        return SimpleNamespace(points=self._points[:limit])
+
+    async def query_batch_points(self, *, collection_name: str, requests: list[Any]) -> list[SimpleNamespace]:
+        self.calls.append({"batch": list(requests)})
+        await asyncio.sleep(0)
+        return [SimpleNamespace(points=self._points[: request.limit]) for request in requests]
+
+    async def query_points_groups(self, **kwargs: object) -> SimpleNamespace:
+        self.calls.append({"groups": kwargs})
+        await asyncio.sleep(0)
+        return _groups(self._points, **kwargs)
+
+    async def scroll(self, **kwargs: object) -> tuple[list[SimpleNamespace], None]:
+        self.calls.append({"scroll": kwargs})
+        await asyncio.sleep(0)
+        return _records(self._points), None
+
+
+def _graph_payload(node_id: str) -> dict[str, Any]:
+    return {
+        "node": {"id": node_id, "labels": ["SourceFile"], "properties": {"path": node_id.split(":", 1)[1]}},
+        "relationships": [
+            {
+                "type": "BELONGS_TO",
+                "direction": "OUT",
+                "target": {"id": "Subsystem:core", "labels": ["Subsystem"], "properties": {"name": "core"}},
+            }
+        ],
+    }
+
+
+class SyncGraph:
+    def __init__(self, missing: set[str] | None = None) -> None:
+        self.missing = missing or set()
+
+    def get_node(self, node_id: str, *, relationships: str, limit: int) -> dict[str, Any]:
+        if node_id in self.missing:
+            raise GraphNotFoundError(f"Node '{node_id}' not found")
+        return _graph_payload(node_id)
+
+    def shortest_path_depth(self, node_id: str, *, max_depth: int = 4) -> int | None:
+        return 1
+
+
+class AsyncGraph:
+    def __init__(self, missing: set[str] | None = None, delay: float = 0.01) -> None:
+        self.missing = missing or set()
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.node_calls = 0
+
+    async def get_node(self, node_id: str, *, relationships: str, limit: int) -> dict[str, Any]:
+        self.node_calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if node_id in self.missing:
+            raise GraphNotFoundError(f"Node '{node_id}' not found")
+        return _graph_payload(node_id)
+
+    async def shortest_path_depth(self, node_id: str, *, max_depth: int = 4) -> int | None:
+        return 1
+
+
+def _points(count: int) -> list[FakePoint]:
+    return [
+        FakePoint(
+            {
+                "chunk_id": f"src/module_{index}.py::0",
+                "path": f"src/module_{index}.py",
+                "artifact_type": "code",
+                "subsystem": "core",
+                "text": "module body",
+            },
+            0.9 - index * 0.01,
+        )
+        for index in range(count)
+    ]
+
+
+def _service(points: list[FakePoint], embedder: ThreadRecordingEmbedder, **options: int) -> SearchService:
+    return SearchService(
+        qdrant_client=FakeSyncQdrant(points),  # type: ignore[arg-type]
+        collection_name="collection",
+        embedder=embedder,  # type: ignore[arg-type]
+        options=SearchOptions(**options),
+    )
+
+
+def _ranking(response: SearchResponse) -> list[tuple[str, Any, Any]]:
+    return [(result.chunk["chunk_id"], result.scoring["adjusted_score"], result.graph_context) for result in response.results]
+
+
+@pytest.mark.asyncio
+async def test_async_search_matches_sync_ranking() -> None:
+    points = _points(8)
+    missing = {"SourceFile:src/module_1.py"}
+    embedder = ThreadRecordingEmbedder()
+    service = _service(points, embedder, enrich_top_n=4)
+
+    expected = service.search(query="core module", limit=5, include_graph=True, graph_service=SyncGraph(missing))  # type: ignore[arg-type]
+    async_service = AsyncSearchService(service, FakeAsyncQdrant(points))  # type: ignore[arg-type]
+    actual = await async_service.search(
+        query="core module",
+        limit=5,
+        include_graph=True,
+        graph_service=AsyncGraph(missing),  # type: ignore[arg-type]
+    )
+
+    assert _ranking(actual) == _ranking(expected)
+    assert actual.metadata["warnings"] == expected.metadata["warnings"] == ["Node 'SourceFile:src/module_1.py' not found"]
+    assert actual.metadata["enrichment"] == expected.metadata["enrichment"]
+    assert "graph_prefetch" in actual.metadata["timings_ms"]
+
+
+@pytest.mark.asyncio
+async def test_async_grouped_search_matches_sync() -> None:
+    points = _points(4) + [
+        FakePoint({**point.payload, "chunk_id": point.payload["path"] + "::1"}, point.score - 0.05) for point in _points(4)
+    ]
+    embedder = ThreadRecordingEmbedder()
+    service = _service(points, embedder)
+    options: dict[str, Any] = {"query": "core module", "limit": 5, "include_graph": False, "group_by": "artifact", "group_siblings": 2}
+
+    expected = service.search(graph_service=None, **options)
+    async_qdrant = FakeAsyncQdrant(points)
+    actual = await AsyncSearchService(service, async_qdrant).search(graph_service=None, **options)  # type: ignore[arg-type]
+
+    assert _ranking(actual) == _ranking(expected)
+    assert len(actual.results) == 4
+    assert actual.results[0].chunk["sibling_chunk_ids"] == ["src/module_0.py::1"]
+    assert async_qdrant.calls[0]["groups"]["group_size"] == 3
+
+
+@pytest.mark.asyncio
+async def test_async_context_expansion_matches_sync() -> None:
+    points = _points(3) + [
+        FakePoint({**point.payload, "chunk_id": point.payload["path"] + "::1"}, point.score - 0.5) for point in _points(3)
+    ]
+    service = _service(points, ThreadRecordingEmbedder())
+    options: dict[str, Any] = {"query": "core module", "limit": 3, "include_graph": False, "expand_context": 1}
+
+    expected = service.search(graph_service=None, **options)
+    async_qdrant = FakeAsyncQdrant(points)
+    actual = await AsyncSearchService(service, async_qdrant).search(graph_service=None, **options)  # type: ignore[arg-type]
+
+    assert [result.chunk["context"] for result in actual.results] == [result.chunk["context"] for result in expected.results]
+    assert actual.results[0].chunk["context"]["chunk_ids"] == ["src/module_0.py::0", "src/module_0.py::1"]
+    assert [call for call in async_qdrant.calls if "scroll" in call][0]["scroll"]["limit"] == 6
+
+
+@pytest.mark.asyncio
+async def test_async_subsystem_routing_matches_sync() -> None:
+    points = _points(4)
+    service = _service(points, ThreadRecordingEmbedder(), routing_mode="subsystem")
+    options: dict[str, Any] = {"query": "core module", "limit": 3, "include_graph": False}
+
+    expected = service.search(graph_service=None, **options)
+    async_qdrant = FakeAsyncQdrant(points)
+    actual = await AsyncSearchService(service, async_qdrant).search(graph_service=None, **options)  # type: ignore[arg-type]
+
+    assert _ranking(actual) == _ranking(expected)
+    assert actual.metadata["routing"] == expected.metadata["routing"]
+    assert actual.metadata["routing"]["outcome"] == "low_confidence"
+    assert async_qdrant.calls[0]["collection_name"] == "collection_subsystems"
+    assert async_qdrant.calls[1]["query_filter"] is None
+
+
+class CountingSyncQdrant(FakeSyncQdrant):
+    def count(self, *, count_filter: Filter | None = None, **kwargs: object) -> SimpleNamespace:
+        return SimpleNamespace(count=40 if count_filter is not None else 10_000)
+
+
+class CountingAsyncQdrant(FakeAsyncQdrant):
+    async def count(self, *, count_filter: Filter | None = None, **kwargs: object) -> SimpleNamespace:
+        await asyncio.sleep(0)
+        return SimpleNamespace(count=40 if count_filter is not None else 10_000)
+
+
+@pytest.mark.asyncio
+async def test_async_search_mode_tuning_matches_sync() -> None:
+    points = _points(4)
+    service = SearchService(
+        qdrant_client=CountingSyncQdrant(points),  # type: ignore[arg-type]
+        collection_name="collection",
+        embedder=ThreadRecordingEmbedder(),  # type: ignore[arg-type]
+        options=SearchOptions(hnsw_ef_search=128),
+    )
+    options: dict[str, Any] = {"query": "core module", "limit": 3, "include_graph": False, "filters": {"artifact_types": ["code"]}}
+
+    expected = service.search(graph_service=None, mode="fast", **options)
+    async_qdrant = CountingAsyncQdrant(points)
+    actual = await AsyncSearchService(service, async_qdrant).search(graph_service=None, mode="fast", **options)  # type: ignore[arg-type]
+
+    assert _ranking(actual) == _ranking(expected)
+    assert actual.metadata["search_mode"] == expected.metadata["search_mode"]
+    assert actual.metadata["search_mode"]["exact"] is True
+    assert async_qdrant.calls[0]["search_params"].exact is True
+    assert async_qdrant.calls[0]["query_filter"].must[0].key == "artifact_type"
+
+
+@pytest.mark.asyncio
+async def test_async_similar_search_matches_sync() -> None:
+    points = _points(5)
+    embedder = ThreadRecordingEmbedder()
+    service = _service(points, embedder)
+    options: dict[str, Any] = {"chunk_ids": ["src/module_0.py::0"], "limit": 3, "include_graph": False}
+
+    expected = service.search_similar(graph_service=None, **options)
+    async_qdrant = FakeAsyncQdrant(points)
+    actual = await AsyncSearchService(service, async_qdrant).search_similar(graph_service=None, **options)  # type: ignore[arg-type]
+
+    assert _ranking(actual) == _ranking(expected)
+    assert actual.metadata["retrieval"] == "similar"
+    assert "query" in async_qdrant.calls[-1] and not embedder.threads
+
+
+@pytest.mark.asyncio
+async def test_async_search_bounds_concurrent_graph_lookups() -> None:
+    points = _points(12)
+    service = _service(points, ThreadRecordingEmbedder(), enrich_top_n=10, overfetch_factor=1.0)
+    graph = AsyncGraph()
+    async_service = AsyncSearchService(service, FakeAsyncQdrant(points), graph_concurrency=3)  # type: ignore[arg-type]
+
+    response = await async_service.search(query="module", limit=12, include_graph=True, graph_service=graph)  # type: ignore[arg-type]
+
+    assert graph.node_calls == 10
+    assert graph.max_in_flight == 3
+    assert [result.scoring["graph_enriched"] for result in response.results].count(True) == 10
+
+
+@pytest.mark.asyncio
+async def test_async_search_resolves_filter_lookups_in_rounds() -> None:
+    points = _points(12)
+    for point in points:
+        point.payload["subsystem"] = "other"  # only graph context can admit a candidate
+    missing = {"SourceFile:src/module_1.py"}
+    options: dict[str, Any] = {"query": "module", "limit": 2, "include_graph": True, "filters": {"subsystems": ["core"]}}
+    service = _service(points, ThreadRecordingEmbedder(), enrich_top_n=1)
+    expected = service.search(graph_service=SyncGraph(missing), **options)  # type: ignore[arg-type]
+    graph = AsyncGraph(missing)
+    async_service = AsyncSearchService(service, FakeAsyncQdrant(points))  # type: ignore[arg-type]
+
+    actual = await async_service.search(graph_service=graph, **options)  # type: ignore[arg-type]
+
+    # The head, then one filter-deciding lookup per open slot: module_1 is rejected, so module_2 follows.
+    assert graph.node_calls == 3
+    assert _ranking(actual) == _ranking(expected)
+    assert [result.chunk["chunk_id"] for result in actual.results] == ["src/module_0.py::0", "src/module_2.py::0"]
+    assert actual.metadata["enrichment"]["graph_lookups"] == expected.metadata["enrichment"]["graph_lookups"] == 3
+
+
+@pytest.mark.asyncio
+async def test_async_search_skips_graph_lookups_while_breaker_is_open() -> None:
+    points = _points(4)
+    service = _service(points, ThreadRecordingEmbedder(), enrich_top_n=4)
+    service.graph_breaker = GraphCircuitBreaker(min_calls=1, cooldown_seconds=60.0)
+    service.graph_breaker.record(0.01, failed=True)
+    graph = AsyncGraph()
+    async_service = AsyncSearchService(service, FakeAsyncQdrant(points))  # type: ignore[arg-type]
+
+    response = await async_service.search(query="module", limit=4, include_graph=True, graph_service=graph)  # type: ignore[arg-type]
+
+    assert graph.node_calls == 0
+    assert response.metadata["warnings"] == ["graph enrichment skipped: graph circuit breaker open"]
+    assert all(result.graph_context is None for result in response.results)
+
+
+@pytest.mark.asyncio
+async def test_async_search_encodes_on_dedicated_executor() -> None:
+    points = _points(3)
+    embedder = ThreadRecordingEmbedder()
+    client = FakeAsyncQdrant(points)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-encode") as executor:
+        async_service = AsyncSearchService(_service(points, embedder), client, encode_executor=executor)  # type: ignore[arg-type]
+        response = await async_service.search(query="module", limit=2, include_graph=False, graph_service=None)
+
+    assert embedder.threads and embedder.threads[0].startswith("search-encode")
+    assert client.calls[0]["query"] == [0.1, 0.2, 0.3]
+    assert response.metadata["retrieval"] == "dense"
+    assert len(response.results) == 2
+
+
+@pytest.mark.asyncio
+async def test_search_events_emit_hits_before_graph_context() -> None:
+    points = _points(6)
+    missing = {"SourceFile:src/module_2.py"}
+    service = _service(points, ThreadRecordingEmbedder(), enrich_top_n=4)
+    async_service = AsyncSearchService(service, FakeAsyncQdrant(points))  # type: ignore[arg-type]
+    options: dict[str, Any] = {"query": "core module", "limit": 4, "include_graph": True}
+
+    events = [event async for event in async_service.search_events(graph_service=AsyncGraph(missing), **options)]  # type: ignore[arg-type]
+    expected = await async_service.search(graph_service=AsyncGraph(missing), **options)  # type: ignore[arg-type]
+
+    kinds = [event["event"] for event in events]
+    assert kinds[:2] == ["header", "hits"]
+    assert kinds[-1] == "final"
+    assert kinds.count("graph") == 4 and kinds.count("score") == 4
+    assert kinds.index("score") > max(index for index, kind in enumerate(kinds) if kind == "graph")
+    assert events[0]["retrieval"] == "dense" and "vector_search" in events[0]["timings_ms"]
+    assert all(hit["graph_context"] is None for hit in events[1]["results"])
+    graph_events = {event["chunk_id"]: event for event in events if event["event"] == "graph"}
+    assert graph_events["src/module_2.py::0"]["warnings"] == ["Node 'SourceFile:src/module_2.py' not found"]
+    scores = [event["result"] for event in events if event["event"] == "score"]
+    assert [(item["chunk"]["chunk_id"], item["scoring"]["adjusted_score"]) for item in scores] == [
+        (chunk_id, score) for chunk_id, score, _context in _ranking(expected)
+    ]
+    assert events[-1]["order"] == [result.chunk["chunk_id"] for result in expected.results]
+    assert events[-1]["metadata"]["warnings"] == expected.metadata["warnings"]
+
+
+@pytest.mark.asyncio
+async def test_async_search_batch_prefetches_each_node_once() -> None:
+    points = _points(6)
+    missing = {"SourceFile:src/module_1.py"}
+    embedder = ThreadRecordingEmbedder()
+    client = FakeAsyncQdrant(points)
+    graph = AsyncGraph(missing)
+    service = _service(points, embedder, enrich_top_n=4)
+    async_service = AsyncSearchService(service, client)  # type: ignore[arg-type]
+    requests = [SearchRequest(query="core module", limit=4), SearchRequest(query="module body", limit=3)]
+
+    batch = await async_service.search_batch(requests, graph_service=graph, request_id="batch")  # type: ignore[arg-type]
+    expected = service.search_batch(requests, graph_service=SyncGraph(missing), request_id="batch")  # type: ignore[arg-type]
+
+    assert len(embedder.threads) == 2  # one encode per batch, async then sync
+    assert len(client.calls) == 1 and len(client.calls[0]["batch"]) == 2
+    assert graph.node_calls == 4
+    assert batch.metadata["graph_lookups"] == 4
+    for actual, sync in zip(batch.responses, expected.responses, strict=True):
+        assert _ranking(actual) == _ranking(sync)
+    assert all("Node 'SourceFile:src/module_1.py' not found" in response.metadata["warnings"] for response in batch.responses)
+
+
+@pytest.mark.asyncio
+async def test_async_search_batch_skips_graph_for_queries_without_include_graph() -> None:
+    points = _points(4)
+    graph = AsyncGraph()
+    service = _service(points, ThreadRecordingEmbedder(), enrich_top_n=4)
+    async_service = AsyncSearchService(service, FakeAsyncQdrant(points))  # type: ignore[arg-type]
+    requests = [SearchRequest(query="module", limit=2, include_graph=False, filters={"subsystems": ["ui"]})]
+
+    batch = await async_service.search_batch(requests, graph_service=graph)  # type: ignore[arg-type]
+    expected = service.search_batch(requests, graph_service=SyncGraph())  # type: ignore[arg-type]
+
+    # The subsystem filter alone must not trigger lookups the sync path would skip.
+    assert graph.node_calls == 0
+    assert batch.metadata["graph_lookups"] == expected.metadata["graph_lookups"] == 0
+    assert _ranking(batch.responses[0]) == _ranking(expected.responses[0])
+
+
+@pytest.mark.asyncio
+async def test_async_search_batch_routes_like_sync() -> None:
+    points = _points(4)
+    client = FakeAsyncQdrant(points)
+    service = SearchService(
+        qdrant_client=FakeSyncQdrant(points),  # type: ignore[arg-type]
+        collection_name="collection",
+        embedder=ThreadRecordingEmbedder(),  # type: ignore[arg-type]
+        options=SearchOptions(routing_mode="subsystem"),
+    )
+    async_service = AsyncSearchService(service, client)  # type: ignore[arg-type]
+    requests = [SearchRequest(query="module", limit=2, include_graph=False)]
+
+    batch = await async_service.search_batch(requests, graph_service=None)
+    expected = service.search_batch(requests, graph_service=None)
+
+    assert len(client.calls[0]["batch"]) == 1  # centroid lookup ahead of retrieval
+    assert batch.responses[0].metadata["routing"] == expected.responses[0].metadata["routing"]
+    assert _ranking(batch.responses[0]) == _ranking(expected.responses[0])
+
+
+@pytest.mark.asyncio
+async def test_concurrency_benchmark_keeps_requested_requests_in_flight() -> None:
+    in_flight = 0
+    peak = 0
+    completed = 0
+    sent: list[str] = []
+
+    async def _send(query: str) -> int:
+        nonlocal in_flight, peak, completed
+        in_flight += 1
+        peak = max(peak, in_flight)
+        sent.append(query)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        completed += 1
+        return 429 if completed == 5 else 200
+
+    result = await run_concurrency_level(_send, ["a", "b"], concurrency=8, total_requests=40)
+
+    assert peak == 8
+    assert len(sent) == 40
+    assert sent[:4] == ["a", "b", "a", "b"]
+    assert result.requests == 39
+    assert result.rate_limited == 1
+    assert result.throughput > 0
+    assert result.percentile(50) <= result.percentile(99)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from prometheus_client import REGISTRY
+
+from gateway.config.settings import AppSettings
+from gateway.graph.service import GraphNotFoundError, GraphServiceError
+from gateway.search import SearchService
+from gateway.search.breaker import GraphCircuitBreaker
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeEmbedder:
+    def encode(self, texts: Sequence[str]) -> list[list[float]]:
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+
+class FakePoint:
+    def __init__(self, payload: dict[str, Any], score: float) -> None:
+        self.payload = payload
+        self.score = score
+
+
+class FakeQdrantClient:
+    def __init__(self, points: list[FakePoint]) -> None:
+        self._points = points
+
+    def query_points(self, **kwargs: object) -> SimpleNamespace:
+        return SimpleNamespace(points=self._points)
+
+
+class FlakyGraph:
+    def __init__(self) -> None:
+        self.failing = True
+        self.calls = 0
+
+    def get_node(self, node_id: str, *, relationships: str, limit: int) -> dict[str, Any]:
+        self.calls += 1
+        if self.failing:
+            raise GraphServiceError("neo4j unavailable")
+        return {"node": {"id": node_id, "labels": ["SourceFile"], "properties": {}}, "relationships": []}
+
+    def shortest_path_depth(self, node_id: str, *, max_depth: int = 4) -> int | None:
+        return 1
+
+
+def _breaker(clock: FakeClock, **overrides: float) -> GraphCircuitBreaker:
+    options: dict[str, Any] = {
+        "window_seconds": 10.0,
+        "min_calls": 4,
+        "error_rate": 0.5,
+        "slow_call_seconds": 1.0,
+        "cooldown_seconds": 5.0,
+        "half_open_probes": 2,
+        "clock": clock,
+    }
+    options.update(overrides)
+    return GraphCircuitBreaker(**options)
+
+
+def _sample(name: str, labels: dict[str, str] | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def test_breaker_opens_on_error_rate_and_recovers_through_half_open() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    for failed in (False, True, False):
+        assert breaker.allow()
+        breaker.record(0.01, failed=failed)
+    assert breaker.state == "closed"  # below min_calls
+    breaker.record(0.01, failed=True)
+    assert breaker.state == "open"
+    assert _sample("km_search_graph_breaker_state") == 2
+    assert not breaker.allow()
+
+    clock.now += 5.0
+    assert breaker.state == "half_open"
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()  # probe budget spent
+    breaker.record(0.01, failed=True)
+    assert breaker.state == "open"
+
+    clock.now += 5.0
+    assert breaker.allow() and breaker.allow()
+    breaker.record(0.01, failed=False)
+    assert breaker.state == "half_open"
+    breaker.record(0.01, failed=False)
+    assert breaker.state == "closed"
+    assert _sample("km_search_graph_breaker_state") == 0
+
+
+def test_breaker_counts_slow_calls_and_forgets_old_outcomes() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    breaker.record(0.01, failed=True)
+    breaker.record(0.01, failed=True)
+    clock.now += 11.0  # both failures fall out of the window
+    for _ in range(3):
+        breaker.record(0.01, failed=False)
+    breaker.record(2.5, failed=False)
+    assert breaker.state == "closed"  # one slow call out of four
+
+    breaker.record(2.5, failed=False)
+    breaker.record(1.5, failed=False)
+    assert breaker.state == "open"  # three slow calls out of six
+
+
+def test_breaker_reissues_probes_that_never_report() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock, min_calls=1)
+    breaker.record(0.01, failed=True)
+
+    clock.now += 5.0
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()
+    clock.now += 5.0
+    assert breaker.allow()
+
+
+def test_search_skips_graph_enrichment_while_breaker_is_open() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock, min_calls=2, half_open_probes=1)
+    points = [
+        FakePoint({"chunk_id": f"src/m{index}.py::0", "path": f"src/m{index}.py", "artifact_type": "code", "text": "x"}, 0.9)
+        for index in range(3)
+    ]
+    service = SearchService(
+        qdrant_client=FakeQdrantClient(points),
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        graph_breaker=breaker,
+    )
+    graph = FlakyGraph()
+    skipped_before = _sample("km_search_graph_cache_events_total", {"status": "skipped"})
+    assert service.cache_scope()["graph_degraded"] is False
+
+    first = service.search(query="module", limit=3, include_graph=True, graph_service=graph)  # type: ignore[arg-type]
+    assert graph.calls == 2  # the second failure opened the breaker, the third hit was skipped
+    assert first.metadata["warnings"].count("graph enrichment skipped: graph circuit breaker open") == 1
+    assert service.cache_scope()["graph_degraded"] is True
+
+    second = service.search(query="module", limit=3, include_graph=True, graph_service=graph)  # type: ignore[arg-type]
+    assert graph.calls == 2
+    assert second.metadata["warnings"] == ["graph enrichment skipped: graph circuit breaker open"]
+    assert all(result.graph_context is None for result in second.results)
+    assert _sample("km_search_graph_cache_events_total", {"status": "skipped"}) - skipped_before == 4
+
+    graph.failing = False
+    clock.now += 5.0
+    third = service.search(query="module", limit=3, include_graph=True, graph_service=graph)  # type: ignore[arg-type]
+    assert graph.calls == 5  # one probe closed the breaker, the rest went through
+    assert third.metadata["warnings"] == []
+    assert breaker.state == "closed"
+
+
+def test_missing_nodes_do_not_trip_the_breaker() -> None:
+    breaker = _breaker(FakeClock(), min_calls=1)
+    service = SearchService(
+        qdrant_client=None,  # type: ignore[arg-type]
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        graph_breaker=breaker,
+    )
+
+    service.pipeline.record_graph_outcome(time.perf_counter(), GraphNotFoundError("missing"))
+    assert breaker.state == "closed"
+    service.pipeline.record_graph_outcome(time.perf_counter(), GraphServiceError("down"))
+    assert breaker.state == "open"
+
+
+def test_neo4j_driver_options_follow_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("KM_NEO4J_MAX_POOL_SIZE", "0")
+    monkeypatch.setenv("KM_NEO4J_ACQUISITION_TIMEOUT", "2.5")
+    monkeypatch.setenv("KM_SEARCH_GRAPH_BREAKER_ERROR_RATE", "1.7")
+
+    settings = AppSettings()
+
+    assert settings.neo4j_driver_options() == {
+        "max_connection_pool_size": 1,
+        "connection_acquisition_timeout": 2.5,
+        "max_connection_lifetime": 3600.0,
+    }
+    assert settings.search_graph_breaker_error_rate == 1.0
+
+
+def test_breaker_and_pool_settings_have_positive_floors(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("KM_NEO4J_ACQUISITION_TIMEOUT", "-5")
+    monkeypatch.setenv("KM_NEO4J_MAX_CONNECTION_LIFETIME", "0")
+    monkeypatch.setenv("KM_SEARCH_GRAPH_BREAKER_WINDOW_SECONDS", "0")
+    monkeypatch.setenv("KM_SEARCH_GRAPH_BREAKER_COOLDOWN_SECONDS", "-1")
+    monkeypatch.setenv("KM_SEARCH_GRAPH_BREAKER_SLOW_MS", "0")
+    monkeypatch.setenv("KM_SEARCH_GRAPH_BREAKER_MIN_CALLS", "0")
+
+    settings = AppSettings()
+
+    assert settings.neo4j_driver_options()["connection_acquisition_timeout"] == 1.0
+    assert settings.neo4j_driver_options()["max_connection_lifetime"] == 1.0
+    assert settings.search_graph_breaker_window_seconds == 1.0
+    assert settings.search_graph_breaker_cooldown_seconds == 1.0
+    assert settings.search_graph_breaker_slow_ms == 1.0
+    assert settings.search_graph_breaker_min_calls == 1
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gateway.search.cache import SearchResponseCache, search_fingerprint
+from gateway.search.service import SearchResponse
+
+
+def _response(query: str = "q") -> SearchResponse:
+    return SearchResponse(query=query, results=[], metadata={"warnings": [], "request_id": "origin"})
+
+
+def test_fingerprint_is_canonical() -> None:
+    base = dict(limit=5, include_graph=True, graph_available=True, sort_by_vector=False)
+
+    first = search_fingerprint(query="graph  service", filters={"tags": ["a"], "subsystems": ["b"]}, **base)
+    second = search_fingerprint(query=" graph service", filters={"subsystems": ["b"], "tags": ["a"]}, **base)
+    different = search_fingerprint(query="graph service", filters={"tags": ["c"]}, **base)
+
+    assert first == second
+    assert first != different
+
+
+def test_cache_returns_private_copies_with_caller_request_id() -> None:
+    cache = SearchResponseCache(max_entries=4)
+    cache.get_or_compute("key", generation=1, request_id="a", compute=_response)
+
+    hit = cache.get_or_compute("key", generation=1, request_id="b", compute=_response)
+    hit.metadata["warnings"].append("mutated")
+    again = cache.get_or_compute("key", generation=1, request_id="c", compute=_response)
+
+    assert hit.metadata["cache"]["status"] == "hit"
+    assert again.metadata["request_id"] == "c"
+    assert again.metadata["warnings"] == []
+
+    newer = cache.get_or_compute("key", generation=2, request_id="d", compute=_response)
+    assert newer.metadata["cache"]["status"] == "miss"
+
+
+def test_cache_coalesces_concurrent_misses() -> None:
+    cache = SearchResponseCache(max_entries=4)
+    calls = 0
+    release = threading.Event()
+    statuses: list[str] = []
+
+    def _slow() -> SearchResponse:
+        nonlocal calls
+        calls += 1
+        release.wait(timeout=5)
+        return _response()
+
+    def _worker(request_id: str) -> None:
+        response = cache.get_or_compute("key", generation=None, request_id=request_id, compute=_slow)
+        statuses.append(response.metadata["cache"]["status"])
+
+    threads = [threading.Thread(target=_worker, args=(str(index),)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == 1
+    assert sorted(statuses) == ["coalesced", "coalesced", "coalesced", "miss"]
+
+
+def test_cache_does_not_store_failures() -> None:
+    cache = SearchResponseCache(max_entries=4)
+
+    def _boom() -> SearchResponse:
+        raise RuntimeError("qdrant down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("key", generation=None, request_id=None, compute=_boom)
+    response = cache.get_or_compute("key", generation=None, request_id=None, compute=_response)
+    assert response.metadata["cache"]["status"] == "miss"
+
+
+@pytest.mark.asyncio
+async def test_async_cache_coalesces_concurrent_misses() -> None:
+    cache = SearchResponseCache(max_entries=4)
+    calls = 0
+    release = asyncio.Event()
+
+    async def _slow() -> SearchResponse:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _response()
+
+    tasks = [
+        asyncio.create_task(cache.get_or_compute_async("key", generation=3, request_id=str(index), compute=_slow)) for index in range(4)
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert sorted(response.metadata["cache"]["status"] for response in responses) == ["coalesced"] * 3 + ["miss"]
+    assert [response.metadata["request_id"] for response in responses] == ["0", "1", "2", "3"]
+    hit = cache.get_or_compute("key", generation=3, request_id="sync", compute=_response)
+    assert hit.metadata["cache"]["status"] == "hit"
+
+
+@pytest.mark.asyncio
+async def test_async_cache_recomputes_when_the_owner_is_cancelled() -> None:
+    cache = SearchResponseCache(max_entries=4)
+    calls = 0
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _slow() -> SearchResponse:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await release.wait()
+        return _response()
+
+    owner = asyncio.create_task(cache.get_or_compute_async("key", generation=1, request_id="owner", compute=_slow))
+    await started.wait()
+    waiters = [
+        asyncio.create_task(cache.get_or_compute_async("key", generation=1, request_id=str(index), compute=_slow)) for index in range(2)
+    ]
+    await asyncio.sleep(0.01)
+    owner.cancel()
+    await asyncio.sleep(0.01)
+    release.set()
+    responses = await asyncio.gather(*waiters)
+
+    assert owner.cancelled()
+    assert calls == 2
+    assert sorted(response.metadata["cache"]["status"] for response in responses) == ["coalesced", "miss"]
+    assert [response.metadata["request_id"] for response in responses] == ["0", "1"]
+
+
+@pytest.mark.asyncio
+async def test_async_cache_survives_a_cancelled_waiter() -> None:
+    cache = SearchResponseCache(max_entries=4)
+    release = asyncio.Event()
+
+    async def _slow() -> SearchResponse:
+        await release.wait()
+        return _response()
+
+    owner = asyncio.create_task(cache.get_or_compute_async("key", generation=1, request_id="owner", compute=_slow))
+    waiter = asyncio.create_task(cache.get_or_compute_async("key", generation=1, request_id="waiter", compute=_slow))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.sleep(0.01)
+    release.set()
+
+    response = await owner
+    assert waiter.cancelled()
+    assert response.metadata["cache"]["status"] == "miss"
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+
+from prometheus_client import REGISTRY
+
+from gateway.search.encoder import QueryEncoder, VectorCache, normalise_query
+
+
+def _metric_value(name: str, labels: dict[str, str] | None = None) -> float:
+    value = REGISTRY.get_sample_value(name, labels or {})
+    return float(value) if value is not None else 0.0
+
+
+class RecordingEmbedder:
+    model_name = "recording"
+    dimension = 4
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def encode(self, texts: Iterable[str]) -> list[list[float]]:
+        batch = list(texts)
+        with self._lock:
+            self.calls.append(batch)
+        return [[float(len(text)), 1.0, 2.0, 3.0] for text in batch]
+
+
+def test_query_encoder_serves_normalised_repeats_from_cache() -> None:
+    embedder = RecordingEmbedder()
+    encoder = QueryEncoder(embedder, batch_window_ms=0)
+    hits_before = _metric_value("km_search_embedding_cache_events_total", {"status": "hit"})
+
+    first = encoder.encode(["graph  service"])
+    second = encoder.encode([" graph service "])
+
+    assert first == second == [[13.0, 1.0, 2.0, 3.0]]
+    assert embedder.calls == [["graph service"]]
+    assert _metric_value("km_search_embedding_cache_events_total", {"status": "hit"}) == hits_before + 1
+    assert normalise_query("a\tb\n c") == "a b c"
+
+
+def test_vector_cache_evicts_least_recently_used_within_budget() -> None:
+    cache = VectorCache(max_bytes=0)
+    cache.put("a", [1.0])
+    assert len(cache) == 0
+
+    probe = VectorCache(max_bytes=10_000)
+    probe.put("a", [1.0] * 4)
+    entry_cost = probe.size_bytes
+
+    cache = VectorCache(max_bytes=entry_cost * 2)
+    cache.put("a", [1.0] * 4)
+    cache.put("b", [2.0] * 4)
+    assert cache.get("a") == [1.0] * 4
+    cache.put("c", [3.0] * 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_query_encoder_micro_batches_concurrent_misses() -> None:
+    embedder = RecordingEmbedder()
+    encoder = QueryEncoder(embedder, cache_max_bytes=0, batch_window_ms=200, max_batch_size=4)
+    batches_before = _metric_value("km_search_embedding_batch_size_count")
+    barrier = threading.Barrier(4)
+    results: dict[int, list[list[float]]] = {}
+
+    def _worker(index: int) -> None:
+        barrier.wait()
+        results[index] = encoder.encode([f"query {index}"])
+
+    threads = [threading.Thread(target=_worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    encoder.close()
+
+    assert sorted(len(batch) for batch in embedder.calls) == [4]
+    assert all(results[index] == [[7.0, 1.0, 2.0, 3.0]] for index in range(4))
+    assert _metric_value("km_search_embedding_batch_size_count") == batches_before + 1
+    assert _metric_value("km_search_embedding_queue_seconds_count") >= 4
+
+
+def test_query_encoder_answers_requests_racing_close() -> None:
+    embedder = RecordingEmbedder()
+    encoder = QueryEncoder(embedder, cache_max_bytes=0, batch_window_ms=5, max_batch_size=8)
+    barrier = threading.Barrier(9)
+    results: dict[int, list[list[float]]] = {}
+
+    def _worker(index: int) -> None:
+        barrier.wait()
+        results[index] = encoder.encode([f"q{index}"])
+
+    threads = [threading.Thread(target=_worker, args=(index,), daemon=True) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    encoder.close()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert all(results[index] == [[2.0, 1.0, 2.0, 3.0]] for index in range(8))
+    assert encoder.encode(["after close"]) == [[11.0, 1.0, 2.0, 3.0]]
+    assert embedder.calls[-1] == ["after close"]
@@ -8,7 +8,7 @@ import pytest
 
 from gateway.search.cli import evaluate_trained_model
 from gateway.search.dataset import DatasetLoadError
-from gateway.search.evaluation import evaluate_model
+from gateway.search.evaluation import compare_rankings, evaluate_model
 
 
 def test_evaluate_model(tmp_path: Path) -> None:
@@ -57,3 +57,23 @@ def test_evaluate_model_with_empty_dataset(tmp_path: Path) -> None:
         assert True
     else:  # pragma: no cover
         raise AssertionError("Expected DatasetLoadError for empty dataset")
+
+
+def test_compare_rankings_identical_and_disjoint() -> None:
+    identical = compare_rankings([(["a", "b", "c"], ["a", "b", "c"])], k=3)
+    assert identical.queries == 1
+    assert identical.overlap_at_k == pytest.approx(1.0)
+    assert identical.ndcg_at_k == pytest.approx(1.0)
+    assert identical.spearman == pytest.approx(1.0)
+
+    disjoint = compare_rankings([(["a", "b"], ["c", "d"])], k=2)
+    assert disjoint.overlap_at_k == pytest.approx(0.0)
+    assert disjoint.ndcg_at_k == pytest.approx(0.0)
+    assert disjoint.spearman is None
+
+
+def test_compare_rankings_penalises_reordering() -> None:
+    comparison = compare_rankings([(["a", "b", "c"], ["c", "b", "a"])], k=3)
+    assert comparison.overlap_at_k == pytest.approx(1.0)
+    assert comparison.ndcg_at_k < 1.0
+    assert comparison.spearman == pytest.approx(-1.0)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from gateway.config.settings import SEARCH_WEIGHT_PROFILES, AppSettings
+from gateway.config.settings import SEARCH_ENRICHMENT_PROFILES, SEARCH_WEIGHT_PROFILES, AppSettings
 
 
 @pytest.fixture(autouse=True)
@@ -42,3 +42,27 @@ def test_resolved_search_weights_overrides(monkeypatch: pytest.MonkeyPatch) -> N
     assert weights["weight_support"] == pytest.approx(0.25)
     # Non-overridden weights fall back to the profile defaults
     assert weights["weight_subsystem"] == pytest.approx(SEARCH_WEIGHT_PROFILES["docs-heavy"]["weight_subsystem"])
+
+
+def test_resolved_search_enrichment_follows_profile(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("KM_SEARCH_OVERFETCH_FACTOR", raising=False)
+    monkeypatch.delenv("KM_SEARCH_ENRICH_TOP_N", raising=False)
+    monkeypatch.setenv("KM_SEARCH_WEIGHT_PROFILE", "analysis")
+    settings = AppSettings()
+
+    enrichment = settings.resolved_search_enrichment()
+
+    assert enrichment["mode"] == "lazy"
+    assert enrichment["overfetch_factor"] == pytest.approx(SEARCH_ENRICHMENT_PROFILES["analysis"]["overfetch_factor"])
+    assert enrichment["enrich_top_n"] == SEARCH_ENRICHMENT_PROFILES["analysis"]["enrich_top_n"]
+
+
+def test_resolved_search_enrichment_env_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("KM_SEARCH_OVERFETCH_FACTOR", "25")
+    monkeypatch.setenv("KM_SEARCH_ENRICH_TOP_N", "4")
+    settings = AppSettings()
+
+    enrichment = settings.resolved_search_enrichment()
+
+    assert enrichment["overfetch_factor"] == pytest.approx(10.0)
+    assert enrichment["enrich_top_n"] == 4
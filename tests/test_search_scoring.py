@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from gateway.search.scoring import HeuristicWeights, LinearModel, ScoringRow, score_candidates
+from gateway.search.trainer import ModelArtifact
+
+WEIGHTS = HeuristicWeights(
+    vector=0.7,
+    lexical=0.3,
+    subsystem=0.3,
+    relationship=0.05,
+    support=0.1,
+    coverage_penalty=0.15,
+    criticality=0.12,
+)
+
+
+def _row(chunk: dict[str, Any], vector: float, lexical: float, graph_context: dict[str, Any] | None = None) -> ScoringRow:
+    return ScoringRow(
+        chunk=chunk,
+        vector_score=vector,
+        lexical_score=lexical,
+        graph_context=graph_context,
+        graph_scored=graph_context is not None,
+        path_depth=None,
+        warnings_count=0,
+    )
+
+
+def _rows() -> list[ScoringRow]:
+    graph_context = {
+        "relationships": [{"type": "BELONGS_TO", "target": {"properties": {"criticality": "high"}}}],
+        "related_artifacts": [{"id": "DesignDoc:docs/core.md"}, {"id": "TestCase:tests/test_core.py"}],
+    }
+    return [
+        _row({"subsystem": "core", "coverage_ratio": 0.5}, 0.9, 0.2, graph_context),
+        _row({"subsystem": "other", "coverage_ratio": None}, 0.8, 0.6),
+        _row({"subsystem": "core", "coverage_ratio": "bad"}, 0.4, 1.0),
+    ]
+
+
+def test_heuristic_scores_match_per_row_formula() -> None:
+    scored = score_candidates(_rows(), weights=WEIGHTS, query_tokens={"core"}, graph_context_included=True)
+
+    base = 0.7 * 0.9 + 0.3 * 0.2
+    expected = base + 0.3 * 1.0 + 0.05 * 1 + 0.1 * (0.2 + 0.1) + 0.12 * 0.8 - 0.15 * 0.5
+    assert scored.adjusted[0] == pytest.approx(expected)
+    assert scored.adjusted[1] == pytest.approx(0.7 * 0.8 + 0.3 * 0.6)
+
+    graph_scoring = scored.explain(0, mode="heuristic", include_graph=True)
+    assert graph_scoring["adjusted_score"] == pytest.approx(expected)
+    assert graph_scoring["signals"]["relationship_count"] == 1
+    assert graph_scoring["signals"]["path_depth"] == 1.0
+    assert graph_scoring["graph_enriched"] is True
+
+    plain_scoring = scored.explain(2, mode="heuristic", include_graph=True)
+    assert "subsystem_affinity" not in plain_scoring["signals"]
+    assert plain_scoring["signals"]["coverage_ratio"] is None
+    assert plain_scoring["graph_enriched"] is False
+
+
+def test_order_ranks_head_before_tail_and_truncates() -> None:
+    scored = score_candidates(_rows(), weights=WEIGHTS, query_tokens={"core"}, graph_context_included=True)
+
+    assert scored.order([False, True, True], sort_by_vector=False, limit=3) == [1, 2, 0]
+    assert scored.order([True, True, True], sort_by_vector=True, limit=2) == [0, 1]
+
+
+def test_linear_model_scores_whole_candidate_set() -> None:
+    artifact = ModelArtifact(
+        model_type="linear_regression",
+        created_at="",
+        feature_names=["vector_score", "signal_subsystem_affinity"],
+        coefficients=[2.0, -1.0],
+        intercept=0.5,
+        metrics={},
+        training_rows=3,
+    )
+    model = LinearModel.from_artifact(artifact)
+    scored = score_candidates(_rows(), weights=WEIGHTS, query_tokens={"core"}, graph_context_included=True, model=model)
+
+    assert scored.model_error is None
+    assert list(scored.adjusted) == pytest.approx([0.5 + 1.8 - 1.0, 0.5 + 1.6, 0.5 + 0.8])
+    explanation = scored.explain(0, mode="ml", include_graph=True)
+    assert explanation["model"]["contributions"] == pytest.approx({"vector_score": 1.8, "signal_subsystem_affinity": -1.0})
+    assert explanation["adjusted_score"] == pytest.approx(1.3)
+
+
+def test_linear_model_with_unknown_feature_falls_back_to_heuristic() -> None:
+    artifact = ModelArtifact(
+        model_type="linear_regression",
+        created_at="",
+        feature_names=["unknown_feature"],
+        coefficients=[1.0],
+        intercept=0.0,
+        metrics={},
+        training_rows=1,
+    )
+    scored = score_candidates(
+        _rows(),
+        weights=WEIGHTS,
+        query_tokens={"core"},
+        graph_context_included=True,
+        model=LinearModel.from_artifact(artifact),
+    )
+
+    assert scored.model_error is not None
+    assert scored.adjusted is scored.heuristic
+    assert "model" not in scored.explain(1, mode="ml", include_graph=True)
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
 from prometheus_client import REGISTRY
+from qdrant_client.http.models import Filter
 
 from gateway.graph.service import GraphService
-from gateway.search import SearchOptions, SearchService, SearchWeights
+from gateway.ingest.lexical import LexicalVocabulary
+from gateway.ingest.symbols import SymbolEntry, SymbolIndex
+from gateway.search import SearchOptions, SearchRequest, SearchResult, SearchService, SearchWeights, project_result
+from gateway.search.service import DEFAULT_SNIPPET_CHARS, classify_query
 from gateway.search.trainer import ModelArtifact
 
 
@@ -33,9 +38,9 @@ class FakeQdrantClient:
         self._points = points
         self.last_kwargs: dict[str, object] = {}
 
-    def search(self, **kwargs: object) -> list[FakePoint]:
+    def query_points(self, **kwargs: object) -> SimpleNamespace:
         self.last_kwargs = dict(kwargs)
-        return self._points
+        return SimpleNamespace(points=self._points)
 
 
 class DummyGraphService(GraphService):  # type: ignore[misc]
@@ -806,3 +811,710 @@ def test_search_service_ml_model_reorders_results() -> None:
     assert response.metadata["scoring_mode"] == "ml"
     assert all(result.scoring["mode"] == "ml" for result in response.results)
     assert "model" in response.results[0].scoring
+
+
+def _module_points(count: int) -> list[FakePoint]:
+    return [
+        FakePoint(
+            {
+                "chunk_id": f"src/module_{index}.py::0",
+                "path": f"src/module_{index}.py",
+                "artifact_type": "code",
+                "subsystem": "core",
+                "text": "module body",
+            },
+            0.9 - index * 0.05,
+        )
+        for index in range(count)
+    ]
+
+
+def test_search_service_lazy_enrichment_limits_graph_lookups(graph_response: dict[str, Any]) -> None:
+    client = FakeQdrantClient(_module_points(6))
+    graph_service = CountingGraphService(graph_response)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        options=SearchOptions(overfetch_factor=2.0, enrich_top_n=2),
+    )
+
+    response = service.search(
+        query="module",
+        limit=3,
+        include_graph=True,
+        graph_service=graph_service,
+    )
+
+    assert client.last_kwargs["limit"] == 6
+    assert graph_service.node_calls == 2
+    assert len(response.results) == 3
+    assert [result.scoring["graph_enriched"] for result in response.results] == [True, True, False]
+    enrichment = response.metadata["enrichment"]
+    assert enrichment == {
+        "mode": "lazy",
+        "overfetch_factor": 2.0,
+        "enrich_top_n": 2,
+        "candidates": 6,
+        "enriched": 2,
+        "graph_lookups": 2,
+    }
+    timings = response.metadata["timings_ms"]
+    assert {"candidate_phase", "enrichment_phase", "total"} <= set(timings)
+
+
+def test_search_service_eager_enrichment_matches_previous_behaviour(graph_response: dict[str, Any]) -> None:
+    client = FakeQdrantClient(_module_points(4))
+    graph_service = CountingGraphService(graph_response)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        options=SearchOptions(enrich_top_n=1),
+    )
+
+    response = service.search(
+        query="module",
+        limit=4,
+        include_graph=True,
+        graph_service=graph_service,
+        enrichment_mode="eager",
+    )
+
+    assert client.last_kwargs["limit"] == 4
+    assert graph_service.node_calls == 4
+    assert all(result.graph_context is not None for result in response.results)
+    assert response.metadata["enrichment"]["mode"] == "eager"
+
+
+def test_search_service_request_overrides_enrichment_budget(graph_response: dict[str, Any]) -> None:
+    client = FakeQdrantClient(_module_points(5))
+    graph_service = CountingGraphService(graph_response)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+    )
+
+    response = service.search(
+        query="module",
+        limit=2,
+        include_graph=True,
+        graph_service=graph_service,
+        overfetch_factor=2.5,
+        enrich_top_n=0,
+    )
+
+    assert client.last_kwargs["limit"] == 5
+    assert graph_service.node_calls == 0
+    assert all(result.graph_context is None for result in response.results)
+
+
+class FakeQueryPoint:
+    def __init__(self, point_id: str, score: float, payload: dict[str, Any] | None = None) -> None:
+        self.id = point_id
+        self.score = score
+        self.payload = payload
+
+
+class FakeHybridQdrantClient(FakeQdrantClient):
+    def __init__(self, dense: list[FakeQueryPoint], sparse: list[FakeQueryPoint]) -> None:
+        super().__init__([])
+        self._dense = dense
+        self._sparse = sparse
+        self.batch_requests: list[Any] = []
+
+    def query_batch_points(self, *, collection_name: str, requests: list[Any]) -> list[SimpleNamespace]:
+        self.batch_requests = list(requests)
+        return [SimpleNamespace(points=self._dense), SimpleNamespace(points=self._sparse)]
+
+
+def _hybrid_vocabulary() -> LexicalVocabulary:
+    vocabulary = LexicalVocabulary()
+    vocabulary.encode_document("load_artifact reads model files")
+    return vocabulary
+
+
+def test_search_service_hybrid_retrieval_uses_sparse_scores() -> None:
+    dense = [
+        FakeQueryPoint("a", 0.80, {"chunk_id": "a::0", "path": "docs/a.md", "artifact_type": "doc", "text": "semantic"}),
+        FakeQueryPoint("b", 0.70, {"chunk_id": "b::0", "path": "src/b.py", "artifact_type": "code", "text": "load_artifact"}),
+    ]
+    sparse = [FakeQueryPoint("b", 6.0), FakeQueryPoint("a", 1.5)]
+    client = FakeHybridQdrantClient(dense, sparse)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        weights=SearchWeights(vector=1.0, lexical=0.5),
+        lexical_vocabulary=_hybrid_vocabulary(),
+    )
+
+    response = service.search(query="load_artifact", limit=2, include_graph=False, graph_service=None)
+
+    assert response.metadata["retrieval"] == "hybrid"
+    assert not client.last_kwargs, "dense-only search should not run"
+    dense_request, sparse_request = client.batch_requests
+    assert sparse_request.using == "lexical"
+    assert [prefetch.using for prefetch in dense_request.prefetch] == [None, "lexical"]
+    top = response.results[0]
+    assert top.chunk["chunk_id"] == "b::0"
+    assert top.scoring["lexical_score"] == pytest.approx(1.0)
+    assert response.results[1].scoring["lexical_score"] == pytest.approx(0.25)
+
+
+def test_search_batch_pushes_artifact_type_filters_into_hybrid_prefetch() -> None:
+    dense = [FakeQueryPoint("b", 0.70, {"chunk_id": "b::0", "path": "src/b.py", "artifact_type": "code", "text": "load_artifact"})]
+    client = FakeHybridQdrantClient(dense, [FakeQueryPoint("b", 6.0)])
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        lexical_vocabulary=_hybrid_vocabulary(),
+    )
+
+    batch = service.search_batch(
+        [SearchRequest(query="load_artifact", limit=2, include_graph=False, filters={"artifact_types": ["Code"]})],
+        graph_service=None,
+    )
+
+    assert batch.responses[0].metadata["retrieval"] == "hybrid"
+    dense_request, _ = client.batch_requests
+    assert [prefetch.filter.must[0].match.any for prefetch in dense_request.prefetch] == [["code"], ["code"]]
+
+
+def test_search_service_ids_verbosity_skips_chunk_text_in_hybrid_retrieval() -> None:
+    dense = [FakeQueryPoint("b", 0.70, {"chunk_id": "b::0", "path": "src/b.py", "artifact_type": "code"})]
+    client = FakeHybridQdrantClient(dense, [FakeQueryPoint("b", 6.0)])
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        lexical_vocabulary=_hybrid_vocabulary(),
+    )
+
+    service.search(query="load_artifact", limit=2, include_graph=False, graph_service=None)
+    full_fields = client.batch_requests[0].with_payload
+    assert "text" in full_fields and "subsystem_metadata" not in full_fields
+
+    response = service.search(query="load_artifact", limit=2, include_graph=False, graph_service=None, verbosity="ids")
+    assert "text" not in client.batch_requests[0].with_payload
+    assert response.results[0].scoring["lexical_score"] == pytest.approx(1.0)
+
+
+def test_project_result_applies_verbosity() -> None:
+    result = SearchResult(
+        chunk={"chunk_id": "a::0", "artifact_path": "src/a.py", "artifact_type": "code", "text": "x" * 300, "tags": ["t"]},
+        graph_context={"primary_node": {"id": "SourceFile:src/a.py"}, "relationships": [{"type": "BELONGS_TO"}]},
+        scoring={"adjusted_score": 1.2, "vector_score": 0.9, "lexical_score": 0.5, "signals": {"subsystem_affinity": 1.0}},
+    )
+
+    assert project_result(result, "full") == {"chunk": result.chunk, "graph_context": result.graph_context, "scoring": result.scoring}
+
+    compact = project_result(result, "compact", snippet_chars=10)
+    assert compact["chunk"] == {"chunk_id": "a::0", "artifact_path": "src/a.py", "artifact_type": "code", "text": "x" * 10 + "…"}
+    assert compact["graph_context"] == {"primary_node": {"id": "SourceFile:src/a.py"}}
+    assert compact["scoring"] == {"adjusted_score": 1.2, "vector_score": 0.9, "lexical_score": 0.5}
+    assert len(project_result(result, "compact")["chunk"]["text"]) == DEFAULT_SNIPPET_CHARS + 1
+
+    assert project_result(result, "ids") == {
+        "chunk": {"chunk_id": "a::0", "artifact_path": "src/a.py"},
+        "graph_context": None,
+        "scoring": {"adjusted_score": 1.2},
+    }
+
+
+class FakeGroupedQdrantClient(FakeQdrantClient):
+    def __init__(self, groups: dict[str, list[FakeQueryPoint]]) -> None:
+        super().__init__([])
+        self._groups = groups
+        self.group_calls: list[dict[str, Any]] = []
+
+    def query_points_groups(self, *, limit: int, group_size: int, **kwargs: object) -> SimpleNamespace:
+        self.group_calls.append({"limit": limit, "group_size": group_size, **kwargs})
+        groups = [SimpleNamespace(id=path, hits=hits[:group_size]) for path, hits in list(self._groups.items())[:limit]]
+        return SimpleNamespace(groups=groups)
+
+
+def test_search_service_groups_chunks_by_artifact() -> None:
+    def chunk(path: str, index: int, score: float) -> FakeQueryPoint:
+        payload = {"chunk_id": f"{path}::{index}", "path": path, "artifact_type": "code", "text": "scheduler loop"}
+        return FakeQueryPoint(f"{path}-{index}", score, payload)
+
+    client = FakeGroupedQdrantClient(
+        {
+            "src/big.py": [chunk("src/big.py", 3, 0.9), chunk("src/big.py", 1, 0.85), chunk("src/big.py", 4, 0.8)],
+            "src/small.py": [chunk("src/small.py", 0, 0.7)],
+        }
+    )
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        lexical_vocabulary=_hybrid_vocabulary(),
+    )
+
+    response = service.search(
+        query="scheduler",
+        limit=5,
+        include_graph=False,
+        graph_service=None,
+        group_by="artifact",
+        group_siblings=1,
+    )
+
+    assert response.metadata["retrieval"] == "grouped"
+    call = client.group_calls[0]
+    assert call["group_by"] == "path" and call["group_size"] == 2
+    assert [result.chunk["chunk_id"] for result in response.results] == ["src/big.py::3", "src/small.py::0"]
+    assert response.results[0].chunk["sibling_chunk_ids"] == ["src/big.py::1"]
+    assert response.results[1].chunk["sibling_chunk_ids"] == []
+
+    batch = service.search_batch(
+        [SearchRequest(query="scheduler", limit=5, include_graph=False, group_by="artifact")],
+        graph_service=None,
+    )
+    assert batch.responses[0].metadata["retrieval"] == "grouped"
+    assert client.group_calls[1]["group_size"] == 1
+    assert "sibling_chunk_ids" not in batch.responses[0].results[0].chunk
+
+
+def test_search_service_falls_back_to_dense_without_vocabulary_match(sample_points: list[FakePoint]) -> None:
+    client = FakeQdrantClient(sample_points)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        lexical_vocabulary=_hybrid_vocabulary(),
+    )
+
+    response = service.search(query="unrelated words", limit=5, include_graph=False, graph_service=None)
+
+    assert response.metadata["retrieval"] == "dense"
+    assert client.last_kwargs["query"] == [0.1, 0.2, 0.3]
+    assert response.results
+
+
+class RecordingEmbedder(FakeEmbedder):
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def encode(self, texts: Sequence[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return super().encode(texts)
+
+
+class FakeBatchQdrantClient(FakeQdrantClient):
+    def __init__(self, points: list[FakePoint]) -> None:
+        super().__init__(points)
+        self.batch_calls: list[list[Any]] = []
+
+    def query_batch_points(self, *, collection_name: str, requests: list[Any]) -> list[SimpleNamespace]:
+        self.batch_calls.append(list(requests))
+        return [SimpleNamespace(points=self._points[: request.limit]) for request in requests]
+
+
+def test_search_batch_shares_embedding_retrieval_and_graph_cache(
+    sample_points: list[FakePoint],
+    graph_response: dict[str, Any],
+) -> None:
+    client = FakeBatchQdrantClient(sample_points)
+    embedder = RecordingEmbedder()
+    graph_service = CountingGraphService(graph_response)
+    service = SearchService(qdrant_client=client, collection_name="collection", embedder=embedder)
+
+    batch = service.search_batch(
+        [
+            SearchRequest(query="core module", limit=2),
+            SearchRequest(query="module overview", limit=1, include_graph=False),
+            SearchRequest(query="core scheduler", limit=2, filters={"artifact_types": ["code"]}),
+        ],
+        graph_service=graph_service,
+        request_id="batch",
+    )
+
+    assert embedder.batches == [["core module", "module overview", "core scheduler"]]
+    assert len(client.batch_calls) == 1 and len(client.batch_calls[0]) == 3
+    assert [request.filter for request in client.batch_calls[0][:2]] == [None, None]
+    assert client.batch_calls[0][2].filter.must[0].match.any == ["code"]
+    assert not client.last_kwargs, "per-query search should not run"
+    # Both graph-enabled queries resolve the same node through the shared cache.
+    assert graph_service.node_calls == 1
+    first, second, third = batch.responses
+    assert first.metadata["graph_context_included"] is True
+    assert second.metadata["graph_context_included"] is False
+    assert all(result.graph_context is None for result in second.results)
+    assert [result.chunk["artifact_type"] for result in third.results] == ["code"]
+    assert [response.metadata["request_id"] for response in batch.responses] == ["batch:0", "batch:1", "batch:2"]
+    assert batch.metadata["query_count"] == 3
+    assert batch.metadata["embedded"] == 3
+    assert batch.metadata["graph_lookups"] == 1
+    assert {"embed", "vector_search", "ranking", "total"} <= set(batch.metadata["timings_ms"])
+
+
+class ExplodingEmbedder:
+    def encode(self, texts: Sequence[str]) -> list[list[float]]:  # pragma: no cover - must not run
+        raise AssertionError("identifier fast path should not embed the query")
+
+
+def _symbol_index() -> SymbolIndex:
+    return SymbolIndex(
+        [
+            SymbolEntry(
+                symbol="IngestionPipeline",
+                kind="class",
+                path="src/module.py",
+                line=12,
+                chunk_sequence=1,
+                artifact_type="code",
+                subsystem="core",
+                snippet="class IngestionPipeline:",
+            ),
+            SymbolEntry(
+                symbol="src/module.py",
+                kind="path",
+                path="src/module.py",
+                line=1,
+                chunk_sequence=0,
+                artifact_type="code",
+                subsystem="core",
+                snippet='"""Module."""',
+            ),
+        ]
+    )
+
+
+def test_search_service_answers_identifier_queries_from_symbol_index() -> None:
+    client = FakeQdrantClient([])
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=ExplodingEmbedder(),
+        symbol_index=_symbol_index(),
+    )
+
+    response = service.search(query="IngestionPipeline", limit=5, include_graph=True, graph_service=None)
+
+    assert not client.last_kwargs
+    assert response.metadata["retrieval"] == "symbol"
+    assert response.metadata["query_kind"] == "identifier"
+    top = response.results[0]
+    assert top.chunk["chunk_id"] == "src/module.py::1"
+    assert top.chunk["symbol"] == {"name": "IngestionPipeline", "kind": "class", "line": 12, "match": "exact"}
+    assert top.scoring["mode"] == "symbol"
+
+    path_response = service.search(query="module.py", limit=5, include_graph=False, graph_service=None)
+    assert path_response.results[0].chunk["chunk_id"] == "src/module.py::0"
+
+
+def test_search_service_fuses_symbol_matches_for_mixed_queries(sample_points: list[FakePoint]) -> None:
+    client = FakeQdrantClient(sample_points)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        symbol_index=_symbol_index(),
+    )
+
+    response = service.search(
+        query="where is IngestionPipeline defined",
+        limit=5,
+        include_graph=False,
+        graph_service=None,
+    )
+
+    assert client.last_kwargs, "mixed queries still run hybrid retrieval"
+    assert response.metadata["query_kind"] == "mixed"
+    chunk_ids = {result.chunk["chunk_id"] for result in response.results}
+    assert chunk_ids == {"path::0", "src/module.py::1"}
+    assert all("fusion_score" in result.scoring for result in response.results)
+
+
+def test_classify_query_shapes() -> None:
+    assert classify_query("IngestionPipeline") == ("identifier", ["IngestionPipeline"])
+    assert classify_query("gateway/search/service.py") == ("path", ["gateway/search/service.py"])
+    assert classify_query("how does run_batch work") == ("mixed", ["run_batch"])
+    assert classify_query("how does ingestion work") == ("natural", [])
+
+
+_CONTEXT_TEXT = "abcdefghijklmnopqrstuvwxyz"
+
+
+class FakeContextQdrantClient(FakeBatchQdrantClient):
+    def __init__(self, points: list[FakePoint]) -> None:
+        super().__init__(points)
+        self.scroll_calls: list[dict[str, Any]] = []
+        # window=10, overlap=4 -> chunks start every 6 characters.
+        self._records = [
+            SimpleNamespace(
+                payload={
+                    "path": "src/a.py",
+                    "chunk_index": index,
+                    "chunk_id": f"src/a.py::{index}",
+                    "text": _CONTEXT_TEXT[start : start + 10],
+                }
+            )
+            for index, start in enumerate(range(0, len(_CONTEXT_TEXT), 6))
+        ]
+
+    def scroll(self, **kwargs: object) -> tuple[list[SimpleNamespace], None]:
+        self.scroll_calls.append(kwargs)
+        return self._records, None
+
+
+def test_search_service_expands_context_in_one_scroll() -> None:
+    hits = [
+        FakePoint({"chunk_id": f"src/a.py::{index}", "path": "src/a.py", "artifact_type": "code", "text": "alphabet"}, score)
+        for index, score in ((0, 0.9), (4, 0.8))
+    ]
+    client = FakeContextQdrantClient(hits)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        options=SearchOptions(chunk_overlap=4),
+    )
+
+    response = service.search(query="alphabet", limit=5, include_graph=False, graph_service=None, expand_context=1)
+
+    assert len(client.scroll_calls) == 1
+    call = client.scroll_calls[0]
+    assert call["limit"] == 5 and call["with_vectors"] is False
+    assert len(call["scroll_filter"].should) == 2
+    contexts = {result.chunk["chunk_id"]: result.chunk["context"] for result in response.results}
+    assert contexts["src/a.py::0"]["text"] == _CONTEXT_TEXT[0:16]
+    assert contexts["src/a.py::0"]["chunk_ids"] == ["src/a.py::0", "src/a.py::1"]
+    assert contexts["src/a.py::4"]["text"] == _CONTEXT_TEXT[18:]
+    assert (contexts["src/a.py::4"]["start_index"], contexts["src/a.py::4"]["end_index"]) == (3, 4)
+    assert "context_expansion" in response.metadata["timings_ms"]
+
+    batch = service.search_batch(
+        [
+            SearchRequest(query="alphabet", limit=5, include_graph=False, expand_context=2),
+            SearchRequest(query="alphabet", limit=5, include_graph=False, expand_context=1, verbosity="ids"),
+        ],
+        graph_service=None,
+    )
+    assert len(client.scroll_calls) == 2
+    assert client.scroll_calls[1]["limit"] == 7
+    assert batch.responses[0].results[0].chunk["context"]["text"] == _CONTEXT_TEXT[0:22]
+    assert "context" not in batch.responses[1].results[0].chunk
+
+
+class FakeSimilarQdrantClient(FakeQdrantClient):
+    def __init__(self, points: list[FakePoint]) -> None:
+        super().__init__(points)
+        self.scroll_calls: list[dict[str, Any]] = []
+        self.query_calls: list[dict[str, Any]] = []
+
+    def scroll(self, *, scroll_filter: Filter, **kwargs: object) -> tuple[list[SimpleNamespace], None]:
+        self.scroll_calls.append({"scroll_filter": scroll_filter, **kwargs})
+        seeds = [SimpleNamespace(id="seed-point", payload={"chunk_id": "src/seed.py::0", "text": "scheduler loop tuning"})]
+        return [record for record in seeds if record.payload["chunk_id"] in scroll_filter.must[0].match.any], None
+
+    def query_points(self, *, limit: int, **kwargs: object) -> SimpleNamespace:
+        self.query_calls.append({"limit": limit, **kwargs})
+        return SimpleNamespace(points=self._points[:limit])
+
+
+def test_search_similar_uses_stored_vectors_without_embedding(sample_points: list[FakePoint]) -> None:
+    client = FakeSimilarQdrantClient(sample_points)
+    service = SearchService(qdrant_client=client, collection_name="collection", embedder=ExplodingEmbedder())
+
+    response = service.search_similar(
+        chunk_ids=["src/seed.py::0", "src/unknown.py::4"],
+        limit=2,
+        include_graph=False,
+        graph_service=None,
+        filters={"artifact_types": ["code"]},
+    )
+
+    call = client.query_calls[0]
+    assert call["query"].recommend.positive == ["seed-point"]
+    assert call["query_filter"].must_not[0].has_id == ["seed-point"]
+    assert response.query == "src/seed.py::0 src/unknown.py::4"
+    assert response.metadata["retrieval"] == "similar"
+    assert response.metadata["seed_chunk_ids"] == ["src/seed.py::0"]
+    assert response.metadata["missing_chunk_ids"] == ["src/unknown.py::4"]
+    assert [result.chunk["artifact_type"] for result in response.results] == ["code"]
+    assert {"seed_lookup", "vector_search", "total"} <= set(response.metadata["timings_ms"])
+
+    empty = service.search_similar(chunk_ids=["src/unknown.py::4"], limit=2, include_graph=False, graph_service=None)
+    assert empty.results == [] and len(client.query_calls) == 1
+
+
+class FakeRoutingQdrantClient(FakeQdrantClient):
+    def __init__(self, points: list[FakePoint], centroids: list[tuple[str, float]]) -> None:
+        super().__init__(points)
+        self.centroids = centroids
+        self.search_calls: list[dict[str, Any]] = []
+        self.batch_calls: list[tuple[str, list[Any]]] = []
+
+    def query_points(
+        self,
+        *,
+        collection_name: str,
+        limit: int,
+        query_filter: Filter | None = None,
+        **kwargs: object,
+    ) -> SimpleNamespace:
+        if collection_name == "collection_subsystems":
+            return SimpleNamespace(points=[FakePoint({"subsystem": name}, score) for name, score in self.centroids[:limit]])
+        self.search_calls.append({"query_filter": query_filter, **kwargs})
+        if query_filter is None:
+            return SimpleNamespace(points=self._points)
+        allowed = query_filter.must[0].match.any
+        return SimpleNamespace(points=[point for point in self._points if point.payload["subsystem"] in allowed])
+
+    def query_batch_points(self, *, collection_name: str, requests: list[Any]) -> list[SimpleNamespace]:
+        self.batch_calls.append((collection_name, list(requests)))
+        return [
+            self.query_points(collection_name=collection_name, limit=request.limit, query_filter=request.filter) for request in requests
+        ]
+
+
+def _routing_points() -> list[FakePoint]:
+    return [
+        FakePoint({"chunk_id": f"{subsystem}/{index}.py::0", "path": f"{subsystem}/{index}.py", "subsystem": subsystem}, 0.9 - index / 10)
+        for index, subsystem in enumerate(["ui", "core", "core", "api"])
+    ]
+
+
+@pytest.mark.parametrize(
+    ("centroids", "limit", "outcome", "searches"),
+    [
+        ([("core", 0.8), ("api", 0.7), ("ui", 0.4)], 3, "routed", 1),
+        ([("core", 0.8), ("api", 0.7), ("ui", 0.68)], 3, "low_confidence", 1),
+        ([("core", 0.2), ("api", 0.1), ("ui", 0.0)], 3, "low_confidence", 1),
+        ([("core", 0.8), ("api", 0.7), ("ui", 0.4)], 4, "fallback", 2),
+    ],
+)
+def test_search_service_routes_to_closest_subsystems(centroids: list[tuple[str, float]], limit: int, outcome: str, searches: int) -> None:
+    client = FakeRoutingQdrantClient(_routing_points(), centroids)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        options=SearchOptions(routing_mode="subsystem", enrichment_mode="eager"),
+    )
+    before = _metric_value("km_search_routing_total", {"outcome": outcome})
+
+    response = service.search(query="scheduler", limit=limit, include_graph=False, graph_service=None)
+
+    routing = response.metadata["routing"]
+    assert routing["outcome"] == outcome
+    assert routing["subsystems"] == [name for name, _ in centroids[:2]]
+    assert len(client.search_calls) == searches
+    routed_filter = client.search_calls[0]["query_filter"]
+    assert (routed_filter is not None) == (outcome in {"routed", "fallback"})
+    assert ("ui" in {result.chunk["subsystem"] for result in response.results}) == (outcome != "routed")
+    assert "routing" in response.metadata["timings_ms"]
+    assert _metric_value("km_search_routing_total", {"outcome": outcome}) == before + 1
+
+
+def test_search_batch_routes_each_query_to_closest_subsystems() -> None:
+    client = FakeRoutingQdrantClient(_routing_points(), [("core", 0.8), ("api", 0.7), ("ui", 0.4)])
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        options=SearchOptions(routing_mode="subsystem", enrichment_mode="eager"),
+    )
+
+    batch = service.search_batch(
+        [
+            SearchRequest(query="scheduler", limit=3, include_graph=False),
+            SearchRequest(query="scheduler", limit=4, include_graph=False),
+            SearchRequest(query="scheduler", limit=2, include_graph=False, filters={"subsystems": ["ui"]}),
+        ],
+        graph_service=None,
+    )
+
+    routed, fallback, filtered = batch.responses
+    assert routed.metadata["routing"] == {"outcome": "routed", "subsystems": ["core", "api"], "confidence": 0.8}
+    assert "ui" not in {result.chunk["subsystem"] for result in routed.results}
+    assert fallback.metadata["routing"]["outcome"] == "fallback"
+    assert "ui" in {result.chunk["subsystem"] for result in fallback.results}
+    assert "routing" not in filtered.metadata
+    # One centroid lookup for both routable queries, one batched retrieval, one global retry.
+    assert [(name, len(requests)) for name, requests in client.batch_calls] == [
+        ("collection_subsystems", 2),
+        ("collection", 3),
+        ("collection", 1),
+    ]
+    assert client.batch_calls[2][1][0].filter is None
+    assert "routing" in batch.metadata["timings_ms"]
+
+
+def test_search_service_skips_routing_when_subsystem_filtered() -> None:
+    client = FakeRoutingQdrantClient(_routing_points(), [("core", 0.9), ("api", 0.1), ("ui", 0.0)])
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        options=SearchOptions(routing_mode="subsystem"),
+    )
+
+    response = service.search(query="scheduler", limit=2, include_graph=False, graph_service=None, filters={"subsystems": ["ui"]})
+
+    assert "routing" not in response.metadata
+    assert client.search_calls[0]["query_filter"] is None
+
+
+class FakeCountingQdrantClient(FakeQdrantClient):
+    def __init__(self, points: list[FakePoint], *, matching: int, total: int = 100_000) -> None:
+        super().__init__(points)
+        self.matching = matching
+        self.total = total
+        self.count_calls: list[dict[str, Any]] = []
+
+    def count(self, *, count_filter: Filter | None = None, **kwargs: object) -> SimpleNamespace:
+        self.count_calls.append({"count_filter": count_filter, **kwargs})
+        return SimpleNamespace(count=self.matching if count_filter is not None else self.total)
+
+
+@pytest.mark.parametrize(
+    ("mode", "filters", "matching", "expected_ef", "exact"),
+    [
+        (None, None, 0, 128, False),
+        ("fast", None, 0, 64, False),
+        ("exhaustive", None, 0, 512, False),
+        ("balanced", {"artifact_types": ["code"]}, 50_000, 256, False),
+        ("fast", {"artifact_types": ["code"]}, 5_000, 1024, False),
+        ("balanced", {"artifact_types": ["code"]}, 1_500, None, True),
+        ("exhaustive", {"artifact_types": ["code"]}, 15_000, None, True),
+    ],
+)
+def test_search_service_adapts_ef_to_mode_and_filter_selectivity(
+    sample_points: list[FakePoint],
+    mode: str | None,
+    filters: dict[str, Any] | None,
+    matching: int,
+    expected_ef: int | None,
+    exact: bool,
+) -> None:
+    client = FakeCountingQdrantClient(sample_points, matching=matching)
+    service = SearchService(
+        qdrant_client=client,
+        collection_name="collection",
+        embedder=FakeEmbedder(),
+        options=SearchOptions(hnsw_ef_search=128),
+    )
+    label = "exact" if exact else str(expected_ef)
+    before = _metric_value("km_search_retrieval_seconds_count", {"mode": mode or "balanced", "ef": label})
+
+    options: dict[str, Any] = {"filters": filters, "mode": mode}
+    response = service.search(query="foo", limit=5, include_graph=False, graph_service=None, **options)
+
+    params = client.last_kwargs["search_params"]
+    assert params.hnsw_ef == expected_ef
+    assert bool(params.exact) is exact
+    assert response.metadata["search_mode"]["hnsw_ef"] == expected_ef
+    assert response.metadata["search_mode"]["exact"] is exact
+    assert response.metadata.get("hnsw_ef_search") == expected_ef
+    assert _metric_value("km_search_retrieval_seconds_count", {"mode": mode or "balanced", "ef": label}) == before + 1
+    if filters is None:
+        assert client.count_calls == [] and client.last_kwargs["query_filter"] is None
+    else:
+        assert client.last_kwargs["query_filter"].must[0].match.any == ["code"]
+        assert response.metadata["search_mode"]["selectivity"] == pytest.approx(matching / 100_000)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from gateway.ingest.artifacts import Artifact, Chunk
+from gateway.ingest.chunking import Chunker
+from gateway.ingest.symbols import SymbolEntry, SymbolIndex, SymbolIndexBuilder, extract_symbols, symbol_index_path
+
+_SOURCE = """\"\"\"Pipeline module.\"\"\"
+
+
+class IngestionPipeline:
+    def run(self) -> None:
+        emit(TelemetryIngestMessage())
+
+
+async def drain_batches() -> None:
+    pass
+"""
+
+
+def _artifact(path: str = "src/gateway/pipeline.py", content: str = _SOURCE) -> Artifact:
+    return Artifact(
+        path=Path(path),
+        artifact_type="code",
+        subsystem="ingest",
+        content=content,
+        git_commit=None,
+        git_timestamp=None,
+        extra_metadata={
+            "message_entities": ["TelemetryIngestMessage"],
+            "telemetry_signals": ["TelemetryIngestMessage"],
+        },
+    )
+
+
+def _entries(window: int = 64, overlap: int = 16) -> tuple[list[SymbolEntry], list[Chunk]]:
+    artifact = _artifact()
+    chunker = Chunker(window=window, overlap=overlap)
+    chunks = list(chunker.split(artifact))
+    return extract_symbols(artifact, chunks, step=chunker.step), chunks
+
+
+def test_extract_symbols_maps_definitions_to_containing_chunk() -> None:
+    entries, chunks = _entries()
+    by_symbol = {(entry.symbol, entry.kind): entry for entry in entries}
+
+    pipeline = by_symbol[("IngestionPipeline", "class")]
+    assert pipeline.line == 4
+    assert pipeline.snippet == "class IngestionPipeline:"
+    chunk_text = next(chunk.text for chunk in chunks if chunk.chunk_id == pipeline.chunk_id)
+    assert "class IngestionPipeline" in chunk_text
+
+    assert ("drain_batches", "function") in by_symbol
+    assert ("TelemetryIngestMessage", "message") in by_symbol
+    assert ("TelemetryIngestMessage", "telemetry") in by_symbol
+    assert by_symbol[("src/gateway/pipeline.py", "path")].chunk_sequence == 0
+
+
+def test_lookup_ranks_exact_definitions_before_partial_matches() -> None:
+    entries, _ = _entries()
+    index = SymbolIndex(entries)
+
+    matches = index.lookup("ingestionpipeline", limit=5)
+    assert matches[0].entry.kind == "class"
+    assert matches[0].match == "exact"
+
+    path_matches = index.lookup("pipeline.py", limit=5)
+    assert path_matches[0].entry.kind == "path"
+    assert path_matches[0].match == "suffix"
+
+    partial = index.lookup("Telemetry", limit=5)
+    assert partial and all(match.match == "prefix" for match in partial)
+    assert partial[0].entry.kind == "message"
+
+    assert index.lookup("nonexistent", limit=5) == []
+
+
+def test_index_round_trip_and_incremental_builder(tmp_path: Path) -> None:
+    entries, _ = _entries()
+    path = symbol_index_path(tmp_path, "km_test")
+    SymbolIndex(entries).save(path)
+
+    loaded = SymbolIndex.load(path)
+    assert loaded is not None
+    assert len(loaded) == len(entries)
+    assert loaded.lookup("drain_batches", limit=1)[0].entry == next(e for e in entries if e.symbol == "drain_batches")
+
+    builder = SymbolIndexBuilder(loaded)
+    other = _artifact("docs/guide.md", "Guide mentions IngestionPipeline.\n")
+    builder.replace("docs/guide.md", extract_symbols(other, list(Chunker().split(other)), step=Chunker().step))
+    builder.remove("src/gateway/pipeline.py")
+    rebuilt = builder.build()
+
+    assert {entry.path for entry in rebuilt.entries} == {"docs/guide.md"}
+    assert SymbolIndex.load(tmp_path / "missing.json") is None